@@ -0,0 +1,159 @@
+"""Microbenchmark for the dataclass push / pull converters.
+
+Compares the compiled dataclass encoders / decoders with each installed JSON
+backend against the previous implementations (per-field runtime type checks to encode
+and dacite to decode) with the standard library json module.
+
+Usage:
+    python -m benchmarks.converters_benchmark [--num-elements 20000]
+"""
+import argparse
+import dataclasses
+import datetime
+import enum
+import importlib.util
+import json
+import timeit
+from typing import Callable, Dict, List, Optional
+
+from dacite import Config
+
+from buildflow.io.utils.schemas import converters
+from buildflow.io.utils.schemas.json_backends import json_backend
+
+# dacite only converts enums if they are explicitly cast.
+_DACITE_CONFIG = Config(
+    type_hooks={datetime.datetime: converters.str_to_datetime}, cast=[enum.Enum]
+)
+
+
+class Status(enum.Enum):
+    PENDING = "pending"
+    SHIPPED = "shipped"
+
+
+@dataclasses.dataclass
+class Event:
+    event_id: str
+    user_id: int
+    value: float
+    event_type: str
+    is_test: bool
+
+
+@dataclasses.dataclass
+class LineItem:
+    sku: str
+    quantity: int
+    price: float
+
+
+@dataclasses.dataclass
+class Address:
+    street: str
+    city: str
+    zip_code: str
+
+
+@dataclasses.dataclass
+class Order:
+    order_id: str
+    created_at: datetime.datetime
+    status: Status
+    line_items: List[LineItem]
+    shipping_address: Address
+    billing_address: Optional[Address]
+    attributes: Dict[str, str]
+
+
+def _legacy_dataclass_to_json(dataclass_instance) -> dict:
+    """The encoder used before dataclass encoders were compiled."""
+    to_ret = {}
+    for k in dataclass_instance.__dataclass_fields__:
+        val = getattr(dataclass_instance, k)
+        if isinstance(val, (datetime.datetime, datetime.date, datetime.time)):
+            val = val.isoformat()
+        if isinstance(val, enum.Enum):
+            # Not supported by the previous implementation, added so the output
+            # can be serialized.
+            val = val.value
+        if dataclasses.is_dataclass(val):
+            val = _legacy_dataclass_to_json(val)
+        if isinstance(val, list) and len(val) > 0 and dataclasses.is_dataclass(val[0]):
+            val = [_legacy_dataclass_to_json(v) for v in val]
+        to_ret[k] = val
+    return to_ret
+
+
+def _event() -> Event:
+    return Event("e-1", 123, 1.5, "click", False)
+
+
+def _order() -> Order:
+    address = Address("1 Main St", "Springfield", "12345")
+    return Order(
+        order_id="o-1",
+        created_at=datetime.datetime(2023, 1, 1, 12, 30),
+        status=Status.SHIPPED,
+        line_items=[LineItem(f"sku-{i}", i, 9.99) for i in range(5)],
+        shipping_address=address,
+        billing_address=address,
+        attributes={"channel": "web", "coupon": "none"},
+    )
+
+
+def _bench(fn: Callable[[], object], num_elements: int) -> float:
+    """Returns the best time per element in microseconds."""
+    times = timeit.repeat(fn, number=num_elements, repeat=3)
+    return min(times) / num_elements * 1e6
+
+
+def _installed_backends() -> List[str]:
+    return [
+        name
+        for name in ("json", "orjson", "msgspec")
+        if name == "json" or importlib.util.find_spec(name) is not None
+    ]
+
+
+def run(num_elements: int):
+    for name, instance in (("Event", _event()), ("Order", _order())):
+        type_ = type(instance)
+        encoded = json.dumps(_legacy_dataclass_to_json(instance)).encode()
+        print(f"{name} ({len(encoded)} bytes)")
+
+        baseline_encode = _bench(
+            lambda: json.dumps(_legacy_dataclass_to_json(instance)).encode(),
+            num_elements,
+        )
+        print(f"  encode  previous + json:           {baseline_encode:7.2f}us")
+        encoder = converters.dataclass_encoder(type_)
+        for backend_name in _installed_backends():
+            dumps_bytes = json_backend(backend_name).dumps_bytes
+            duration = _bench(lambda: dumps_bytes(encoder(instance)), num_elements)
+            print(
+                f"  encode  compiled + {backend_name:<17} {duration:7.2f}us "
+                f"({baseline_encode / duration:.1f}x)"
+            )
+
+        baseline_decode = _bench(
+            lambda: converters._dataclass_from_dict(
+                type_, json.loads(encoded), config=_DACITE_CONFIG
+            ),
+            num_elements,
+        )
+        print(f"  decode  previous (dacite) + json:  {baseline_decode:7.2f}us")
+        decoder = converters.dataclass_decoder(type_)
+        for backend_name in _installed_backends():
+            loads = json_backend(backend_name).loads
+            duration = _bench(lambda: decoder(loads(encoded)), num_elements)
+            print(
+                f"  decode  compiled + {backend_name:<17} {duration:7.2f}us "
+                f"({baseline_decode / duration:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-elements", type=int, default=20000)
+    run(parser.parse_args().num_elements)
@@ -36,6 +36,7 @@ def collector(
     max_replicas: int = 1000,
     target_num_ongoing_requests_per_replica: int = 1,
     max_concurrent_queries: int = 100,
+    trace_sample_rate: float = 0,
     log_level: str = "INFO",
 ):
     autoscale_options = AutoscalerOptions(
@@ -58,6 +59,7 @@ def collector(
                 autoscaler_options=autoscale_options,
                 # This option isn't used by collectors or endpoints
                 num_concurrency=1,
+                trace_sample_rate=trace_sample_rate,
             ),
             original_process_fn_or_class=original_fn_or_class,
         )
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
 from buildflow.core.options.runtime_options import AutoscalerOptions, ProcessorOptions
 from buildflow.io.primitive import Primitive
@@ -29,6 +29,15 @@ def consumer(
     autoscale_frequency_secs: int = 60,
     consumer_backlog_burn_threshold: int = 60,
     consumer_cpu_percent_target: int = 25,
+    consumer_memory_percent_target: int = 75,
+    memory_mb: Optional[float] = None,
+    memory_throttle_percent: int = 90,
+    resources: Optional[Dict[str, float]] = None,
+    placement_strategy: Optional[str] = None,
+    node_labels: Optional[Dict[str, str]] = None,
+    trace_sample_rate: float = 0,
+    unknown_field_policy: str = "ignore",
+    missing_field_policy: str = "raise",
     log_level: str = "INFO",
 ):
     autoscale_options = AutoscalerOptions(
@@ -39,6 +48,7 @@ def consumer(
         autoscale_frequency_secs=autoscale_frequency_secs,
         consumer_backlog_burn_threshold=consumer_backlog_burn_threshold,
         consumer_cpu_percent_target=consumer_cpu_percent_target,
+        consumer_memory_percent_target=consumer_memory_percent_target,
     )
 
     def decorator_function(original_fn_or_class):
@@ -50,6 +60,14 @@ def consumer(
                 num_concurrency=num_concurrency,
                 log_level=log_level,
                 autoscaler_options=autoscale_options,
+                memory_mb=memory_mb,
+                memory_throttle_percent=memory_throttle_percent,
+                resources=resources or {},
+                placement_strategy=placement_strategy,
+                node_labels=node_labels or {},
+                trace_sample_rate=trace_sample_rate,
+                unknown_field_policy=unknown_field_policy,
+                missing_field_policy=missing_field_policy,
             ),
             original_process_fn_or_class=original_fn_or_class,
         )
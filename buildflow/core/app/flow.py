@@ -521,6 +521,15 @@ class Flow:
         autoscale_frequency_secs: int = 60,
         consumer_backlog_burn_threshold: int = 60,
         consumer_cpu_percent_target: int = 25,
+        consumer_memory_percent_target: int = 75,
+        memory_mb: Optional[float] = None,
+        memory_throttle_percent: int = 90,
+        resources: Optional[Dict[str, float]] = None,
+        placement_strategy: Optional[str] = None,
+        node_labels: Optional[Dict[str, str]] = None,
+        trace_sample_rate: float = 0,
+        unknown_field_policy: str = "ignore",
+        missing_field_policy: str = "raise",
         log_level: str = "INFO",
     ):
         autoscale_options = AutoscalerOptions(
@@ -531,6 +540,7 @@ class Flow:
             autoscale_frequency_secs=autoscale_frequency_secs,
             consumer_backlog_burn_threshold=consumer_backlog_burn_threshold,
             consumer_cpu_percent_target=consumer_cpu_percent_target,
+            consumer_memory_percent_target=consumer_memory_percent_target,
         )
         if not dataclasses.is_dataclass(source):
             raise ValueError(
@@ -559,6 +569,14 @@ class Flow:
                 num_concurrency=num_concurrency,
                 log_level=log_level,
                 autoscaler_options=autoscale_options,
+                memory_mb=memory_mb,
+                memory_throttle_percent=memory_throttle_percent,
+                resources=resources or {},
+                placement_strategy=placement_strategy,
+                node_labels=node_labels or {},
+                trace_sample_rate=trace_sample_rate,
+                unknown_field_policy=unknown_field_policy,
+                missing_field_policy=missing_field_policy,
             ),
             source_credentials=source_credentials,
             sink_credentials=sink_credentials,
@@ -634,6 +652,7 @@ class Flow:
         min_replicas: int = 1,
         max_replicas: int = 1000,
         target_num_ongoing_requests_per_replica: int = 1,
+        trace_sample_rate: float = 0,
         log_level: str = "INFO",
     ):
         if isinstance(method, str):
@@ -668,6 +687,7 @@ class Flow:
                 num_concurrency=1,
                 log_level=log_level,
                 autoscaler_options=autoscale_options,
+                trace_sample_rate=trace_sample_rate,
             ),
             sink_credentials=sink_credentials,
         )
@@ -684,6 +704,7 @@ class Flow:
         max_replicas: int = 1000,
         max_concurrent_queries: int = 100,
         target_num_ongoing_requests_per_replica: int = 1,
+        trace_sample_rate: float = 0,
         log_level: str = "INFO",
     ):
         service = Service(
@@ -695,6 +716,7 @@ class Flow:
             min_replics=min_replicas,
             max_replicas=max_replicas,
             target_num_ongoing_requests_per_replica=target_num_ongoing_requests_per_replica,
+            trace_sample_rate=trace_sample_rate,
             log_level=log_level,
             service_id=service_id,
         )
@@ -724,6 +746,7 @@ class Flow:
                     num_concurrency=1,
                     log_level=service.log_level,
                     autoscaler_options=service.autoscale_options,
+                    trace_sample_rate=service.trace_sample_rate,
                 ),
             )
 
@@ -1,9 +1,19 @@
+import asyncio
 import logging
 from collections import deque
-from typing import Any, Dict, List, Type
+from typing import Any, Deque, Dict, List, Tuple, Type
 
 import ray
 from ray.exceptions import OutOfMemoryError, RayActorError
+from ray.util import placement_group, remove_placement_group
+from ray.util.placement_group import PlacementGroup
+from ray.util.scheduling_strategies import PlacementGroupSchedulingStrategy
+
+try:
+    from ray.util.scheduling_strategies import In, NodeLabelSchedulingStrategy
+except ImportError:
+    # Node label scheduling is only available in newer versions of ray.
+    In = NodeLabelSchedulingStrategy = None
 
 from buildflow.core import utils
 from buildflow.core.app.runtime._runtime import RunID, RuntimeStatus
@@ -12,6 +22,8 @@ from buildflow.core.app.runtime.actors.consumer_pattern.consumer_pool_snapshot i
     ConsumerProcessorSnapshot,
 )
 from buildflow.core.app.runtime.actors.consumer_pattern.pull_process_push import (
+    LATENCY_STAGES,
+    TIME_BREAKDOWN_STAGES,
     PullProcessPushActor,
     PullProcessPushSnapshot,
 )
@@ -21,11 +33,20 @@ from buildflow.core.app.runtime.actors.process_pool import (
     ReplicaReference,
 )
 from buildflow.core.app.runtime.autoscaler import calculate_target_num_replicas
-from buildflow.core.app.runtime.metrics import RateCalculation, SimpleGaugeMetric
+from buildflow.core.app.runtime.loop_monitor import EventLoopSnapshot
+from buildflow.core.app.runtime.metrics import (
+    HistogramCalculation,
+    RateCalculation,
+    SimpleGaugeMetric,
+)
 from buildflow.core.options.runtime_options import ProcessorOptions
 from buildflow.core.processor.patterns.consumer import ConsumerProcessor
 from buildflow.core.processor.processor import ProcessorGroup
 
+# How long we wait for a placement group to be scheduled before falling back to
+# scheduling the replicas without one.
+_PLACEMENT_GROUP_TIMEOUT_SECS = 60
+
 
 @ray.remote
 class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
@@ -51,6 +72,11 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
         # configuration
         self.processor_group = processor_group
         self.options = processor_options
+        if self.options.node_labels and NodeLabelSchedulingStrategy is None:
+            raise ValueError(
+                "node_labels requires a version of ray that supports node label "
+                f"scheduling, the installed version is: {ray.__version__}"
+            )
         # metrics
         job_id = ray.get_runtime_context().get_job_id()
         self.current_backlog_gauge = SimpleGaugeMetric(
@@ -63,6 +89,10 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
             },
         )
         self.prev_snapshot: ProcessorGroupSnapshot = None
+        # Placement group bundles reserved by add_replicas that have not been
+        # assigned to a replica yet.
+        self._unassigned_bundles: Deque[Tuple[PlacementGroup, int]] = deque()
+        self._placement_groups: List[PlacementGroup] = []
 
     async def scale(self):
         if self._status != RuntimeStatus.RUNNING:
@@ -90,12 +120,77 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
             await self.remove_replicas(abs(num_replicas_delta))
         self.prev_snapshot = processor_snapshot
 
+    async def _reserve_placement_group(self, num_replicas: int):
+        bundle = self.options.replica_bundle()
+        if not bundle:
+            # Ray does not allow empty bundles, so there is nothing to place.
+            return
+        pg = placement_group(
+            [bundle] * num_replicas, strategy=self.options.placement_strategy
+        )
+        try:
+            await asyncio.wait_for(pg.ready(), timeout=_PLACEMENT_GROUP_TIMEOUT_SECS)
+        except asyncio.TimeoutError:
+            logging.warning(
+                "placement group for %s replicas could not be scheduled, replicas "
+                "will be scheduled without a placement group.",
+                num_replicas,
+            )
+            remove_placement_group(pg)
+            return
+        self._placement_groups.append(pg)
+        self._unassigned_bundles.extend((pg, i) for i in range(num_replicas))
+
+    def _remove_unused_placement_groups(self):
+        used_pg_ids = {
+            replica.placement_group.id
+            for replica in self.replicas
+            if replica.placement_group is not None
+        }
+        used_pg_ids.update(pg.id for pg, _ in self._unassigned_bundles)
+        placement_groups = []
+        for pg in self._placement_groups:
+            if pg.id in used_pg_ids:
+                placement_groups.append(pg)
+            else:
+                remove_placement_group(pg)
+        self._placement_groups = placement_groups
+
+    async def add_replicas(self, num_replicas: int):
+        if self.options.placement_strategy is not None and num_replicas > 0:
+            await self._reserve_placement_group(num_replicas)
+        await super().add_replicas(num_replicas)
+        # Release any bundles that were not used (e.g. if we started draining).
+        self._unassigned_bundles.clear()
+        self._remove_unused_placement_groups()
+
+    async def remove_replicas(self, num_replicas: int):
+        await super().remove_replicas(num_replicas)
+        self._remove_unused_placement_groups()
+
     # NOTE: Providing this method is the main purpose of this class. It allows us to
     # contain any runtime logic that applies to all Processor types.
     async def create_replica(self) -> ReplicaReference:
         replica_id = utils.uuid()
+        replica_pg = None
+        scheduling_strategy = None
+        if self._unassigned_bundles:
+            replica_pg, bundle_index = self._unassigned_bundles.popleft()
+            scheduling_strategy = PlacementGroupSchedulingStrategy(
+                placement_group=replica_pg, placement_group_bundle_index=bundle_index
+            )
+        elif self.options.node_labels:
+            scheduling_strategy = NodeLabelSchedulingStrategy(
+                hard={
+                    label: In(value)
+                    for label, value in self.options.node_labels.items()
+                }
+            )
         replica_actor_handle = PullProcessPushActor.options(
             num_cpus=self.options.num_cpus,
+            memory=self.options.memory_bytes(),
+            resources=self.options.resources,
+            scheduling_strategy=scheduling_strategy,
             name=f"PullProcessPushActor-{self.processor_group.group_id}-{replica_id}",
         ).remote(
             self.run_id,
@@ -103,12 +198,19 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
             replica_id=replica_id,
             log_level=self.options.log_level,
             flow_dependencies=self.flow_dependencies,
+            memory_limit_bytes=self.options.memory_bytes(),
+            memory_throttle_percent=self.options.memory_throttle_percent,
+            trace_sample_rate=self.options.trace_sample_rate,
+            blocking_callback_threshold_secs=self.options.blocking_callback_threshold_secs,  # noqa: E501
+            unknown_field_policy=self.options.unknown_field_policy,
+            missing_field_policy=self.options.missing_field_policy,
         )
         await replica_actor_handle.initialize.remote()
 
         return ReplicaReference(
             replica_id=replica_id,
             ray_actor_handle=replica_actor_handle,
+            placement_group=replica_pg,
         )
 
     async def snapshot(self) -> ConsumerProcessorGroupSnapshot:
@@ -130,6 +232,7 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
             replica = self.replicas.pop(idx)
         if dead_replica_indices:
             logging.error("removed %s dead replicas", len(dead_replica_indices))
+            self._remove_unused_placement_groups()
             # update our gauge if had to remove some replicas.
             self.num_replicas_gauge.set(len(self.replicas))
         # NOTE: we grab the parrent snapshot after we've updated the replica list
@@ -214,6 +317,59 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
                 ]
             ).average_value_rate()
 
+            # below metric(s) derived from the `throttled_pulls` composite counter
+            total_throttled_pulls_per_sec = RateCalculation.merge(
+                [
+                    replica_snapshot.processor_snapshots[processor_id].throttled_pulls
+                    for replica_snapshot in replica_snapshots
+                ]
+            ).total_count_rate()
+
+            # below metric(s) derived from the replica memory usage
+            memory_percentages = [
+                replica_snapshot.memory_percentage
+                for replica_snapshot in replica_snapshots
+            ]
+            if memory_percentages:
+                avg_memory_percentage = sum(memory_percentages) / len(
+                    memory_percentages
+                )
+                max_memory_percentage = max(memory_percentages)
+                avg_in_flight_bytes = sum(
+                    replica_snapshot.processor_snapshots[processor_id].in_flight_bytes
+                    for replica_snapshot in replica_snapshots
+                ) / len(replica_snapshots)
+            else:
+                avg_memory_percentage = 0
+                max_memory_percentage = 0
+                avg_in_flight_bytes = 0
+
+            # below metric(s) derived from the per stage latency histograms
+            latency_millis = {
+                stage: HistogramCalculation.merge(
+                    [
+                        replica_snapshot.processor_snapshots[
+                            processor_id
+                        ].latency_millis[stage]
+                        for replica_snapshot in replica_snapshots
+                    ]
+                )
+                for stage in LATENCY_STAGES
+            }
+
+            # below metric(s) derived from the per stage time counters
+            avg_stage_time_millis = {
+                stage: RateCalculation.merge(
+                    [
+                        replica_snapshot.processor_snapshots[
+                            processor_id
+                        ].stage_time_millis[stage]
+                        for replica_snapshot in replica_snapshots
+                    ]
+                ).average_value_rate()
+                for stage in TIME_BREAKDOWN_STAGES
+            }
+
             # derived metric(s)
             if total_events_processed_per_sec == 0:
                 eta_secs = -1
@@ -233,6 +389,12 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
                 avg_process_time_millis_per_batch=avg_process_time_millis_per_batch,
                 avg_pull_to_ack_time_millis_per_batch=avg_pull_to_ack_time_millis_per_batch,
                 avg_cpu_percentage_per_replica=avg_cpu_percentage,
+                avg_memory_percentage_per_replica=avg_memory_percentage,
+                max_memory_percentage_per_replica=max_memory_percentage,
+                avg_in_flight_bytes_per_replica=avg_in_flight_bytes,
+                total_throttled_pulls_per_sec=total_throttled_pulls_per_sec,
+                latency_millis=latency_millis,
+                avg_stage_time_millis=avg_stage_time_millis,
             )
         return ConsumerProcessorGroupSnapshot(
             # parent snapshot fields
@@ -242,7 +404,15 @@ class ConsumerProcessorReplicaPoolActor(ProcessorGroupReplicaPoolActor):
             group_type=parent_snapshot.group_type,
             num_replicas=parent_snapshot.num_replicas,
             num_cpu_per_replica=parent_snapshot.num_cpu_per_replica,
+            memory_mb_per_replica=parent_snapshot.memory_mb_per_replica,
+            resources_per_replica=parent_snapshot.resources_per_replica,
+            placement_strategy=parent_snapshot.placement_strategy,
+            node_labels=parent_snapshot.node_labels,
             num_concurrency_per_replica=parent_snapshot.num_concurrency_per_replica,
+            pool_event_loop=parent_snapshot.pool_event_loop,
+            replica_event_loop=EventLoopSnapshot.merge(
+                [replica_snapshot.event_loop for replica_snapshot in replica_snapshots]
+            ),
             # pipeline-specific snapshot fields
             processor_snapshots=processor_snapshots,
         )
@@ -2,9 +2,10 @@ import dataclasses
 from typing import Dict
 
 from buildflow.core.app.runtime.actors.process_pool import (
-    ProcessorGroupSnapshot,
     IndividualProcessorSnapshot,
+    ProcessorGroupSnapshot,
 )
+from buildflow.core.app.runtime.metrics import HistogramCalculation
 from buildflow.core.processor.processor import ProcessorID, ProcessorType
 
 
@@ -22,6 +23,14 @@ class ConsumerProcessorSnapshot(IndividualProcessorSnapshot):
     avg_process_time_millis_per_batch: float
     avg_pull_to_ack_time_millis_per_batch: float
     avg_cpu_percentage_per_replica: float
+    avg_memory_percentage_per_replica: float
+    max_memory_percentage_per_replica: float
+    avg_in_flight_bytes_per_replica: float
+    total_throttled_pulls_per_sec: float
+    latency_millis: Dict[str, HistogramCalculation]
+    # The average time spent in each stage of the consumer loop. decode, process
+    # and encode are per element, pull, push and ack are per batch.
+    avg_stage_time_millis: Dict[str, float]
 
     def as_dict(self) -> dict:
         return {
@@ -37,6 +46,15 @@ class ConsumerProcessorSnapshot(IndividualProcessorSnapshot):
             "avg_process_time_millis_per_batch": self.avg_process_time_millis_per_batch,  # noqa: E501
             "avg_pull_to_ack_time_millis_per_batch": self.avg_pull_to_ack_time_millis_per_batch,  # noqa: E501
             "avg_cpu_percentage_per_replica": self.avg_cpu_percentage_per_replica,
+            "avg_memory_percentage_per_replica": self.avg_memory_percentage_per_replica,  # noqa: E501
+            "max_memory_percentage_per_replica": self.max_memory_percentage_per_replica,  # noqa: E501
+            "avg_in_flight_bytes_per_replica": self.avg_in_flight_bytes_per_replica,
+            "total_throttled_pulls_per_sec": self.total_throttled_pulls_per_sec,
+            "latency_millis": {
+                stage: histogram.as_dict()
+                for stage, histogram in self.latency_millis.items()
+            },
+            "avg_stage_time_millis": self.avg_stage_time_millis,
         }
 
 
@@ -2,18 +2,30 @@ import asyncio
 import dataclasses
 import logging
 import os
+import sys
 import time
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
 
 import psutil
 import ray
+from opentelemetry import trace
 
-from buildflow.core import utils
+from buildflow.core import tracing, utils
+from buildflow.core.app.runtime import profiler
 from buildflow.core.app.runtime._runtime import RunID, Runtime, RuntimeStatus, Snapshot
 from buildflow.core.app.runtime.actors.process_pool import ReplicaID
+from buildflow.core.app.runtime.loop_monitor import (
+    DEFAULT_BLOCKING_THRESHOLD_SECS,
+    EventLoopMonitor,
+    EventLoopSnapshot,
+    monitor_tags,
+)
 from buildflow.core.app.runtime.metrics import (
+    CompositeHistogramMetric,
     CompositeRateCounterMetric,
+    HistogramCalculation,
     RateCalculation,
+    SimpleGaugeMetric,
     num_events_processed,
     process_time_counter,
 )
@@ -25,6 +37,7 @@ from buildflow.dependencies.base import (
     initialize_dependencies,
     resolve_dependencies,
 )
+from buildflow.io.utils.schemas import converters
 
 # TODO: Explore the idea of letting this class autoscale the number of threads
 # it runs dynamically. Related: What if every implementation of RuntimeAPI
@@ -38,6 +51,64 @@ from buildflow.dependencies.base import (
 # current utilization of the tasks so that way we dont have to guess and under-
 # utilitize, and we also dont have to guess and over-utilitize and cause
 # contention / OOM (all pending pulled batches are kept in memory).
+# NOTE: We partially address the OOM case by throttling pulls when the replica is
+# close to its memory ceiling (see: _pull_throttle_secs).
+
+# How long to wait before checking memory again when a pull was throttled. The
+# wait doubles for every consecutive throttled pull, up to the max.
+_MEMORY_THROTTLE_SLEEP_SECS = 0.1
+_MAX_MEMORY_THROTTLE_SLEEP_SECS = 5
+
+# When a batch is sampled for tracing we only create per element spans for the
+# first few elements to avoid flooding the trace with identical spans.
+_MAX_TRACED_ELEMENTS_PER_BATCH = 10
+
+# The stages of the consumer loop we track latency histograms for.
+LATENCY_STAGES = ("pull", "process", "push", "ack", "pull_to_ack")
+# The stages of the consumer loop we track the time spent in. decode, process and
+# encode are measured per element, the other stages per batch. Elements of a batch
+# are processed concurrently, and the process time of an element is the wall time
+# until its coroutine finishes (including time waiting on other elements), so the
+# per element times overlap and can add up to more than the batch time.
+TIME_BREAKDOWN_STAGES = ("pull", "decode", "process", "encode", "push", "ack")
+_ELEMENT_STAGES = ("decode", "process", "encode")
+
+
+def _stage_time_description(stage: str) -> str:
+    if stage == "process":
+        return (
+            "Wall time in milliseconds each element spent in the process stage, "
+            "averaged per batch. Elements are processed concurrently so these "
+            "overlap. Only increments."
+        )
+    if stage in _ELEMENT_STAGES:
+        return (
+            f"Milliseconds each element spent in the {stage} stage, averaged per "
+            "batch. Only increments."
+        )
+    return f"Milliseconds each batch spent in the {stage} stage. Only increments."
+
+
+# The decode shape stats we export as counters, keyed by the DecodeShapeStats field.
+_DECODE_SHAPE_STATS = {
+    "num_shapes": "Number of field sets a decode plan was compiled for (evicted plans count again when recompiled). Only increments.",  # noqa: E501
+    "num_unknown_field_elements": "Number of elements with fields the input type doesn't have. Only increments.",  # noqa: E501
+    "num_missing_field_elements": "Number of elements missing required fields of the input type. Only increments.",  # noqa: E501
+}
+
+
+def _identity(element: Any) -> Any:
+    return element
+
+
+def _payload_size_bytes(element: Any) -> int:
+    """Returns an estimate of how much memory a pulled element holds on to."""
+    if isinstance(element, (bytes, bytearray, str)):
+        return len(element)
+    data = getattr(element, "data", None)
+    if isinstance(data, (bytes, bytearray, str)):
+        return len(data)
+    return sys.getsizeof(element)
 
 
 @dataclasses.dataclass
@@ -48,6 +119,10 @@ class IndividualProcessorMetrics:
     process_batch_time_millis: RateCalculation
     pull_to_ack_time_millis: RateCalculation
     cpu_percentage: RateCalculation
+    throttled_pulls: RateCalculation
+    in_flight_bytes: int
+    latency_millis: Dict[str, HistogramCalculation]
+    stage_time_millis: Dict[str, RateCalculation]
 
     def as_dict(self) -> dict:
         return {
@@ -57,6 +132,16 @@ class IndividualProcessorMetrics:
             "process_batch_time_millis": self.process_batch_time_millis.average_value_rate(),  # noqa: E501
             "pull_to_ack_time_millis": self.pull_to_ack_time_millis.average_value_rate(),  # noqa: E501
             "cpu_percentage": self.cpu_percentage.average_value_rate(),
+            "throttled_pulls_per_sec": self.throttled_pulls.total_count_rate(),
+            "in_flight_bytes": self.in_flight_bytes,
+            "latency_millis": {
+                stage: histogram.as_dict()
+                for stage, histogram in self.latency_millis.items()
+            },
+            "stage_time_millis": {
+                stage: rate.average_value_rate()
+                for stage, rate in self.stage_time_millis.items()
+            },
         }
 
 
@@ -64,12 +149,18 @@ class IndividualProcessorMetrics:
 class PullProcessPushSnapshot(Snapshot):
     status: RuntimeStatus
     timestamp_millis: int
+    memory_rss_bytes: int
+    memory_percentage: float
+    event_loop: EventLoopSnapshot
     processor_snapshots: Dict[str, IndividualProcessorMetrics]
 
     def as_dict(self) -> dict:
         snapshot_dict = {
             "status": self.status.name,
             "timestamp_millis": self.timestamp_millis,
+            "memory_rss_bytes": self.memory_rss_bytes,
+            "memory_percentage": self.memory_percentage,
+            "event_loop": self.event_loop.as_dict(),
         }
         for processor_id, processor_snapshot in self.processor_snapshots.items():
             snapshot_dict[processor_id] = processor_snapshot.as_dict()
@@ -86,15 +177,28 @@ class PullProcessPushActor(Runtime):
         replica_id: ReplicaID,
         flow_dependencies: Dict[Type, Any],
         log_level: str = "INFO",
+        memory_limit_bytes: Optional[int] = None,
+        memory_throttle_percent: int = 90,
+        trace_sample_rate: float = 0,
+        blocking_callback_threshold_secs: float = DEFAULT_BLOCKING_THRESHOLD_SECS,
+        unknown_field_policy: str = converters.UnknownFieldPolicy.IGNORE.value,
+        missing_field_policy: str = converters.MissingFieldPolicy.RAISE.value,
     ) -> None:
         # NOTE: Ray actors run in their own process, so we need to configure
         # logging per actor / remote task.
         logging.getLogger().setLevel(log_level)
+        tracing.configure_tracing(trace_sample_rate)
 
         # setup
         self.run_id = run_id
         self.processor_group = processor_group
         self.flow_dependencies = flow_dependencies
+        self.memory_limit_bytes = memory_limit_bytes
+        self.memory_throttle_percent = memory_throttle_percent
+        self.decode_policy = converters.DecodePolicy(
+            unknown_fields=converters.UnknownFieldPolicy(unknown_field_policy),
+            missing_fields=converters.MissingFieldPolicy(missing_field_policy),
+        )
 
         # validation
         # TODO: Validate that the schemas & types are all compatible
@@ -104,6 +208,8 @@ class PullProcessPushActor(Runtime):
         self._num_running_threads = 0
         self._replica_id = replica_id
         self._last_snapshot_time = time.monotonic()
+        self._proc = psutil.Process(os.getpid())
+        self._in_flight_bytes: Dict[str, int] = {}
         # metrics
         job_id = ray.get_runtime_context().get_job_id()
         self.num_events_processed = {}
@@ -112,8 +218,32 @@ class PullProcessPushActor(Runtime):
         self.batch_time_counter = {}
         self.total_time_counter = {}
         self.cpu_percentage = {}
+        self.throttled_pulls_counter = {}
+        self.latency_histograms: Dict[str, Dict[str, CompositeHistogramMetric]] = {}
+        self.stage_time_counters: Dict[str, Dict[str, CompositeRateCounterMetric]] = {}
+        self.decode_shape_counters: Dict[
+            str, Dict[str, CompositeRateCounterMetric]
+        ] = {}
+        # The decode stats are tracked per type for the whole process, so we keep
+        # the last reported stats once per type and only report the change.
+        self._reported_decode_shape_stats: Dict[Type, converters.DecodeShapeStats] = {}
+        self.memory_percentage_gauge = SimpleGaugeMetric(
+            "memory_percentage",
+            description="Current memory percentage of a replica. Goes up and down.",
+            default_tags={
+                "processor_group_id": self.processor_group.group_id,
+                "JobId": job_id,
+                "RunId": self.run_id,
+                "ReplicaID": self._replica_id,
+            },
+        )
+        self.loop_monitor = EventLoopMonitor(
+            monitor_tags(self.processor_group.group_id, self.run_id, self._replica_id),
+            blocking_threshold_secs=blocking_callback_threshold_secs,
+        )
         for processor in self.processor_group.processors:
             processor_id = processor.processor_id
+            self._in_flight_bytes[processor_id] = 0
 
             self.num_events_processed[processor_id] = num_events_processed(
                 processor_id=processor_id,
@@ -164,6 +294,95 @@ class PullProcessPushActor(Runtime):
                     "ReplicaID": self._replica_id,
                 },
             )
+            self.throttled_pulls_counter[processor_id] = CompositeRateCounterMetric(
+                "throttled_pulls",
+                description="Number of pulls skipped due to memory pressure. Only increments.",  # noqa: E501
+                default_tags={
+                    "processor_id": processor_id,
+                    "JobId": job_id,
+                    "RunId": self.run_id,
+                },
+            )
+            self.latency_histograms[processor_id] = {
+                stage: CompositeHistogramMetric(
+                    f"{stage}_latency_millis",
+                    description=f"Distribution of the {stage} latency in milliseconds.",  # noqa: E501
+                    default_tags={
+                        "processor_id": processor_id,
+                        "JobId": job_id,
+                        "RunId": self.run_id,
+                    },
+                )
+                for stage in LATENCY_STAGES
+            }
+            self.stage_time_counters[processor_id] = {
+                stage: CompositeRateCounterMetric(
+                    f"{stage}_stage_time_millis",
+                    description=_stage_time_description(stage),
+                    default_tags={
+                        "processor_id": processor_id,
+                        "JobId": job_id,
+                        "RunId": self.run_id,
+                    },
+                )
+                for stage in TIME_BREAKDOWN_STAGES
+            }
+            self.decode_shape_counters[processor_id] = {
+                stat: CompositeRateCounterMetric(
+                    f"decode_{stat}",
+                    description=description,
+                    default_tags={
+                        "processor_id": processor_id,
+                        "JobId": job_id,
+                        "RunId": self.run_id,
+                    },
+                )
+                for stat, description in _DECODE_SHAPE_STATS.items()
+            }
+
+    def _report_decode_shape_stats(self, processor_id: str, type_: Type):
+        """Reports the decode shapes seen since the last report for this type.
+
+        The stats are shared by every loop and processor decoding the same type, so
+        the change is only counted once, by whichever loop reports it first.
+        """
+        stats = converters.decode_shape_stats(type_)
+        reported = self._reported_decode_shape_stats[type_]
+        if stats == reported:
+            return
+        for stat, counter in self.decode_shape_counters[processor_id].items():
+            new_count = getattr(stats, stat) - getattr(reported, stat)
+            if new_count > 0:
+                counter.inc(new_count)
+        self._reported_decode_shape_stats[type_] = dataclasses.replace(stats)
+
+    def _memory_percent(self) -> float:
+        rss = self._proc.memory_info().rss
+        if self.memory_limit_bytes is not None:
+            return rss / self.memory_limit_bytes * 100
+        # If no budget was configured we use the share of the node's memory used by
+        # this replica. The memory usage of the whole node includes other processes,
+        # so neither throttling nor adding replicas could lower it.
+        return rss / psutil.virtual_memory().total * 100
+
+    def _pull_throttle_secs(self, prev_throttle_secs: float) -> float:
+        """Returns how long to wait before pulling, or 0 if we can pull now.
+
+        prev_throttle_secs is the wait returned by the previous call, consecutive
+        waits back off exponentially up to _MAX_MEMORY_THROTTLE_SLEEP_SECS.
+        """
+        if self._memory_percent() < self.memory_throttle_percent:
+            return 0
+        if prev_throttle_secs >= _MAX_MEMORY_THROTTLE_SLEEP_SECS and not any(
+            self._in_flight_bytes.values()
+        ):
+            # Nothing in flight will free memory, let a pull through so the replica
+            # doesn't stall forever. The next pull backs off from the start again.
+            return 0
+        return min(
+            max(prev_throttle_secs * 2, _MEMORY_THROTTLE_SLEEP_SECS),
+            _MAX_MEMORY_THROTTLE_SLEEP_SECS,
+        )
 
     async def initialize(self):
         for processor in self.processor_group.processors:
@@ -176,6 +395,7 @@ class PullProcessPushActor(Runtime):
         if self._status == RuntimeStatus.PENDING:
             logging.info("Starting PullProcessPushActor...")
             self._status = RuntimeStatus.RUNNING
+            self.loop_monitor.start()
         elif self._status == RuntimeStatus.DRAINING:
             logging.info("PullProcessPushActor is already draining will not start.")
             return
@@ -190,14 +410,14 @@ class PullProcessPushActor(Runtime):
         if self._num_running_threads <= 0:
             # Only mark this as drained if all the threads have completed.
             self._status = RuntimeStatus.DRAINED
+            self.loop_monitor.stop()
             logging.info("PullProcessPushActor Complete.")
 
         logging.debug("Thread Complete.")
 
     async def _run_processor(self, processor: ConsumerProcessor):
         processor_id = processor.processor_id
-        pid = os.getpid()
-        proc = psutil.Process(pid)
+        proc = self._proc
 
         input_types, output_type = process_types(processor)
         if len(input_types) != 1:
@@ -205,34 +425,101 @@ class PullProcessPushActor(Runtime):
         input_type = input_types[0]
         source = processor.source()
         sink = processor.sink()
-        pull_converter = source.pull_converter(input_type.arg_type)
-        push_converter = sink.push_converter(output_type)
+        with converters.decode_policy(self.decode_policy):
+            pull_converter = source.pull_converter(input_type.arg_type)
+        self._reported_decode_shape_stats.setdefault(
+            input_type.arg_type,
+            dataclasses.replace(converters.decode_shape_stats(input_type.arg_type)),
+        )
+        # Sinks that write tabular data can take the whole batch as a columnar
+        # Arrow batch, in which case elements are only converted once per batch.
+        arrow_push_converter = sink.arrow_push_converter(output_type)
+        if arrow_push_converter is not None:
+            push_converter = _identity
+        else:
+            push_converter = sink.push_converter(output_type)
         process_fn = processor.process
+        latency_histograms = self.latency_histograms[processor_id]
+        stage_time_counters = self.stage_time_counters[processor_id]
+        # The time spent in each per element stage for the current batch. Each call
+        # of _run_processor processes one batch at a time so this isn't shared.
+        element_stage_secs = dict.fromkeys(_ELEMENT_STAGES, 0.0)
+        tracer = tracing.get_tracer()
+        span_attributes = {"buildflow.processor_id": processor_id}
 
         async def process_element(element, *args, **kwargs):
-            results = await process_fn(pull_converter(element), *args, **kwargs)
+            start_time = time.perf_counter()
+            converted = pull_converter(element)
+            decode_end_time = time.perf_counter()
+            results = await process_fn(converted, *args, **kwargs)
+            process_end_time = time.perf_counter()
+            element_stage_secs["decode"] += decode_end_time - start_time
+            element_stage_secs["process"] += process_end_time - decode_end_time
             if results is None:
                 # Exclude none results
                 return
             elif isinstance(results, (list, tuple)):
-                return [push_converter(result) for result in results]
+                encoded = [push_converter(result) for result in results]
             else:
-                return push_converter(results)
+                encoded = push_converter(results)
+            element_stage_secs["encode"] += time.perf_counter() - process_end_time
+            return encoded
+
+        async def traced_process_element(
+            element, batch_context, upstream_links, *args, **kwargs
+        ):
+            with tracer.start_as_current_span(
+                "process_element",
+                context=batch_context,
+                links=upstream_links,
+                attributes=span_attributes,
+            ):
+                start_time = time.perf_counter()
+                with tracer.start_as_current_span("pull_convert"):
+                    converted = pull_converter(element)
+                decode_end_time = time.perf_counter()
+                with tracer.start_as_current_span("process"):
+                    results = await process_fn(converted, *args, **kwargs)
+                process_end_time = time.perf_counter()
+                element_stage_secs["decode"] += decode_end_time - start_time
+                element_stage_secs["process"] += process_end_time - decode_end_time
+                if results is None:
+                    return
+                with tracer.start_as_current_span("push_convert"):
+                    if isinstance(results, (list, tuple)):
+                        encoded = [push_converter(result) for result in results]
+                    else:
+                        encoded = push_converter(results)
+                element_stage_secs["encode"] += time.perf_counter() - process_end_time
+                return encoded
 
         max_batch_size = source.max_batch_size()
+        throttle_secs = 0
         while self._status == RuntimeStatus.RUNNING:
             # Add a small sleep here so none async sources can yield
             # otherwise drain signals never get received.
             # TODO: figure out away to remove this sleep
             await asyncio.sleep(0.001)
             proc.cpu_percent()
+            throttle_secs = self._pull_throttle_secs(throttle_secs)
+            if throttle_secs > 0:
+                # The replica is close to its memory ceiling, wait for in flight
+                # batches to be acked (or memory to be freed) before pulling more
+                # data.
+                self.throttled_pulls_counter[processor_id].inc()
+                await asyncio.sleep(throttle_secs)
+                continue
             # PULL
             total_start_time = time.monotonic()
+            pull_start_time_ns = time.time_ns()
             try:
                 response = await source.pull()
             except Exception:
                 logging.exception("pull failed")
                 continue
+            pull_time_millis = (time.monotonic() - total_start_time) * 1000
+            latency_histograms["pull"].observe(pull_time_millis)
+            stage_time_counters["pull"].inc(pull_time_millis)
             if not response.payload:
                 self.pull_percentage_counter[processor_id].empty_inc()
                 cpu_percent = proc.cpu_percent()
@@ -241,6 +528,23 @@ class PullProcessPushActor(Runtime):
                 else:
                     self.cpu_percentage[processor_id].empty_inc()
                 continue
+            # We only know if a batch should be traced once the pull returns data,
+            # so the batch and pull spans are started retroactively.
+            batch_span = tracer.start_span(
+                "consume_batch",
+                start_time=pull_start_time_ns,
+                links=tracing.extract_links(response.trace_contexts),
+                attributes={
+                    **span_attributes,
+                    "buildflow.batch_size": len(response.payload),
+                },
+            )
+            batch_context = trace.set_span_in_context(batch_span)
+            tracer.start_span(
+                "pull", context=batch_context, start_time=pull_start_time_ns
+            ).end()
+            batch_bytes = sum(_payload_size_bytes(e) for e in response.payload)
+            self._in_flight_bytes[processor_id] += batch_bytes
             # PROCESS
             process_success = True
             process_start_time = time.monotonic()
@@ -249,14 +553,37 @@ class PullProcessPushActor(Runtime):
                 self.pull_percentage_counter[processor_id].inc(
                     len(response.payload) / source.max_batch_size()
                 )
+            for stage in _ELEMENT_STAGES:
+                element_stage_secs[stage] = 0.0
             try:
                 coros = []
-                for element in response.payload:
-                    dependency_args = dependency_args = await resolve_dependencies(
-                        processor.dependencies(), self.flow_dependencies
-                    )
-                    coros.append(process_element(element, **dependency_args))
-                flattened_results = await asyncio.gather(*coros)
+                num_traced_elements = 0
+                if batch_span.is_recording():
+                    num_traced_elements = _MAX_TRACED_ELEMENTS_PER_BATCH
+                process_span = tracer.start_span("process_batch", context=batch_context)
+                process_context = trace.set_span_in_context(process_span)
+                try:
+                    for i, element in enumerate(response.payload):
+                        dependency_args = await resolve_dependencies(
+                            processor.dependencies(), self.flow_dependencies
+                        )
+                        if i < num_traced_elements:
+                            trace_context = None
+                            if response.trace_contexts:
+                                trace_context = response.trace_contexts[i]
+                            coros.append(
+                                traced_process_element(
+                                    element,
+                                    process_context,
+                                    tracing.extract_links([trace_context]),
+                                    **dependency_args,
+                                )
+                            )
+                        else:
+                            coros.append(process_element(element, **dependency_args))
+                    flattened_results = await asyncio.gather(*coros)
+                finally:
+                    process_span.end()
                 batch_results = []
                 for results in flattened_results:
                     if results is None:
@@ -266,41 +593,69 @@ class PullProcessPushActor(Runtime):
                         batch_results.extend(results)
                     else:
                         batch_results.append(results)
+                if batch_results and arrow_push_converter is not None:
+                    encode_start_time = time.perf_counter()
+                    batch_results = arrow_push_converter(batch_results)
+                    element_stage_secs["encode"] += (
+                        time.perf_counter() - encode_start_time
+                    )
 
                 batch_process_time_millis = (
                     time.monotonic() - process_start_time
                 ) * 1000
-                self.batch_time_counter[processor_id].inc(
-                    (time.monotonic() - process_start_time) * 1000
-                )
+                self.batch_time_counter[processor_id].inc(batch_process_time_millis)
+                latency_histograms["process"].observe(batch_process_time_millis)
                 element_process_time_millis = batch_process_time_millis / len(
                     response.payload
                 )
                 self.process_time_counter[processor_id].inc(element_process_time_millis)
+                for stage in _ELEMENT_STAGES:
+                    stage_time_counters[stage].inc(
+                        element_stage_secs[stage] * 1000 / len(response.payload)
+                    )
+                self._report_decode_shape_stats(processor_id, input_type.arg_type)
 
                 # PUSH
                 if batch_results:
-                    await sink.push(batch_results)
-            except Exception:
+                    push_start_time = time.monotonic()
+                    # The push span is made current so sinks can propagate it.
+                    with tracer.start_as_current_span("push", context=batch_context):
+                        await sink.push(batch_results)
+                    push_time_millis = (time.monotonic() - push_start_time) * 1000
+                    latency_histograms["push"].observe(push_time_millis)
+                    stage_time_counters["push"].inc(push_time_millis)
+            except Exception as e:
                 logging.exception(
                     "failed to process batch, messages will not be acknowledged"
                 )
+                batch_span.record_exception(e)
+                batch_span.set_status(trace.StatusCode.ERROR)
                 process_success = False
             finally:
+                self._in_flight_bytes[processor_id] -= batch_bytes
                 # ACK
                 try:
-                    await source.ack(response.ack_info, process_success)
-                except Exception:
+                    ack_start_time = time.monotonic()
+                    with tracer.start_as_current_span("ack", context=batch_context):
+                        await source.ack(response.ack_info, process_success)
+                    ack_time_millis = (time.monotonic() - ack_start_time) * 1000
+                    latency_histograms["ack"].observe(ack_time_millis)
+                    stage_time_counters["ack"].inc(ack_time_millis)
+                except Exception as e:
                     # This can happen if there is network failures for w/e reason
                     # we want to try and catch here so our runtime loop
                     # doesn't die.
                     logging.exception("failed to ack batch, will continue")
+                    batch_span.record_exception(e)
+                    batch_span.set_status(trace.StatusCode.ERROR)
+                    batch_span.end()
                     continue
+            batch_span.end()
             self.num_events_processed[processor_id].inc(len(response.payload))
             # DONE -> LOOP
-            self.total_time_counter[processor_id].inc(
-                (time.monotonic() - total_start_time) * 1000
-            )
+            total_time_millis = (time.monotonic() - total_start_time) * 1000
+            self.total_time_counter[processor_id].inc(total_time_millis)
+            latency_histograms["pull_to_ack"].observe(total_time_millis)
             cpu_percent = proc.cpu_percent()
             if cpu_percent > 0.0:
                 # Ray doesn't like it when we try to set a metric to 0
@@ -320,6 +675,11 @@ class PullProcessPushActor(Runtime):
             await asyncio.sleep(1)
         return True
 
+    async def profile(
+        self, mode: profiler.ProfileMode, seconds: float
+    ) -> profiler.CollapsedStacks:
+        return await profiler.profile(mode, seconds)
+
     async def num_active_threads(self):
         return self._num_running_threads
 
@@ -344,10 +704,29 @@ class PullProcessPushActor(Runtime):
                     processor_id
                 ].calculate_rate(),
                 cpu_percentage=self.cpu_percentage[processor_id].calculate_rate(),
+                throttled_pulls=self.throttled_pulls_counter[
+                    processor_id
+                ].calculate_rate(),
+                in_flight_bytes=self._in_flight_bytes[processor_id],
+                latency_millis={
+                    stage: histogram.calculate_histogram()
+                    for stage, histogram in self.latency_histograms[
+                        processor_id
+                    ].items()
+                },
+                stage_time_millis={
+                    stage: counter.calculate_rate()
+                    for stage, counter in self.stage_time_counters[processor_id].items()
+                },
             )
+        memory_percentage = self._memory_percent()
+        self.memory_percentage_gauge.set(memory_percentage)
         snapshot = PullProcessPushSnapshot(
             status=self._status,
             timestamp_millis=utils.timestamp_millis(),
+            memory_rss_bytes=self._proc.memory_info().rss,
+            memory_percentage=memory_percentage,
+            event_loop=self.loop_monitor.snapshot(),
             processor_snapshots=individual_metrics,
         )
         # reset the counters
@@ -1,4 +1,5 @@
 import asyncio
+import dataclasses
 import os
 import shutil
 import tempfile
@@ -12,6 +13,7 @@ import pytest
 from buildflow.core.app.flow import Flow
 from buildflow.core.app.runtime._runtime import RuntimeStatus
 from buildflow.core.app.runtime.actors.consumer_pattern.pull_process_push import (
+    TIME_BREAKDOWN_STAGES,
     PullProcessPushActor,
 )
 from buildflow.core.processor.patterns.consumer import ConsumerGroup
@@ -20,6 +22,12 @@ from buildflow.io.local.pulse import Pulse
 from buildflow.types.portable import FileFormat
 
 
+@dataclasses.dataclass
+class Output:
+    field: int
+    doubled: int
+
+
 @pytest.mark.usefixtures("ray")
 class PullProcessPushTest(unittest.IsolatedAsyncioTestCase):
     def get_output_file(self) -> str:
@@ -117,6 +125,35 @@ class PullProcessPushTest(unittest.IsolatedAsyncioTestCase):
 
         await self.run_with_timeout(actor.drain.remote())
 
+    async def test_snapshot_includes_stage_time_breakdown(self):
+        app = Flow()
+
+        @app.consumer(
+            source=Pulse([{"field": 1}, {"field": 2}], pulse_interval_seconds=0.1),
+            sink=File(file_path=self.output_path, file_format=FileFormat.CSV),
+        )
+        def process(payload):
+            return payload
+
+        actor = PullProcessPushActor.remote(
+            run_id="test-run",
+            processor_group=ConsumerGroup(group_id="g", processors=[process]),
+            replica_id="1",
+            flow_dependencies={},
+        )
+        await actor.initialize.remote()
+
+        await self.run_with_timeout(actor.run.remote(), timeout=2)
+        snapshot = await actor.snapshot.remote()
+
+        stage_time_millis = snapshot.processor_snapshots["process"].stage_time_millis
+        self.assertCountEqual(TIME_BREAKDOWN_STAGES, stage_time_millis.keys())
+        for stage in TIME_BREAKDOWN_STAGES:
+            self.assertGreater(stage_time_millis[stage].values_count, 0, stage)
+        self.assertIn("stage_time_millis", snapshot.as_dict()["process"])
+
+        await self.run_with_timeout(actor.drain.remote())
+
     async def test_end_to_end_with_processor_decorator_async(self):
         app = Flow()
 
@@ -177,6 +214,36 @@ class PullProcessPushTest(unittest.IsolatedAsyncioTestCase):
 
         await self.run_with_timeout(actor.drain.remote())
 
+    async def test_end_to_end_with_processor_decorator_arrow_batch(self):
+        app = Flow()
+
+        @app.consumer(
+            source=Pulse([{"field": 1}, {"field": 2}], pulse_interval_seconds=0.1),
+            sink=File(file_path=self.output_path, file_format=FileFormat.CSV),
+        )
+        def process(payload) -> List[Output]:
+            return [Output(field=payload["field"], doubled=payload["field"] * 2)]
+
+        actor = PullProcessPushActor.remote(
+            run_id="test-run",
+            processor_group=ConsumerGroup(group_id="g", processors=[process]),
+            replica_id="1",
+            flow_dependencies={},
+        )
+        await actor.initialize.remote()
+
+        await self.run_with_timeout(actor.run.remote())
+
+        final_file = self.get_output_file()
+        table = pcsv.read_csv(Path(final_file))
+        table_list = table.to_pylist()
+        self.assertGreaterEqual(len(table_list), 2)
+        self.assertCountEqual(
+            [{"field": 1, "doubled": 2}, {"field": 2, "doubled": 4}], table_list[0:2]
+        )
+
+        await self.run_with_timeout(actor.drain.remote())
+
     async def test_end_to_end_with_processor_drain_multi_thread(self):
         app = Flow()
 
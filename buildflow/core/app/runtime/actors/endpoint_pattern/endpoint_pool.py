@@ -14,6 +14,7 @@ from buildflow.core.app.runtime.actors.process_pool import (
     ProcessorGroupSnapshot,
     ReplicaReference,
 )
+from buildflow.core.app.runtime.metrics import HistogramCalculation
 from buildflow.core.options.runtime_options import ProcessorOptions
 from buildflow.core.processor.patterns.endpoint import EndpointProcessor
 from buildflow.core.processor.processor import (
@@ -27,8 +28,12 @@ from buildflow.core.processor.processor import (
 class IndividualProcessorMetrics(IndividualProcessorSnapshot):
     processor_id: ProcessorID
     processor_type: ProcessorType
-    total_events_processed_per_sec: int
+    total_events_processed_per_sec: float
     avg_process_time_millis_per_element: float
+    total_errors_per_sec: float
+    error_percentage: float
+    total_in_flight_requests: int
+    latency_millis: Dict[str, HistogramCalculation]
 
     def as_dict(self) -> dict:
         return {
@@ -36,6 +41,13 @@ class IndividualProcessorMetrics(IndividualProcessorSnapshot):
             "processor_type": self.processor_type.name,
             "total_events_processed_per_sec": self.total_events_processed_per_sec,  # noqa: E501
             "avg_process_time_millis_per_element": self.avg_process_time_millis_per_element,  # noqa: E501
+            "total_errors_per_sec": self.total_errors_per_sec,
+            "error_percentage": self.error_percentage,
+            "total_in_flight_requests": self.total_in_flight_requests,
+            "latency_millis": {
+                stage: histogram.as_dict()
+                for stage, histogram in self.latency_millis.items()
+            },
         }
 
 
@@ -99,10 +111,12 @@ class EndpointProcessorGroupPoolActor(ProcessorGroupReplicaPoolActor):
     async def snapshot(self) -> ProcessorGroupSnapshot:
         parent_snapshot: ProcessorGroupSnapshot = await super().snapshot()
         num_replicas = 0
+        replica_event_loop = None
         processor_snapshots = {}
         if len(self.replicas) > 0:
             replica_snapshot = await self.replicas[0].ray_actor_handle.snapshot.remote()
             num_replicas = replica_snapshot.num_replicas
+            replica_event_loop = replica_snapshot.event_loop
             for pid, metrics in replica_snapshot.processor_snapshots.items():
                 total_events_processed_per_sec = metrics.events_processed_per_sec
                 avg_process_time_millis_per_element = metrics.avg_process_time_millis
@@ -112,6 +126,10 @@ class EndpointProcessorGroupPoolActor(ProcessorGroupReplicaPoolActor):
                     ProcessorType.ENDPOINT,
                     total_events_processed_per_sec,
                     avg_process_time_millis_per_element,
+                    metrics.errors_per_sec,
+                    metrics.error_percentage,
+                    metrics.num_in_flight_requests,
+                    metrics.latency_millis,
                 )
         return EndpointProcessorSnapshot(
             status=parent_snapshot.status,
@@ -121,5 +139,10 @@ class EndpointProcessorGroupPoolActor(ProcessorGroupReplicaPoolActor):
             num_replicas=num_replicas,
             num_concurrency_per_replica=parent_snapshot.num_concurrency_per_replica,
             num_cpu_per_replica=parent_snapshot.num_cpu_per_replica,
+            memory_mb_per_replica=parent_snapshot.memory_mb_per_replica,
+            resources_per_replica=parent_snapshot.resources_per_replica,
+            placement_strategy=parent_snapshot.placement_strategy,
             processor_snapshots=processor_snapshots,
+            pool_event_loop=parent_snapshot.pool_event_loop,
+            replica_event_loop=replica_event_loop,
         )
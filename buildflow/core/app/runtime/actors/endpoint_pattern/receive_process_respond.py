@@ -1,29 +1,48 @@
 import asyncio
 import dataclasses
 import logging
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
 
 import ray
 from ray import serve
 
 from buildflow.core import utils
+from buildflow.core.app.runtime import profiler
 from buildflow.core.app.runtime._runtime import RunID, Runtime, RuntimeStatus, Snapshot
-from buildflow.core.app.runtime.fastapi import create_app
+from buildflow.core.app.runtime.fastapi import (
+    ServeReplicaMetricsStore,
+    ServeReplicaProcessorMetrics,
+    create_app,
+)
+from buildflow.core.app.runtime.loop_monitor import EventLoopSnapshot
+from buildflow.core.app.runtime.metrics import HistogramCalculation
 from buildflow.core.options.runtime_options import ProcessorOptions
 from buildflow.core.processor.patterns.endpoint import EndpointGroup
+from buildflow.core.processor.processor import ProcessorID
 
 _MAX_SERVE_START_TRIES = 10
 
 
 @dataclasses.dataclass
 class IndividualProcessorMetrics:
-    events_processed_per_sec: int
+    events_processed_per_sec: float
     avg_process_time_millis: float
+    errors_per_sec: float
+    error_percentage: float
+    num_in_flight_requests: int
+    latency_millis: Dict[str, HistogramCalculation]
 
     def as_dict(self) -> dict:
         return {
             "events_processed_per_sec": self.events_processed_per_sec,  # noqa: E501
             "process_time_millis": self.avg_process_time_millis,
+            "errors_per_sec": self.errors_per_sec,
+            "error_percentage": self.error_percentage,
+            "num_in_flight_requests": self.num_in_flight_requests,
+            "latency_millis": {
+                stage: histogram.as_dict()
+                for stage, histogram in self.latency_millis.items()
+            },
         }
 
 
@@ -32,6 +51,8 @@ class ReceiveProcessRespondSnapshot(Snapshot):
     status: RuntimeStatus
     timestamp_millis: int
     num_replicas: int
+    # The merged event loops of all Serve replicas.
+    event_loop: EventLoopSnapshot
     processor_snapshots: Dict[str, IndividualProcessorMetrics]
 
     def as_dict(self) -> dict:
@@ -41,9 +62,8 @@ class ReceiveProcessRespondSnapshot(Snapshot):
         return {
             "status": self.status.name,
             "timestamp_millis": self.timestamp_millis,
-            "events_processed_per_sec": self.events_processed_per_sec,  # noqa: E501
-            "process_time_millis": self.avg_process_time_millis,
             "num_replicas": self.num_replicas,
+            "event_loop": self.event_loop.as_dict(),
             "processor_snapshots": processor_snapshots,
         }
 
@@ -75,6 +95,7 @@ class ReceiveProcessRespond(Runtime):
         self.flow_dependencies = flow_dependencies
         self.serve_host = serve_host
         self.serve_port = serve_port
+        self.replica_metrics = ServeReplicaMetricsStore()
 
     async def run(self) -> bool:
         async def process_fn(processor, *args, **kwargs):
@@ -85,6 +106,9 @@ class ReceiveProcessRespond(Runtime):
             self.flow_dependencies,
             self.run_id,
             process_fn,
+            metrics_actor=ray.get_runtime_context().current_actor,
+            trace_sample_rate=self.processor_options.trace_sample_rate,
+            blocking_callback_threshold_secs=self.processor_options.blocking_callback_threshold_secs,  # noqa: E501
         )
 
         @serve.deployment(
@@ -137,13 +161,38 @@ class ReceiveProcessRespond(Runtime):
     async def status(self) -> RuntimeStatus:
         return self._status
 
+    async def report_replica_metrics(
+        self,
+        replica_id: str,
+        processor_metrics: Dict[ProcessorID, ServeReplicaProcessorMetrics],
+        event_loop: Optional[EventLoopSnapshot] = None,
+    ) -> Optional[profiler.ProfileRequest]:
+        """Called periodically by each Serve replica with its latest metrics."""
+        return self.replica_metrics.report(replica_id, processor_metrics, event_loop)
+
+    async def report_replica_profile(
+        self, request_id: str, replica_id: str, stacks: profiler.CollapsedStacks
+    ):
+        self.replica_metrics.report_profile(request_id, replica_id, stacks)
+
+    async def profile(
+        self, mode: profiler.ProfileMode, seconds: float
+    ) -> profiler.CollapsedStacks:
+        return await self.replica_metrics.profile(mode, seconds)
+
     async def snapshot(self) -> Snapshot:
         processor_snapshots = {}
-        # TODO: need to figure out local metrics
         for processor in self.processor_group.processors:
+            metrics = self.replica_metrics.merged_processor_metrics(
+                processor.processor_id
+            )
             processor_snapshots[processor.processor_id] = IndividualProcessorMetrics(
-                events_processed_per_sec=0,
-                avg_process_time_millis=0,
+                events_processed_per_sec=metrics.events_processed_per_sec(),
+                avg_process_time_millis=metrics.avg_process_time_millis(),
+                errors_per_sec=metrics.errors_per_sec(),
+                error_percentage=metrics.error_percentage(),
+                num_in_flight_requests=metrics.num_in_flight_requests,
+                latency_millis=metrics.latency_millis,
             )
         if self.endpoint_deployment is not None:
             num_replicas = (
@@ -160,4 +209,5 @@ class ReceiveProcessRespond(Runtime):
             timestamp_millis=utils.timestamp_millis(),
             processor_snapshots=processor_snapshots,
             num_replicas=num_replicas,
+            event_loop=self.replica_metrics.merged_event_loop(),
         )
@@ -1,13 +1,20 @@
 import asyncio
 import dataclasses
 import logging
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type
 
 import ray
 from ray.actor import ActorHandle
+from ray.util.placement_group import PlacementGroup
 
 from buildflow.core import utils
+from buildflow.core.app.runtime import profiler
 from buildflow.core.app.runtime._runtime import RunID, Runtime, RuntimeStatus, Snapshot
+from buildflow.core.app.runtime.loop_monitor import (
+    EventLoopMonitor,
+    EventLoopSnapshot,
+    monitor_tags,
+)
 from buildflow.core.app.runtime.metrics import SimpleGaugeMetric
 from buildflow.core.background_tasks.background_task import BackgroundTask
 from buildflow.core.options.runtime_options import ProcessorOptions
@@ -26,6 +33,8 @@ ReplicaID = str
 class ReplicaReference:
     replica_id: ReplicaID
     ray_actor_handle: ActorHandle
+    # The placement group the replica was scheduled in (if any).
+    placement_group: Optional[PlacementGroup] = None
 
 
 @dataclasses.dataclass
@@ -49,23 +58,39 @@ class ProcessorGroupSnapshot(Snapshot):
     group_type: ProcessorGroupType
     num_replicas: float
     num_cpu_per_replica: float
+    memory_mb_per_replica: float
+    resources_per_replica: Dict[str, float]
+    placement_strategy: Optional[str]
     num_concurrency_per_replica: float
     processor_snapshots: Dict[str, IndividualProcessorSnapshot]
+    # The event loop of the pool actor, and the merged event loops of its replicas.
+    pool_event_loop: Optional[EventLoopSnapshot] = None
+    replica_event_loop: Optional[EventLoopSnapshot] = None
+    node_labels: Dict[str, str] = dataclasses.field(default_factory=dict)
 
     def as_dict(self) -> dict:
-        return {
+        snapshot_dict = {
             "status": self.status.name,
             "timestamp_millis": self.timestamp_millis,
             "group_id": self.group_id,
             "group_type": self.group_type.name,
             "num_replicas": self.num_replicas,
             "num_cpu_per_replica": self.num_cpu_per_replica,
+            "memory_mb_per_replica": self.memory_mb_per_replica,
+            "resources_per_replica": self.resources_per_replica,
+            "placement_strategy": self.placement_strategy,
+            "node_labels": self.node_labels,
             "num_concurrency_per_replica": self.num_concurrency_per_replica,
             "processor_snapshots": {
                 pid: snapshot.as_dict()
                 for pid, snapshot in self.processor_snapshots.items()
             },
         }
+        if self.pool_event_loop is not None:
+            snapshot_dict["pool_event_loop"] = self.pool_event_loop.as_dict()
+        if self.replica_event_loop is not None:
+            snapshot_dict["replica_event_loop"] = self.replica_event_loop.as_dict()
+        return snapshot_dict
 
 
 class ProcessorGroupReplicaPoolActor(Runtime):
@@ -119,6 +144,10 @@ class ProcessorGroupReplicaPoolActor(Runtime):
             },
         )
         self.concurrency_gauge.set(self.options.num_concurrency)
+        self.loop_monitor = EventLoopMonitor(
+            monitor_tags(self.processor_group.group_id, self.run_id, "pool"),
+            blocking_threshold_secs=self.options.blocking_callback_threshold_secs,
+        )
 
     async def scale(self):
         raise NotImplementedError("scale must be implemented by subclasses.")
@@ -170,6 +199,7 @@ class ProcessorGroupReplicaPoolActor(Runtime):
     async def run(self):
         logging.info(f"Starting ProcessorPool({self.processor_group.group_id})...")
         self._status = RuntimeStatus.RUNNING
+        self.loop_monitor.start()
         await self.add_replicas(self.initial_replicas)
 
         coros = []
@@ -177,6 +207,25 @@ class ProcessorGroupReplicaPoolActor(Runtime):
             coros.append(task.start())
         await asyncio.gather(*coros)
 
+    async def profile(
+        self, mode: profiler.ProfileMode, seconds: float
+    ) -> profiler.CollapsedStacks:
+        """Profiles all replicas in the pool and merges the results."""
+        results = await asyncio.gather(
+            *[
+                replica.ray_actor_handle.profile.remote(mode, seconds)
+                for replica in self.replicas
+            ],
+            return_exceptions=True,
+        )
+        replica_profiles = []
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error("failed to profile replica: %s", result)
+                continue
+            replica_profiles.append(result)
+        return profiler.merge_collapsed_stacks(replica_profiles)
+
     async def drain(self):
         logging.info(f"Draining ProcessorPool({self.processor_group.group_id})...")
         self._status = RuntimeStatus.DRAINING
@@ -185,6 +234,7 @@ class ProcessorGroupReplicaPoolActor(Runtime):
         for task in self.background_tasks:
             coros.append(task.shutdown())
         await asyncio.gather(*coros)
+        self.loop_monitor.stop()
         self._status = RuntimeStatus.DRAINED
         logging.info(f"Drain ProcessorPool({self.processor_group.group_id}) complete.")
         return True
@@ -202,6 +252,11 @@ class ProcessorGroupReplicaPoolActor(Runtime):
             group_type=self.processor_group.group_type,
             num_replicas=self.num_replicas_gauge.get_latest_value(),
             num_cpu_per_replica=self.options.num_cpus,
+            memory_mb_per_replica=self.options.memory_mb or 0,
+            resources_per_replica=self.options.resources,
+            placement_strategy=self.options.placement_strategy,
+            node_labels=self.options.node_labels,
             num_concurrency_per_replica=self.concurrency_gauge.get_latest_value(),
             processor_snapshots={},
+            pool_event_loop=self.loop_monitor.snapshot(),
         )
@@ -12,6 +12,7 @@ from ray.actor import ActorHandle
 from ray.exceptions import OutOfMemoryError, RayActorError
 
 from buildflow.core import utils
+from buildflow.core.app.runtime import profiler
 from buildflow.core.app.runtime._runtime import (
     RunID,
     Runtime,
@@ -209,6 +210,21 @@ class RuntimeActor(Runtime):
             processor_groups=processor_snapshots,
         )
 
+    async def profile(
+        self, processor: str, mode: profiler.ProfileMode, seconds: float
+    ) -> profiler.CollapsedStacks:
+        """Profiles every replica of a processor group.
+
+        `processor` can either be a group ID or the ID of a processor in the group.
+        """
+        for processor_pool in self._processor_group_pool_refs:
+            group = processor_pool.processor_group
+            if processor == group.group_id or any(
+                processor == p.processor_id for p in group.processors
+            ):
+                return await processor_pool.actor_handle.profile.remote(mode, seconds)
+        raise ValueError(f"Unknown processor: {processor}")
+
     async def run_until_complete(self):
         if self._runtime_loop_future is not None:
             await self._runtime_loop_future
@@ -1,7 +1,7 @@
 import dataclasses
 import logging
 import math
-from typing import Optional
+from typing import Dict, List, Optional
 
 import ray
 from ray.autoscaler.sdk import request_resources
@@ -14,10 +14,78 @@ from buildflow.core.options.runtime_options import AutoscalerOptions
 from buildflow.core.processor.processor import ProcessorGroupType
 
 
-def _available_replicas(cpu_per_replica: float):
-    num_cpus = ray.available_resources().get("CPU", 0)
+def _available_resources_per_node(
+    node_labels: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, float]]:
+    """Returns the available resources of each node that has all node_labels."""
+    if ray.is_initialized():
+        try:
+            from ray._private.state import state as ray_state
+
+            resources_per_node = ray_state._available_resources_per_node()
+        except (ImportError, AttributeError):
+            # The per node view is a private API, so fall back to the cluster wide
+            # view if it is not available in this version of ray.
+            logging.debug("per node resources unavailable, using cluster resources")
+        else:
+            if node_labels:
+                labels_per_node = {
+                    node["NodeID"]: node.get("Labels", {}) for node in ray.nodes()
+                }
+                resources_per_node = {
+                    node_id: resources
+                    for node_id, resources in resources_per_node.items()
+                    if node_labels.items() <= labels_per_node.get(node_id, {}).items()
+                }
+            return list(resources_per_node.values())
+    return [ray.available_resources()]
+
+
+def _replica_bundle(
+    cpu_per_replica: float,
+    memory_mb_per_replica: float,
+    resources_per_replica: Dict[str, float],
+) -> Dict[str, float]:
+    # Ray reports the memory resource in bytes.
+    bundle = {"CPU": cpu_per_replica, "memory": memory_mb_per_replica * 1024 * 1024}
+    bundle.update(resources_per_replica)
+    return {resource: amount for resource, amount in bundle.items() if amount > 0}
+
+
+def _available_replicas(
+    cpu_per_replica: float,
+    memory_mb_per_replica: float = 0,
+    resources_per_replica: Optional[Dict[str, float]] = None,
+    placement_strategy: Optional[str] = None,
+    node_labels: Optional[Dict[str, str]] = None,
+):
+    """Returns the number of replicas that can actually be packed onto the nodes.
 
-    return int(num_cpus / cpu_per_replica)
+    We count the replicas that fit on each node individually so resources that
+    are fragmented across nodes are not counted as usable. If node_labels are set
+    only the nodes with all of the labels are counted.
+    """
+    bundle = _replica_bundle(
+        cpu_per_replica, memory_mb_per_replica, resources_per_replica or {}
+    )
+    replicas_per_node = []
+    for node_resources in _available_resources_per_node(node_labels):
+        replicas_per_node.append(
+            min(
+                (
+                    int(node_resources.get(resource, 0) / amount)
+                    for resource, amount in bundle.items()
+                ),
+                default=0,
+            )
+        )
+    if placement_strategy == "STRICT_PACK":
+        # All replicas added together have to fit on a single node.
+        return max(replicas_per_node, default=0)
+    elif placement_strategy == "STRICT_SPREAD":
+        # Each replica added together has to be on a different node.
+        return sum(1 for num_replicas in replicas_per_node if num_replicas > 0)
+    return sum(replicas_per_node)
 
 
 @dataclasses.dataclass
@@ -26,6 +94,7 @@ class _CombinedMetrics:
     throughput: float
     avg_replica_cpu_percentage: float
     pulls_per_sec: float
+    max_replica_memory_percentage: float
 
     @classmethod
     def from_snapshot(cls, snapshot: ConsumerProcessorGroupSnapshot):
@@ -43,11 +112,16 @@ class _CombinedMetrics:
             / len(snapshot.processor_snapshots),
             2,
         )
+        max_replica_memory_percentage = max(
+            s.max_memory_percentage_per_replica
+            for s in snapshot.processor_snapshots.values()
+        )
         return cls(
             backlog=backlog,
             throughput=throughput,
             avg_replica_cpu_percentage=avg_replica_cpu_percentage,
             pulls_per_sec=avg_pulls_per_sec,
+            max_replica_memory_percentage=max_replica_memory_percentage,
         )
 
 
@@ -132,15 +206,42 @@ def _calculate_target_num_replicas_for_consumer_v2(
                 current_replicas / (25 / avg_cpu_percentage_per_replica)
                 4 / (25 / 20) = floor(3.2) = 3
 
+    When do we scale up for memory?
+        After the checks above we look at the replica with the highest memory
+        usage. If it is above the memory target we make sure we have enough
+        replicas to bring it back under the target, since the pulled data will
+        be spread over more replicas. This also prevents a scale down while
+        replicas are under memory pressure.
+
+        This is only done if memory_mb_per_replica is set. Without a per replica
+        budget the memory percentage isn't something adding replicas can lower.
+
+        Example:
+            max_memory_percentage_per_replica: 90%
+            current_replicas: 4
+
+            new_num_replicas =
+                current_replicas * (max_memory_percentage_per_replica / 75)
+                4 * (90 / 75) = ceil(4.8) = 5
+
     """
     cpus_per_replica = current_snapshot.num_cpu_per_replica
+    memory_mb_per_replica = current_snapshot.memory_mb_per_replica
+    resources_per_replica = current_snapshot.resources_per_replica
     num_replicas = current_snapshot.num_replicas
     current_metrics = _CombinedMetrics.from_snapshot(current_snapshot)
     backlog = current_metrics.backlog
     throughput = current_metrics.throughput
     throughput_per_replica = throughput / num_replicas
     avg_replica_cpu_percentage = current_metrics.avg_replica_cpu_percentage
-    available_replicas = _available_replicas(cpus_per_replica)
+    max_replica_memory_percentage = current_metrics.max_replica_memory_percentage
+    available_replicas = _available_replicas(
+        cpus_per_replica,
+        memory_mb_per_replica,
+        resources_per_replica,
+        current_snapshot.placement_strategy,
+        current_snapshot.node_labels,
+    )
     previous_metrics = None
     if prev_snapshot is not None:
         previous_metrics = _CombinedMetrics.from_snapshot(prev_snapshot)
@@ -150,12 +251,16 @@ def _calculate_target_num_replicas_for_consumer_v2(
     logging.debug("config min replicas: %s", config.min_replicas)
     logging.debug("backlog burn threshold: %s", config.consumer_backlog_burn_threshold)
     logging.debug("cpu percent target: %s", config.consumer_cpu_percent_target)
+    logging.debug("memory percent target: %s", config.consumer_memory_percent_target)
     logging.debug("cpus per replica: %s", cpus_per_replica)
+    logging.debug("memory mb per replica: %s", memory_mb_per_replica)
+    logging.debug("resources per replica: %s", resources_per_replica)
     logging.debug("start num replicas: %s", num_replicas)
     logging.debug("backlog: %s", backlog)
     logging.debug("throughput: %s", throughput)
     logging.debug("throughput per replica: %s", throughput_per_replica)
     logging.debug("avg replica cpu percentage: %s", avg_replica_cpu_percentage)
+    logging.debug("max replica memory percentage: %s", max_replica_memory_percentage)
     logging.debug("max available cluster replicas: %s", available_replicas)
 
     new_num_replicas = num_replicas
@@ -202,6 +307,19 @@ def _calculate_target_num_replicas_for_consumer_v2(
             num_replicas
             / (config.consumer_cpu_percent_target / avg_replica_cpu_percentage)
         )
+    # Memory pressure event. This happens when a replica is getting close to its
+    # memory ceiling, we add replicas before it gets OOM killed.
+    if (
+        memory_mb_per_replica > 0
+        and max_replica_memory_percentage > config.consumer_memory_percent_target
+    ):
+        memory_num_replicas = math.ceil(
+            num_replicas
+            * (max_replica_memory_percentage / config.consumer_memory_percent_target)
+        )
+        logging.debug("memory num replicas: %s", memory_num_replicas)
+        new_num_replicas = max(new_num_replicas, memory_num_replicas)
+
     # Sanity check to make sure we don't scale below 0.
     new_num_replicas = max(new_num_replicas, 1)
 
@@ -217,8 +335,16 @@ def _calculate_target_num_replicas_for_consumer_v2(
         if replicas_adding > available_replicas:
             new_num_replicas = current_snapshot.num_replicas + available_replicas
             # Cap how much we request to ensure we're not requesting a huge amount
-            cpu_to_request = new_num_replicas * cpus_per_replica * 2
-            request_resources(num_cpus=math.ceil(cpu_to_request))
+            if memory_mb_per_replica > 0 or resources_per_replica:
+                # Request whole replicas so the cluster adds nodes that can fit a
+                # replica, not just enough CPU.
+                bundle = _replica_bundle(
+                    cpus_per_replica, memory_mb_per_replica, resources_per_replica
+                )
+                request_resources(bundles=[bundle] * (new_num_replicas * 2))
+            else:
+                cpu_to_request = new_num_replicas * cpus_per_replica * 2
+                request_resources(num_cpus=math.ceil(cpu_to_request))
     elif new_num_replicas <= current_snapshot.num_replicas:
         # We're scaling down so we don't need to request any resources. Set this to 0
         # to let the autoscaler know that we're not requesting any resources.
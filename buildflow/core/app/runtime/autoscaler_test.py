@@ -1,5 +1,6 @@
 import logging
 import unittest
+from typing import Dict, Optional
 from unittest import mock
 
 from buildflow.core.app.runtime import autoscaler
@@ -24,10 +25,17 @@ def create_snapshot(
     avg_cpu_percent: float = 1,
     timestamp_millis: int = 1,
     pull_per_sec: float = 1000,
+    memory_mb_per_replica: float = 0,
+    max_memory_percent: float = 1,
+    resources_per_replica: Optional[Dict[str, float]] = None,
+    placement_strategy: Optional[str] = None,
 ) -> ConsumerProcessorGroupSnapshot:
     return ConsumerProcessorGroupSnapshot(
         num_replicas=num_replicas,
         num_cpu_per_replica=num_cpu_per_replica,
+        memory_mb_per_replica=memory_mb_per_replica,
+        resources_per_replica=resources_per_replica or {},
+        placement_strategy=placement_strategy,
         status=RuntimeStatus.RUNNING,
         timestamp_millis=timestamp_millis,
         group_id="id",
@@ -47,6 +55,12 @@ def create_snapshot(
                 avg_process_time_millis_per_element=1,
                 avg_process_time_millis_per_batch=1,
                 avg_pull_to_ack_time_millis_per_batch=1,
+                avg_memory_percentage_per_replica=max_memory_percent,
+                max_memory_percentage_per_replica=max_memory_percent,
+                avg_in_flight_bytes_per_replica=0,
+                total_throttled_pulls_per_sec=0,
+                latency_millis={},
+                avg_stage_time_millis={},
             )
         },
     )
@@ -265,6 +279,155 @@ class ConsumerAutoScalerTest(unittest.TestCase):
         )
         self.assertEqual(rec_replicas, 5)
 
+    @mock.patch("buildflow.core.app.runtime.autoscaler.request_resources")
+    def test_scale_up_for_memory_pressure(
+        self, request_resources_mock: mock.MagicMock, resources_mock
+    ):
+        resources_mock.return_value = {"CPU": 32, "memory": 32 * 1024 * 1024 * 1024}
+        current_num_replics = 4
+        current_throughput = 100000
+        backlog = 0
+        avg_cpu_percent = 20
+        max_memory_percent = 90
+
+        snapshot = create_snapshot(
+            num_replicas=current_num_replics,
+            throughput=current_throughput,
+            backlog=backlog,
+            avg_cpu_percent=avg_cpu_percent,
+            memory_mb_per_replica=1024,
+            max_memory_percent=max_memory_percent,
+        )
+        config = AutoscalerOptions(
+            enable_autoscaler=True,
+            min_replicas=1,
+            max_replicas=100,
+            num_replicas=1,
+        )
+        rec_replicas = autoscaler.calculate_target_num_replicas(
+            current_snapshot=snapshot,
+            prev_snapshot=None,
+            config=config,
+        )
+        # The CPU usage would normally trigger a scale down to 3, but the memory
+        # usage requires: ceil(4 * 90 / 75) = 5
+        self.assertEqual(rec_replicas, 5)
+        request_resources_mock.assert_not_called()
+
+    @mock.patch("buildflow.core.app.runtime.autoscaler.request_resources")
+    def test_memory_pressure_ignored_without_memory_budget(
+        self, request_resources_mock: mock.MagicMock, resources_mock
+    ):
+        snapshot = create_snapshot(
+            num_replicas=4,
+            throughput=100000,
+            backlog=0,
+            avg_cpu_percent=20,
+            max_memory_percent=90,
+        )
+        config = AutoscalerOptions(
+            enable_autoscaler=True,
+            min_replicas=1,
+            max_replicas=100,
+            num_replicas=1,
+        )
+        rec_replicas = autoscaler.calculate_target_num_replicas(
+            current_snapshot=snapshot,
+            prev_snapshot=None,
+            config=config,
+        )
+        # Without a per replica memory budget adding replicas can't relieve the
+        # memory pressure, so we scale down based on CPU usage: floor(4 / (25 / 20))
+        self.assertEqual(rec_replicas, 3)
+
+    @mock.patch("buildflow.core.app.runtime.autoscaler.request_resources")
+    def test_scale_up_to_max_available_memory_replicas(
+        self, request_resources_mock: mock.MagicMock, resources_mock
+    ):
+        resources_mock.return_value = {"CPU": 32, "memory": 1024 * 1024 * 1024}
+        current_num_replics = 2
+        current_throughput = 10
+        backlog = 1000
+
+        snapshot = create_snapshot(
+            num_replicas=current_num_replics,
+            throughput=current_throughput,
+            backlog=backlog,
+            memory_mb_per_replica=1024,
+        )
+        config = AutoscalerOptions(
+            enable_autoscaler=True,
+            min_replicas=1,
+            max_replicas=100,
+            num_replicas=1,
+        )
+        rec_replicas = autoscaler.calculate_target_num_replicas(
+            current_snapshot=snapshot,
+            prev_snapshot=None,
+            config=config,
+        )
+        # Only enough memory is available for one more replica.
+        self.assertEqual(rec_replicas, 3)
+        request_resources_mock.assert_called_once_with(
+            bundles=[{"CPU": 1, "memory": 1024 * 1024 * 1024}] * 6
+        )
+
+
+class AvailableReplicasTest(unittest.TestCase):
+    @mock.patch(
+        "buildflow.core.app.runtime.autoscaler._available_resources_per_node",
+        return_value=[{"CPU": 1.5}, {"CPU": 1.5}],
+    )
+    def test_fragmented_cpus_are_not_packable(self, resources_mock):
+        # There are 3 CPUs free in total, but only one replica fits on each node.
+        self.assertEqual(autoscaler._available_replicas(2), 0)
+        self.assertEqual(autoscaler._available_replicas(1), 2)
+
+    @mock.patch(
+        "buildflow.core.app.runtime.autoscaler._available_resources_per_node",
+        return_value=[{"CPU": 8, "GPU": 1}, {"CPU": 8}],
+    )
+    def test_custom_resources(self, resources_mock):
+        self.assertEqual(
+            autoscaler._available_replicas(1, resources_per_replica={"GPU": 1}), 1
+        )
+
+    @mock.patch(
+        "buildflow.core.app.runtime.autoscaler._available_resources_per_node",
+        return_value=[{"CPU": 4}, {"CPU": 2}, {"CPU": 0.5}],
+    )
+    def test_placement_strategies(self, resources_mock):
+        self.assertEqual(autoscaler._available_replicas(1), 6)
+        self.assertEqual(
+            autoscaler._available_replicas(1, placement_strategy="STRICT_PACK"), 4
+        )
+        self.assertEqual(
+            autoscaler._available_replicas(1, placement_strategy="STRICT_SPREAD"), 2
+        )
+
+    @mock.patch("ray.nodes")
+    @mock.patch("ray.is_initialized", return_value=True)
+    def test_node_labels(self, is_initialized_mock, nodes_mock):
+        from ray._private.state import state as ray_state
+
+        nodes_mock.return_value = [
+            {"NodeID": "a", "Labels": {"zone": "us-east1-b", "gpu": "a100"}},
+            {"NodeID": "b", "Labels": {"zone": "us-east1-c"}},
+            {"NodeID": "c"},
+        ]
+        with mock.patch.object(
+            ray_state,
+            "_available_resources_per_node",
+            return_value={"a": {"CPU": 2}, "b": {"CPU": 4}, "c": {"CPU": 8}},
+            create=True,
+        ):
+            self.assertEqual(autoscaler._available_replicas(1), 14)
+            # Replicas can only be scheduled on the nodes with the labels.
+            self.assertEqual(
+                autoscaler._available_replicas(1, node_labels={"zone": "us-east1-b"}),
+                2,
+            )
+
 
 if __name__ == "__name__":
     unittest.main()
@@ -1,6 +1,20 @@
+import asyncio
+import dataclasses
 import inspect
+import logging
 import time
-from typing import Any, Callable, Dict, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import fastapi
 import ray
@@ -10,17 +24,34 @@ from fastapi.openapi.docs import (
 )
 from fastapi.openapi.utils import get_openapi
 from fastapi.staticfiles import StaticFiles
+from opentelemetry import context as otel_context
+from opentelemetry import propagate, trace
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
 from starlette.websockets import WebSocket
 
+from buildflow.core import tracing, utils
+from buildflow.core.app.runtime import profiler
 from buildflow.core.app.runtime._runtime import RunID
+from buildflow.core.app.runtime.loop_monitor import (
+    DEFAULT_BLOCKING_THRESHOLD_SECS,
+    EventLoopMonitor,
+    EventLoopSnapshot,
+    monitor_tags,
+)
+from buildflow.core.app.runtime.metrics import (
+    CompositeHistogramMetric,
+    CompositeRateCounterMetric,
+    HistogramCalculation,
+    RateCalculation,
+)
 from buildflow.core.app.runtime.metrics.common import (
     num_events_processed,
     process_time_counter,
 )
 from buildflow.core.processor.patterns.collector import CollectorGroup
 from buildflow.core.processor.patterns.endpoint import EndpointGroup
+from buildflow.core.processor.processor import ProcessorID
 from buildflow.core.processor.utils import process_types
 from buildflow.dependencies.base import (
     Scope,
@@ -30,6 +61,175 @@ from buildflow.dependencies.base import (
 from buildflow.dependencies.headers import security_dependencies
 from buildflow.io.endpoint import Method
 
+# The stages of a request we track latency histograms for.
+LATENCY_STAGES = ("resolve_dependencies", "process", "request")
+# How often each Serve replica reports its in-memory metrics to the actor that
+# owns the deployment.
+_REPORT_METRICS_INTERVAL_SECS = 10
+# Reports older than this are ignored, this happens when a replica is removed.
+_REPORT_METRICS_TTL_SECS = 3 * _REPORT_METRICS_INTERVAL_SECS
+# How long to wait for replicas to return a profile after the profile finished.
+_PROFILE_GRACE_SECS = 5
+_PROFILE_POLL_INTERVAL_SECS = 0.5
+
+
+@dataclasses.dataclass
+class ServeReplicaProcessorMetrics:
+    events_processed: RateCalculation
+    process_time_millis: RateCalculation
+    errors: RateCalculation
+    num_in_flight_requests: int
+    latency_millis: Dict[str, HistogramCalculation]
+
+    def events_processed_per_sec(self) -> float:
+        return self.events_processed.total_value_rate()
+
+    def avg_process_time_millis(self) -> float:
+        return self.process_time_millis.average_value_rate()
+
+    def errors_per_sec(self) -> float:
+        return self.errors.total_count_rate()
+
+    def error_percentage(self) -> float:
+        if self.events_processed.values_sum == 0:
+            return 0.0
+        return self.errors.values_count / self.events_processed.values_sum * 100
+
+    @classmethod
+    def merge(
+        cls, replica_metrics: Iterable["ServeReplicaProcessorMetrics"]
+    ) -> "ServeReplicaProcessorMetrics":
+        """Combines the metrics reported by multiple replicas."""
+        replica_metrics = list(replica_metrics)
+        return cls(
+            events_processed=RateCalculation.merge(
+                metrics.events_processed for metrics in replica_metrics
+            ),
+            process_time_millis=RateCalculation.merge(
+                metrics.process_time_millis for metrics in replica_metrics
+            ),
+            errors=RateCalculation.merge(metrics.errors for metrics in replica_metrics),
+            num_in_flight_requests=sum(
+                metrics.num_in_flight_requests for metrics in replica_metrics
+            ),
+            latency_millis={
+                stage: HistogramCalculation.merge(
+                    metrics.latency_millis[stage]
+                    for metrics in replica_metrics
+                    if stage in metrics.latency_millis
+                )
+                for stage in LATENCY_STAGES
+            },
+        )
+
+
+class ServeReplicaMetricsStore:
+    """Holds the latest metrics reported by each Serve replica."""
+
+    def __init__(self, ttl_secs: float = _REPORT_METRICS_TTL_SECS) -> None:
+        self.ttl_secs = ttl_secs
+        self._reports: Dict[
+            str, Tuple[float, Dict[ProcessorID, ServeReplicaProcessorMetrics]]
+        ] = {}
+        self._event_loops: Dict[str, EventLoopSnapshot] = {}
+        # The active profile request. It is handed out to each replica the next
+        # time the replica reports its metrics.
+        self._profile_request: Optional[profiler.ProfileRequest] = None
+        self._profile_replicas: Set[str] = set()
+        self._profile_results: Dict[str, profiler.CollapsedStacks] = {}
+        self._profile_lock = asyncio.Lock()
+
+    def report(
+        self,
+        replica_id: str,
+        processor_metrics: Dict[ProcessorID, ServeReplicaProcessorMetrics],
+        event_loop: Optional[EventLoopSnapshot] = None,
+    ) -> Optional[profiler.ProfileRequest]:
+        """Stores the metrics of a replica, returns a profile request if pending."""
+        self._reports[replica_id] = (time.monotonic(), processor_metrics)
+        if event_loop is not None:
+            self._event_loops[replica_id] = event_loop
+        if (
+            self._profile_request is not None
+            and replica_id not in self._profile_replicas
+        ):
+            self._profile_replicas.add(replica_id)
+            return self._profile_request
+        return None
+
+    def _live_replica_ids(self) -> Set[str]:
+        now = time.monotonic()
+        stale_replicas = [
+            replica_id
+            for replica_id, (report_time, _) in self._reports.items()
+            if now - report_time > self.ttl_secs
+        ]
+        for replica_id in stale_replicas:
+            del self._reports[replica_id]
+            self._event_loops.pop(replica_id, None)
+        return set(self._reports)
+
+    def processor_metrics(
+        self, processor_id: ProcessorID
+    ) -> List[ServeReplicaProcessorMetrics]:
+        """Returns the metrics of all live replicas for the given processor."""
+        self._live_replica_ids()
+        return [
+            processor_metrics[processor_id]
+            for _, processor_metrics in self._reports.values()
+            if processor_id in processor_metrics
+        ]
+
+    def merged_event_loop(self) -> EventLoopSnapshot:
+        """Returns the merged event loop snapshots of all live replicas."""
+        self._live_replica_ids()
+        return EventLoopSnapshot.merge(self._event_loops.values())
+
+    async def profile(
+        self, mode: profiler.ProfileMode, seconds: float
+    ) -> profiler.CollapsedStacks:
+        """Profiles all live replicas and merges the results.
+
+        Replicas only pick up the request when they next report their metrics, so
+        this can take up to _REPORT_METRICS_INTERVAL_SECS longer than `seconds`.
+        """
+        async with self._profile_lock:
+            self._profile_request = profiler.ProfileRequest(
+                request_id=utils.uuid(), mode=mode, seconds=seconds
+            )
+            self._profile_replicas = set()
+            self._profile_results = {}
+            deadline = (
+                time.monotonic()
+                + seconds
+                + _REPORT_METRICS_INTERVAL_SECS
+                + _PROFILE_GRACE_SECS
+            )
+            try:
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(_PROFILE_POLL_INTERVAL_SECS)
+                    live_replicas = self._live_replica_ids()
+                    if live_replicas and live_replicas.issubset(self._profile_results):
+                        break
+            finally:
+                self._profile_request = None
+            return profiler.merge_collapsed_stacks(self._profile_results.values())
+
+    def report_profile(
+        self, request_id: str, replica_id: str, stacks: profiler.CollapsedStacks
+    ):
+        if (
+            self._profile_request is not None
+            and self._profile_request.request_id == request_id
+        ):
+            self._profile_results[replica_id] = stacks
+
+    def merged_processor_metrics(
+        self, processor_id: ProcessorID
+    ) -> ServeReplicaProcessorMetrics:
+        """Merges the metrics of all live replicas for the given processor."""
+        return ServeReplicaProcessorMetrics.merge(self.processor_metrics(processor_id))
+
 
 def create_app(
     processor_group: Union[EndpointGroup, CollectorGroup],
@@ -37,7 +237,15 @@ def create_app(
     run_id: RunID,
     process_fn: Callable,
     include_output_type: bool = True,
+    metrics_actor: Optional[ray.actor.ActorHandle] = None,
+    trace_sample_rate: float = 0,
+    blocking_callback_threshold_secs: float = DEFAULT_BLOCKING_THRESHOLD_SECS,
 ):
+    """Creates the FastAPI app that is served by each Serve replica.
+
+    If metrics_actor is set the replicas will periodically report their metrics
+    to it by calling: metrics_actor.report_replica_metrics
+    """
     app = fastapi.FastAPI(
         title=processor_group.group_id,
         version="0.0.1",
@@ -69,9 +277,41 @@ def create_app(
         return get_swagger_ui_oauth2_redirect_html()
 
     security_schemes = {}
+    endpoint_wrappers = {}
+
+    async def run_replica_profile(
+        replica_id: str, profile_request: profiler.ProfileRequest
+    ):
+        try:
+            stacks = await profiler.profile(
+                profile_request.mode, profile_request.seconds
+            )
+            await metrics_actor.report_replica_profile.remote(
+                profile_request.request_id, replica_id, stacks
+            )
+        except Exception:
+            logging.exception("failed to profile replica")
+
+    async def report_replica_metrics(replica_id: str, loop_monitor: EventLoopMonitor):
+        while True:
+            await asyncio.sleep(_REPORT_METRICS_INTERVAL_SECS)
+            processor_metrics = {
+                processor_id: wrapper.replica_metrics()
+                for processor_id, wrapper in endpoint_wrappers.items()
+            }
+            try:
+                profile_request = await metrics_actor.report_replica_metrics.remote(
+                    replica_id, processor_metrics, loop_monitor.snapshot()
+                )
+            except Exception:
+                logging.exception("failed to report replica metrics, will retry")
+                continue
+            if profile_request is not None:
+                asyncio.create_task(run_replica_profile(replica_id, profile_request))
 
     @app.on_event("startup")
     async def setup_processor_group():
+        tracing.configure_tracing(trace_sample_rate)
         for processor in processor_group.processors:
             if hasattr(app.state, "processor_map"):
                 app.state.processor_map[processor.processor_id] = processor
@@ -81,6 +321,16 @@ def create_app(
             await initialize_dependencies(
                 processor.dependencies(), flow_dependencies, [Scope.REPLICA]
             )
+        replica_id = utils.uuid()
+        app.state.loop_monitor = EventLoopMonitor(
+            monitor_tags(processor_group.group_id, run_id, replica_id),
+            blocking_threshold_secs=blocking_callback_threshold_secs,
+        )
+        app.state.loop_monitor.start()
+        if metrics_actor is not None:
+            app.state.report_metrics_task = asyncio.create_task(
+                report_replica_metrics(replica_id, app.state.loop_monitor)
+            )
 
     for processor in processor_group.processors:
         input_types, output_type = process_types(processor)
@@ -103,6 +353,29 @@ def create_app(
                     run_id=run_id,
                     status_code="200",
                 )
+                self.num_errors_counter = CompositeRateCounterMetric(
+                    "num_request_errors",
+                    description="Number of requests that raised an error. Only increments.",  # noqa: E501
+                    default_tags={
+                        "processor_id": processor_id,
+                        "JobId": self.job_id,
+                        "RunId": run_id,
+                        "StatusCode": "500",
+                    },
+                )
+                self.num_in_flight_requests = 0
+                self.latency_histograms = {
+                    stage: CompositeHistogramMetric(
+                        f"{stage}_latency_millis",
+                        description=f"Distribution of the {stage} latency in milliseconds.",  # noqa: E501
+                        default_tags={
+                            "processor_id": processor_id,
+                            "JobId": self.job_id,
+                            "RunId": run_id,
+                        },
+                    )
+                    for stage in LATENCY_STAGES
+                }
                 self.processor_id = processor_id
                 self.flow_dependencies = flow_dependencies
                 self.request_arg = None
@@ -118,6 +391,18 @@ def create_app(
                     ):
                         self.websocket_arg = arg
 
+            def replica_metrics(self) -> ServeReplicaProcessorMetrics:
+                return ServeReplicaProcessorMetrics(
+                    events_processed=self.num_events_processed_counter.calculate_rate(),  # noqa: E501
+                    process_time_millis=self.process_time_counter.calculate_rate(),
+                    errors=self.num_errors_counter.calculate_rate(),
+                    num_in_flight_requests=self.num_in_flight_requests,
+                    latency_millis={
+                        stage: histogram.calculate_histogram()
+                        for stage, histogram in self.latency_histograms.items()
+                    },
+                )
+
             # NOTE: we have to import this seperately because it gets run
             # inside of the ray actor
             from buildflow.core.processor.utils import add_input_types
@@ -130,13 +415,29 @@ def create_app(
             ):
                 processor = app.state.processor_map[self.processor_id]
                 start_time = time.monotonic()
+                self.num_in_flight_requests += 1
+                tracer = tracing.get_tracer()
+                # Continue the trace of the caller if they sent a traceparent header.
+                request_span = tracer.start_span(
+                    "request",
+                    context=propagate.extract(internal_buildflow_request.headers),
+                    attributes={"buildflow.processor_id": self.processor_id},
+                )
+                context_token = otel_context.attach(
+                    trace.set_span_in_context(request_span)
+                )
 
                 status_code = 200
                 try:
-                    dependency_args = await resolve_dependencies(
-                        processor.dependencies(),
-                        self.flow_dependencies,
-                        internal_buildflow_request,
+                    with tracer.start_as_current_span("resolve_dependencies"):
+                        dependency_args = await resolve_dependencies(
+                            processor.dependencies(),
+                            self.flow_dependencies,
+                            internal_buildflow_request,
+                        )
+                    process_start_time = time.monotonic()
+                    self.latency_histograms["resolve_dependencies"].observe(
+                        (process_start_time - start_time) * 1000
                     )
                     if self.request_arg is not None and self.request_arg not in kwargs:
                         kwargs[self.request_arg] = internal_buildflow_request
@@ -145,17 +446,37 @@ def create_app(
                         and self.websocket_arg not in kwargs
                     ):
                         kwargs[self.websocket_arg] = internal_buildflow_request
-                    output = await process_fn(
-                        processor, *args, **kwargs, **dependency_args
+                    with tracer.start_as_current_span("process"):
+                        output = await process_fn(
+                            processor, *args, **kwargs, **dependency_args
+                        )
+                    self.latency_histograms["process"].observe(
+                        (time.monotonic() - process_start_time) * 1000
                     )
                 except Exception as e:
                     if isinstance(e, HTTPException):
                         status_code = e.status_code
                     else:
                         status_code = 500
+                    request_span.record_exception(e)
+                    request_span.set_status(trace.StatusCode.ERROR)
+                    self.num_errors_counter.inc(
+                        tags={
+                            "processor_id": processor.processor_id,
+                            "JobId": self.job_id,
+                            "RunId": self.run_id,
+                            "StatusCode": str(status_code),
+                        }
+                    )
                     raise e
                 finally:
+                    self.num_in_flight_requests -= 1
                     status_code = str(status_code)
+                    request_span.set_attribute("http.status_code", status_code)
+                    request_span.end()
+                    otel_context.detach(context_token)
+                    request_time_millis = (time.monotonic() - start_time) * 1000
+                    self.latency_histograms["request"].observe(request_time_millis)
                     self.num_events_processed_counter.inc(
                         tags={
                             "processor_id": processor.processor_id,
@@ -165,7 +486,7 @@ def create_app(
                         }
                     )
                     self.process_time_counter.inc(
-                        (time.monotonic() - start_time) * 1000,
+                        request_time_millis,
                         tags={
                             "processor_id": processor.processor_id,
                             "JobId": self.job_id,
@@ -195,6 +516,7 @@ def create_app(
         endpoint_wrapper = EndpointFastAPIWrapper(
             processor.processor_id, run_id, flow_dependencies
         )
+        endpoint_wrappers[processor.processor_id] = endpoint_wrapper
         security_deps = security_dependencies(processor.dependencies())
         security_openapi_extras = {}
         for security_dep in security_deps:
@@ -0,0 +1,107 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from buildflow.core.app.runtime import fastapi, profiler
+from buildflow.core.app.runtime.fastapi import (
+    ServeReplicaMetricsStore,
+    ServeReplicaProcessorMetrics,
+)
+from buildflow.core.app.runtime.metrics import HistogramCalculation, RateCalculation
+
+
+def create_replica_metrics(
+    *, num_events: int, num_errors: int, num_in_flight_requests: int
+) -> ServeReplicaProcessorMetrics:
+    latency = HistogramCalculation()
+    for _ in range(num_events):
+        latency.add(10)
+    return ServeReplicaProcessorMetrics(
+        events_processed=RateCalculation(num_events, num_events, 10),
+        process_time_millis=RateCalculation(num_events * 10, num_events, 10),
+        errors=RateCalculation(num_errors, num_errors, 10),
+        num_in_flight_requests=num_in_flight_requests,
+        latency_millis={"request": latency},
+    )
+
+
+class ServeReplicaMetricsStoreTest(unittest.TestCase):
+    def test_merges_replica_metrics(self):
+        store = ServeReplicaMetricsStore()
+        store.report(
+            "replica-1",
+            {
+                "p1": create_replica_metrics(
+                    num_events=100, num_errors=0, num_in_flight_requests=2
+                )
+            },
+        )
+        store.report(
+            "replica-2",
+            {
+                "p1": create_replica_metrics(
+                    num_events=300, num_errors=20, num_in_flight_requests=3
+                )
+            },
+        )
+
+        metrics = store.merged_processor_metrics("p1")
+
+        self.assertEqual(metrics.events_processed_per_sec(), 40)
+        self.assertEqual(metrics.avg_process_time_millis(), 10)
+        self.assertEqual(metrics.errors_per_sec(), 2)
+        self.assertEqual(metrics.error_percentage(), 5)
+        self.assertEqual(metrics.num_in_flight_requests, 5)
+        self.assertEqual(metrics.latency_millis["request"].values_count, 400)
+        self.assertEqual(metrics.latency_millis["process"].values_count, 0)
+
+    def test_drops_stale_replicas(self):
+        store = ServeReplicaMetricsStore(ttl_secs=30)
+        with mock.patch("time.monotonic", return_value=100):
+            store.report(
+                "replica-1",
+                {
+                    "p1": create_replica_metrics(
+                        num_events=100, num_errors=0, num_in_flight_requests=2
+                    )
+                },
+            )
+        with mock.patch("time.monotonic", return_value=110):
+            self.assertEqual(len(store.processor_metrics("p1")), 1)
+        with mock.patch("time.monotonic", return_value=140):
+            self.assertEqual(len(store.processor_metrics("p1")), 0)
+
+        metrics = store.merged_processor_metrics("p1")
+        self.assertEqual(metrics.events_processed_per_sec(), 0)
+        self.assertEqual(metrics.error_percentage(), 0)
+
+
+class ServeReplicaMetricsStoreProfileTest(unittest.IsolatedAsyncioTestCase):
+    async def test_profile_merges_replica_profiles(self):
+        store = ServeReplicaMetricsStore()
+        store.report("replica-1", {})
+        store.report("replica-2", {})
+
+        async def replica_loop(replica_id: str, stacks: profiler.CollapsedStacks):
+            while True:
+                profile_request = store.report(replica_id, {})
+                if profile_request is not None:
+                    store.report_profile(profile_request.request_id, replica_id, stacks)
+                    return profile_request
+                await asyncio.sleep(0.01)
+
+        with mock.patch.object(fastapi, "_PROFILE_POLL_INTERVAL_SECS", 0.01):
+            stacks, request_1, request_2 = await asyncio.gather(
+                store.profile(profiler.ProfileMode.CPU, 1),
+                replica_loop("replica-1", {"a;b": 1}),
+                replica_loop("replica-2", {"a;b": 2, "a;c": 1}),
+            )
+
+        self.assertEqual(stacks, {"a;b": 3, "a;c": 1})
+        self.assertEqual(request_1, request_2)
+        # The request is cleared once the profile finished.
+        self.assertIsNone(store.report("replica-1", {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
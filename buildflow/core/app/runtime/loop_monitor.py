@@ -0,0 +1,228 @@
+"""Monitors the health of the asyncio event loop of a runtime actor.
+
+Every replica multiplexes many coroutines on a single event loop, so one
+blocking call (e.g. a synchronous client call inside of a sink) stalls every
+other coroutine in the replica. The monitor measures:
+
+- scheduling lag: how late a periodic timer wakes up compared to when it was
+  scheduled to.
+- pending tasks: the number of tasks that have not completed yet.
+- blocking callbacks: a watchdog thread captures the stack of the event loop
+  thread if it has not returned control to the loop for longer than a threshold.
+"""
+import asyncio
+import dataclasses
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, Iterable, Optional
+
+import ray
+
+from buildflow.core import utils
+from buildflow.core.app.runtime.metrics import (
+    CompositeHistogramMetric,
+    CompositeRateCounterMetric,
+    HistogramCalculation,
+    RateCalculation,
+    SimpleGaugeMetric,
+)
+
+_DEFAULT_INTERVAL_SECS = 0.25
+DEFAULT_BLOCKING_THRESHOLD_SECS = 0.1
+# Only the innermost frames are kept to keep snapshots small.
+_MAX_STACK_FRAMES = 32
+
+
+@dataclasses.dataclass
+class BlockingCallback:
+    timestamp_millis: int
+    duration_millis: float
+    # The stack of the event loop thread while it was blocked. This is empty if
+    # the watchdog thread couldn't run (e.g. the GIL was held the entire time).
+    stack: str
+
+    def as_dict(self) -> dict:
+        return {
+            "timestamp_millis": self.timestamp_millis,
+            "duration_millis": self.duration_millis,
+            "stack": self.stack,
+        }
+
+
+@dataclasses.dataclass
+class EventLoopSnapshot:
+    lag_millis: HistogramCalculation
+    num_pending_tasks: int
+    # count is the number of blocking callbacks, sum is the total blocked millis
+    blocking_callbacks: RateCalculation
+    last_blocking_callback: Optional[BlockingCallback]
+
+    def as_dict(self) -> dict:
+        last_blocking_callback = None
+        if self.last_blocking_callback is not None:
+            last_blocking_callback = self.last_blocking_callback.as_dict()
+        return {
+            "lag_millis": self.lag_millis.as_dict(),
+            "num_pending_tasks": self.num_pending_tasks,
+            "blocking_callbacks_per_sec": self.blocking_callbacks.total_count_rate(),
+            "blocked_millis_per_sec": self.blocking_callbacks.total_value_rate(),
+            "last_blocking_callback": last_blocking_callback,
+        }
+
+    @classmethod
+    def empty(cls) -> "EventLoopSnapshot":
+        return cls(
+            lag_millis=HistogramCalculation(),
+            num_pending_tasks=0,
+            blocking_callbacks=RateCalculation(0, 0, 0),
+            last_blocking_callback=None,
+        )
+
+    @classmethod
+    def merge(cls, snapshots: Iterable["EventLoopSnapshot"]) -> "EventLoopSnapshot":
+        """Merges the snapshots of multiple event loops (i.e. multiple replicas)."""
+        snapshots = list(snapshots)
+        if not snapshots:
+            return cls.empty()
+        blocking_callbacks = [
+            s.last_blocking_callback
+            for s in snapshots
+            if s.last_blocking_callback is not None
+        ]
+        last_blocking_callback = None
+        if blocking_callbacks:
+            last_blocking_callback = max(
+                blocking_callbacks, key=lambda b: b.timestamp_millis
+            )
+        return cls(
+            lag_millis=HistogramCalculation.merge([s.lag_millis for s in snapshots]),
+            num_pending_tasks=sum(s.num_pending_tasks for s in snapshots),
+            blocking_callbacks=RateCalculation.merge(
+                [s.blocking_callbacks for s in snapshots]
+            ),
+            last_blocking_callback=last_blocking_callback,
+        )
+
+
+class EventLoopMonitor:
+    """Measures the lag and blocking callbacks of the running event loop.
+
+    `start` must be called from within the event loop that should be monitored.
+    """
+
+    def __init__(
+        self,
+        default_tags: Dict[str, str],
+        *,
+        interval_secs: float = _DEFAULT_INTERVAL_SECS,
+        blocking_threshold_secs: float = DEFAULT_BLOCKING_THRESHOLD_SECS,
+    ) -> None:
+        self.interval_secs = interval_secs
+        self.blocking_threshold_secs = blocking_threshold_secs
+        # runtime state
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        # The monotonic time the monitor coroutine is next expected to wake up.
+        self._expected_wakeup = time.monotonic()
+        # The stack captured by the watchdog for the current stall (if any).
+        self._blocked_stack: Optional[str] = None
+        self._last_blocking_callback: Optional[BlockingCallback] = None
+        self._num_pending_tasks = 0
+        # metrics
+        self.lag_histogram = CompositeHistogramMetric(
+            "event_loop_lag_millis",
+            description="Distribution of how late the event loop runs scheduled callbacks.",  # noqa: E501
+            default_tags=default_tags,
+        )
+        self.pending_tasks_gauge = SimpleGaugeMetric(
+            "event_loop_pending_tasks",
+            description="Current number of pending tasks on the event loop. Goes up and down.",  # noqa: E501
+            default_tags=default_tags,
+        )
+        self.blocking_callbacks_counter = CompositeRateCounterMetric(
+            "event_loop_blocking_callbacks",
+            description="Number of callbacks that blocked the event loop. Only increments.",  # noqa: E501
+            default_tags=default_tags,
+        )
+
+    def start(self):
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._expected_wakeup = time.monotonic() + self.interval_secs
+        self._task = asyncio.create_task(self._run())
+        self._watchdog_thread = threading.Thread(
+            target=self._watchdog, name="buildflow-loop-monitor", daemon=True
+        )
+        self._watchdog_thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_secs)
+            now = time.monotonic()
+            lag_secs = max(now - self._expected_wakeup, 0)
+            self._expected_wakeup = now + self.interval_secs
+            stack, self._blocked_stack = self._blocked_stack, None
+            self.lag_histogram.observe(lag_secs * 1000)
+            if lag_secs >= self.blocking_threshold_secs:
+                self._record_blocking_callback(lag_secs, stack or "")
+            self._num_pending_tasks = len(asyncio.all_tasks())
+            self.pending_tasks_gauge.set(self._num_pending_tasks)
+
+    def _record_blocking_callback(self, lag_secs: float, stack: str):
+        self._last_blocking_callback = BlockingCallback(
+            timestamp_millis=utils.timestamp_millis(),
+            duration_millis=lag_secs * 1000,
+            stack=stack,
+        )
+        self.blocking_callbacks_counter.inc(lag_secs * 1000)
+        logging.warning(
+            "event loop was blocked for %.0fms. stack of the event loop:\n%s",
+            lag_secs * 1000,
+            stack,
+        )
+
+    def _watchdog(self):
+        check_interval_secs = self.blocking_threshold_secs / 2
+        while not self._stop_event.wait(check_interval_secs):
+            if self._blocked_stack is not None:
+                # We already captured the stack for the current stall.
+                continue
+            overdue_secs = time.monotonic() - self._expected_wakeup
+            if overdue_secs < self.blocking_threshold_secs:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._blocked_stack = "".join(
+                traceback.format_stack(frame)[-_MAX_STACK_FRAMES:]
+            )
+
+    def snapshot(self) -> EventLoopSnapshot:
+        return EventLoopSnapshot(
+            lag_millis=self.lag_histogram.calculate_histogram(),
+            num_pending_tasks=self._num_pending_tasks,
+            blocking_callbacks=self.blocking_callbacks_counter.calculate_rate(),
+            last_blocking_callback=self._last_blocking_callback,
+        )
+
+
+def monitor_tags(group_id: str, run_id: str, replica_id: str) -> Dict[str, Any]:
+    """Returns the metric tags used by every event loop monitor."""
+    return {
+        "processor_group_id": group_id,
+        "JobId": ray.get_runtime_context().get_job_id(),
+        "RunId": run_id,
+        "ReplicaID": replica_id,
+    }
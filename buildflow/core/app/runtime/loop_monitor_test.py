@@ -0,0 +1,77 @@
+import asyncio
+import time
+import unittest
+
+from buildflow.core.app.runtime.loop_monitor import (
+    BlockingCallback,
+    EventLoopMonitor,
+    EventLoopSnapshot,
+)
+from buildflow.core.app.runtime.metrics import HistogramCalculation, RateCalculation
+
+
+def blocking_function(seconds: float):
+    time.sleep(seconds)
+
+
+class EventLoopMonitorTest(unittest.IsolatedAsyncioTestCase):
+    async def test_detects_blocking_callback(self):
+        monitor = EventLoopMonitor({}, interval_secs=0.02, blocking_threshold_secs=0.1)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+            blocking_function(0.3)
+            await asyncio.sleep(0.1)
+            snapshot = monitor.snapshot()
+        finally:
+            monitor.stop()
+
+        self.assertEqual(snapshot.blocking_callbacks.values_count, 1)
+        self.assertGreaterEqual(snapshot.last_blocking_callback.duration_millis, 250)
+        self.assertIn("blocking_function", snapshot.last_blocking_callback.stack)
+        self.assertGreaterEqual(snapshot.lag_millis.max_value, 250)
+        self.assertGreater(snapshot.num_pending_tasks, 0)
+
+    async def test_no_blocking_callbacks(self):
+        monitor = EventLoopMonitor({}, interval_secs=0.02, blocking_threshold_secs=0.1)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.2)
+            snapshot = monitor.snapshot()
+        finally:
+            monitor.stop()
+
+        self.assertEqual(snapshot.blocking_callbacks.values_count, 0)
+        self.assertIsNone(snapshot.last_blocking_callback)
+        self.assertGreater(snapshot.lag_millis.values_count, 0)
+
+
+class EventLoopSnapshotTest(unittest.TestCase):
+    def test_merge(self):
+        lag_millis = HistogramCalculation()
+        lag_millis.add(5)
+        snapshot_1 = EventLoopSnapshot(
+            lag_millis=lag_millis,
+            num_pending_tasks=3,
+            blocking_callbacks=RateCalculation(200, 1, 10),
+            last_blocking_callback=BlockingCallback(1000, 200, "stack 1"),
+        )
+        snapshot_2 = EventLoopSnapshot(
+            lag_millis=lag_millis,
+            num_pending_tasks=4,
+            blocking_callbacks=RateCalculation(300, 1, 10),
+            last_blocking_callback=BlockingCallback(2000, 300, "stack 2"),
+        )
+
+        merged = EventLoopSnapshot.merge([snapshot_1, snapshot_2])
+
+        self.assertEqual(merged.num_pending_tasks, 7)
+        self.assertEqual(merged.lag_millis.values_count, 2)
+        self.assertEqual(merged.blocking_callbacks.values_count, 2)
+        self.assertEqual(merged.last_blocking_callback.stack, "stack 2")
+        self.assertEqual(merged.as_dict()["blocking_callbacks_per_sec"], 0.2)
+        self.assertEqual(EventLoopSnapshot.merge([]).num_pending_tasks, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,9 @@
 # ruff: noqa
 from .common import num_events_processed, process_time_counter
-from .metrics import CompositeRateCounterMetric, RateCalculation, SimpleGaugeMetric
+from .metrics import (
+    CompositeHistogramMetric,
+    CompositeRateCounterMetric,
+    HistogramCalculation,
+    RateCalculation,
+    SimpleGaugeMetric,
+)
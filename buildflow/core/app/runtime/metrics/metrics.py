@@ -1,9 +1,33 @@
+import math
 import time
-from collections import deque
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Union
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from ray.util.metrics import Counter, Gauge
+from ray.util.metrics import Counter, Gauge, Histogram
+
+TagsKey = Tuple[Tuple[str, str], ...]
+
+# Values are stored in log-scaled buckets where each bucket is _HISTOGRAM_GAMMA
+# times wider than the previous one. This keeps percentiles within ~1% of the
+# real value while only storing one counter per non-empty bucket.
+_HISTOGRAM_GAMMA = 1.02
+_LOG_HISTOGRAM_GAMMA = math.log(_HISTOGRAM_GAMMA)
+DEFAULT_LATENCY_BOUNDARIES_MILLIS = [
+    1,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    30_000,
+    60_000,
+]
 
 
 @dataclass
@@ -79,9 +103,88 @@ class RateCalculation:
         return cls(combined_values_sum, combined_values_count, average_num_rate_seconds)
 
 
+@dataclass
+class HistogramCalculation:
+    """Stores a mergeable snapshot of a log-bucketed histogram."""
+
+    bucket_counts: Dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+    values_count: int = 0
+    values_sum: float = 0.0
+    max_value: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.values_count,
+            "avg": self.average_value(),
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max_value,
+        }
+
+    def add(self, value: Union[int, float]):
+        """Adds a single value to the histogram."""
+        self.values_count += 1
+        self.values_sum += value
+        if value > self.max_value:
+            self.max_value = value
+        if value <= 0:
+            self.zero_count += 1
+            return
+        idx = math.ceil(math.log(value) / _LOG_HISTOGRAM_GAMMA)
+        self.bucket_counts[idx] = self.bucket_counts.get(idx, 0) + 1
+
+    def average_value(self) -> float:
+        """Calculates the average of all values in the histogram."""
+        if self.values_count == 0:
+            return 0.0
+        return self.values_sum / self.values_count
+
+    def percentile(self, percentile: float) -> float:
+        """Estimates the value at the given percentile (0-100)."""
+        if self.values_count == 0:
+            return 0.0
+        rank = percentile / 100 * (self.values_count - 1)
+        if rank >= self.values_count - 1:
+            # The max value is tracked exactly.
+            return self.max_value
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for idx in sorted(self.bucket_counts):
+            seen += self.bucket_counts[idx]
+            if rank < seen:
+                # Use the midpoint of the bucket (gamma^(idx-1), gamma^idx]
+                value = 2 * _HISTOGRAM_GAMMA**idx / (_HISTOGRAM_GAMMA + 1)
+                return min(value, self.max_value)
+        return self.max_value
+
+    @classmethod
+    def merge(
+        cls,
+        histogram_calculations: Iterable["HistogramCalculation"],
+    ) -> "HistogramCalculation":
+        """Combines multiple histograms into a single histogram."""
+        merged = cls()
+        for histogram in histogram_calculations:
+            for idx, count in histogram.bucket_counts.items():
+                merged.bucket_counts[idx] = merged.bucket_counts.get(idx, 0) + count
+            merged.zero_count += histogram.zero_count
+            merged.values_count += histogram.values_count
+            merged.values_sum += histogram.values_sum
+            merged.max_value = max(merged.max_value, histogram.max_value)
+        return merged
+
+
 # NOTE: This is only an approximation and is not meant for precise calculations.
 class CompositeRateCounterMetric:
-    """A composite of 2 Counter metrics that do in-memory rate calculations."""
+    """A composite of 2 Counter metrics that do in-memory rate calculations.
+
+    The in-memory rate is tracked in a fixed size ring buffer with one slot per
+    second, so updates are O(1). Increments to the Ray counters are aggregated
+    locally and flushed every `flush_interval_secs` instead of on every call.
+    """
 
     def __init__(
         self,
@@ -89,16 +192,22 @@ class CompositeRateCounterMetric:
         description: str = "",
         default_tags: Dict[str, str] = None,
         rate_secs: int = 60,
+        flush_interval_secs: float = 5,
     ):
         # setup for in-memory metrics
         self.rate_secs = rate_secs
-        self.buckets = deque([(0, 0) for _ in range(self.rate_secs)])
-        self.running_count = 0
-        self.running_sum = 0.0
-        self.running_time_secs = 0
-        self.last_update_sec = int(time.monotonic())
-
+        # Each slot holds the count and sum for the second stored in
+        # _bucket_secs. Slots are lazily reset when a new second reuses them.
+        self._bucket_counts = [0] * self.rate_secs
+        self._bucket_sums = [0.0] * self.rate_secs
+        self._bucket_secs = [-1] * self.rate_secs
+        self._start_sec = int(time.monotonic())
         # setup for ray metrics
+        self.flush_interval_secs = flush_interval_secs
+        self._last_flush_time = time.monotonic()
+        # pending increments keyed by the tags they were reported with
+        self._pending_counts: Dict[Optional[TagsKey], int] = {}
+        self._pending_sums: Dict[Optional[TagsKey], float] = {}
         tag_keys = tuple(default_tags.keys()) if default_tags else None
         self._count_ray_counter = Counter(
             name=f"{name}_count", description=description, tag_keys=tag_keys
@@ -109,52 +218,119 @@ class CompositeRateCounterMetric:
         )
         self._value_ray_counter.set_default_tags(default_tags)
 
-    def inc(self, n: Union[int, float] = 1, *args, **kwargs):
+    def inc(self, n: Union[int, float] = 1, tags: Optional[Dict[str, str]] = None):
         """Increments both the COUNT & VALUE counters and updates the rate buckets."""
-        self._count_ray_counter.inc(1, *args, **kwargs)
-        self._value_ray_counter.inc(n, *args, **kwargs)
+        key = None if tags is None else tuple(tags.items())
+        self._pending_counts[key] = self._pending_counts.get(key, 0) + 1
+        self._pending_sums[key] = self._pending_sums.get(key, 0) + n
         self.update_rate_buckets(n)
 
-    def empty_inc(self, *args, **kwargs):
+    def empty_inc(self, tags: Optional[Dict[str, str]] = None):
         """Only increments the COUNT counter and updates the rate buckets."""
-        self._count_ray_counter.inc(1, *args, **kwargs)
+        key = None if tags is None else tuple(tags.items())
+        self._pending_counts[key] = self._pending_counts.get(key, 0) + 1
         self.update_rate_buckets(0)
 
     def update_rate_buckets(self, value: Union[int, float]):
         """Updates the rate buckets with the given value."""
-        now_sec = int(time.monotonic())
-        seconds_difference = now_sec - self.last_update_sec
-        self.last_update_sec = now_sec
-        self.running_time_secs += seconds_difference
-
-        # Check if more than rate_secs seconds have passed since the last update
-        if seconds_difference >= self.rate_secs:
-            # If so, clear all buckets
-            self.buckets = deque([(0, 0) for _ in range(self.rate_secs)])
-            self.running_count = 0
-            self.running_sum = 0.0
-        else:
-            # Otherwise, add new buckets for the seconds that have passed
-            for _ in range(seconds_difference):
-                # append a new bucket for the current second
-                self.buckets.append((0, 0))
-                # remove the oldest bucket
-                removed_count, removed_sum = self.buckets.popleft()
-                if removed_count > 0:
-                    self.running_count -= removed_count
-                    self.running_sum -= removed_sum
-
-        # Add the data point to the correct bucket
-        current_count, current_sum = self.buckets[-1]
-        self.buckets[-1] = (current_count + 1, current_sum + value)
-        self.running_count += 1
-        self.running_sum += value
+        now = time.monotonic()
+        now_sec = int(now)
+        idx = now_sec % self.rate_secs
+        if self._bucket_secs[idx] != now_sec:
+            # This slot was last used more than rate_secs ago, so reset it.
+            self._bucket_secs[idx] = now_sec
+            self._bucket_counts[idx] = 0
+            self._bucket_sums[idx] = 0.0
+        self._bucket_counts[idx] += 1
+        self._bucket_sums[idx] += value
+        if now - self._last_flush_time >= self.flush_interval_secs:
+            self.flush()
+
+    def flush(self):
+        """Exports the locally aggregated increments to the Ray counters."""
+        self._last_flush_time = time.monotonic()
+        for key, count in self._pending_counts.items():
+            tags = None if key is None else dict(key)
+            self._count_ray_counter.inc(count, tags=tags)
+            value = self._pending_sums.get(key, 0)
+            # Ray doesn't allow incrementing a counter by 0.
+            if value > 0:
+                self._value_ray_counter.inc(value, tags=tags)
+        self._pending_counts.clear()
+        self._pending_sums.clear()
 
     def calculate_rate(self) -> RateCalculation:
-        """Calculates the rate using the latest running counters."""
+        """Calculates the rate using the buckets from the last rate_secs seconds."""
+        self.flush()
+        now_sec = int(time.monotonic())
+        values_sum = 0.0
+        values_count = 0
+        for bucket_sec, count, value in zip(
+            self._bucket_secs, self._bucket_counts, self._bucket_sums
+        ):
+            if now_sec - bucket_sec < self.rate_secs:
+                values_count += count
+                values_sum += value
         # Handles the case where less than rate_secs has passed
-        rate_secs = min(self.running_time_secs, self.rate_secs)
-        return RateCalculation(self.running_sum, self.running_count, rate_secs)
+        rate_secs = min(now_sec - self._start_sec, self.rate_secs)
+        return RateCalculation(values_sum, values_count, rate_secs)
+
+
+# NOTE: This is only an approximation and is not meant for precise calculations.
+class CompositeHistogramMetric:
+    """A Histogram metric that also keeps an in-memory mergeable histogram.
+
+    The in-memory histogram covers the current and the previous rate window, so
+    percentiles reflect the last rate_secs to 2 * rate_secs seconds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "",
+        default_tags: Dict[str, str] = None,
+        rate_secs: int = 60,
+        boundaries: Optional[List[float]] = None,
+    ):
+        # setup for in-memory metrics
+        self.rate_secs = rate_secs
+        self._window_start = time.monotonic()
+        self._current = HistogramCalculation()
+        self._previous = HistogramCalculation()
+        # setup for ray metrics
+        if boundaries is None:
+            boundaries = DEFAULT_LATENCY_BOUNDARIES_MILLIS
+        tag_keys = tuple(default_tags.keys()) if default_tags else None
+        self._ray_histogram = Histogram(
+            name=name,
+            description=description,
+            boundaries=boundaries,
+            tag_keys=tag_keys,
+        )
+        self._ray_histogram.set_default_tags(default_tags)
+
+    def observe(self, value: Union[int, float], tags: Optional[Dict[str, str]] = None):
+        """Records the value in both the Ray & in-memory histograms."""
+        self._maybe_rotate()
+        self._current.add(value)
+        self._ray_histogram.observe(value, tags=tags)
+
+    def _maybe_rotate(self):
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.rate_secs:
+            return
+        if elapsed < 2 * self.rate_secs:
+            self._previous = self._current
+        else:
+            self._previous = HistogramCalculation()
+        self._current = HistogramCalculation()
+        self._window_start = now
+
+    def calculate_histogram(self) -> HistogramCalculation:
+        """Returns the histogram of the values from the recent rate windows."""
+        self._maybe_rotate()
+        return HistogramCalculation.merge([self._previous, self._current])
 
 
 class SimpleGaugeMetric:
@@ -1,8 +1,11 @@
 import time
 import unittest
+from unittest import mock
 
 from buildflow.core.app.runtime.metrics import (
+    CompositeHistogramMetric,
     CompositeRateCounterMetric,
+    HistogramCalculation,
     RateCalculation,
 )
 
@@ -60,6 +63,99 @@ class MetricsTest(unittest.TestCase):
         expected_average_value_rate = 80 / 4
         self.assertEqual(result.average_value_rate(), expected_average_value_rate)
 
+    def test_composite_rate_counter_expires_buckets_without_updates(self):
+        counter = CompositeRateCounterMetric("test", "desc", {}, rate_secs=2)
+        counter.inc(10)
+        time.sleep(2)
+        result = counter.calculate_rate()
+        # The only data point is older than rate_secs, so it is no longer counted.
+        self.assertEqual(
+            result, RateCalculation(values_sum=0, values_count=0, num_rate_seconds=2)
+        )
+
+    def test_composite_rate_counter_batches_ray_counter_updates(self):
+        counter = CompositeRateCounterMetric(
+            "test", "desc", {}, rate_secs=5, flush_interval_secs=60
+        )
+        counter._count_ray_counter = mock.MagicMock()
+        counter._value_ray_counter = mock.MagicMock()
+
+        counter.inc(10)
+        counter.inc(20)
+        counter.empty_inc()
+        counter._count_ray_counter.inc.assert_not_called()
+        counter._value_ray_counter.inc.assert_not_called()
+
+        counter.flush()
+        counter._count_ray_counter.inc.assert_called_once_with(3, tags=None)
+        counter._value_ray_counter.inc.assert_called_once_with(30, tags=None)
+
+        counter._count_ray_counter.reset_mock()
+        counter._value_ray_counter.reset_mock()
+        counter.inc(1, tags={"StatusCode": "200"})
+        counter.inc(1, tags={"StatusCode": "500"})
+        counter.inc(1, tags={"StatusCode": "200"})
+        counter.flush()
+        counter._count_ray_counter.inc.assert_has_calls(
+            [
+                mock.call(2, tags={"StatusCode": "200"}),
+                mock.call(1, tags={"StatusCode": "500"}),
+            ]
+        )
+
+        # Nothing is pending so nothing should be exported.
+        counter._count_ray_counter.reset_mock()
+        counter.flush()
+        counter._count_ray_counter.inc.assert_not_called()
+
+    def test_histogram_percentiles(self):
+        histogram = HistogramCalculation()
+        for value in range(1, 1001):
+            histogram.add(value)
+        histogram.add(0)
+
+        self.assertEqual(histogram.values_count, 1001)
+        self.assertEqual(histogram.max_value, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=500 * 0.01)
+        self.assertAlmostEqual(histogram.percentile(90), 900, delta=900 * 0.01)
+        self.assertAlmostEqual(histogram.percentile(99), 990, delta=990 * 0.01)
+        self.assertEqual(histogram.percentile(0), 0)
+        self.assertEqual(histogram.percentile(100), 1000)
+        self.assertEqual(HistogramCalculation().percentile(99), 0)
+
+    def test_histogram_merge(self):
+        fast_replica = HistogramCalculation()
+        slow_replica = HistogramCalculation()
+        for _ in range(90):
+            fast_replica.add(10)
+        for _ in range(10):
+            slow_replica.add(1000)
+
+        merged = HistogramCalculation.merge([fast_replica, slow_replica])
+
+        self.assertEqual(merged.values_count, 100)
+        self.assertEqual(merged.values_sum, 90 * 10 + 10 * 1000)
+        self.assertEqual(merged.max_value, 1000)
+        self.assertAlmostEqual(merged.percentile(50), 10, delta=0.1)
+        self.assertAlmostEqual(merged.percentile(95), 1000, delta=10)
+        # The inputs are left untouched.
+        self.assertEqual(fast_replica.values_count, 90)
+
+    def test_composite_histogram_rotates_windows(self):
+        histogram = CompositeHistogramMetric("test", "desc", {}, rate_secs=1)
+        histogram._ray_histogram = mock.MagicMock()
+
+        histogram.observe(10)
+        histogram._ray_histogram.observe.assert_called_once_with(10, tags=None)
+        self.assertEqual(histogram.calculate_histogram().values_count, 1)
+        time.sleep(1)
+        histogram.observe(20)
+        # The previous window is still included.
+        self.assertEqual(histogram.calculate_histogram().values_count, 2)
+        time.sleep(2)
+        # Both windows have expired.
+        self.assertEqual(histogram.calculate_histogram().values_count, 0)
+
 
 if __name__ == "__name__":
     unittest.main()
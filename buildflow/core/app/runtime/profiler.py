@@ -0,0 +1,148 @@
+"""Low overhead profilers that can be triggered inside of running replicas.
+
+Both profilers return "collapsed stacks", a mapping from a semicolon separated
+stack (root frame first) to a value. This is the input format of most flamegraph
+tools (e.g. flamegraph.pl, speedscope), and can be merged across replicas by
+summing the values.
+"""
+import asyncio
+import collections
+import dataclasses
+import enum
+import sys
+import threading
+import tracemalloc
+from typing import Dict, Iterable, Optional
+
+CollapsedStacks = Dict[str, int]
+
+# Sample the stacks 100 times a second.
+_DEFAULT_SAMPLE_INTERVAL_SECS = 0.01
+_MAX_STACK_DEPTH = 128
+_TRACEMALLOC_NUM_FRAMES = 32
+# Only the largest allocation sites are returned to keep the response small.
+_MAX_MEMORY_STACKS = 1000
+
+
+class ProfileMode(enum.Enum):
+    CPU = "cpu"
+    MEMORY = "memory"
+
+
+@dataclasses.dataclass(frozen=True)
+class ProfileRequest:
+    request_id: str
+    mode: ProfileMode
+    seconds: float
+
+
+def _format_frame(filename: str, function_name: str, lineno: int) -> str:
+    # NOTE: ';' is the separator of the collapsed stack format.
+    return f"{function_name} ({filename}:{lineno})".replace(";", ":")
+
+
+def _collapse_frame(frame) -> str:
+    stack = []
+    while frame is not None and len(stack) < _MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append(_format_frame(code.co_filename, code.co_name, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return ";".join(stack)
+
+
+class SamplingProfiler:
+    """Periodically samples the stack of a thread from a background thread.
+
+    By default only the thread that created the profiler is sampled, inside of
+    our actors this is the thread running the asyncio event loop.
+    """
+
+    def __init__(
+        self,
+        interval_secs: float = _DEFAULT_SAMPLE_INTERVAL_SECS,
+        thread_id: Optional[int] = None,
+    ) -> None:
+        self.interval_secs = interval_secs
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self._stacks: CollapsedStacks = collections.Counter()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval_secs):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._stacks[_collapse_frame(frame)] += 1
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="buildflow-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> CollapsedStacks:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        return dict(self._stacks)
+
+
+async def profile_cpu(
+    seconds: float, interval_secs: float = _DEFAULT_SAMPLE_INTERVAL_SECS
+) -> CollapsedStacks:
+    """Samples the event loop thread for `seconds`. Values are sample counts."""
+    profiler = SamplingProfiler(interval_secs)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stacks = profiler.stop()
+    return stacks
+
+
+async def profile_memory(seconds: float) -> CollapsedStacks:
+    """Traces allocations for `seconds`. Values are the bytes still allocated."""
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(_TRACEMALLOC_NUM_FRAMES)
+    try:
+        await asyncio.sleep(seconds)
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    stacks = collections.Counter()
+    for stat in snapshot.statistics("traceback")[:_MAX_MEMORY_STACKS]:
+        # Frames are ordered from the oldest to the most recent call.
+        stack = ";".join(
+            f"{frame.filename}:{frame.lineno}".replace(";", ":")
+            for frame in stat.traceback
+        )
+        stacks[stack] += stat.size
+    return dict(stacks)
+
+
+async def profile(mode: ProfileMode, seconds: float) -> CollapsedStacks:
+    if mode == ProfileMode.CPU:
+        return await profile_cpu(seconds)
+    return await profile_memory(seconds)
+
+
+def merge_collapsed_stacks(
+    collapsed_stacks: Iterable[CollapsedStacks],
+) -> CollapsedStacks:
+    """Merges the profiles of multiple replicas by summing the values."""
+    merged = collections.Counter()
+    for stacks in collapsed_stacks:
+        merged.update(stacks)
+    return dict(merged)
+
+
+def format_collapsed_stacks(stacks: CollapsedStacks) -> str:
+    """Formats the stacks as `frame;frame;frame value` lines, largest first."""
+    lines = [
+        f"{stack} {value}"
+        for stack, value in sorted(stacks.items(), key=lambda kv: -kv[1])
+    ]
+    return "\n".join(lines) + "\n"
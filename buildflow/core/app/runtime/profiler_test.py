@@ -0,0 +1,54 @@
+import asyncio
+import time
+import unittest
+
+from buildflow.core.app.runtime import profiler
+
+
+def busy_function(seconds: float):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+class ProfilerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_profile_cpu(self):
+        profile_task = asyncio.create_task(
+            profiler.profile(profiler.ProfileMode.CPU, 0.5)
+        )
+        # Give the profiler a chance to start before blocking the event loop.
+        await asyncio.sleep(0)
+        busy_function(0.3)
+        stacks = await profile_task
+
+        busy_samples = sum(
+            count for stack, count in stacks.items() if "busy_function" in stack
+        )
+        self.assertGreater(busy_samples, 0)
+        self.assertTrue(all(";" in stack for stack in stacks))
+
+    async def test_profile_memory(self):
+        allocations = []
+
+        async def allocate():
+            await asyncio.sleep(0.05)
+            allocations.append(bytearray(1024 * 1024))
+
+        profile_task = asyncio.create_task(
+            profiler.profile(profiler.ProfileMode.MEMORY, 0.2)
+        )
+        await allocate()
+        stacks = await profile_task
+
+        self.assertTrue(stacks)
+        self.assertGreaterEqual(max(stacks.values()), 1024 * 1024)
+
+    def test_merge_and_format_collapsed_stacks(self):
+        merged = profiler.merge_collapsed_stacks([{"a;b": 1, "a;c": 5}, {"a;b": 3}])
+
+        self.assertEqual(merged, {"a;b": 4, "a;c": 5})
+        self.assertEqual(profiler.format_collapsed_stacks(merged), "a;c 5\na;b 4\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
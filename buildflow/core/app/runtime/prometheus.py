@@ -0,0 +1,127 @@
+"""Renders runtime snapshots in the Prometheus text exposition format."""
+import re
+from typing import Any, Dict, List, Optional
+
+_METRIC_PREFIX = "buildflow"
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+# The percentiles included in HistogramCalculation.as_dict
+_QUANTILES = {"p50": "0.5", "p90": "0.9", "p99": "0.99"}
+
+
+def _metric_name(*parts: str) -> str:
+    return _INVALID_NAME_CHARS.sub("_", "_".join((_METRIC_PREFIX,) + parts))
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    formatted = ",".join(
+        f'{key}="{_escape_label_value(value)}"' for key, value in labels.items()
+    )
+    return "{" + formatted + "}"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_histogram(value: Any) -> bool:
+    return isinstance(value, dict) and "count" in value and "p50" in value
+
+
+class _MetricsWriter:
+    def __init__(self) -> None:
+        self._types: Dict[str, str] = {}
+        self._samples: Dict[str, List[str]] = {}
+
+    def add(
+        self,
+        name: str,
+        value: float,
+        labels: Dict[str, Any],
+        metric_type: str = "gauge",
+        family: Optional[str] = None,
+    ):
+        family = family or name
+        self._types.setdefault(family, metric_type)
+        self._samples.setdefault(family, []).append(
+            f"{name}{_format_labels(labels)} {float(value)}"
+        )
+
+    def add_fields(self, prefix: str, fields: Dict[str, Any], labels: Dict[str, Any]):
+        """Adds all numeric fields, nested dicts are flattened into the name."""
+        for key, value in fields.items():
+            if _is_number(value):
+                self.add(_metric_name(prefix, key), value, labels)
+            elif _is_histogram(value):
+                self.add_histogram(_metric_name(prefix, key), value, labels)
+            elif isinstance(value, dict):
+                if value and all(_is_histogram(v) for v in value.values()):
+                    for stage, histogram in value.items():
+                        self.add_histogram(
+                            _metric_name(prefix, key),
+                            histogram,
+                            {**labels, "stage": stage},
+                        )
+                else:
+                    self.add_fields(f"{prefix}_{key}", value, labels)
+
+    def add_histogram(self, name: str, histogram: Dict[str, Any], labels):
+        for percentile, quantile in _QUANTILES.items():
+            self.add(
+                name,
+                histogram[percentile],
+                {**labels, "quantile": quantile},
+                metric_type="summary",
+            )
+        self.add(
+            f"{name}_sum",
+            histogram["avg"] * histogram["count"],
+            labels,
+            metric_type="summary",
+            family=name,
+        )
+        self.add(
+            f"{name}_count",
+            histogram["count"],
+            labels,
+            metric_type="summary",
+            family=name,
+        )
+
+    def render(self) -> str:
+        lines = []
+        for family, samples in self._samples.items():
+            lines.append(f"# TYPE {family} {self._types[family]}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def snapshot_to_prometheus(snapshot: Dict[str, Any]) -> str:
+    """Converts the dict form of a RuntimeSnapshot to Prometheus text format."""
+    writer = _MetricsWriter()
+    writer.add(_metric_name("runtime", "status"), 1, {"status": snapshot.get("status")})
+    for group in snapshot.get("processor_groups", []):
+        group_labels = {
+            "group_id": group.get("group_id"),
+            "group_type": group.get("group_type"),
+        }
+        writer.add(
+            _metric_name("processor_group", "status"),
+            1,
+            {**group_labels, "status": group.get("status")},
+        )
+        group_fields = {
+            key: value
+            for key, value in group.items()
+            if key not in ("processor_snapshots", "timestamp_millis")
+        }
+        writer.add_fields("processor_group", group_fields, group_labels)
+        for processor_id, processor in group.get("processor_snapshots", {}).items():
+            processor_labels = {**group_labels, "processor_id": processor_id}
+            writer.add_fields("processor", processor, processor_labels)
+    return writer.render()
@@ -0,0 +1,73 @@
+import unittest
+
+from buildflow.core.app.runtime.prometheus import snapshot_to_prometheus
+
+
+class PrometheusTest(unittest.TestCase):
+    def test_snapshot_to_prometheus(self):
+        snapshot = {
+            "status": "RUNNING",
+            "timestamp_millis": 1,
+            "processor_groups": [
+                {
+                    "status": "RUNNING",
+                    "timestamp_millis": 1,
+                    "group_id": "group",
+                    "group_type": "CONSUMER",
+                    "num_replicas": 2,
+                    "resources_per_replica": {"GPU": 1},
+                    "placement_strategy": None,
+                    "processor_snapshots": {
+                        "proc": {
+                            "processor_id": "proc",
+                            "processor_type": "CONSUMER",
+                            "total_events_processed_per_sec": 10.5,
+                            "latency_millis": {
+                                "pull": {
+                                    "count": 4,
+                                    "avg": 2.5,
+                                    "p50": 2,
+                                    "p90": 4,
+                                    "p99": 4,
+                                    "max": 4,
+                                }
+                            },
+                        }
+                    },
+                }
+            ],
+        }
+
+        lines = snapshot_to_prometheus(snapshot).splitlines()
+
+        self.assertIn('buildflow_runtime_status{status="RUNNING"} 1.0', lines)
+        self.assertIn(
+            'buildflow_processor_group_num_replicas{group_id="group",group_type="CONSUMER"} 2.0',  # noqa: E501
+            lines,
+        )
+        self.assertIn(
+            'buildflow_processor_group_resources_per_replica_GPU{group_id="group",group_type="CONSUMER"} 1.0',  # noqa: E501
+            lines,
+        )
+        self.assertIn(
+            'buildflow_processor_total_events_processed_per_sec{group_id="group",group_type="CONSUMER",processor_id="proc"} 10.5',  # noqa: E501
+            lines,
+        )
+        self.assertIn("# TYPE buildflow_processor_latency_millis summary", lines)
+        self.assertIn(
+            'buildflow_processor_latency_millis{group_id="group",group_type="CONSUMER",processor_id="proc",stage="pull",quantile="0.99"} 4.0',  # noqa: E501
+            lines,
+        )
+        self.assertIn(
+            'buildflow_processor_latency_millis_sum{group_id="group",group_type="CONSUMER",processor_id="proc",stage="pull"} 10.0',  # noqa: E501
+            lines,
+        )
+        # Each metric family only has a single TYPE line.
+        type_lines = [line for line in lines if line.startswith("# TYPE")]
+        self.assertEqual(len(type_lines), len(set(type_lines)))
+        # String fields are not exported as metrics.
+        self.assertFalse(any("processor_type" in line for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
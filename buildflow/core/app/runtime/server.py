@@ -1,16 +1,29 @@
+import asyncio
+import collections
 import contextlib
+import json
 import logging
 import threading
 import time
-from typing import Optional
+from typing import Any, Deque, Dict, List, Optional
 
 import uvicorn
-from fastapi import APIRouter, FastAPI
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
 
 from buildflow.core.app.flow_state import FlowState
 from buildflow.core.app.infra.actors.infra import InfraActor
+from buildflow.core.app.runtime import profiler
 from buildflow.core.app.runtime.actors.runtime import RuntimeActor, RuntimeSnapshot
+from buildflow.core.app.runtime.prometheus import snapshot_to_prometheus
+
+# Profiles block a request, so we cap how long they can run for.
+_MAX_PROFILE_SECS = 300
 
 app = FastAPI(
     docs_url=None,
@@ -61,6 +74,8 @@ class RuntimeServer(uvicorn.Server):
         infra_actor: Optional[InfraActor] = None,
         *,
         log_level: str = "WARNING",
+        snapshot_interval_secs: float = 10,
+        max_snapshot_history: int = 360,
     ) -> None:
         super().__init__(
             uvicorn.Config(app, host=host, port=port, log_level=log_level.lower())
@@ -73,6 +88,16 @@ class RuntimeServer(uvicorn.Server):
         # configuration
         self.runtime_actor = runtime_actor
         self.infra_actor = infra_actor
+        self.snapshot_interval_secs = snapshot_interval_secs
+
+        # snapshot cache & history, refreshed by _snapshot_loop so that readers
+        # don't fan out to every actor on each request.
+        self._snapshot_history: Deque[Dict[str, Any]] = collections.deque(
+            maxlen=max_snapshot_history
+        )
+        self._snapshot_subscribers: List[asyncio.Queue] = []
+        self._snapshot_task: Optional[asyncio.Task] = None
+
         self.router = APIRouter()
         self.router.add_api_route("/", self.index, methods=["GET"])
         self.router.add_api_route(
@@ -82,11 +107,25 @@ class RuntimeServer(uvicorn.Server):
         self.router.add_api_route(
             "/runtime/snapshot", self.runtime_snapshot, methods=["GET"]
         )
+        self.router.add_api_route(
+            "/runtime/snapshots", self.runtime_snapshots, methods=["GET"]
+        )
+        self.router.add_api_route(
+            "/runtime/snapshots/stream",
+            self.runtime_snapshots_stream,
+            methods=["GET"],
+        )
+        self.router.add_api_route("/metrics", self.metrics, methods=["GET"])
+        self.router.add_api_route(
+            "/runtime/profile", self.runtime_profile, methods=["GET"]
+        )
         self.router.add_api_route(
             "/runtime/status", self.runtime_status, methods=["GET"]
         )
         self.router.add_api_route("/infra/status", self.runtime_status, methods=["GET"])
         self.router.add_api_route("/flowstate", self.flowstate, methods=["GET"])
+        self.router.add_event_handler("startup", self._start_snapshot_loop)
+        self.router.add_event_handler("shutdown", self._stop_snapshot_loop)
         app.include_router(self.router)
 
     @contextlib.contextmanager
@@ -101,6 +140,37 @@ class RuntimeServer(uvicorn.Server):
             self.should_exit = True
             thread.join()
 
+    async def _start_snapshot_loop(self):
+        self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+
+    async def _stop_snapshot_loop(self):
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+
+    async def _snapshot_loop(self):
+        while True:
+            try:
+                await self._refresh_snapshot()
+            except Exception:
+                logging.exception("failed to refresh runtime snapshot, will retry")
+            await asyncio.sleep(self.snapshot_interval_secs)
+
+    async def _refresh_snapshot(self) -> Dict[str, Any]:
+        snapshot: RuntimeSnapshot = await self.runtime_actor.snapshot.remote()
+        snapshot_dict = snapshot.as_dict()
+        self._snapshot_history.append(snapshot_dict)
+        for subscriber in self._snapshot_subscribers:
+            # Slow subscribers miss snapshots instead of growing unbounded.
+            if not subscriber.full():
+                subscriber.put_nowait(snapshot_dict)
+        return snapshot_dict
+
+    async def _latest_snapshot(self) -> Dict[str, Any]:
+        if self._snapshot_history:
+            return self._snapshot_history[-1]
+        # The background loop hasn't produced a snapshot yet.
+        return await self._refresh_snapshot()
+
     async def index(self):
         return HTMLResponse(index_html)
 
@@ -113,6 +183,64 @@ class RuntimeServer(uvicorn.Server):
         snapshot: RuntimeSnapshot = await self.runtime_actor.snapshot.remote()
         return JSONResponse(snapshot.as_dict())
 
+    async def runtime_snapshots(self, since: int = 0):
+        """Returns the cached snapshots taken after `since` (epoch millis)."""
+        snapshots = [
+            snapshot
+            for snapshot in self._snapshot_history
+            if snapshot["timestamp_millis"] > since
+        ]
+        return JSONResponse(snapshots)
+
+    async def runtime_snapshots_stream(self):
+        """Streams each new snapshot as a server-sent event."""
+
+        async def event_stream():
+            subscriber = asyncio.Queue(maxsize=self._snapshot_history.maxlen)
+            # Registered here so the finally below always unregisters it. If the
+            # client disconnects before the stream starts the generator never runs.
+            self._snapshot_subscribers.append(subscriber)
+            try:
+                while True:
+                    snapshot = await subscriber.get()
+                    yield f"data: {json.dumps(snapshot)}\n\n"
+            finally:
+                self._snapshot_subscribers.remove(subscriber)
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    async def metrics(self):
+        snapshot = await self._latest_snapshot()
+        return PlainTextResponse(
+            snapshot_to_prometheus(snapshot),
+            media_type="text/plain; version=0.0.4",
+        )
+
+    async def runtime_profile(
+        self, processor: str, seconds: float = 10, mode: str = "cpu"
+    ):
+        """Profiles a processor group and returns the merged collapsed stacks.
+
+        The response can be fed directly to flamegraph tools (e.g. speedscope).
+        """
+        if not 0 < seconds <= _MAX_PROFILE_SECS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"seconds must be in (0, {_MAX_PROFILE_SECS}]",
+            )
+        try:
+            profile_mode = profiler.ProfileMode(mode)
+        except ValueError:
+            modes = [m.value for m in profiler.ProfileMode]
+            raise HTTPException(status_code=400, detail=f"mode must be one of: {modes}")
+        try:
+            stacks = await self.runtime_actor.profile.remote(
+                processor, profile_mode, seconds
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return PlainTextResponse(profiler.format_collapsed_stacks(stacks))
+
     async def runtime_stop(self):
         # Send two drain requests to stop the runtime.
         self.runtime_actor.drain.remote()
@@ -17,6 +17,7 @@ class Service:
     min_replics: int = 1
     max_replicas: int = 1000
     target_num_ongoing_requests_per_replica: int = 1
+    trace_sample_rate: float = 0
     log_level: str = "INFO"
     service_id: str = dataclasses.field(default_factory=uuid)
     endpoints: List[Endpoint] = dataclasses.field(default_factory=list, init=False)
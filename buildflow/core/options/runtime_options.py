@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Dict
+from typing import Dict, Optional
 
 from buildflow.core.options._options import Options
 from buildflow.core.processor.processor import ProcessorID
@@ -20,6 +20,11 @@ class AutoscalerOptions(Options):
     consumer_cpu_percent_target (int): The target cpu percentage for scaling
         down. Increasing this number will cause your consumer to scale down
         more aggresively. Defaults to 25.
+    consumer_memory_percent_target (int): The memory percentage a consumer
+        replica can reach before we scale up to spread the load over more
+        replicas. Decreasing this number will cause your consumer to scale up
+        earlier when replicas are under memory pressure. Only used if the
+        replicas have a memory budget (memory_mb). Defaults to 75.
     """
 
     enable_autoscaler: bool
@@ -30,6 +35,7 @@ class AutoscalerOptions(Options):
     # Options for configuring scaling for consumers
     consumer_backlog_burn_threshold: int = 60
     consumer_cpu_percent_target: int = 25
+    consumer_memory_percent_target: int = 75
     # Options for configuring scaling for collectors and endpoints
     target_num_ongoing_requests_per_replica: int = 1
     max_concurrent_queries: int = 100
@@ -49,6 +55,11 @@ class AutoscalerOptions(Options):
             or self.consumer_cpu_percent_target > 100
         ):
             raise ValueError("consumer_cpu_percent_target must be between 0 and 100")
+        if (
+            self.consumer_memory_percent_target <= 0
+            or self.consumer_memory_percent_target > 100
+        ):
+            raise ValueError("consumer_memory_percent_target must be between 0 and 100")
         if self.min_replicas < 0:
             raise ValueError("min_replicas must be greater than 0")
         if self.max_replicas < 0:
@@ -63,14 +74,63 @@ class AutoscalerOptions(Options):
             )
 
 
+_PLACEMENT_STRATEGIES = ("PACK", "SPREAD", "STRICT_PACK", "STRICT_SPREAD")
+_UNKNOWN_FIELD_POLICIES = ("ignore", "raise")
+_MISSING_FIELD_POLICIES = ("raise", "use_none")
+
+
 # TODO: Add options for other pattern types, or merge into a single options object
 @dataclasses.dataclass
 class ProcessorOptions(Options):
+    """Options for a processor.
+
+    num_cpus (float): The number of CPUs to reserve for each replica.
+    num_concurrency (int): The number of concurrent loops to run in each replica.
+    log_level (str): The log level for the replicas.
+    autoscaler_options (AutoscalerOptions): The configuration of the autoscaler.
+    memory_mb (Optional[float]): The memory budget of each replica in megabytes.
+        If set this is reserved as the `memory` resource in Ray, and used as the
+        ceiling for memory based throttling and autoscaling. If not set replicas
+        are throttled based on the share of the node's memory they use, and don't
+        scale up for memory. Defaults to None.
+    memory_throttle_percent (int): The percentage of the memory ceiling at which a
+        replica will stop pulling new data until memory is freed. Defaults to 90.
+    resources (Dict[str, float]): Custom Ray resources to reserve for each replica.
+        Defaults to no custom resources.
+    placement_strategy (Optional[str]): If set replicas that are added together
+        are scheduled in a Ray placement group with this strategy. Valid values
+        are: PACK, SPREAD, STRICT_PACK, STRICT_SPREAD. Defaults to None.
+    node_labels (Dict[str, str]): Only schedule replicas on Ray nodes that have
+        all of these labels. Can not be used with placement_strategy. Defaults to
+        no labels.
+    trace_sample_rate (float): The fraction of batches (for consumers) or
+        requests (for collectors and endpoints) to trace with OpenTelemetry.
+        Tracing is disabled when this is 0. Defaults to 0.
+    blocking_callback_threshold_secs (float): Callbacks that block the event loop
+        of a replica for longer than this are logged with their stack and
+        reported in the snapshots. Defaults to 0.1.
+    unknown_field_policy (str): How consumers decode data into a dataclass that
+        has fields the dataclass doesn't have. Either "ignore" to drop the fields
+        or "raise" to fail the element. Defaults to "ignore".
+    missing_field_policy (str): How consumers decode data into a dataclass that
+        is missing required fields of the dataclass. Either "raise" to fail the
+        element or "use_none" to set the fields to None. Defaults to "raise".
+    """
+
     num_cpus: float
     num_concurrency: int
     log_level: str
     # the configuration of the autoscaler for this processor
     autoscaler_options: AutoscalerOptions
+    memory_mb: Optional[float] = None
+    memory_throttle_percent: int = 90
+    resources: Dict[str, float] = dataclasses.field(default_factory=dict)
+    placement_strategy: Optional[str] = None
+    node_labels: Dict[str, str] = dataclasses.field(default_factory=dict)
+    trace_sample_rate: float = 0
+    blocking_callback_threshold_secs: float = 0.1
+    unknown_field_policy: str = "ignore"
+    missing_field_policy: str = "raise"
 
     @classmethod
     def default(cls) -> "ProcessorOptions":
@@ -81,6 +141,51 @@ class ProcessorOptions(Options):
             autoscaler_options=AutoscalerOptions.default(),
         )
 
+    def __post_init__(self):
+        if self.memory_mb is not None and self.memory_mb <= 0:
+            raise ValueError("memory_mb must be greater than 0")
+        if self.memory_throttle_percent <= 0 or self.memory_throttle_percent > 100:
+            raise ValueError("memory_throttle_percent must be between 0 and 100")
+        if (
+            self.placement_strategy is not None
+            and self.placement_strategy not in _PLACEMENT_STRATEGIES
+        ):
+            raise ValueError(
+                f"placement_strategy must be one of: {_PLACEMENT_STRATEGIES}. "
+                f"Received: {self.placement_strategy}"
+            )
+        if self.placement_strategy is not None and self.node_labels:
+            raise ValueError("placement_strategy and node_labels can not both be set")
+        if self.trace_sample_rate < 0 or self.trace_sample_rate > 1:
+            raise ValueError("trace_sample_rate must be between 0 and 1")
+        if self.blocking_callback_threshold_secs <= 0:
+            raise ValueError("blocking_callback_threshold_secs must be greater than 0")
+        if self.unknown_field_policy not in _UNKNOWN_FIELD_POLICIES:
+            raise ValueError(
+                f"unknown_field_policy must be one of: {_UNKNOWN_FIELD_POLICIES}. "
+                f"Received: {self.unknown_field_policy}"
+            )
+        if self.missing_field_policy not in _MISSING_FIELD_POLICIES:
+            raise ValueError(
+                f"missing_field_policy must be one of: {_MISSING_FIELD_POLICIES}. "
+                f"Received: {self.missing_field_policy}"
+            )
+
+    def memory_bytes(self) -> Optional[int]:
+        """Returns the memory budget of each replica in bytes."""
+        if self.memory_mb is None:
+            return None
+        return int(self.memory_mb * 1024 * 1024)
+
+    def replica_bundle(self) -> Dict[str, float]:
+        """Returns the Ray resources required to schedule a single replica."""
+        bundle = {"CPU": self.num_cpus}
+        memory_bytes = self.memory_bytes()
+        if memory_bytes is not None:
+            bundle["memory"] = memory_bytes
+        bundle.update(self.resources)
+        return {resource: amount for resource, amount in bundle.items() if amount > 0}
+
 
 @dataclasses.dataclass
 class RuntimeOptions(Options):
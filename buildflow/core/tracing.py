@@ -0,0 +1,87 @@
+"""Opt-in OpenTelemetry tracing for BuildFlow processors.
+
+Tracing is disabled unless a processor is configured with a trace_sample_rate
+greater than 0. Spans are exported with the OTLP exporter which can be
+configured with the standard OTEL_EXPORTER_OTLP_* environment variables.
+
+When tracing is disabled the OpenTelemetry API returns non-recording spans, so
+the instrumentation in the runtime is close to free.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from opentelemetry import propagate, trace
+
+_TRACER_NAME = "buildflow"
+
+# Set once per process by configure_tracing.
+_tracing_configured = False
+
+
+def configure_tracing(sample_rate: float, service_name: str = "buildflow") -> None:
+    """Installs the global tracer provider for the current process.
+
+    Ray actors and Serve replicas each run in their own process, so this needs to
+    be called from within the actor / replica.
+    """
+    global _tracing_configured
+    if _tracing_configured or sample_rate <= 0:
+        return
+    # NOTE: we import the sdk here so it's only required when tracing is enabled.
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+        OTLPSpanExporter,
+    )
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(sample_rate)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    _tracing_configured = True
+    logging.info("tracing enabled with sample rate: %s", sample_rate)
+
+
+def get_tracer() -> trace.Tracer:
+    return trace.get_tracer(_TRACER_NAME)
+
+
+def propagation_fields() -> List[str]:
+    """Returns the keys used to propagate trace context (e.g. traceparent)."""
+    return sorted(propagate.get_global_textmap().fields)
+
+
+def inject_context() -> Dict[str, str]:
+    """Returns the current trace context to attach to an outgoing message.
+
+    The result is empty if there is no active sampled span.
+    """
+    carrier: Dict[str, str] = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Dict[str, str]) -> Optional[trace.SpanContext]:
+    """Returns the span context stored in the attributes of an incoming message."""
+    if not carrier:
+        return None
+    span_context = trace.get_current_span(propagate.extract(carrier)).get_span_context()
+    if not span_context.is_valid:
+        return None
+    return span_context
+
+
+def extract_links(carriers: Optional[Iterable[Dict[str, str]]]) -> List[trace.Link]:
+    """Returns links to the upstream spans of each message in a batch."""
+    if not carriers:
+        return []
+    links = []
+    for carrier in carriers:
+        span_context = extract_context(carrier)
+        if span_context is not None:
+            links.append(trace.Link(span_context))
+    return links
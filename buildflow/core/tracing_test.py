@@ -0,0 +1,33 @@
+import unittest
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+
+from buildflow.core import tracing
+
+
+class TracingTest(unittest.TestCase):
+    def test_inject_without_active_span(self):
+        self.assertEqual(tracing.inject_context(), {})
+
+    def test_inject_and_extract_links(self):
+        tracer = TracerProvider().get_tracer("test")
+        with tracer.start_as_current_span("producer") as span:
+            carrier = tracing.inject_context()
+
+        self.assertIn("traceparent", carrier)
+        self.assertIn("traceparent", tracing.propagation_fields())
+        links = tracing.extract_links([carrier, {}, {"traceparent": "invalid"}])
+        self.assertEqual(len(links), 1)
+        self.assertEqual(links[0].context.trace_id, span.get_span_context().trace_id)
+        self.assertEqual(links[0].context.span_id, span.get_span_context().span_id)
+        self.assertEqual(tracing.extract_links(None), [])
+
+    def test_tracer_is_non_recording_when_not_configured(self):
+        with tracing.get_tracer().start_as_current_span("span") as span:
+            self.assertFalse(span.is_recording())
+            self.assertIsInstance(span, trace.NonRecordingSpan)
+
+
+if __name__ == "__main__":
+    unittest.main()
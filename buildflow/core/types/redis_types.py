@@ -0,0 +1,6 @@
+# Redis
+
+RedisHost = str
+RedisPort = int
+RedisStreamName = str
+RedisConsumerGroup = str
@@ -16,6 +16,7 @@ from buildflow.io.aws.strategies.s3_file_change_stream_strategies import (
 )
 from buildflow.io.primitive import AWSPrimtive
 from buildflow.io.strategies.source import SourceStrategy
+from buildflow.io.utils import blob_prefetch
 from buildflow.types.aws import S3ChangeStreamEventType
 
 
@@ -31,6 +32,15 @@ class S3FileChangeStream(AWSPrimtive):
     # is setup in __post_init__ based on the bucket configuration.
     sqs_queue: SQSQueue = dataclasses.field(init=False)
 
+    # source options
+    prefetch_blobs: bool = dataclasses.field(default=False, init=False)
+    max_concurrent_prefetches: int = dataclasses.field(
+        default=blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY, init=False
+    )
+    max_prefetch_bytes: int = dataclasses.field(
+        default=blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES, init=False
+    )
+
     def __post_init__(self):
         self.sqs_queue = SQSQueue(
             queue_name=f"{self.s3_bucket.bucket_name}_queue",
@@ -38,6 +48,23 @@ class S3FileChangeStream(AWSPrimtive):
         )
         self.sqs_queue.enable_managed()
 
+    def options(
+        self,
+        # Source options
+        # Download the blobs of each pulled batch of events concurrently, before
+        # they are processed.
+        prefetch_blobs: bool = False,
+        # Max number of blobs downloaded at once.
+        max_concurrent_prefetches: int = blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY,
+        # No more blobs of a batch are prefetched once this many bytes were
+        # downloaded.
+        max_prefetch_bytes: int = blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES,
+    ) -> "S3FileChangeStream":
+        self.prefetch_blobs = prefetch_blobs
+        self.max_concurrent_prefetches = max_concurrent_prefetches
+        self.max_prefetch_bytes = max_prefetch_bytes
+        return self
+
     def primitive_id(self):
         return f"{self.s3_bucket.bucket_name}:{self.sqs_queue.queue_name}"
 
@@ -55,6 +82,9 @@ class S3FileChangeStream(AWSPrimtive):
             sqs_source=self.sqs_queue.source(credentials),
             aws_region=self.s3_bucket.aws_region,
             filter_test_events=self.filter_test_events,
+            prefetch_blobs=self.prefetch_blobs,
+            max_concurrent_prefetches=self.max_concurrent_prefetches,
+            max_prefetch_bytes=self.max_prefetch_bytes,
         )
 
     def pulumi_resources(
@@ -13,12 +13,45 @@ from buildflow.io.primitive import AWSPrimtive
 from buildflow.io.strategies.sink import SinkStrategy
 from buildflow.io.strategies.source import SourceStrategy
 
+_DEFAULT_BATCH_SIZE = 10
+_DEFAULT_MAX_WAIT_SECS = 0
+_DEFAULT_MAX_LEASE_SECONDS = 60 * 60
+
 
 @dataclasses.dataclass
 class SQSQueue(AWSPrimtive):
     queue_name: SQSQueueName
     aws_account_id: Optional[AWSAccountID] = None
     aws_region: Optional[AWSRegion] = None
+    # source options
+    batch_size: int = dataclasses.field(default=_DEFAULT_BATCH_SIZE, init=False)
+    max_wait_secs: float = dataclasses.field(default=_DEFAULT_MAX_WAIT_SECS, init=False)
+    visibility_timeout_secs: Optional[int] = dataclasses.field(default=None, init=False)
+    max_lease_seconds: Optional[int] = dataclasses.field(
+        default=_DEFAULT_MAX_LEASE_SECONDS, init=False
+    )
+
+    def options(
+        self,
+        # Source options
+        # Number of messages to pull at once. SQS returns at most 10 messages per
+        # request, so larger batches are received with concurrent requests.
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+        # How long a pull waits (long polling) to fill up a batch.
+        max_wait_secs: float = _DEFAULT_MAX_WAIT_SECS,
+        # Visibility timeout of received messages. If None the visibility timeout
+        # of the queue is used.
+        visibility_timeout_secs: Optional[int] = None,
+        # The visibility timeout of messages that are still being processed is
+        # extended for up to this many seconds, see: LeaseManager. If None the
+        # visibility timeouts are never extended.
+        max_lease_seconds: Optional[int] = _DEFAULT_MAX_LEASE_SECONDS,
+    ) -> "SQSQueue":
+        self.batch_size = batch_size
+        self.max_wait_secs = max_wait_secs
+        self.visibility_timeout_secs = visibility_timeout_secs
+        self.max_lease_seconds = max_lease_seconds
+        return self
 
     def primitive_id(self):
         queue_id_components = []
@@ -40,6 +73,10 @@ class SQSQueue(AWSPrimtive):
             queue_name=self.queue_name,
             aws_account_id=self.aws_account_id,
             aws_region=self.aws_region,
+            batch_size=self.batch_size,
+            max_wait_secs=self.max_wait_secs,
+            visibility_timeout_secs=self.visibility_timeout_secs,
+            max_lease_seconds=self.max_lease_seconds,
         )
 
     def sink(self, credentials: AWSCredentials) -> SinkStrategy:
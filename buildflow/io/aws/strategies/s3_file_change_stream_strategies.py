@@ -1,9 +1,11 @@
+import asyncio
 import json
 from typing import Any, Callable, Coroutine, Type
 
 from buildflow.core.credentials.aws_credentials import AWSCredentials
 from buildflow.io.aws.strategies.sqs_strategies import SQSSource
 from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
+from buildflow.io.utils import blob_prefetch
 from buildflow.io.utils.clients.aws_clients import AWSClients
 from buildflow.io.utils.schemas import converters
 from buildflow.types.aws import S3ChangeStreamEventType, S3FileChangeEvent
@@ -17,6 +19,9 @@ class S3FileChangeStreamSource(SourceStrategy):
         sqs_source: SQSSource,
         aws_region: str,
         filter_test_events: bool = True,
+        prefetch_blobs: bool = False,
+        max_concurrent_prefetches: int = blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY,
+        max_prefetch_bytes: int = blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES,
     ):
         super().__init__(
             credentials=credentials, strategy_id="aws-s3-filestream-source"
@@ -24,7 +29,11 @@ class S3FileChangeStreamSource(SourceStrategy):
         self.sqs_queue_source = sqs_source
         aws_clients = AWSClients(credentials=credentials, region=aws_region)
         self._s3_client = aws_clients.s3_client()
+        self._async_s3_client = aws_clients.async_s3_client()
         self._filter_test_events = filter_test_events
+        self.prefetch_blobs = prefetch_blobs
+        self.max_concurrent_prefetches = max_concurrent_prefetches
+        self.max_prefetch_bytes = max_prefetch_bytes
 
     async def pull(self) -> PullResponse:
         sqs_response = await self.sqs_queue_source.pull()
@@ -40,6 +49,7 @@ class S3FileChangeStreamSource(SourceStrategy):
                         S3FileChangeEvent(
                             bucket_name=bucket_name,
                             s3_client=self._s3_client,
+                            async_s3_client=self._async_s3_client,
                             file_path=file_path,
                             event_type=s3_event_type,
                             metadata=record,
@@ -56,12 +66,19 @@ class S3FileChangeStreamSource(SourceStrategy):
                 parsed_payloads.append(
                     S3FileChangeEvent(
                         s3_client=self._s3_client,
+                        async_s3_client=self._async_s3_client,
                         bucket_name=metadata.get("Bucket"),
                         metadata=metadata,
                         file_path=None,
                         event_type=S3ChangeStreamEventType.UNKNOWN,
                     )
                 )
+        if self.prefetch_blobs:
+            await blob_prefetch.prefetch_blobs(
+                parsed_payloads,
+                max_concurrent_prefetches=self.max_concurrent_prefetches,
+                max_prefetch_bytes=self.max_prefetch_bytes,
+            )
         return PullResponse(parsed_payloads, sqs_response.ack_info)
 
     def pull_converter(self, user_defined_type: Type) -> Callable[[Any], Any]:
@@ -75,3 +92,8 @@ class S3FileChangeStreamSource(SourceStrategy):
 
     def max_batch_size(self) -> int:
         return self.sqs_queue_source.max_batch_size()
+
+    async def teardown(self):
+        await asyncio.gather(
+            self.sqs_queue_source.teardown(), self._async_s3_client.close()
+        )
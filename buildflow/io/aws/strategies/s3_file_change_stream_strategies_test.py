@@ -1,9 +1,10 @@
 import json
 import os
 import unittest
+from unittest import mock
 
 import boto3
-from moto import mock_sqs, mock_sts
+from moto import mock_s3, mock_sqs, mock_sts
 
 from buildflow.core.credentials.aws_credentials import AWSCredentials
 from buildflow.core.options.credentials_options import CredentialsOptions
@@ -12,6 +13,7 @@ from buildflow.io.aws.strategies.s3_file_change_stream_strategies import (
     S3FileChangeStreamSource,
 )
 from buildflow.io.aws.strategies.sqs_strategies import SQSSink, SQSSource
+from buildflow.io.utils import blob_prefetch
 from buildflow.types.aws import S3ChangeStreamEventType
 
 
@@ -216,6 +218,133 @@ class S3FileChangeStreamTest(unittest.IsolatedAsyncioTestCase):
                 backlog = await s3_stream.backlog()
                 self.assertEqual(backlog, 0)
 
+    async def test_s3_file_change_event_read_blob(self):
+        with mock_sts():
+            with mock_sqs():
+                with mock_s3():
+                    self.queue_url = self._create_queue(self.queue_name, self.region)
+                    s3_client = boto3.client("s3", region_name=self.region)
+                    s3_client.create_bucket(Bucket="test-bucket")
+                    s3_client.put_object(
+                        Bucket="test-bucket", Key="new file.txt", Body=b"contents"
+                    )
+                    sink = SQSSink(
+                        credentials=self.creds,
+                        queue_name=self.queue_name,
+                        aws_region=self.region,
+                        aws_account_id=None,
+                    )
+                    contents = {
+                        "Records": [
+                            {
+                                "s3": {
+                                    "object": {"key": "new+file.txt"},
+                                    "bucket": {"name": "test-bucket"},
+                                },
+                                "eventName": "ObjectCreated:Put",
+                            },
+                        ],
+                    }
+                    await sink.push([json.dumps(contents)])
+
+                    source = SQSSource(
+                        credentials=self.creds,
+                        queue_name=self.queue_name,
+                        aws_region=self.region,
+                        aws_account_id=None,
+                    )
+                    s3_stream = S3FileChangeStreamSource(
+                        sqs_source=source,
+                        aws_region=self.region,
+                        credentials=self.creds,
+                    )
+
+                    pull_response = await s3_stream.pull()
+                    self.assertEqual(len(pull_response.payload), 1)
+
+                    event = pull_response.payload[0]
+                    self.assertEqual(await event.read_blob(), b"contents")
+                    self.assertEqual(event.blob, b"contents")
+                    await s3_stream.teardown()
+                    await sink.teardown()
+
+    async def test_s3_file_change_event_ranged_reads_and_prefetch(self):
+        with mock_sts():
+            with mock_sqs():
+                with mock_s3():
+                    self.queue_url = self._create_queue(self.queue_name, self.region)
+                    s3_client = boto3.client("s3", region_name=self.region)
+                    s3_client.create_bucket(Bucket="test-bucket")
+                    for key in ["a.txt", "b.txt"]:
+                        s3_client.put_object(
+                            Bucket="test-bucket", Key=key, Body=b"0123456789"
+                        )
+                    sink = SQSSink(
+                        credentials=self.creds,
+                        queue_name=self.queue_name,
+                        aws_region=self.region,
+                        aws_account_id=None,
+                    )
+                    contents = {
+                        "Records": [
+                            {
+                                "s3": {
+                                    "object": {"key": key},
+                                    "bucket": {"name": "test-bucket"},
+                                },
+                                "eventName": "ObjectCreated:Put",
+                            }
+                            for key in ["a.txt", "b.txt"]
+                        ]
+                        + [
+                            {
+                                "s3": {
+                                    "object": {"key": "removed.txt"},
+                                    "bucket": {"name": "test-bucket"},
+                                },
+                                "eventName": "ObjectRemoved:Delete",
+                            }
+                        ],
+                    }
+                    await sink.push([json.dumps(contents)])
+
+                    source = SQSSource(
+                        credentials=self.creds,
+                        queue_name=self.queue_name,
+                        aws_region=self.region,
+                        aws_account_id=None,
+                    )
+                    s3_stream = S3FileChangeStreamSource(
+                        sqs_source=source,
+                        aws_region=self.region,
+                        credentials=self.creds,
+                        prefetch_blobs=True,
+                        max_concurrent_prefetches=1,
+                        max_prefetch_bytes=5,
+                    )
+
+                    with mock.patch.object(
+                        blob_prefetch.logging, "exception"
+                    ) as log_exception:
+                        pull_response = await s3_stream.pull()
+                    s3_client.delete_object(Bucket="test-bucket", Key="a.txt")
+
+                    # Only the first blob fit into the prefetch budget, and the
+                    # removed object wasn't fetched.
+                    prefetched, event, removed = pull_response.payload
+                    log_exception.assert_not_called()
+                    self.assertIsNone(removed._prefetched_blob)
+                    self.assertEqual(await prefetched.read_blob(), b"0123456789")
+                    self.assertEqual(await prefetched.read_blob_range(2, 4), b"23")
+
+                    self.assertEqual(await event.read_blob_range(2, 5), b"234")
+                    self.assertEqual(await event.read_blob_range(8, 20), b"89")
+                    self.assertEqual(await event.read_blob_range(20, 30), b"")
+                    chunks = [chunk async for chunk in event.stream_blob(4)]
+                    self.assertEqual(b"".join(chunks), b"0123456789")
+                    await s3_stream.teardown()
+                    await sink.teardown()
+
 
 if __name__ == "__main__":
     unittest.main()
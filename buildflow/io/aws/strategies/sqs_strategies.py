@@ -1,16 +1,29 @@
 import asyncio
 import dataclasses
-from typing import Any, Callable, Iterable, List, Optional, Type
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
 
+from buildflow.core import tracing
 from buildflow.core.credentials.aws_credentials import AWSCredentials
 from buildflow.core.types.aws_types import AWSAccountID, AWSRegion, SQSQueueName
 from buildflow.core.utils import uuid
 from buildflow.io.strategies.sink import Batch, SinkStrategy
 from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
 from buildflow.io.utils.clients.aws_clients import AWSClients
+from buildflow.io.utils.leases import LeaseManager
 from buildflow.io.utils.schemas import converters
 
+# Max number of messages in a single SQS batch request.
 _MAX_BATCH_SIZE = 10
+# Max number of seconds a receive request can long poll for.
+_MAX_WAIT_TIME_SECS = 20
+# Bounds SQS accepts when changing the visibility timeout of a message.
+_MIN_VISIBILITY_TIMEOUT_SECS = 10
+_MAX_VISIBILITY_TIMEOUT_SECS = 12 * 60 * 60
+# Connections for requests other than receives (sends, deletes, etc.).
+_MAX_POOL_CONNECTIONS = 100
 
 
 @dataclasses.dataclass(frozen=True)
@@ -49,113 +62,251 @@ class SQSSink(SinkStrategy):
         self.aws_account_id = aws_account_id
         self.aws_region = aws_region
         aws_clients = AWSClients(credentials=credentials, region=self.aws_region)
-        self.sqs_client = aws_clients.sqs_client()
+        # The blocking client is only used to look up the queue during setup.
         self.queue_url = _get_queue_url(
-            self.sqs_client, self.queue_name, self.aws_account_id
+            aws_clients.sqs_client(), self.queue_name, self.aws_account_id
+        )
+        self.sqs_client = aws_clients.async_sqs_client(
+            max_pool_connections=_MAX_POOL_CONNECTIONS
         )
 
-    def _send_messages(self, messages: List[str]):
+    async def _send_messages(self, messages: List[str], trace_context: Dict[str, str]):
+        message_attributes = {
+            key: {"DataType": "String", "StringValue": value}
+            for key, value in trace_context.items()
+        }
         to_send = []
         for message in messages:
-            to_send.append({"Id": uuid(80), "MessageBody": message})
-        response = self.sqs_client.send_message_batch(
+            entry = {"Id": uuid(80), "MessageBody": message}
+            if message_attributes:
+                entry["MessageAttributes"] = message_attributes
+            to_send.append(entry)
+        sqs_client = await self.sqs_client.get()
+        response = await sqs_client.send_message_batch(
             QueueUrl=self.queue_url, Entries=to_send
         )
-        if "Failed" in response:
+        if response.get("Failed"):
             raise ValueError(f"failed to write messages to SQS: {response['Failed']}")
 
     async def push(self, batch: Batch):
+        trace_context = tracing.inject_context()
         coros = []
-        loop = asyncio.get_event_loop()
         for i in range(0, len(batch), _MAX_BATCH_SIZE):
             batch_to_write = batch[i : i + _MAX_BATCH_SIZE]
-            coros.append(
-                loop.run_in_executor(None, self._send_messages, batch_to_write)
-            )
+            coros.append(self._send_messages(batch_to_write, trace_context))
 
         return await asyncio.gather(*coros)
 
     def push_converter(self, user_defined_type: Optional[Type]) -> Callable[[Any], str]:
         return converters.str_push_converter(user_defined_type)
 
+    async def teardown(self):
+        await self.sqs_client.close()
+
 
 class SQSSource(SourceStrategy):
+    """Pulls messages from a SQS queue.
+
+    SQS returns at most 10 messages per receive request, so each pull issues up
+    to ceil(batch_size / 10) receives concurrently to assemble larger batches.
+    Receives are repeated (long polling for the remaining time) until batch_size
+    messages were received, the queue returned no messages, or max_wait_secs
+    passed.
+
+    The visibility timeout of pulled messages is extended until they are acked,
+    see: LeaseManager.
+    """
+
     def __init__(
         self,
         credentials: AWSCredentials,
         queue_name: SQSQueueName,
         aws_account_id: Optional[AWSAccountID],
         aws_region: Optional[AWSRegion],
+        batch_size: int = _MAX_BATCH_SIZE,
+        max_wait_secs: float = 0,
+        visibility_timeout_secs: Optional[int] = None,
+        max_lease_seconds: Optional[int] = 3600,
     ):
         super().__init__(credentials, "aws-sqs-source")
         self.queue_name = queue_name
         self.aws_account_id = aws_account_id
         self.aws_region = aws_region
+        self.batch_size = batch_size
+        self.max_wait_secs = max_wait_secs
+        self.max_concurrent_receives = math.ceil(batch_size / _MAX_BATCH_SIZE)
         aws_clients = AWSClients(credentials=credentials, region=self.aws_region)
-        self.sqs_client = aws_clients.sqs_client()
+        # The blocking client is only used to look up the queue during setup.
+        blocking_sqs_client = aws_clients.sqs_client()
         self.queue_url = _get_queue_url(
-            self.sqs_client, self.queue_name, self.aws_account_id
+            blocking_sqs_client, self.queue_name, self.aws_account_id
         )
+        # Receives long poll, so they get their own connections to not hold up
+        # acks.
+        self.sqs_client = aws_clients.async_sqs_client(
+            max_pool_connections=self.max_concurrent_receives + _MAX_POOL_CONNECTIONS
+        )
+        # If None the visibility timeout configured on the queue is used.
+        self.visibility_timeout_secs = visibility_timeout_secs
+        self._trace_fields = tracing.propagation_fields()
+        self._lease_manager: Optional[LeaseManager] = None
+        if max_lease_seconds is not None:
+            if visibility_timeout_secs is None:
+                queue_atts = blocking_sqs_client.get_queue_attributes(
+                    QueueUrl=self.queue_url, AttributeNames=["VisibilityTimeout"]
+                )
+                visibility_timeout_secs = int(
+                    queue_atts["Attributes"]["VisibilityTimeout"]
+                )
+            self._lease_manager = LeaseManager(
+                self._extend_visibility_timeout,
+                lease_seconds=visibility_timeout_secs,
+                max_lease_seconds=max_lease_seconds,
+                min_extension_seconds=_MIN_VISIBILITY_TIMEOUT_SECS,
+                max_extension_seconds=_MAX_VISIBILITY_TIMEOUT_SECS,
+                max_ids_per_request=_MAX_BATCH_SIZE,
+            )
 
-    def _pull(self) -> PullResponse:
-        response = self.sqs_client.receive_message(
+    async def _receive_messages(self, max_messages: int, wait_secs: int) -> List[Dict]:
+        kwargs = {}
+        if self.visibility_timeout_secs is not None:
+            kwargs["VisibilityTimeout"] = self.visibility_timeout_secs
+        sqs_client = await self.sqs_client.get()
+        response = await sqs_client.receive_message(
             QueueUrl=self.queue_url,
             AttributeNames=["All"],
-            MaxNumberOfMessages=_MAX_BATCH_SIZE,
+            MessageAttributeNames=self._trace_fields,
+            MaxNumberOfMessages=max_messages,
+            WaitTimeSeconds=wait_secs,
+            **kwargs,
         )
+        return response.get("Messages", [])
+
+    def _to_pull_response(self, messages: List[Dict]) -> PullResponse:
         payload = []
         message_infos = []
-        for message in response.get("Messages", []):
+        trace_contexts = []
+        for message in messages:
+            message_attributes = message.get("MessageAttributes", {})
+            trace_contexts.append(
+                {
+                    key: attribute["StringValue"]
+                    for key, attribute in message_attributes.items()
+                    if "StringValue" in attribute
+                }
+            )
             message_info = _MessageInfo(
                 message_id=message["MessageId"], receipt_handle=message["ReceiptHandle"]
             )
             message_infos.append(message_info)
             payload.append(message["Body"])
         return PullResponse(
-            payload=payload, ack_info=_SQSAckInfo(message_infos=message_infos)
+            payload=payload,
+            ack_info=_SQSAckInfo(message_infos=message_infos),
+            trace_contexts=trace_contexts,
         )
 
     async def pull(self) -> PullResponse:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._pull)
+        deadline = time.monotonic() + self.max_wait_secs
+        messages = []
+        while True:
+            remaining = self.batch_size - len(messages)
+            wait_secs = min(
+                max(int(deadline - time.monotonic()), 0), _MAX_WAIT_TIME_SECS
+            )
+            receives = [
+                self._receive_messages(min(_MAX_BATCH_SIZE, remaining - i), wait_secs)
+                for i in range(0, remaining, _MAX_BATCH_SIZE)
+            ]
+            results = await asyncio.gather(*receives, return_exceptions=True)
+            received = []
+            errors = []
+            for result in results:
+                if isinstance(result, BaseException):
+                    errors.append(result)
+                else:
+                    received.extend(result)
+            messages.extend(received)
+            if errors:
+                if not messages:
+                    raise errors[0]
+                # Return what we have, the messages would otherwise only be
+                # redelivered after their visibility timeout.
+                logging.error("sqs receive failed with: %s", errors[0])
+                break
+            if (
+                not received
+                or len(messages) >= self.batch_size
+                or time.monotonic() >= deadline
+            ):
+                break
+        pull_response = self._to_pull_response(messages)
+        if self._lease_manager is not None and messages:
+            self._lease_manager.add(pull_response.ack_info.message_infos)
+            self._lease_manager.start()
+        return pull_response
+
+    async def _extend_visibility_timeout(
+        self, message_infos: List[_MessageInfo], visibility_timeout_secs: int
+    ):
+        entries = [
+            {
+                "Id": info.message_id,
+                "ReceiptHandle": info.receipt_handle,
+                "VisibilityTimeout": visibility_timeout_secs,
+            }
+            for info in message_infos
+        ]
+        sqs_client = await self.sqs_client.get()
+        response = await sqs_client.change_message_visibility_batch(
+            QueueUrl=self.queue_url, Entries=entries
+        )
+        if response.get("Failed"):
+            raise ValueError(f"message visibility change failed: {response['Failed']}")
 
-    def _delete_messages(self, batch_to_delete: Iterable[_MessageInfo]):
+    async def _delete_messages(self, batch_to_delete: Iterable[_MessageInfo]):
         to_delete = []
         for info in batch_to_delete:
             to_delete.append(
                 {"Id": info.message_id, "ReceiptHandle": info.receipt_handle}
             )
-        response = self.sqs_client.delete_message_batch(
+        sqs_client = await self.sqs_client.get()
+        response = await sqs_client.delete_message_batch(
             QueueUrl=self.queue_url, Entries=to_delete
         )
-        if "Failed" in response:
+        if response.get("Failed"):
             raise ValueError(f"message delete failed: {response['Failed']}")
 
     async def ack(self, to_ack: _SQSAckInfo, success: bool):
-        if success:
-            coros = []
-            loop = asyncio.get_event_loop()
-            for i in range(0, len(to_ack.message_infos), _MAX_BATCH_SIZE):
-                batch_to_delete = to_ack.message_infos[i : i + _MAX_BATCH_SIZE]
-                coros.append(
-                    loop.run_in_executor(None, self._delete_messages, batch_to_delete)
-                )
-            await asyncio.gather(*coros)
+        if self._lease_manager is not None:
+            self._lease_manager.remove(to_ack.message_infos)
+        coros = []
+        for i in range(0, len(to_ack.message_infos), _MAX_BATCH_SIZE):
+            batch = to_ack.message_infos[i : i + _MAX_BATCH_SIZE]
+            if success:
+                coros.append(self._delete_messages(batch))
+            else:
+                # A visibility timeout of 0 makes the messages visible again right
+                # away, instead of after the (possibly extended) timeout.
+                coros.append(self._extend_visibility_timeout(batch, 0))
+        await asyncio.gather(*coros)
 
-    def _get_backlog(self):
-        queue_atts = self.sqs_client.get_queue_attributes(
+    async def backlog(self) -> int:
+        sqs_client = await self.sqs_client.get()
+        queue_atts = await sqs_client.get_queue_attributes(
             QueueUrl=self.queue_url, AttributeNames=["ApproximateNumberOfMessages"]
         )
         if "ApproximateNumberOfMessages" in queue_atts["Attributes"]:
             return int(queue_atts["Attributes"]["ApproximateNumberOfMessages"])
         return 0
 
-    async def backlog(self) -> int:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self._get_backlog)
-
     def max_batch_size(self) -> int:
-        return _MAX_BATCH_SIZE
+        return self.batch_size
+
+    async def teardown(self):
+        if self._lease_manager is not None:
+            await self._lease_manager.stop()
+        await self.sqs_client.close()
 
     def pull_converter(self, type_: Type) -> Callable[[str], Any]:
         return converters.str_pull_converter(type_)
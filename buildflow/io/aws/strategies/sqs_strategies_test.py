@@ -4,6 +4,7 @@ import unittest
 
 import boto3
 from moto import mock_sqs, mock_sts
+from opentelemetry.sdk.trace import TracerProvider
 
 from buildflow.core.credentials.aws_credentials import AWSCredentials
 from buildflow.core.options.credentials_options import CredentialsOptions
@@ -90,6 +91,149 @@ class SqsStrategiesTest(unittest.IsolatedAsyncioTestCase):
                 backlog = await source.backlog()
                 self.assertEqual(backlog, 0)
 
+    @mock_sqs
+    @mock_sts
+    async def test_sqs_propagates_trace_context(self):
+        with mock_sts():
+            with mock_sqs():
+                self.queue_url = self._create_queue(self.queue_name, self.region)
+                sink = SQSSink(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+                tracer = TracerProvider().get_tracer("test")
+                with tracer.start_as_current_span("push") as span:
+                    await sink.push([json.dumps({"a": 1})])
+                # Messages pushed without an active span have no trace context.
+                await sink.push([json.dumps({"a": 2})])
+
+                source = SQSSource(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+                pull_response = await source.pull()
+                self.assertEqual(len(pull_response.payload), 2)
+
+                contexts = {
+                    payload: trace_context
+                    for payload, trace_context in zip(
+                        pull_response.payload, pull_response.trace_contexts
+                    )
+                }
+                trace_id = format(span.get_span_context().trace_id, "032x")
+                self.assertIn(trace_id, contexts[json.dumps({"a": 1})]["traceparent"])
+                self.assertEqual(contexts[json.dumps({"a": 2})], {})
+
+    @mock_sqs
+    @mock_sts
+    async def test_sqs_source_pull_concurrent_receives(self):
+        with mock_sts():
+            with mock_sqs():
+                self.queue_url = self._create_queue(self.queue_name, self.region)
+                sink = SQSSink(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+                await sink.push([json.dumps({"a": i}) for i in range(30)])
+
+                source = SQSSource(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                    batch_size=25,
+                    max_wait_secs=1,
+                )
+                self.assertEqual(source.max_batch_size(), 25)
+
+                pull_response1 = await source.pull()
+                self.assertEqual(len(pull_response1.payload), 25)
+                pull_response2 = await source.pull()
+                self.assertEqual(len(pull_response2.payload), 5)
+                self.assertEqual(
+                    {json.loads(p)["a"] for p in pull_response1.payload}
+                    | {json.loads(p)["a"] for p in pull_response2.payload},
+                    set(range(30)),
+                )
+
+                await source.ack(pull_response1.ack_info, True)
+                await source.ack(pull_response2.ack_info, True)
+                backlog = await source.backlog()
+                self.assertEqual(backlog, 0)
+                await source.teardown()
+
+    @mock_sqs
+    @mock_sts
+    async def test_sqs_source_extends_visibility_timeout(self):
+        with mock_sts():
+            with mock_sqs():
+                self.sqs_client.create_queue(
+                    QueueName=self.queue_name,
+                    Attributes={"VisibilityTimeout": "45"},
+                )
+                sink = SQSSink(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+                await sink.push([json.dumps({"a": 1})] * 3)
+
+                source = SQSSource(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+                self.assertEqual(source._lease_manager.lease_seconds, 45)
+
+                pull_response = await source.pull()
+                self.assertEqual(source._lease_manager.num_leases, 3)
+                await source._extend_visibility_timeout(
+                    pull_response.ack_info.message_infos, 60
+                )
+
+                await source.ack(pull_response.ack_info, True)
+                self.assertEqual(source._lease_manager.num_leases, 0)
+                await source.teardown()
+
+    async def test_sqs_source_nack_makes_messages_visible(self):
+        with mock_sts():
+            with mock_sqs():
+                self.sqs_client.create_queue(
+                    QueueName=self.queue_name,
+                    Attributes={"VisibilityTimeout": "45"},
+                )
+                sink = SQSSink(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+                await sink.push([json.dumps({"a": 1})] * 12)
+
+                source = SQSSource(
+                    credentials=self.creds,
+                    queue_name=self.queue_name,
+                    aws_region=self.region,
+                    aws_account_id=None,
+                )
+
+                pull_response1 = await source.pull()
+                self.assertEqual(len(pull_response1.payload), 10)
+                await source.ack(pull_response1.ack_info, False)
+                self.assertEqual(source._lease_manager.num_leases, 0)
+
+                backlog = await source.backlog()
+                self.assertEqual(backlog, 12)
+                await source.teardown()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,10 @@
 import asyncio
 import logging
-from typing import Any, Callable, Dict, Iterable, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
 
 import clickhouse_connect
 import pandas as pd
+import pyarrow as pa
 
 from buildflow.core.credentials import EmptyCredentials
 from buildflow.core.types.clickhouse_types import (
@@ -73,11 +74,18 @@ class ClickhouseSink(SinkStrategy):
     ) -> Callable[[Any], Dict[str, Any]]:
         return converters.json_push_converter(user_defined_type)
 
-    async def push(self, batch: Iterable[Dict[str, Any]]):
+    def arrow_push_converter(
+        self, user_defined_type: Type
+    ) -> Optional[Callable[[List[Any]], pa.RecordBatch]]:
+        return converters.arrow_push_converter(user_defined_type)
+
+    async def push(self, batch: Union[pa.RecordBatch, Iterable[Dict[str, Any]]]):
         if self.client is None:
             await self.connect()
-        df = pd.DataFrame(batch)
         try:
-            self.client.insert_df(self.table, df)
+            if isinstance(batch, pa.RecordBatch):
+                self.client.insert_arrow(self.table, pa.Table.from_batches([batch]))
+            else:
+                self.client.insert_df(self.table, pd.DataFrame(batch))
         except clickhouse_connect.driver.exceptions.DataError:
             logging.exception("failed to connect to clickhouse database")
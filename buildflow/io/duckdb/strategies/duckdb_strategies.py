@@ -1,9 +1,10 @@
 import asyncio
 import logging
-from typing import Any, Callable, Dict, Iterable, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
 
 import duckdb
 import pandas as pd
+import pyarrow as pa
 
 from buildflow.core.credentials import EmptyCredentials
 from buildflow.core.types.duckdb_types import DuckDBDatabase, DuckDBTableID
@@ -30,14 +31,26 @@ class DuckDBSink(SinkStrategy):
     ) -> Callable[[Any], Dict[str, Any]]:
         return converters.json_push_converter(user_defined_type)
 
-    async def push(self, batch: Iterable[Dict[str, Any]]):
-        df = pd.DataFrame(batch)
+    def arrow_push_converter(
+        self, user_defined_type: Type
+    ) -> Optional[Callable[[List[Any]], pa.RecordBatch]]:
+        return converters.arrow_push_converter(user_defined_type)
+
+    async def push(self, batch: Union[pa.RecordBatch, Iterable[Dict[str, Any]]]):
+        if isinstance(batch, pa.RecordBatch):
+            # DuckDB scans Arrow tables in place.
+            df = pa.Table.from_batches([batch])
+        else:
+            df = pd.DataFrame(batch)
         connect_tries = 0
         while connect_tries < _MAX_CONNECT_TRIES:
             try:
                 with duckdb.connect(self.database, read_only=False) as con:
                     try:
-                        con.append(self.table, df)
+                        if isinstance(df, pa.Table):
+                            con.execute(f'INSERT INTO "{self.table}" SELECT * FROM df')
+                        else:
+                            con.append(self.table, df)
                     except duckdb.CatalogException:
                         con.execute(f'CREATE TABLE "{self.table}" AS SELECT * FROM df')
                     break
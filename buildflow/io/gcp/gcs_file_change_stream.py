@@ -15,6 +15,7 @@ from buildflow.io.gcp.strategies.gcs_file_change_stream_strategies import (
 )
 from buildflow.io.primitive import GCPPrimtive
 from buildflow.io.strategies.source import SourceStrategy
+from buildflow.io.utils import blob_prefetch
 from buildflow.types.gcp import GCSChangeStreamEventType
 
 
@@ -29,6 +30,15 @@ class GCSFileChangeStream(GCPPrimtive):
     pubsub_subscription: GCPPubSubSubscription = dataclasses.field(init=False)
     pubsub_subscription: GCPPubSubTopic = dataclasses.field(init=False)
 
+    # source options
+    prefetch_blobs: bool = dataclasses.field(default=False, init=False)
+    max_concurrent_prefetches: int = dataclasses.field(
+        default=blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY, init=False
+    )
+    max_prefetch_bytes: int = dataclasses.field(
+        default=blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES, init=False
+    )
+
     def __post_init__(self):
         self.pubsub_topic = GCPPubSubTopic(
             self.gcs_bucket.project_id,
@@ -41,6 +51,23 @@ class GCSFileChangeStream(GCPPrimtive):
         ).options(topic=self.pubsub_topic, include_attributes=True)
         self.pubsub_subscription.enable_managed()
 
+    def options(
+        self,
+        # Source options
+        # Download the blobs of each pulled batch of events concurrently, before
+        # they are processed.
+        prefetch_blobs: bool = False,
+        # Max number of blobs downloaded at once.
+        max_concurrent_prefetches: int = blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY,
+        # No more blobs of a batch are prefetched once this many bytes were
+        # downloaded.
+        max_prefetch_bytes: int = blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES,
+    ) -> "GCSFileChangeStream":
+        self.prefetch_blobs = prefetch_blobs
+        self.max_concurrent_prefetches = max_concurrent_prefetches
+        self.max_prefetch_bytes = max_prefetch_bytes
+        return self
+
     @classmethod
     def from_gcp_options(
         cls,
@@ -58,6 +85,9 @@ class GCSFileChangeStream(GCPPrimtive):
             credentials=credentials,
             project_id=self.gcs_bucket.project_id,
             pubsub_source=self.pubsub_subscription.source(credentials=credentials),
+            prefetch_blobs=self.prefetch_blobs,
+            max_concurrent_prefetches=self.max_concurrent_prefetches,
+            max_prefetch_bytes=self.max_prefetch_bytes,
         )
 
     def primitive_id(self):
@@ -10,7 +10,10 @@ from buildflow.core.credentials.gcp_credentials import GCPCredentials
 from buildflow.core.types.gcp_types import GCPProjectID, PubSubSubscriptionName
 from buildflow.core.types.portable_types import SubscriptionName
 from buildflow.io.gcp.pubsub_topic import GCPPubSubTopic
-from buildflow.io.gcp.strategies.pubsub_strategies import GCPPubSubSubscriptionSource
+from buildflow.io.gcp.strategies.pubsub_strategies import (
+    GCPPubSubStreamingSubscriptionSource,
+    GCPPubSubSubscriptionSource,
+)
 from buildflow.io.primitive import GCPPrimtive
 
 _DEFAULT_ACK_DEADLINE_SECONDS = 10 * 60
@@ -18,6 +21,10 @@ _DEFAULT_MESSAGE_RETENTION_DURATION = "1200s"
 _DEFAULT_BATCH_SIZE = 1_000
 _DEFAULT_INCLUDE_ATTRIBUTES = False
 _DEFAULT_ENABLE_EXACTLY_ONCE_DELIVERY = False
+_DEFAULT_STREAMING_PULL = False
+_DEFAULT_MAX_OUTSTANDING_MESSAGES = 1_000
+_DEFAULT_MAX_OUTSTANDING_BYTES = 100 * 1024 * 1024
+_DEFAULT_MAX_LEASE_SECONDS = 60 * 60
 
 
 # NOTE: A user should use this in the case where they want to connect to an existing
@@ -31,6 +38,18 @@ class GCPPubSubSubscription(GCPPrimtive):
     include_attributes: bool = dataclasses.field(
         default=_DEFAULT_INCLUDE_ATTRIBUTES, init=False
     )
+    streaming_pull: bool = dataclasses.field(
+        default=_DEFAULT_STREAMING_PULL, init=False
+    )
+    max_outstanding_messages: int = dataclasses.field(
+        default=_DEFAULT_MAX_OUTSTANDING_MESSAGES, init=False
+    )
+    max_outstanding_bytes: int = dataclasses.field(
+        default=_DEFAULT_MAX_OUTSTANDING_BYTES, init=False
+    )
+    max_lease_seconds: Optional[int] = dataclasses.field(
+        default=_DEFAULT_MAX_LEASE_SECONDS, init=False
+    )
     # pulumi options
     ack_deadline_seconds: bool = dataclasses.field(
         default=_DEFAULT_ACK_DEADLINE_SECONDS, init=False
@@ -53,6 +72,16 @@ class GCPPubSubSubscription(GCPPrimtive):
         # Source options
         batch_size: int = _DEFAULT_BATCH_SIZE,
         include_attributes: bool = _DEFAULT_INCLUDE_ATTRIBUTES,
+        # If true messages are pulled over a stream that is kept open by each
+        # replica, see: GCPPubSubStreamingSubscriptionSource.
+        streaming_pull: bool = _DEFAULT_STREAMING_PULL,
+        # Flow control for streaming pulls.
+        max_outstanding_messages: int = _DEFAULT_MAX_OUTSTANDING_MESSAGES,
+        max_outstanding_bytes: int = _DEFAULT_MAX_OUTSTANDING_BYTES,
+        # The ack deadline of messages that are still being processed is extended
+        # for up to this many seconds, see: LeaseManager. If None the ack
+        # deadlines are never extended.
+        max_lease_seconds: Optional[int] = _DEFAULT_MAX_LEASE_SECONDS,
     ) -> "GCPPubSubSubscription":
         self.ack_deadline_seconds = ack_deadline_seconds
         self.message_retention_duration = message_retention_duration
@@ -60,6 +89,10 @@ class GCPPubSubSubscription(GCPPrimtive):
         self.batch_size = batch_size
         self.include_attributes = include_attributes
         self.enable_exactly_once_delivery = enable_exactly_once_delivery
+        self.streaming_pull = streaming_pull
+        self.max_outstanding_messages = max_outstanding_messages
+        self.max_outstanding_bytes = max_outstanding_bytes
+        self.max_lease_seconds = max_lease_seconds
         return self
 
     def primitive_id(self):
@@ -89,12 +122,26 @@ class GCPPubSubSubscription(GCPPrimtive):
         )
 
     def source(self, credentials: GCPCredentials) -> GCPPubSubSubscriptionSource:
+        if self.streaming_pull:
+            return GCPPubSubStreamingSubscriptionSource(
+                credentials=credentials,
+                project_id=self.project_id,
+                subscription_name=self.subscription_name,
+                batch_size=self.batch_size,
+                include_attributes=self.include_attributes,
+                ack_deadline_seconds=self.ack_deadline_seconds,
+                max_lease_seconds=self.max_lease_seconds,
+                max_outstanding_messages=self.max_outstanding_messages,
+                max_outstanding_bytes=self.max_outstanding_bytes,
+            )
         return GCPPubSubSubscriptionSource(
             credentials=credentials,
             project_id=self.project_id,
             subscription_name=self.subscription_name,
             batch_size=self.batch_size,
             include_attributes=self.include_attributes,
+            ack_deadline_seconds=self.ack_deadline_seconds,
+            max_lease_seconds=self.max_lease_seconds,
         )
 
     def pulumi_resources(
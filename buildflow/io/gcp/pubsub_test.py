@@ -1,10 +1,22 @@
+import asyncio
 import json
 import unittest
 from dataclasses import asdict, dataclass
 from unittest import mock
 
+from google.pubsub_v1.types import (
+    PubsubMessage,
+    PullResponse,
+    ReceivedMessage,
+    StreamingPullResponse,
+    Subscription,
+)
+
 from buildflow.io.gcp.pubsub_subscription import GCPPubSubSubscription
 from buildflow.io.gcp.pubsub_topic import GCPPubSubTopic
+from buildflow.io.gcp.strategies.pubsub_strategies import (
+    GCPPubSubStreamingSubscriptionSource,
+)
 
 
 # TODO: Add tests for PulumiResources. Can reference bigquery_test.py for an example.
@@ -64,9 +76,8 @@ class GCPPubsubTest(unittest.TestCase):
         pubsub_sink = pubsub_topic.sink(mock.MagicMock())
 
         input_data = Test(a=1)
-        bytes_data = json.dumps(asdict(input_data)).encode("utf-8")
         converter = pubsub_sink.push_converter(type(input_data))
-        self.assertEqual(bytes_data, converter(input_data))
+        self.assertEqual(asdict(input_data), json.loads(converter(input_data)))
 
     def test_gcp_pubsub_push_converter_none(self):
         pubsub_topic = GCPPubSubTopic(project_id="project", topic_name="pubsub-topic")
@@ -76,5 +87,235 @@ class GCPPubsubTest(unittest.TestCase):
         self.assertEqual(input_data, converter(input_data))
 
 
+class GCPPubsubLeaseTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        pubsub_subscription = GCPPubSubSubscription(
+            project_id="project",
+            subscription_name="pubsub-sub",
+        )
+        self.source = pubsub_subscription.source(mock.MagicMock())
+        self.client = mock.MagicMock()
+        self.client.pull = mock.AsyncMock(
+            return_value=PullResponse(
+                received_messages=[
+                    ReceivedMessage(ack_id="1", message=PubsubMessage(data=b"1")),
+                    ReceivedMessage(ack_id="2", message=PubsubMessage(data=b"2")),
+                ]
+            )
+        )
+        self.client.acknowledge = mock.AsyncMock()
+        self.client.modify_ack_deadline = mock.AsyncMock()
+        self.client.get_subscription = mock.AsyncMock(
+            return_value=Subscription(ack_deadline_seconds=20)
+        )
+        self.source.subscriber_client = self.client
+
+    async def asyncTearDown(self):
+        await self.source.teardown()
+
+    async def test_pulled_messages_are_leased_until_acked(self):
+        response = await self.source.pull()
+        self.assertEqual(self.source._lease_manager.num_leases, 2)
+
+        await self.source.ack(response.ack_info, True)
+        self.assertEqual(self.source._lease_manager.num_leases, 0)
+
+    async def test_leased_with_subscription_ack_deadline(self):
+        await self.source.pull()
+        await self.source.pull()
+
+        # The subscription's deadline is used instead of the configured 600s.
+        self.assertEqual(self.source._lease_manager.lease_seconds, 20)
+        self.client.get_subscription.assert_awaited_once_with(
+            subscription="projects/project/subscriptions/pubsub-sub"
+        )
+
+    async def test_leased_with_min_ack_deadline_if_unknown(self):
+        self.client.get_subscription.side_effect = Exception("permission denied")
+
+        await self.source.pull()
+
+        self.assertEqual(self.source._lease_manager.lease_seconds, 10)
+        self.assertEqual(self.source._lease_manager.num_leases, 2)
+
+    async def test_extend_ack_deadlines(self):
+        await self.source._extend_ack_deadlines(["1", "2"], 30)
+
+        self.client.modify_ack_deadline.assert_awaited_once_with(
+            subscription="projects/project/subscriptions/pubsub-sub",
+            ack_ids=["1", "2"],
+            ack_deadline_seconds=30,
+        )
+
+    async def test_leases_disabled(self):
+        self.source = (
+            GCPPubSubSubscription(project_id="project", subscription_name="pubsub-sub")
+            .options(max_lease_seconds=None)
+            .source(mock.MagicMock())
+        )
+        self.source.subscriber_client = self.client
+
+        await self.source.pull()
+
+        self.assertIsNone(self.source._lease_manager)
+
+
+class FakeStreamingSubscriberClient:
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        self.acknowledge = mock.AsyncMock()
+        self.modify_ack_deadline = mock.AsyncMock()
+
+    async def streaming_pull(self, requests):
+        async def consume_requests():
+            async for request in requests:
+                self.requests.append(request)
+
+        self.consume_task = asyncio.create_task(consume_requests())
+
+        async def responses():
+            for response in self.responses:
+                yield response
+            # Keep the stream open.
+            await asyncio.Event().wait()
+
+        return responses()
+
+
+class DroppingStreamingSubscriberClient(FakeStreamingSubscriberClient):
+    """Doesn't consume requests and drops the stream once `drop` is set."""
+
+    def __init__(self, responses):
+        super().__init__(responses)
+        self.drop = asyncio.Event()
+
+    async def streaming_pull(self, requests):
+        async def responses():
+            for response in self.responses:
+                yield response
+            await self.drop.wait()
+            raise ConnectionError("stream dropped")
+
+        return responses()
+
+
+def received_messages(*ack_ids: str) -> StreamingPullResponse:
+    return StreamingPullResponse(
+        received_messages=[
+            ReceivedMessage(ack_id=ack_id, message=PubsubMessage(data=ack_id.encode()))
+            for ack_id in ack_ids
+        ]
+    )
+
+
+class GCPPubsubStreamingPullTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        pubsub_subscription = GCPPubSubSubscription(
+            project_id="project",
+            subscription_name="pubsub-sub",
+        ).options(
+            batch_size=2,
+            streaming_pull=True,
+            max_outstanding_messages=10,
+            max_outstanding_bytes=1024,
+        )
+        self.source = pubsub_subscription.source(mock.MagicMock())
+        self.client = FakeStreamingSubscriberClient(
+            [received_messages("1", "2", "3"), received_messages("4")]
+        )
+        self.source.subscriber_client = self.client
+
+    async def asyncTearDown(self):
+        await self.source.teardown()
+
+    async def test_pull_from_buffer(self):
+        self.assertIsInstance(self.source, GCPPubSubStreamingSubscriptionSource)
+
+        first = await self.source.pull()
+        second = await self.source.pull()
+        third = await self.source.pull()
+
+        self.assertEqual(first.payload, [b"1", b"2"])
+        self.assertEqual(second.payload, [b"3", b"4"])
+        self.assertEqual(third.payload, [])
+        initial_request = self.client.requests[0]
+        self.assertEqual(
+            initial_request.subscription, "projects/project/subscriptions/pubsub-sub"
+        )
+        self.assertEqual(initial_request.max_outstanding_messages, 10)
+        self.assertEqual(initial_request.max_outstanding_bytes, 1024)
+
+    async def test_ack_over_stream(self):
+        first = await self.source.pull()
+        second = await self.source.pull()
+
+        await self.source.ack(first.ack_info, True)
+        await self.source.ack(second.ack_info, False)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(list(self.client.requests[1].ack_ids), ["1", "2"])
+        self.assertEqual(
+            list(self.client.requests[2].modify_deadline_ack_ids), ["3", "4"]
+        )
+        self.assertEqual(list(self.client.requests[2].modify_deadline_seconds), [0, 0])
+        self.client.acknowledge.assert_not_called()
+
+    async def test_extend_ack_deadlines_over_stream(self):
+        await self.source.pull()
+        # Buffered messages are leased as well.
+        self.assertEqual(self.source._lease_manager.num_leases, 4)
+
+        await self.source._extend_ack_deadlines(["1", "2"], 30)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(
+            list(self.client.requests[1].modify_deadline_ack_ids), ["1", "2"]
+        )
+        self.assertEqual(
+            list(self.client.requests[1].modify_deadline_seconds), [30, 30]
+        )
+        self.client.modify_ack_deadline.assert_not_called()
+
+    async def test_teardown_nacks_buffered_messages(self):
+        await self.source.pull()
+        # Wait for the second response to be buffered.
+        await asyncio.sleep(0.1)
+
+        await self.source.teardown()
+
+        self.client.modify_ack_deadline.assert_awaited_once_with(
+            subscription="projects/project/subscriptions/pubsub-sub",
+            ack_ids=["3", "4"],
+            ack_deadline_seconds=0,
+        )
+
+    async def test_queued_requests_replayed_when_stream_drops(self):
+        self.client = DroppingStreamingSubscriberClient(
+            [received_messages("1", "2", "3", "4")]
+        )
+        self.source.subscriber_client = self.client
+        first = await self.source.pull()
+        second = await self.source.pull()
+
+        await self.source.ack(first.ack_info, False)
+        await self.source._extend_ack_deadlines(second.ack_info.ack_ids, 30)
+        self.client.drop.set()
+        await asyncio.sleep(0.1)
+
+        self.client.modify_ack_deadline.assert_any_await(
+            subscription="projects/project/subscriptions/pubsub-sub",
+            ack_ids=["1", "2"],
+            ack_deadline_seconds=0,
+        )
+        self.client.modify_ack_deadline.assert_any_await(
+            subscription="projects/project/subscriptions/pubsub-sub",
+            ack_ids=["3", "4"],
+            ack_deadline_seconds=30,
+        )
+        # The extended messages are still leased.
+        self.assertEqual(self.source._lease_manager.num_leases, 2)
+
+
 if __name__ == "__main__":
     unittest.main()
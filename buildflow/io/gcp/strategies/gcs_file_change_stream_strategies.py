@@ -3,6 +3,7 @@ from typing import Any, Callable, Optional, Type
 from buildflow.core.credentials import GCPCredentials
 from buildflow.io.gcp.strategies.pubsub_strategies import GCPPubSubSubscriptionSource
 from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
+from buildflow.io.utils import blob_prefetch
 from buildflow.io.utils.clients import gcp_clients
 from buildflow.io.utils.schemas import converters
 from buildflow.types.gcp import GCSChangeStreamEventType, GCSFileChangeEvent
@@ -15,12 +16,18 @@ class GCSFileChangeStreamSource(SourceStrategy):
         project_id: str,
         credentials: GCPCredentials,
         pubsub_source: GCPPubSubSubscriptionSource,
+        prefetch_blobs: bool = False,
+        max_concurrent_prefetches: int = blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY,
+        max_prefetch_bytes: int = blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES,
     ):
         super().__init__(
             credentials=credentials, strategy_id="gcp-gcs-filestream-source"
         )
         # configuration
         self.pubsub_source = pubsub_source
+        self.prefetch_blobs = prefetch_blobs
+        self.max_concurrent_prefetches = max_concurrent_prefetches
+        self.max_prefetch_bytes = max_prefetch_bytes
         clients = gcp_clients.GCPClients(
             credentials=credentials,
             quota_project_id=project_id,
@@ -38,6 +45,12 @@ class GCSFileChangeStreamSource(SourceStrategy):
             )
             for payload in pull_response.payload
         ]
+        if self.prefetch_blobs:
+            await blob_prefetch.prefetch_blobs(
+                payload,
+                max_concurrent_prefetches=self.max_concurrent_prefetches,
+                max_prefetch_bytes=self.max_prefetch_bytes,
+            )
         return PullResponse(payload=payload, ack_info=pull_response.ack_info)
 
     async def ack(self, ack_info: AckInfo, success: bool):
@@ -1,14 +1,27 @@
+import asyncio
+import collections
 import dataclasses
 import datetime
 import logging
-from typing import Any, Callable, Iterable, Optional, Type, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
 
 from google.cloud.monitoring_v3 import query
 from google.cloud.pubsub_v1.types import PubsubMessage as GCPPubSubMessage
 from google.protobuf.timestamp_pb2 import Timestamp
+from google.pubsub_v1.types import ReceivedMessage, StreamingPullRequest
 
-from buildflow import exceptions
-from buildflow.core import utils
+from buildflow.core import tracing, utils
 from buildflow.core.credentials import GCPCredentials
 from buildflow.core.types.gcp_types import (
     GCPProjectID,
@@ -20,9 +33,23 @@ from buildflow.core.types.gcp_types import (
 from buildflow.io.strategies.sink import Batch, SinkStrategy
 from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
 from buildflow.io.utils.clients import gcp_clients
+from buildflow.io.utils.leases import LeaseManager
 from buildflow.io.utils.schemas import converters
 from buildflow.types.gcp import PubsubMessage
 
+# How long pull waits for the stream to deliver messages before returning an empty
+# batch, so the runtime can still handle drain requests.
+_STREAM_PULL_WAIT_SECS = 1
+# How often an empty request is sent to keep an idle stream open.
+_STREAM_HEARTBEAT_SECS = 30
+_STREAM_MIN_BACKOFF_SECS = 0.5
+_STREAM_MAX_BACKOFF_SECS = 30
+# Bounds Pub/Sub accepts for ModifyAckDeadline.
+_MIN_ACK_DEADLINE_SECS = 10
+_MAX_ACK_DEADLINE_SECS = 600
+# Max number of ack ids sent in a single ModifyAckDeadline request.
+_MAX_ACK_IDS_PER_REQUEST = 2500
+
 
 @dataclasses.dataclass(frozen=True)
 class _PubsubAckInfo(AckInfo):
@@ -44,6 +71,8 @@ class GCPPubSubSubscriptionSource(SourceStrategy):
         project_id: GCPProjectID,
         batch_size: int = 1000,
         include_attributes: bool = False,
+        ack_deadline_seconds: int = 600,
+        max_lease_seconds: Optional[int] = 3600,
     ):
         super().__init__(
             credentials=credentials,
@@ -54,6 +83,10 @@ class GCPPubSubSubscriptionSource(SourceStrategy):
         self.project_id = project_id
         self.batch_size = batch_size
         self.include_attributes = include_attributes
+        self.ack_deadline_seconds = ack_deadline_seconds
+        # How long the ack deadline of an unacked message is extended for. If None
+        # the deadlines are never extended.
+        self.max_lease_seconds = max_lease_seconds
         # setup
         self.credentials = credentials
         clients = gcp_clients.GCPClients(
@@ -63,13 +96,51 @@ class GCPPubSubSubscriptionSource(SourceStrategy):
         self.subscriber_client = clients.get_async_subscriber_client()
         self.publisher_client = clients.get_async_publisher_client()
         self.metrics_client = clients.get_metrics_client()
+        self._trace_fields = tracing.propagation_fields()
         # initial state
+        self._lease_manager: Optional[LeaseManager] = None
+        self._ack_deadline_fetched = False
+        if max_lease_seconds is not None:
+            self._lease_manager = LeaseManager(
+                self._extend_ack_deadlines,
+                lease_seconds=ack_deadline_seconds,
+                max_lease_seconds=max_lease_seconds,
+                min_extension_seconds=_MIN_ACK_DEADLINE_SECS,
+                max_extension_seconds=_MAX_ACK_DEADLINE_SECS,
+                max_ids_per_request=_MAX_ACK_IDS_PER_REQUEST,
+            )
 
     @property
     def subscription_id(self) -> PubSubSubscriptionID:
         return f"projects/{self.project_id}/subscriptions/{self.subscription_name}"  # noqa: E501
 
+    async def _fetch_ack_deadline(self):
+        """Sets the lease of pulled messages to the subscription's ack deadline.
+
+        The subscription isn't necessarily created with ack_deadline_seconds (e.g.
+        subscriptions that aren't managed by buildflow), and unary pulls deliver
+        messages with the subscription's ack deadline.
+        """
+        self._ack_deadline_fetched = True
+        try:
+            subscription = await self.subscriber_client.get_subscription(
+                subscription=self.subscription_id
+            )
+            lease_seconds = subscription.ack_deadline_seconds or _MIN_ACK_DEADLINE_SECS
+        except Exception:
+            # Extending too early only costs extra requests, too late causes
+            # redeliveries.
+            lease_seconds = _MIN_ACK_DEADLINE_SECS
+            logging.exception(
+                "failed to get the ack deadline of %s, assuming %ss",
+                self.subscription_id,
+                lease_seconds,
+            )
+        self._lease_manager.lease_seconds = lease_seconds
+
     async def pull(self) -> PullResponse:
+        if self._lease_manager is not None and not self._ack_deadline_fetched:
+            await self._fetch_ack_deadline()
         try:
             response = await self.subscriber_client.pull(
                 subscription=self.subscription_id,
@@ -79,12 +150,40 @@ class GCPPubSubSubscriptionSource(SourceStrategy):
             logging.error("pubsub pull failed with: %s", e)
             return PullResponse([], _PubsubAckInfo([]))
 
+        self._lease(
+            [received_message.ack_id for received_message in response.received_messages]
+        )
+        return self._to_pull_response(response.received_messages)
+
+    def _lease(self, ack_ids: List[str]):
+        if self._lease_manager is not None and ack_ids:
+            self._lease_manager.add(ack_ids)
+            self._lease_manager.start()
+
+    async def _extend_ack_deadlines(self, ack_ids: List[str], seconds: int):
+        await self.subscriber_client.modify_ack_deadline(
+            subscription=self.subscription_id,
+            ack_ids=ack_ids,
+            ack_deadline_seconds=seconds,
+        )
+
+    def _to_pull_response(
+        self, received_messages: Iterable[ReceivedMessage]
+    ) -> PullResponse:
         payloads = []
         ack_ids = []
-        for received_message in response.received_messages:
+        trace_contexts = []
+        for received_message in received_messages:
+            attributes = received_message.message.attributes
+            trace_contexts.append(
+                {
+                    field: attributes[field]
+                    for field in self._trace_fields
+                    if field in attributes
+                }
+            )
             if self.include_attributes:
                 att_dict = {}
-                attributes = received_message.message.attributes
                 for key, value in attributes.items():
                     att_dict[key] = value
 
@@ -102,9 +201,11 @@ class GCPPubSubSubscriptionSource(SourceStrategy):
             payloads.append(payload)
             ack_ids.append(received_message.ack_id)
 
-        return PullResponse(payloads, _PubsubAckInfo(ack_ids))
+        return PullResponse(payloads, _PubsubAckInfo(ack_ids), trace_contexts)
 
     async def ack(self, ack_info: _PubsubAckInfo, success: bool):
+        if self._lease_manager is not None:
+            self._lease_manager.remove(ack_info.ack_ids)
         if ack_info.ack_ids:
             if success:
                 await self.subscriber_client.acknowledge(
@@ -155,28 +256,216 @@ class GCPPubSubSubscriptionSource(SourceStrategy):
         )
         return points[0].value.int64_value
 
+    async def teardown(self):
+        if self._lease_manager is not None:
+            await self._lease_manager.stop()
+
     def max_batch_size(self) -> int:
         return self.batch_size
 
     def pull_converter(self, type_: Optional[Type]) -> Callable[[bytes], Any]:
-        if type_ is None or self.include_attributes:
+        if self.include_attributes:
             # If include attributes is true, we always return a PubsubMessage
             return converters.identity()
-        elif hasattr(type_, "from_bytes"):
-            return lambda output: type_.from_bytes(output)
-        elif dataclasses.is_dataclass(type_):
-            return converters.bytes_to_dataclass(type_)
+        return converters.bytes_pull_converter(type_)
+
+
+class GCPPubSubStreamingSubscriptionSource(GCPPubSubSubscriptionSource):
+    """Pulls messages from a subscription over a streaming pull.
+
+    Instead of a unary pull per batch, each replica keeps a bidirectional stream
+    open. The stream fills a local buffer in the background and pull() is served
+    from that buffer. Acks and nacks are sent over the same stream.
+
+    Pub/Sub stops delivering to the stream once max_outstanding_messages or
+    max_outstanding_bytes messages have been delivered but not acked yet, which
+    bounds the size of the local buffer.
+    """
+
+    def __init__(
+        self,
+        *,
+        credentials: GCPCredentials,
+        subscription_name: PubSubSubscriptionName,
+        project_id: GCPProjectID,
+        batch_size: int = 1000,
+        include_attributes: bool = False,
+        ack_deadline_seconds: int = 600,
+        max_lease_seconds: Optional[int] = 3600,
+        max_outstanding_messages: int = 1000,
+        max_outstanding_bytes: int = 100 * 1024 * 1024,
+    ):
+        super().__init__(
+            credentials=credentials,
+            subscription_name=subscription_name,
+            project_id=project_id,
+            batch_size=batch_size,
+            include_attributes=include_attributes,
+            ack_deadline_seconds=ack_deadline_seconds,
+            max_lease_seconds=max_lease_seconds,
+        )
+        # configuration
+        self.max_outstanding_messages = max_outstanding_messages
+        self.max_outstanding_bytes = max_outstanding_bytes
+        # initial state
+        # The client id lets Pub/Sub keep the flow control state of this replica
+        # when the stream is reopened.
+        self._client_id = utils.uuid()
+        self._buffer: Deque[ReceivedMessage] = collections.deque()
+        self._buffer_not_empty = asyncio.Event()
+        self._stream_task: Optional[asyncio.Task] = None
+        # Requests (acks / nacks) to send over the open stream. None if the stream
+        # is not connected.
+        self._stream_requests: Optional[asyncio.Queue] = None
+
+    def _ensure_stream(self):
+        if self._stream_task is None or self._stream_task.done():
+            self._stream_task = asyncio.create_task(self._run_stream())
+
+    async def _run_stream(self):
+        backoff_secs = _STREAM_MIN_BACKOFF_SECS
+        while True:
+            requests: asyncio.Queue = asyncio.Queue()
+            failed = False
+            try:
+                stream = await self.subscriber_client.streaming_pull(
+                    requests=self._stream_request_iterator(requests)
+                )
+                self._stream_requests = requests
+                async for response in stream:
+                    backoff_secs = _STREAM_MIN_BACKOFF_SECS
+                    if response.received_messages:
+                        # Buffered messages are leased as well, so they aren't
+                        # redelivered while waiting to be pulled.
+                        self._lease(
+                            [
+                                received_message.ack_id
+                                for received_message in response.received_messages
+                            ]
+                        )
+                        self._buffer.extend(response.received_messages)
+                        self._buffer_not_empty.set()
+                # Pub/Sub closes streams periodically, so we just reopen it.
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning("pubsub streaming pull failed with: %s", e)
+                failed = True
+            finally:
+                self._stream_requests = None
+                # Acks / nacks that weren't sent before the stream closed.
+                await self._send_unary(requests)
+            if failed:
+                await asyncio.sleep(backoff_secs)
+                backoff_secs = min(backoff_secs * 2, _STREAM_MAX_BACKOFF_SECS)
+
+    async def _stream_request_iterator(
+        self, requests: asyncio.Queue
+    ) -> AsyncIterator[StreamingPullRequest]:
+        yield StreamingPullRequest(
+            subscription=self.subscription_id,
+            stream_ack_deadline_seconds=self.ack_deadline_seconds,
+            client_id=self._client_id,
+            max_outstanding_messages=self.max_outstanding_messages,
+            max_outstanding_bytes=self.max_outstanding_bytes,
+        )
+        while True:
+            try:
+                request = await asyncio.wait_for(
+                    requests.get(), timeout=_STREAM_HEARTBEAT_SECS
+                )
+            except asyncio.TimeoutError:
+                # An empty request keeps the stream from being closed as idle.
+                request = StreamingPullRequest()
+            yield request
+
+    async def _send_unary(self, requests: asyncio.Queue):
+        # The leases were already updated when the requests were queued, so this
+        # only replays them against the unary API.
+        while not requests.empty():
+            request = requests.get_nowait()
+            try:
+                if request.ack_ids:
+                    await self.subscriber_client.acknowledge(
+                        ack_ids=list(request.ack_ids),
+                        subscription=self.subscription_id,
+                    )
+                # Modify requests are both lease extensions and nacks (a deadline
+                # of 0), so we send each deadline with its own ack IDs.
+                ack_ids_per_deadline: Dict[int, List[str]] = collections.defaultdict(
+                    list
+                )
+                for ack_id, seconds in zip(
+                    request.modify_deadline_ack_ids, request.modify_deadline_seconds
+                ):
+                    ack_ids_per_deadline[seconds].append(ack_id)
+                for seconds, ack_ids in ack_ids_per_deadline.items():
+                    await super()._extend_ack_deadlines(ack_ids, seconds)
+            except Exception:
+                # The messages will be redelivered once their ack deadline expires.
+                logging.exception("failed to send pending pubsub acks")
+
+    async def pull(self) -> PullResponse:
+        self._ensure_stream()
+        if not self._buffer:
+            try:
+                await asyncio.wait_for(
+                    self._buffer_not_empty.wait(), timeout=_STREAM_PULL_WAIT_SECS
+                )
+            except asyncio.TimeoutError:
+                return PullResponse([], _PubsubAckInfo([]))
+        num_messages = min(self.batch_size, len(self._buffer))
+        received_messages = [self._buffer.popleft() for _ in range(num_messages)]
+        if not self._buffer:
+            self._buffer_not_empty.clear()
+        return self._to_pull_response(received_messages)
+
+    async def _extend_ack_deadlines(self, ack_ids: List[str], seconds: int):
+        requests = self._stream_requests
+        if requests is None:
+            await super()._extend_ack_deadlines(ack_ids, seconds)
         else:
-            if hasattr(type_, "__origin__"):
-                type_ = type_.__origin__
-            if issubclass(type_, bytes):
-                return converters.identity()
-            elif issubclass(type_, dict):
-                return converters.bytes_to_dict()
-            else:
-                raise exceptions.CannotConvertSourceException(
-                    f"Cannot convert from bytes to type: `{type_}`"
+            requests.put_nowait(
+                StreamingPullRequest(
+                    modify_deadline_ack_ids=ack_ids,
+                    modify_deadline_seconds=[seconds] * len(ack_ids),
                 )
+            )
+
+    async def ack(self, ack_info: _PubsubAckInfo, success: bool):
+        if not ack_info.ack_ids:
+            return
+        if self._lease_manager is not None:
+            self._lease_manager.remove(ack_info.ack_ids)
+        requests = self._stream_requests
+        if requests is None:
+            await super().ack(ack_info, success)
+        elif success:
+            requests.put_nowait(StreamingPullRequest(ack_ids=ack_info.ack_ids))
+        else:
+            # A deadline of 0 nacks the messages.
+            requests.put_nowait(
+                StreamingPullRequest(
+                    modify_deadline_ack_ids=ack_info.ack_ids,
+                    modify_deadline_seconds=[0] * len(ack_info.ack_ids),
+                )
+            )
+
+    async def teardown(self):
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            try:
+                await self._stream_task
+            except asyncio.CancelledError:
+                pass
+            self._stream_task = None
+        # Nack the buffered messages so they are redelivered right away instead of
+        # after the ack deadline.
+        ack_ids = [received_message.ack_id for received_message in self._buffer]
+        self._buffer.clear()
+        self._buffer_not_empty.clear()
+        await super().ack(_PubsubAckInfo(ack_ids), False)
+        await super().teardown()
 
 
 class GCPPubSubTopicSink(SinkStrategy):
@@ -202,7 +491,11 @@ class GCPPubSubTopicSink(SinkStrategy):
 
     @utils.log_errors(endpoint="apis.buildflow.dev/...")
     async def push(self, batch: Batch):
-        pubsub_messages = [GCPPubSubMessage(data=elem) for elem in batch]
+        # Propagates the current trace (if any) to the consumers of the topic.
+        attributes = tracing.inject_context()
+        pubsub_messages = [
+            GCPPubSubMessage(data=elem, attributes=attributes) for elem in batch
+        ]
         await self.publisher_client.publish(
             topic=self.topic_id, messages=pubsub_messages
         )
@@ -1,4 +1,5 @@
 # ruff: noqa
 from .file import File
 from .file_change_stream import LocalFileChangeStream
+from .file_dataset import FileDataset
 from .pulse import Pulse
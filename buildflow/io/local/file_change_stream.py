@@ -10,7 +10,11 @@ from buildflow.io.local.strategies.file_change_stream_strategies import (
     LocalFileChangeStreamSource,
 )
 from buildflow.io.primitive import LocalPrimtive
-from buildflow.types.local import FileChangeStreamEventType
+from buildflow.io.utils import blob_prefetch
+from buildflow.types.local import FileChangeOverflowPolicy, FileChangeStreamEventType
+
+_DEFAULT_MAX_BUFFER_SIZE = 10_000
+_DEFAULT_BATCH_SIZE = 1000
 
 
 @dataclasses.dataclass
@@ -19,6 +23,21 @@ class LocalFileChangeStream(LocalPrimtive):
     event_types: Iterable[FileChangeStreamEventType] = (
         FileChangeStreamEventType.CREATED,
     )
+    # source options
+    max_buffer_size: int = dataclasses.field(
+        default=_DEFAULT_MAX_BUFFER_SIZE, init=False
+    )
+    overflow_policy: FileChangeOverflowPolicy = dataclasses.field(
+        default=FileChangeOverflowPolicy.BLOCK, init=False
+    )
+    max_batch_size: int = dataclasses.field(default=_DEFAULT_BATCH_SIZE, init=False)
+    prefetch_blobs: bool = dataclasses.field(default=False, init=False)
+    max_concurrent_prefetches: int = dataclasses.field(
+        default=blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY, init=False
+    )
+    max_prefetch_bytes: int = dataclasses.field(
+        default=blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES, init=False
+    )
 
     def __post_init__(self):
         if not self.file_path.startswith("/"):
@@ -26,6 +45,32 @@ class LocalFileChangeStream(LocalPrimtive):
 
         self._primitive_id = uuid()
 
+    def options(
+        self,
+        # Source options
+        # Max number of file change events buffered until they are pulled.
+        max_buffer_size: int = _DEFAULT_MAX_BUFFER_SIZE,
+        # What happens to new events once the buffer is full.
+        overflow_policy: FileChangeOverflowPolicy = FileChangeOverflowPolicy.BLOCK,
+        # Max number of events returned by a single pull.
+        max_batch_size: int = _DEFAULT_BATCH_SIZE,
+        # Download the blobs of each pulled batch of events concurrently, before
+        # they are processed.
+        prefetch_blobs: bool = False,
+        # Max number of blobs downloaded at once.
+        max_concurrent_prefetches: int = blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY,
+        # No more blobs of a batch are prefetched once this many bytes were
+        # downloaded.
+        max_prefetch_bytes: int = blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES,
+    ) -> "LocalFileChangeStream":
+        self.max_buffer_size = max_buffer_size
+        self.overflow_policy = overflow_policy
+        self.max_batch_size = max_batch_size
+        self.prefetch_blobs = prefetch_blobs
+        self.max_concurrent_prefetches = max_concurrent_prefetches
+        self.max_prefetch_bytes = max_prefetch_bytes
+        return self
+
     def primitive_id(self):
         return self._primitive_id
 
@@ -46,5 +91,11 @@ class LocalFileChangeStream(LocalPrimtive):
         return LocalFileChangeStreamSource(
             file_path=self.file_path,
             event_types=self.event_types,
+            max_buffer_size=self.max_buffer_size,
+            overflow_policy=self.overflow_policy,
+            max_batch_size=self.max_batch_size,
+            prefetch_blobs=self.prefetch_blobs,
+            max_concurrent_prefetches=self.max_concurrent_prefetches,
+            max_prefetch_bytes=self.max_prefetch_bytes,
             credentials=credentials,
         )
@@ -0,0 +1,61 @@
+import dataclasses
+import hashlib
+import os
+from typing import Optional
+
+from buildflow.config.cloud_provider_config import LocalOptions
+from buildflow.core.credentials.empty_credentials import EmptyCredentials
+from buildflow.core.types.shared_types import FilePath
+from buildflow.io.local.strategies.file_dataset_strategies import FileDatasetSource
+from buildflow.io.primitive import LocalPrimtive
+from buildflow.types.portable import FileFormat
+
+_DEFAULT_CHUNK_SIZE = 10_000
+
+
+@dataclasses.dataclass
+class FileDataset(LocalPrimtive):
+    # A file, or a directory that is searched (recursively) for files of the
+    # given format.
+    file_path: FilePath
+    file_format: FileFormat
+    # Number of rows read at once.
+    chunk_size: int = _DEFAULT_CHUNK_SIZE
+    # Where the progress of the replicas is tracked, defaults to a directory in
+    # .buildflow/ of the current working directory.
+    progress_dir: Optional[FilePath] = None
+
+    def __post_init__(self):
+        if not self.file_path.startswith("/"):
+            self.file_path = os.path.join(os.getcwd(), self.file_path)
+        if isinstance(self.file_format, str):
+            self.file_format = FileFormat(self.file_format)
+        self._primitive_id = hashlib.sha1(self.file_path.encode()).hexdigest()[:16]
+        if self.progress_dir is None:
+            self.progress_dir = os.path.join(
+                os.getcwd(), ".buildflow", "file_dataset", self._primitive_id
+            )
+        elif not self.progress_dir.startswith("/"):
+            self.progress_dir = os.path.join(os.getcwd(), self.progress_dir)
+
+    def primitive_id(self):
+        return self._primitive_id
+
+    @classmethod
+    def from_local_options(
+        cls,
+        local_options: LocalOptions,
+        *,
+        file_path: FilePath,
+        file_format: FileFormat,
+    ) -> "FileDataset":
+        return cls(file_path=file_path, file_format=file_format)
+
+    def source(self, credentials: EmptyCredentials) -> FileDatasetSource:
+        return FileDatasetSource(
+            credentials=credentials,
+            file_path=self.file_path,
+            file_format=self.file_format,
+            progress_dir=self.progress_dir,
+            chunk_size=self.chunk_size,
+        )
@@ -1,3 +1,4 @@
+import dataclasses
 import json
 import os
 import tempfile
@@ -5,6 +6,7 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
+import pyarrow as pa
 import pyarrow.csv as pcsv
 import pyarrow.parquet as pq
 
@@ -12,6 +14,11 @@ from buildflow.io.local.file import File
 from buildflow.types.portable import FileFormat
 
 
+@dataclasses.dataclass
+class Row:
+    field: int
+
+
 class FilePrimitiveTest(unittest.IsolatedAsyncioTestCase):
     def get_output_file(self) -> str:
         files = os.listdir(self.output_path)
@@ -64,6 +71,84 @@ class FilePrimitiveTest(unittest.IsolatedAsyncioTestCase):
         table = pq.read_table(file_path)
         self.assertEqual([{"field": 1}, {"field": 2}], table.to_pylist())
 
+    async def test_push_parquet_record_batch(self):
+        file_path = os.path.join(self.output_path, "output.parquet")
+        local_file = File(
+            file_path=file_path,
+            file_format=FileFormat.PARQUET,
+        )
+
+        file_sink = local_file.sink(mock.MagicMock())
+        await file_sink.push(pa.RecordBatch.from_pylist([{"field": 1}, {"field": 2}]))
+        await file_sink.push(pa.RecordBatch.from_pylist([{"field": 3}]))
+        file_path = self.get_output_file()
+        table = pq.read_table(file_path)
+        self.assertEqual([{"field": 1}, {"field": 2}, {"field": 3}], table.to_pylist())
+
+    async def test_push_parquet_record_batch_keeps_integer_nulls(self):
+        file_path = os.path.join(self.output_path, "output.parquet")
+        local_file = File(
+            file_path=file_path,
+            file_format=FileFormat.PARQUET,
+        )
+        schema = pa.schema([pa.field("field", pa.int64())])
+
+        file_sink = local_file.sink(mock.MagicMock())
+        await file_sink.push(
+            pa.RecordBatch.from_pylist([{"field": 1}, {"field": None}], schema=schema)
+        )
+        file_path = self.get_output_file()
+        table = pq.read_table(file_path)
+        self.assertEqual(table.schema.field("field").type, pa.int64())
+        self.assertEqual([{"field": 1}, {"field": None}], table.to_pylist())
+
+    async def test_push_parquet_required_field_is_none(self):
+        file_path = os.path.join(self.output_path, "output.parquet")
+        local_file = File(
+            file_path=file_path,
+            file_format=FileFormat.PARQUET,
+        )
+
+        file_sink = local_file.sink(mock.MagicMock())
+        converter = file_sink.arrow_push_converter(Row)
+        # Python doesn't enforce the annotation, so the sink still accepts it.
+        await file_sink.push(converter([Row(field=1), Row(field=None)]))
+
+        file_path = self.get_output_file()
+        table = pq.read_table(file_path)
+        self.assertEqual([{"field": 1}, {"field": None}], table.to_pylist())
+
+    async def test_push_csv_record_batch(self):
+        file_path = os.path.join(self.output_path, "output.csv")
+        local_file = File(
+            file_path=file_path,
+            file_format=FileFormat.CSV,
+        )
+
+        schema = pa.schema([pa.field("field", pa.int64(), nullable=False)])
+
+        file_sink = local_file.sink(mock.MagicMock())
+        await file_sink.push(
+            pa.RecordBatch.from_pylist([{"field": 1}, {"field": 2}], schema=schema)
+        )
+        await file_sink.push(pa.RecordBatch.from_pylist([{"field": 3}], schema=schema))
+
+        file_path = self.get_output_file()
+        table = pcsv.read_csv(Path(file_path))
+        self.assertCountEqual(
+            [{"field": 1}, {"field": 2}, {"field": 3}], table.to_pylist()
+        )
+
+    def test_arrow_push_converter_not_used_for_json(self):
+        local_file = File(
+            file_path=os.path.join(self.output_path, "output.json"),
+            file_format=FileFormat.JSON,
+        )
+
+        file_sink = local_file.sink(mock.MagicMock())
+
+        self.assertIsNone(file_sink.arrow_push_converter(Row))
+
 
 if __name__ == "__main__":
     unittest.main()
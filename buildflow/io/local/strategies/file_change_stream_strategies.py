@@ -1,6 +1,8 @@
 import asyncio
+import collections
 import dataclasses
-from threading import Lock
+import logging
+import mmap
 from typing import Any, Callable, Dict, Iterable, Type
 
 from watchfiles import awatch
@@ -8,8 +10,9 @@ from watchfiles import awatch
 from buildflow.core.credentials import EmptyCredentials
 from buildflow.core.types.shared_types import FilePath
 from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
+from buildflow.io.utils import blob_prefetch
 from buildflow.io.utils.schemas import converters
-from buildflow.types.local import FileChangeStreamEventType
+from buildflow.types.local import FileChangeOverflowPolicy, FileChangeStreamEventType
 from buildflow.types.portable import FileChangeEvent
 
 
@@ -17,15 +20,40 @@ from buildflow.types.portable import FileChangeEvent
 class LocalFileChangeEvent(FileChangeEvent):
     event_type: FileChangeStreamEventType
 
-    @property
-    def blob(self) -> bytes:
+    def _open(self):
         if self.event_type == FileChangeStreamEventType.DELETED:
             raise ValueError("Can't fetch blob for `delete` event.")
-        with open(self.metadata["src_path"], "rb") as f:
+        return open(self.metadata["src_path"], "rb")
+
+    def memory_map(self) -> mmap.mmap:
+        """Memory maps the file read only.
+
+        Only the slices of the file that are accessed are read from disk. Close
+        the map once done with it.
+        """
+        with self._open() as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _download_blob(self) -> bytes:
+        with self._open() as f:
             return f.read()
 
+    def _download_blob_range(self, start: int, end: int) -> bytes:
+        with self._open() as f:
+            f.seek(start)
+            return f.read(end - start)
+
 
 class LocalFileChangeStreamSource(SourceStrategy):
+    """Emits events for changes of the files in a directory.
+
+    Events are buffered (up to max_buffer_size) until they are pulled. Events for
+    a path that is already buffered are coalesced into the buffered event: the
+    newest event type wins, except that a modification of a buffered created
+    file is still emitted as created. Once the buffer is full the overflow
+    policy decides whether reading changes blocks, or events are dropped.
+    """
+
     _setup_task = None
 
     def __init__(
@@ -34,30 +62,71 @@ class LocalFileChangeStreamSource(SourceStrategy):
         credentials: EmptyCredentials,
         file_path: FilePath,
         event_types: Iterable[FileChangeStreamEventType],
+        max_buffer_size: int = 10_000,
+        overflow_policy: FileChangeOverflowPolicy = FileChangeOverflowPolicy.BLOCK,
+        max_batch_size: int = 1000,
+        prefetch_blobs: bool = False,
+        max_concurrent_prefetches: int = blob_prefetch.DEFAULT_PREFETCH_CONCURRENCY,
+        max_prefetch_bytes: int = blob_prefetch.DEFAULT_MAX_PREFETCH_BYTES,
     ):
         super().__init__(
             credentials=credentials, strategy_id="local-file-change-stream-source"
         )
         self.file_path = file_path
         self.event_types = {et.value for et in event_types}
-        self.event_queue = []
-        self.lock = Lock()
+        self.max_buffer_size = max_buffer_size
+        self.overflow_policy = overflow_policy
+        self._max_batch_size = max_batch_size
+        self.prefetch_blobs = prefetch_blobs
+        self.max_concurrent_prefetches = max_concurrent_prefetches
+        self.max_prefetch_bytes = max_prefetch_bytes
+        # Buffered events by path, in the order they were first buffered.
+        self._events: "collections.OrderedDict[str, LocalFileChangeEvent]" = (
+            collections.OrderedDict()
+        )
+        self._buffer_not_full = asyncio.Event()
+        self._buffer_not_full.set()
+        self.num_dropped = 0
+
+    async def _buffer_event(self, event: LocalFileChangeEvent):
+        buffered = self._events.get(event.file_path)
+        if buffered is not None:
+            if not (
+                buffered.event_type == FileChangeStreamEventType.CREATED
+                and event.event_type == FileChangeStreamEventType.MODIFIED
+            ):
+                self._events[event.file_path] = event
+            return
+        while len(self._events) >= self.max_buffer_size:
+            if self.overflow_policy == FileChangeOverflowPolicy.BLOCK:
+                self._buffer_not_full.clear()
+                await self._buffer_not_full.wait()
+                continue
+            if self.num_dropped == 0:
+                logging.warning(
+                    "file change buffer is full (%s events), dropping events",
+                    self.max_buffer_size,
+                )
+            self.num_dropped += 1
+            if self.overflow_policy == FileChangeOverflowPolicy.DROP_NEWEST:
+                return
+            self._events.popitem(last=False)
+        self._events[event.file_path] = event
 
     async def setup(self):
         # TODO: we have to do this to ensure the observer isn't setup twice.
-        self.event_queue = []
+        self._events.clear()
         async for change in awatch(self.file_path):
             for event, file_path in change:
                 if event.name in self.event_types:
                     metadata = {"event_type": event, "src_path": file_path}
-                    with self.lock:
-                        self.event_queue.append(
-                            LocalFileChangeEvent(
-                                file_path=file_path,
-                                event_type=FileChangeStreamEventType(event.name),
-                                metadata=metadata,
-                            )
+                    await self._buffer_event(
+                        LocalFileChangeEvent(
+                            file_path=file_path,
+                            event_type=FileChangeStreamEventType(event.name),
+                            metadata=metadata,
                         )
+                    )
 
     async def teardown(self):
         if self._setup_task is not None:
@@ -70,11 +139,16 @@ class LocalFileChangeStreamSource(SourceStrategy):
     async def pull(self) -> PullResponse:
         if self._setup_task is None:
             self._setup_task = asyncio.create_task(self.setup())
-        payloads = []
-        if self.event_queue:
-            with self.lock:
-                payloads.extend(self.event_queue)
-                self.event_queue.clear()
+        num_events = min(len(self._events), self._max_batch_size)
+        payloads = [self._events.popitem(last=False)[1] for _ in range(num_events)]
+        if payloads:
+            self._buffer_not_full.set()
+        if self.prefetch_blobs:
+            await blob_prefetch.prefetch_blobs(
+                payloads,
+                max_concurrent_prefetches=self.max_concurrent_prefetches,
+                max_prefetch_bytes=self.max_prefetch_bytes,
+            )
         return PullResponse(payload=payloads, ack_info=None)
 
     def pull_converter(
@@ -83,10 +157,10 @@ class LocalFileChangeStreamSource(SourceStrategy):
         return converters.identity()
 
     async def backlog(self) -> int:
-        return 0
+        return len(self._events)
 
     async def ack(self, to_ack: AckInfo, success: bool):
         return
 
     def max_batch_size(self) -> int:
-        return -1
+        return self._max_batch_size
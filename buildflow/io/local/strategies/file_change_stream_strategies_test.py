@@ -5,9 +5,18 @@ import tempfile
 import unittest
 
 from buildflow.io.local.strategies.file_change_stream_strategies import (
+    LocalFileChangeEvent,
     LocalFileChangeStreamSource,
 )
-from buildflow.types.local import FileChangeStreamEventType
+from buildflow.types.local import FileChangeOverflowPolicy, FileChangeStreamEventType
+
+
+def _event(file_path: str, event_type: FileChangeStreamEventType):
+    return LocalFileChangeEvent(
+        file_path=file_path,
+        event_type=event_type,
+        metadata={"src_path": file_path},
+    )
 
 
 class FileChangeStreamStrategiesTest(unittest.TestCase):
@@ -90,5 +99,134 @@ class FileChangeStreamStrategiesTest(unittest.TestCase):
             await strat.teardown()
 
 
+class FileChangeStreamBufferTest(unittest.IsolatedAsyncioTestCase):
+    def _source(self, **kwargs):
+        source = LocalFileChangeStreamSource(
+            credentials=None,
+            file_path="/tmp",
+            event_types=(FileChangeStreamEventType.CREATED,),
+            **kwargs,
+        )
+        # Don't watch the directory, events are buffered by the tests.
+        source._setup_task = asyncio.get_running_loop().create_future()
+        return source
+
+    async def test_events_coalesced(self):
+        source = self._source()
+
+        await source._buffer_event(_event("a", FileChangeStreamEventType.CREATED))
+        await source._buffer_event(_event("b", FileChangeStreamEventType.MODIFIED))
+        await source._buffer_event(_event("a", FileChangeStreamEventType.MODIFIED))
+        await source._buffer_event(_event("b", FileChangeStreamEventType.DELETED))
+        self.assertEqual(await source.backlog(), 2)
+
+        response = await source.pull()
+
+        self.assertEqual(
+            [(e.file_path, e.event_type) for e in response.payload],
+            [
+                ("a", FileChangeStreamEventType.CREATED),
+                ("b", FileChangeStreamEventType.DELETED),
+            ],
+        )
+        self.assertEqual(await source.backlog(), 0)
+
+    async def test_pull_max_batch_size(self):
+        source = self._source(max_batch_size=2)
+        for path in ["a", "b", "c"]:
+            await source._buffer_event(_event(path, FileChangeStreamEventType.CREATED))
+
+        self.assertEqual(source.max_batch_size(), 2)
+        self.assertEqual(len((await source.pull()).payload), 2)
+        self.assertEqual(await source.backlog(), 1)
+
+    async def test_overflow_drop_oldest(self):
+        source = self._source(
+            max_buffer_size=2, overflow_policy=FileChangeOverflowPolicy.DROP_OLDEST
+        )
+        for path in ["a", "b", "c"]:
+            await source._buffer_event(_event(path, FileChangeStreamEventType.CREATED))
+
+        response = await source.pull()
+
+        self.assertEqual([e.file_path for e in response.payload], ["b", "c"])
+        self.assertEqual(source.num_dropped, 1)
+
+    async def test_overflow_drop_newest(self):
+        source = self._source(
+            max_buffer_size=2, overflow_policy=FileChangeOverflowPolicy.DROP_NEWEST
+        )
+        for path in ["a", "b", "c"]:
+            await source._buffer_event(_event(path, FileChangeStreamEventType.CREATED))
+
+        response = await source.pull()
+
+        self.assertEqual([e.file_path for e in response.payload], ["a", "b"])
+        self.assertEqual(source.num_dropped, 1)
+
+    async def test_overflow_block(self):
+        source = self._source(max_buffer_size=1)
+        await source._buffer_event(_event("a", FileChangeStreamEventType.CREATED))
+
+        blocked = asyncio.create_task(
+            source._buffer_event(_event("b", FileChangeStreamEventType.CREATED))
+        )
+        await asyncio.sleep(0.1)
+        self.assertFalse(blocked.done())
+
+        self.assertEqual([e.file_path for e in (await source.pull()).payload], ["a"])
+        await asyncio.wait_for(blocked, timeout=1)
+        self.assertEqual([e.file_path for e in (await source.pull()).payload], ["b"])
+
+
+class LocalFileChangeEventBlobTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.data_dir, "file.txt")
+        with open(self.file_path, "wb") as f:
+            f.write(b"0123456789")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.data_dir)
+
+    async def test_read_blob_range(self):
+        event = _event(self.file_path, FileChangeStreamEventType.CREATED)
+
+        self.assertEqual(await event.read_blob_range(2, 5), b"234")
+        self.assertEqual(await event.read_blob_range(8, 20), b"89")
+        self.assertEqual(await event.read_blob_range(20, 30), b"")
+
+    async def test_stream_blob(self):
+        event = _event(self.file_path, FileChangeStreamEventType.CREATED)
+
+        chunks = [chunk async for chunk in event.stream_blob(chunk_size=4)]
+
+        self.assertEqual(chunks, [b"0123", b"4567", b"89"])
+
+    def test_memory_map(self):
+        event = _event(self.file_path, FileChangeStreamEventType.CREATED)
+
+        with event.memory_map() as mapped:
+            self.assertEqual(mapped[3:6], b"345")
+
+    async def test_pull_prefetches_blobs(self):
+        source = LocalFileChangeStreamSource(
+            credentials=None,
+            file_path=self.data_dir,
+            event_types=(FileChangeStreamEventType.CREATED,),
+            prefetch_blobs=True,
+        )
+        source._setup_task = asyncio.get_running_loop().create_future()
+        await source._buffer_event(
+            _event(self.file_path, FileChangeStreamEventType.CREATED)
+        )
+
+        response = await source.pull()
+        os.remove(self.file_path)
+
+        # The file was read on pull, so it can still be read after it was removed.
+        self.assertEqual(response.payload[0].blob, b"0123456789")
+
+
 if __name__ == "__main__":
     unittest.main()
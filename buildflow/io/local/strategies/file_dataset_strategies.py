@@ -0,0 +1,388 @@
+import asyncio
+import collections
+import dataclasses
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Set, Type
+
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+
+from buildflow.core.credentials import EmptyCredentials
+from buildflow.core.types.shared_types import FilePath
+from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
+from buildflow.io.utils.schemas import converters
+from buildflow.types.portable import FileFormat
+
+_FILE_EXTENSIONS = {
+    FileFormat.PARQUET: (".parquet", ".pq"),
+    FileFormat.CSV: (".csv",),
+    FileFormat.JSON: (".json", ".jsonl", ".ndjson"),
+}
+# How long a pull waits before returning an empty response once all files
+# are claimed, so the runtime doesn't spin on empty pulls.
+_IDLE_SLEEP_SECS = 1
+# Bytes of a CSV file parsed at once, each block is split into chunks.
+_CSV_BLOCK_SIZE = 1 << 20
+
+
+@dataclasses.dataclass
+class _FileChunkAckInfo(AckInfo):
+    file_path: str
+    chunk_index: int
+    rows: List[Dict[str, Any]]
+
+
+def _progress_key(file_path: str) -> str:
+    return hashlib.sha1(file_path.encode()).hexdigest()[:16]
+
+
+def _count_lines(file_path: str) -> int:
+    num_lines = 0
+    last_block = b""
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_CSV_BLOCK_SIZE), b""):
+            num_lines += block.count(b"\n")
+            last_block = block
+    if last_block and not last_block.endswith(b"\n"):
+        num_lines += 1
+    return num_lines
+
+
+def _count_rows(file_path: str, file_format: FileFormat) -> int:
+    """Returns the number of rows in a file, for CSV and JSON this is estimated
+    from the number of lines."""
+    if file_format == FileFormat.PARQUET:
+        return pq.ParquetFile(file_path).metadata.num_rows
+    elif file_format == FileFormat.CSV:
+        return max(_count_lines(file_path) - 1, 0)
+    elif file_format == FileFormat.JSON:
+        return _count_lines(file_path)
+    raise ValueError(f"Unknown file format: {file_format}")
+
+
+def _slice_batches(
+    batches: Iterator[pa.RecordBatch], skip_rows: int, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    for batch in batches:
+        if skip_rows >= batch.num_rows:
+            skip_rows -= batch.num_rows
+            continue
+        batch = batch.slice(skip_rows)
+        skip_rows = 0
+        for offset in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size).to_pylist()
+
+
+def _read_parquet(
+    file_path: str, skip_rows: int, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    parquet_file = pq.ParquetFile(file_path, memory_map=True)
+    # Row groups that were fully read before are not read again.
+    row_groups = []
+    for i in range(parquet_file.num_row_groups):
+        num_rows = parquet_file.metadata.row_group(i).num_rows
+        if not row_groups and skip_rows >= num_rows:
+            skip_rows -= num_rows
+            continue
+        row_groups.append(i)
+    if not row_groups:
+        return iter(())
+    batches = parquet_file.iter_batches(batch_size=chunk_size, row_groups=row_groups)
+    return _slice_batches(batches, skip_rows, chunk_size)
+
+
+def _read_csv(
+    file_path: str, skip_rows: int, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    if os.path.getsize(file_path) == 0:
+        return iter(())
+    reader = pcsv.open_csv(
+        pa.memory_map(file_path),
+        read_options=pcsv.ReadOptions(block_size=_CSV_BLOCK_SIZE),
+    )
+    return _slice_batches(reader, skip_rows, chunk_size)
+
+
+def _read_json_lines(
+    file_path: str, skip_rows: int, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            rows = []
+            for line in iter(mm.readline, b""):
+                if not line.strip():
+                    continue
+                if skip_rows > 0:
+                    skip_rows -= 1
+                    continue
+                rows.append(json.loads(line))
+                if len(rows) == chunk_size:
+                    yield rows
+                    rows = []
+            if rows:
+                yield rows
+
+
+_READERS = {
+    FileFormat.PARQUET: _read_parquet,
+    FileFormat.CSV: _read_csv,
+    FileFormat.JSON: _read_json_lines,
+}
+
+
+def _read_progress(progress_path: str) -> Dict[str, Any]:
+    try:
+        with open(progress_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"committed_rows": 0, "done": False}
+
+
+def _write_progress(progress_path: str, progress: Dict[str, Any]):
+    # Written to a temporary file first so a crash never leaves a partially
+    # written progress file behind.
+    tmp_path = f"{progress_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(progress, f)
+    os.replace(tmp_path, progress_path)
+
+
+class _ClaimedFile:
+    """A file this replica holds the lock of, and its read / ack progress."""
+
+    def __init__(
+        self,
+        file_path: str,
+        lock_file,
+        progress_path: str,
+        committed_rows: int,
+        rows: Iterator[List[Dict[str, Any]]],
+    ):
+        self.file_path = file_path
+        self.lock_file = lock_file
+        self.progress_path = progress_path
+        self.committed_rows = committed_rows
+        self.rows = rows
+        self.done_reading = False
+        self.num_chunks = 0
+        # Chunk index -> number of rows, for chunks that were acked but can't be
+        # committed yet because an earlier chunk is still outstanding.
+        self.acked_chunks: Dict[int, int] = {}
+        self.next_chunk_to_commit = 0
+
+    @property
+    def done(self) -> bool:
+        return self.done_reading and self.next_chunk_to_commit == self.num_chunks
+
+    def commit(self, chunk_index: int, num_rows: int) -> bool:
+        """Marks a chunk as acked, returns whether the committed rows advanced."""
+        self.acked_chunks[chunk_index] = num_rows
+        advanced = False
+        while self.next_chunk_to_commit in self.acked_chunks:
+            self.committed_rows += self.acked_chunks.pop(self.next_chunk_to_commit)
+            self.next_chunk_to_commit += 1
+            advanced = True
+        return advanced
+
+    def release(self):
+        fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        self.lock_file.close()
+
+
+class FileDatasetSource(SourceStrategy):
+    """Reads the rows of a file, or a directory of files, in chunks.
+
+    Files are memory mapped and streamed chunk_size rows at a time. JSON files
+    are read as newline delimited JSON. Rows are emitted as dicts.
+
+    Files are split across replicas: a replica claims a file by taking a lock on
+    it in progress_dir, and reads the file until all of its chunks were acked.
+    Locks are released if the replica goes away, so its files are picked up by
+    another replica. The rows of a file that were acked (in order) are recorded
+    in progress_dir, and a file is resumed from there when it is claimed again,
+    e.g. when the consumer is restarted. Delete progress_dir to read the dataset
+    from the start again.
+
+    The backlog is the number of rows of the dataset that weren't committed yet
+    (estimated from the number of lines for CSV and JSON).
+    """
+
+    def __init__(
+        self,
+        *,
+        credentials: EmptyCredentials,
+        file_path: FilePath,
+        file_format: FileFormat,
+        progress_dir: FilePath,
+        chunk_size: int = 10_000,
+    ):
+        super().__init__(credentials=credentials, strategy_id="local-file-dataset")
+        self.file_path = file_path
+        self.file_format = file_format
+        self.progress_dir = progress_dir
+        self.chunk_size = chunk_size
+        # initial state
+        self._file_paths: Optional[List[str]] = None
+        self._num_rows: Dict[str, int] = {}
+        self._done_files: Set[str] = set()
+        self._claimed_files: Dict[str, _ClaimedFile] = {}
+        self._reading: Optional[_ClaimedFile] = None
+        self._retries: Deque[_FileChunkAckInfo] = collections.deque()
+
+    def _list_files(self) -> List[str]:
+        if os.path.isfile(self.file_path):
+            return [self.file_path]
+        extensions = _FILE_EXTENSIONS[self.file_format]
+        file_paths = []
+        for root, dirs, files in os.walk(self.file_path):
+            dirs[:] = [d for d in dirs if os.path.join(root, d) != self.progress_dir]
+            for file_name in files:
+                if file_name.endswith(extensions):
+                    file_paths.append(os.path.join(root, file_name))
+        return sorted(file_paths)
+
+    def _file_paths_or_list(self) -> List[str]:
+        if self._file_paths is None:
+            os.makedirs(self.progress_dir, exist_ok=True)
+            self._file_paths = self._list_files()
+        return self._file_paths
+
+    def _progress_path(self, file_path: str) -> str:
+        return os.path.join(self.progress_dir, f"{_progress_key(file_path)}.json")
+
+    def _claim_next_file(self) -> Optional[_ClaimedFile]:
+        for file_path in self._file_paths_or_list():
+            if file_path in self._done_files or file_path in self._claimed_files:
+                continue
+            progress_path = self._progress_path(file_path)
+            if _read_progress(progress_path)["done"]:
+                self._done_files.add(file_path)
+                continue
+            lock_path = os.path.join(
+                self.progress_dir, f"{_progress_key(file_path)}.lock"
+            )
+            lock_file = open(lock_path, "a")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Claimed by another replica.
+                lock_file.close()
+                continue
+            # Read the progress again now that we hold the lock, another replica
+            # might have finished the file in the meantime.
+            progress = _read_progress(progress_path)
+            if progress["done"]:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+                self._done_files.add(file_path)
+                continue
+            committed_rows = progress["committed_rows"]
+            rows = _READERS[self.file_format](
+                file_path, committed_rows, self.chunk_size
+            )
+            return _ClaimedFile(
+                file_path, lock_file, progress_path, committed_rows, rows
+            )
+        return None
+
+    async def _read_next_chunk(self) -> Optional[_FileChunkAckInfo]:
+        # Only the blocking reads run in the executor, the state is only updated
+        # from the event loop.
+        loop = asyncio.get_running_loop()
+        while True:
+            if self._reading is None:
+                claimed = await loop.run_in_executor(None, self._claim_next_file)
+                if claimed is None:
+                    return None
+                self._claimed_files[claimed.file_path] = claimed
+                self._reading = claimed
+            claimed = self._reading
+            rows = await loop.run_in_executor(None, next, claimed.rows, None)
+            if rows is not None:
+                chunk_index = claimed.num_chunks
+                claimed.num_chunks += 1
+                return _FileChunkAckInfo(claimed.file_path, chunk_index, rows)
+            claimed.done_reading = True
+            self._reading = None
+            self._finish_if_done(claimed)
+
+    def _finish_if_done(self, claimed: _ClaimedFile):
+        if not claimed.done:
+            return
+        _write_progress(
+            claimed.progress_path,
+            {"committed_rows": claimed.committed_rows, "done": True},
+        )
+        claimed.release()
+        del self._claimed_files[claimed.file_path]
+        self._done_files.add(claimed.file_path)
+
+    async def pull(self) -> PullResponse:
+        if self._retries:
+            chunk = self._retries.popleft()
+        else:
+            chunk = await self._read_next_chunk()
+        if chunk is None:
+            await asyncio.sleep(_IDLE_SLEEP_SECS)
+            return PullResponse([], None)
+        return PullResponse(chunk.rows, chunk)
+
+    async def ack(self, to_ack: Optional[_FileChunkAckInfo], success: bool):
+        if to_ack is None:
+            return
+        if not success:
+            self._retries.append(to_ack)
+            return
+        claimed = self._claimed_files.get(to_ack.file_path)
+        if claimed is None:
+            # The file was released on teardown.
+            return
+        if claimed.commit(to_ack.chunk_index, len(to_ack.rows)):
+            if claimed.done:
+                self._finish_if_done(claimed)
+            else:
+                _write_progress(
+                    claimed.progress_path,
+                    {"committed_rows": claimed.committed_rows, "done": False},
+                )
+
+    def _backlog(self) -> int:
+        backlog = 0
+        for file_path in self._file_paths_or_list():
+            if file_path in self._done_files:
+                continue
+            claimed = self._claimed_files.get(file_path)
+            if claimed is not None:
+                committed_rows = claimed.committed_rows
+            else:
+                progress = _read_progress(self._progress_path(file_path))
+                if progress["done"]:
+                    continue
+                committed_rows = progress["committed_rows"]
+            if file_path not in self._num_rows:
+                self._num_rows[file_path] = _count_rows(file_path, self.file_format)
+            backlog += max(self._num_rows[file_path] - committed_rows, 0)
+        return backlog
+
+    async def backlog(self) -> int:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._backlog)
+
+    def max_batch_size(self) -> int:
+        return self.chunk_size
+
+    def pull_converter(self, user_defined_type: Type) -> Callable[[Any], Any]:
+        return converters.dict_pull_converter(user_defined_type)
+
+    async def teardown(self):
+        for claimed in self._claimed_files.values():
+            claimed.release()
+        self._claimed_files.clear()
+        self._reading = None
@@ -0,0 +1,159 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import pyarrow as pa
+import pyarrow.csv as pcsv
+import pyarrow.parquet as pq
+
+from buildflow.io.local.strategies.file_dataset_strategies import FileDatasetSource
+from buildflow.types.portable import FileFormat
+
+
+class FileDatasetStrategiesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.data_dir = tempfile.mkdtemp()
+        self.progress_dir = os.path.join(tempfile.mkdtemp(), "progress")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.data_dir)
+        shutil.rmtree(os.path.dirname(self.progress_dir))
+
+    def _source(self, file_path: str, file_format: FileFormat, chunk_size: int):
+        return FileDatasetSource(
+            credentials=None,
+            file_path=file_path,
+            file_format=file_format,
+            progress_dir=self.progress_dir,
+            chunk_size=chunk_size,
+        )
+
+    def _write_json_lines(self, file_name: str, start: int, end: int) -> str:
+        file_path = os.path.join(self.data_dir, file_name)
+        with open(file_path, "w") as f:
+            for i in range(start, end):
+                f.write(json.dumps({"id": i}) + "\n")
+        return file_path
+
+    async def _read_all(self, source: FileDatasetSource):
+        rows = []
+        while True:
+            response = await source.pull()
+            if not response.payload:
+                return rows
+            rows.extend(response.payload)
+            await source.ack(response.ack_info, success=True)
+
+    async def test_file_dataset_parquet(self):
+        file_path = os.path.join(self.data_dir, "data.parquet")
+        pq.write_table(pa.table({"id": list(range(100))}), file_path, row_group_size=30)
+        source = self._source(file_path, FileFormat.PARQUET, chunk_size=25)
+        self.assertEqual(await source.backlog(), 100)
+
+        response = await source.pull()
+        self.assertEqual(response.payload, [{"id": i} for i in range(25)])
+        response = await source.pull()
+        self.assertEqual(response.payload, [{"id": i} for i in range(25, 50)])
+
+        await source.ack(response.ack_info, success=True)
+        # The first chunk wasn't acked yet, so nothing can be committed.
+        self.assertEqual(await source.backlog(), 100)
+
+        rows = await self._read_all(source)
+        self.assertEqual(rows, [{"id": i} for i in range(50, 100)])
+        self.assertEqual(await source.backlog(), 100)
+
+        await source.teardown()
+
+    async def test_file_dataset_parquet_resume_skips_row_groups(self):
+        file_path = os.path.join(self.data_dir, "data.parquet")
+        pq.write_table(pa.table({"id": list(range(100))}), file_path, row_group_size=30)
+        source = self._source(file_path, FileFormat.PARQUET, chunk_size=35)
+        for _ in range(2):
+            response = await source.pull()
+            await source.ack(response.ack_info, success=True)
+        await source.teardown()
+
+        source = self._source(file_path, FileFormat.PARQUET, chunk_size=35)
+        self.assertEqual(await source.backlog(), 30)
+        rows = await self._read_all(source)
+        self.assertEqual(rows, [{"id": i} for i in range(70, 100)])
+        await source.teardown()
+
+    async def test_file_dataset_csv(self):
+        file_path = os.path.join(self.data_dir, "data.csv")
+        pcsv.write_csv(
+            pa.table({"id": list(range(50)), "name": [str(i) for i in range(50)]}),
+            file_path,
+        )
+        source = self._source(file_path, FileFormat.CSV, chunk_size=20)
+        self.assertEqual(await source.backlog(), 50)
+
+        rows = await self._read_all(source)
+
+        self.assertEqual(rows, [{"id": i, "name": i} for i in range(50)])
+        self.assertEqual(await source.backlog(), 0)
+        await source.teardown()
+
+    async def test_file_dataset_resume(self):
+        file_path = self._write_json_lines("data.jsonl", 0, 10)
+        source = self._source(file_path, FileFormat.JSON, chunk_size=3)
+
+        first = await source.pull()
+        second = await source.pull()
+        third = await source.pull()
+        await source.ack(first.ack_info, success=True)
+        await source.ack(third.ack_info, success=True)
+        self.assertEqual(await source.backlog(), 7)
+        await source.teardown()
+
+        # Only the rows acked in order are committed, so the second and third
+        # chunk are read again.
+        source = self._source(file_path, FileFormat.JSON, chunk_size=3)
+        rows = await self._read_all(source)
+        self.assertEqual(rows, second.payload + [{"id": i} for i in range(6, 10)])
+        self.assertEqual(await source.backlog(), 0)
+        await source.teardown()
+
+        source = self._source(file_path, FileFormat.JSON, chunk_size=3)
+        self.assertEqual(await self._read_all(source), [])
+
+    async def test_file_dataset_nack_retried(self):
+        file_path = self._write_json_lines("data.jsonl", 0, 4)
+        source = self._source(file_path, FileFormat.JSON, chunk_size=2)
+
+        response = await source.pull()
+        await source.ack(response.ack_info, success=False)
+
+        retried = await source.pull()
+        self.assertEqual(retried.payload, response.payload)
+        await source.ack(retried.ack_info, success=True)
+        self.assertEqual(await source.backlog(), 2)
+        await source.teardown()
+
+    async def test_file_dataset_files_split_across_replicas(self):
+        self._write_json_lines("a.jsonl", 0, 5)
+        self._write_json_lines("b.jsonl", 5, 10)
+        os.mkdir(os.path.join(self.data_dir, "nested"))
+        self._write_json_lines("nested/c.jsonl", 10, 15)
+        replica1 = self._source(self.data_dir, FileFormat.JSON, chunk_size=100)
+        replica2 = self._source(self.data_dir, FileFormat.JSON, chunk_size=100)
+        self.assertEqual(await replica1.backlog(), 15)
+
+        # Each replica claims its own file while the other holds its lock.
+        response1 = await replica1.pull()
+        response2 = await replica2.pull()
+        self.assertEqual(response1.payload, [{"id": i} for i in range(5)])
+        self.assertEqual(response2.payload, [{"id": i} for i in range(5, 10)])
+        await replica1.ack(response1.ack_info, success=True)
+        await replica2.ack(response2.ack_info, success=True)
+
+        rows = await self._read_all(replica1) + await self._read_all(replica2)
+        self.assertEqual(rows, [{"id": i} for i in range(10, 15)])
+        self.assertEqual(await replica2.backlog(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import json
-from typing import Any, Callable, Dict, Iterable, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union
 
 import fastparquet
 import fsspec
@@ -15,6 +15,10 @@ from buildflow.io.strategies.sink import SinkStrategy
 from buildflow.io.utils.schemas import converters
 from buildflow.types.portable import FileFormat
 
+# Keeps nulls in integer and boolean columns instead of converting them to floats
+# and objects, so every parquet file written for a type has the same schema.
+_NULLABLE_PANDAS_TYPES = {pa.int64(): pd.Int64Dtype(), pa.bool_(): pd.BooleanDtype()}
+
 
 class FileSink(SinkStrategy):
     def __init__(
@@ -43,21 +47,42 @@ class FileSink(SinkStrategy):
     ) -> Callable[[Any], Dict[str, Any]]:
         return converters.json_push_converter(user_defined_type)
 
-    async def push(self, batch: Iterable[Dict[str, Any]]):
+    def arrow_push_converter(
+        self, user_defined_type: Type
+    ) -> Optional[Callable[[List[Any]], pa.RecordBatch]]:
+        if self.file_format == FileFormat.JSON:
+            # JSON is written row by row so there is nothing to gain from Arrow.
+            return None
+        return converters.arrow_push_converter(user_defined_type)
+
+    async def push(self, batch: Union[pa.RecordBatch, Iterable[Dict[str, Any]]]):
         exists = self.file_system.exists(self.file_path)
+        is_arrow = isinstance(batch, pa.RecordBatch)
         if self.file_format == FileFormat.PARQUET:
             fastparquet.write(
                 self.file_path,
-                pd.DataFrame.from_records(batch),
+                (
+                    batch.to_pandas(types_mapper=_NULLABLE_PANDAS_TYPES.get)
+                    if is_arrow
+                    else pd.DataFrame.from_records(batch)
+                ),
                 append=exists,
                 open_with=self.file_system.open,
             )
         elif self.file_format == FileFormat.CSV:
-            if batch:
-                table = pa.Table.from_pylist(batch)
+            if len(batch) > 0:
+                if is_arrow:
+                    table = pa.Table.from_batches([batch])
+                else:
+                    table = pa.Table.from_pylist(batch)
                 if exists and self.file_system.size(self.file_path) > 0:
                     with self.file_system.open(self.file_path, "rb") as source:
-                        table = pa.concat_tables([table, pcsv.read_csv(source)])
+                        existing = pcsv.read_csv(source)
+                    if is_arrow:
+                        # The types read back from the CSV are inferred, so we
+                        # cast them to the schema of the batch.
+                        existing = existing.cast(table.schema)
+                    table = pa.concat_tables([table, existing])
                 with self.file_system.open(self.file_path, "wb") as output:
                     pcsv.write_csv(table, output)
         elif self.file_format == FileFormat.JSON:
@@ -0,0 +1,301 @@
+import asyncio
+import collections
+import dataclasses
+import datetime
+import enum
+import logging
+import random
+import string
+import time
+import typing
+from typing import Any, Callable, Deque, List, Optional, Type
+
+from buildflow.core.credentials import EmptyCredentials
+from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
+from buildflow.io.utils.schemas import converters
+
+# Number of distinct payloads generated up front. Payloads are cycled through so
+# generating them doesn't slow down pulls.
+_PAYLOAD_POOL_SIZE = 1024
+# Number of the most recent ack latencies that are kept.
+_NUM_LATENCY_SAMPLES = 100_000
+_MAX_GENERATED_LIST_LENGTH = 3
+# Max time a pull waits for elements to become available.
+_MAX_WAIT_SECS = 1
+
+
+class SizeDistribution(enum.Enum):
+    # Every payload is exactly payload_size_bytes.
+    FIXED = "fixed"
+    # Sizes are uniformly distributed between 0 and 2 * payload_size_bytes.
+    UNIFORM = "uniform"
+    # Sizes are exponentially distributed with a mean of payload_size_bytes.
+    EXPONENTIAL = "exponential"
+
+
+@dataclasses.dataclass
+class _LoadGeneratorAckInfo(AckInfo):
+    # time.monotonic() when each element was emitted.
+    emit_timestamps: List[float]
+
+
+class _PayloadGenerator:
+    def __init__(
+        self,
+        *,
+        schema: Optional[Type],
+        template: Any,
+        payload_size_bytes: int,
+        size_distribution: SizeDistribution,
+        seed: Optional[int],
+    ):
+        self.schema = schema
+        self.template = template
+        self.payload_size_bytes = payload_size_bytes
+        self.size_distribution = size_distribution
+        self.rand = random.Random(seed)
+
+    def _size(self) -> int:
+        if self.size_distribution == SizeDistribution.FIXED:
+            return self.payload_size_bytes
+        elif self.size_distribution == SizeDistribution.UNIFORM:
+            return self.rand.randint(0, 2 * self.payload_size_bytes)
+        elif self.size_distribution == SizeDistribution.EXPONENTIAL:
+            return int(self.rand.expovariate(1 / max(self.payload_size_bytes, 1)))
+        raise ValueError(f"unsupported size distribution: {self.size_distribution}")
+
+    def _bytes(self) -> bytes:
+        # NOTE: random.Random.randbytes requires python 3.9, and getrandbits(0)
+        # raises before python 3.9.
+        size = self._size()
+        if size == 0:
+            return b""
+        return self.rand.getrandbits(8 * size).to_bytes(size, "little")
+
+    def _string(self) -> str:
+        return "".join(self.rand.choices(string.ascii_letters, k=self._size()))
+
+    def _resize(self, template):
+        size = self._size()
+        if not template:
+            return template
+        repeats = size // len(template) + 1
+        return (template * repeats)[:size]
+
+    def _value(self, type_: Type) -> Any:
+        origin = typing.get_origin(type_)
+        if origin is typing.Union:
+            # Optional[X] (or any union) generates a value of the first type.
+            args = [arg for arg in typing.get_args(type_) if arg is not type(None)]
+            return self._value(args[0]) if args else None
+        if origin in (list, List):
+            (item_type,) = typing.get_args(type_) or (str,)
+            return [
+                self._value(item_type)
+                for _ in range(self.rand.randint(1, _MAX_GENERATED_LIST_LENGTH))
+            ]
+        if origin is dict or type_ is dict:
+            return {}
+        if dataclasses.is_dataclass(type_):
+            return self._dataclass(type_)
+        if type_ is bool:
+            return self.rand.random() < 0.5
+        if type_ is int:
+            return self.rand.randint(0, 2**31)
+        if type_ is float:
+            return self.rand.random()
+        if type_ is str:
+            return self._string()
+        if type_ is bytes:
+            return self._bytes()
+        if type_ is datetime.datetime:
+            return datetime.datetime.utcnow()
+        if type_ is datetime.date:
+            return datetime.date.today()
+        if isinstance(type_, type) and issubclass(type_, enum.Enum):
+            return self.rand.choice(list(type_))
+        return None
+
+    def _dataclass(self, type_: Type):
+        hints = typing.get_type_hints(type_)
+        return type_(
+            **{
+                field.name: self._value(hints[field.name])
+                for field in dataclasses.fields(type_)
+                if field.init
+            }
+        )
+
+    def generate(self) -> Any:
+        if self.schema is not None:
+            return self._value(self.schema)
+        if isinstance(self.template, (str, bytes)):
+            return self._resize(self.template)
+        if isinstance(self.template, dict):
+            return {
+                key: self._resize(value) if isinstance(value, (str, bytes)) else value
+                for key, value in self.template.items()
+            }
+        if self.template is not None:
+            return self.template
+        return self._bytes()
+
+
+class LoadGeneratorSource(SourceStrategy):
+    """Generates synthetic load, for benchmarking consumers.
+
+    Each pull returns batch_size elements, paced to elements_per_second (or as
+    fast as possible if None). Payloads are instances of a dataclass schema with
+    random field values, a template (strings and bytes are resized to the sampled
+    payload size), or random bytes.
+
+    By default the generator has an unlimited supply of elements and reports a
+    fixed backlog of initial_backlog. If arrival_rate is set, elements "arrive" at
+    that rate on top of the initial backlog, pulls only return elements that have
+    arrived, and the backlog grows or drains depending on how fast the consumer
+    keeps up.
+
+    Each element's emit time is kept in its ack info. The time until it is acked
+    is recorded (see ack_latencies_secs) and summarized on teardown. If
+    timestamp_field is set, the emit time (unix seconds) is also written to that
+    field of dict or dataclass payloads, so sinks can measure end to end latency.
+    """
+
+    def __init__(
+        self,
+        *,
+        credentials: EmptyCredentials,
+        batch_size: int = 100,
+        elements_per_second: Optional[float] = None,
+        schema: Optional[Type] = None,
+        template: Any = None,
+        payload_size_bytes: int = 100,
+        size_distribution: SizeDistribution = SizeDistribution.FIXED,
+        initial_backlog: int = 0,
+        arrival_rate: Optional[float] = None,
+        timestamp_field: Optional[str] = None,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(credentials=credentials, strategy_id="local-load-generator")
+        # configuration
+        self.batch_size = batch_size
+        self.elements_per_second = elements_per_second
+        self.initial_backlog = initial_backlog
+        self.arrival_rate = arrival_rate
+        self.timestamp_field = timestamp_field
+        generator = _PayloadGenerator(
+            schema=schema,
+            template=template,
+            payload_size_bytes=payload_size_bytes,
+            size_distribution=size_distribution,
+            seed=seed,
+        )
+        self._payloads = [generator.generate() for _ in range(_PAYLOAD_POOL_SIZE)]
+        # initial state
+        self._started_at: Optional[float] = None
+        self._num_emitted = 0
+        self._next_payload = 0
+        self.num_acked = 0
+        self.num_nacked = 0
+        self.ack_latencies_secs: Deque[float] = collections.deque(
+            maxlen=_NUM_LATENCY_SAMPLES
+        )
+
+    def _num_arrived(self, now: float) -> float:
+        if self.arrival_rate is None:
+            return float("inf")
+        return self.initial_backlog + self.arrival_rate * (now - self._started_at)
+
+    def _num_available(self, now: float) -> float:
+        available = self._num_arrived(now) - self._num_emitted
+        if self.elements_per_second is not None:
+            # Element i is due i / elements_per_second after the first pull.
+            num_due = self.elements_per_second * (now - self._started_at) + 1
+            available = min(available, num_due - self._num_emitted)
+        return available
+
+    async def _wait_for_elements(self) -> int:
+        """Returns how many elements to emit, waiting if none are available.
+
+        Returns 0 if still none are available after waiting (at most
+        _MAX_WAIT_SECS).
+        """
+        now = time.monotonic()
+        available = self._num_available(now)
+        if available < 1:
+            wait_secs = 0
+            if self.elements_per_second is not None:
+                due_at = self._started_at + self._num_emitted / self.elements_per_second
+                wait_secs = max(wait_secs, due_at - now)
+            arrived = self._num_arrived(now) - self._num_emitted
+            if arrived < 1:
+                if self.arrival_rate:
+                    wait_secs = max(wait_secs, (1 - arrived) / self.arrival_rate)
+                else:
+                    wait_secs = _MAX_WAIT_SECS
+            await asyncio.sleep(min(wait_secs, _MAX_WAIT_SECS))
+            available = self._num_available(time.monotonic())
+        return int(min(max(available, 0), self.batch_size))
+
+    def _with_timestamp(self, payload: Any, timestamp: float) -> Any:
+        if isinstance(payload, dict):
+            return {**payload, self.timestamp_field: timestamp}
+        if dataclasses.is_dataclass(payload):
+            return dataclasses.replace(payload, **{self.timestamp_field: timestamp})
+        return payload
+
+    async def pull(self) -> PullResponse:
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        num_elements = await self._wait_for_elements()
+        payload = []
+        for _ in range(num_elements):
+            payload.append(self._payloads[self._next_payload])
+            self._next_payload = (self._next_payload + 1) % len(self._payloads)
+        if self.timestamp_field is not None:
+            timestamp = time.time()
+            payload = [self._with_timestamp(p, timestamp) for p in payload]
+        self._num_emitted += num_elements
+        if self.elements_per_second is None:
+            # Give other tasks a chance to run.
+            await asyncio.sleep(0)
+        emitted_at = time.monotonic()
+        return PullResponse(
+            payload, _LoadGeneratorAckInfo(emit_timestamps=[emitted_at] * num_elements)
+        )
+
+    async def ack(self, to_ack: _LoadGeneratorAckInfo, success: bool):
+        now = time.monotonic()
+        if success:
+            self.num_acked += len(to_ack.emit_timestamps)
+        else:
+            self.num_nacked += len(to_ack.emit_timestamps)
+        self.ack_latencies_secs.extend(
+            now - emitted_at for emitted_at in to_ack.emit_timestamps
+        )
+
+    async def backlog(self) -> int:
+        if self.arrival_rate is None or self._started_at is None:
+            return self.initial_backlog
+        return max(int(self._num_arrived(time.monotonic()) - self._num_emitted), 0)
+
+    def max_batch_size(self) -> int:
+        return self.batch_size
+
+    def pull_converter(self, user_defined_type: Type) -> Callable[[Any], Any]:
+        return converters.identity()
+
+    async def teardown(self):
+        if not self.ack_latencies_secs:
+            return
+        latencies = sorted(self.ack_latencies_secs)
+        logging.info(
+            "load generator emitted %s elements (%s acked, %s nacked), ack latency "
+            "p50: %.4fs p99: %.4fs max: %.4fs",
+            self._num_emitted,
+            self.num_acked,
+            self.num_nacked,
+            latencies[len(latencies) // 2],
+            latencies[int(0.99 * (len(latencies) - 1))],
+            latencies[-1],
+        )
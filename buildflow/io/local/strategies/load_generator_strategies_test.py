@@ -0,0 +1,120 @@
+import dataclasses
+import time
+import unittest
+from typing import List, Optional
+
+from buildflow.io.local.strategies.load_generator_strategies import (
+    LoadGeneratorSource,
+    SizeDistribution,
+)
+
+
+@dataclasses.dataclass
+class Nested:
+    value: float
+
+
+@dataclasses.dataclass
+class Element:
+    id: int
+    name: str
+    tags: List[str]
+    nested: Nested
+    emitted_at: Optional[float] = None
+
+
+class LoadGeneratorStrategiesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_load_generator_as_fast_as_possible(self):
+        source = LoadGeneratorSource(credentials=None, batch_size=1000)
+
+        for _ in range(10):
+            response = await source.pull()
+            self.assertEqual(len(response.payload), 1000)
+            self.assertTrue(all(isinstance(p, bytes) for p in response.payload))
+            self.assertTrue(all(len(p) == 100 for p in response.payload))
+
+    async def test_load_generator_target_rate(self):
+        source = LoadGeneratorSource(
+            credentials=None, batch_size=10, elements_per_second=100
+        )
+
+        start = time.monotonic()
+        num_emitted = 0
+        while num_emitted < 50:
+            response = await source.pull()
+            num_emitted += len(response.payload)
+        elapsed = time.monotonic() - start
+
+        # The first element is emitted right away, so this takes at least 0.49s.
+        # The upper bound is loose since CI machines can be slow.
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertLess(elapsed, 5)
+
+    async def test_load_generator_schema(self):
+        source = LoadGeneratorSource(
+            credentials=None,
+            batch_size=5,
+            schema=Element,
+            payload_size_bytes=10,
+            timestamp_field="emitted_at",
+            seed=1,
+        )
+
+        before = time.time()
+        response = await source.pull()
+
+        for element in response.payload:
+            self.assertIsInstance(element, Element)
+            self.assertEqual(len(element.name), 10)
+            self.assertIsInstance(element.nested, Nested)
+            self.assertGreaterEqual(element.emitted_at, before)
+
+    async def test_load_generator_template_size_distribution(self):
+        source = LoadGeneratorSource(
+            credentials=None,
+            batch_size=1000,
+            template={"key": "value", "count": 1},
+            payload_size_bytes=50,
+            size_distribution=SizeDistribution.UNIFORM,
+            seed=1,
+        )
+
+        response = await source.pull()
+
+        sizes = [len(p["key"]) for p in response.payload]
+        self.assertTrue(all(0 <= size <= 100 for size in sizes))
+        self.assertGreater(len(set(sizes)), 1)
+        self.assertTrue(all(p["count"] == 1 for p in response.payload))
+
+    async def test_load_generator_draining_backlog(self):
+        source = LoadGeneratorSource(
+            credentials=None, batch_size=40, initial_backlog=100, arrival_rate=0
+        )
+        self.assertEqual(await source.backlog(), 100)
+
+        response = await source.pull()
+        self.assertEqual(len(response.payload), 40)
+        self.assertEqual(await source.backlog(), 60)
+
+        await source.pull()
+        response = await source.pull()
+        self.assertEqual(len(response.payload), 20)
+        self.assertEqual(await source.backlog(), 0)
+
+    async def test_load_generator_ack_latencies(self):
+        source = LoadGeneratorSource(credentials=None, batch_size=10)
+
+        response = await source.pull()
+        await source.ack(response.ack_info, success=True)
+        response = await source.pull()
+        await source.ack(response.ack_info, success=False)
+
+        self.assertEqual(source.num_acked, 10)
+        self.assertEqual(source.num_nacked, 10)
+        self.assertEqual(len(source.ack_latencies_secs), 20)
+        self.assertTrue(all(latency >= 0 for latency in source.ack_latencies_secs))
+        await source.teardown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import dataclasses
+from typing import Any, Optional, Type
+
+from buildflow.config.cloud_provider_config import LocalOptions
+from buildflow.core.credentials.empty_credentials import EmptyCredentials
+from buildflow.core.utils import uuid
+from buildflow.io.local.strategies.load_generator_strategies import (
+    LoadGeneratorSource,
+    SizeDistribution,
+)
+from buildflow.io.primitive import LocalPrimtive
+
+_DEFAULT_BATCH_SIZE = 100
+_DEFAULT_PAYLOAD_SIZE_BYTES = 100
+
+
+@dataclasses.dataclass
+class LoadGenerator(LocalPrimtive):
+    # Elements emitted per second, if None elements are emitted as fast as they
+    # are pulled.
+    elements_per_second: Optional[float] = None
+    batch_size: int = _DEFAULT_BATCH_SIZE
+    # Payloads are generated from the schema (a dataclass) if set, otherwise from
+    # the template. If neither is set payloads are random bytes.
+    schema: Optional[Type] = None
+    template: Any = None
+    payload_size_bytes: int = _DEFAULT_PAYLOAD_SIZE_BYTES
+    size_distribution: SizeDistribution = SizeDistribution.FIXED
+    # Simulated backlog, see: LoadGeneratorSource
+    initial_backlog: int = 0
+    arrival_rate: Optional[float] = None
+    # Field of dict / dataclass payloads the emit time is written to.
+    timestamp_field: Optional[str] = None
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if isinstance(self.size_distribution, str):
+            self.size_distribution = SizeDistribution(self.size_distribution)
+        self._primitive_id = uuid()
+
+    def primitive_id(self):
+        return self._primitive_id
+
+    @classmethod
+    def from_local_options(
+        cls, local_options: LocalOptions, **kwargs
+    ) -> "LoadGenerator":
+        return cls(**kwargs)
+
+    def source(self, credentials: EmptyCredentials) -> LoadGeneratorSource:
+        return LoadGeneratorSource(
+            credentials=credentials,
+            batch_size=self.batch_size,
+            elements_per_second=self.elements_per_second,
+            schema=self.schema,
+            template=self.template,
+            payload_size_bytes=self.payload_size_bytes,
+            size_distribution=self.size_distribution,
+            initial_backlog=self.initial_backlog,
+            arrival_rate=self.arrival_rate,
+            timestamp_field=self.timestamp_field,
+            seed=self.seed,
+        )
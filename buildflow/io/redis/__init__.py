@@ -0,0 +1,2 @@
+# ruff: noqa
+from .redis_stream import RedisStream
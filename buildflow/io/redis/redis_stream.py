@@ -0,0 +1,107 @@
+import dataclasses
+from typing import Optional
+
+from buildflow.config.cloud_provider_config import LocalOptions
+from buildflow.core.credentials.empty_credentials import EmptyCredentials
+from buildflow.core.types.redis_types import (
+    RedisConsumerGroup,
+    RedisHost,
+    RedisPort,
+    RedisStreamName,
+)
+from buildflow.io.primitive import LocalPrimtive
+from buildflow.io.redis.strategies.redis_stream_strategies import (
+    RedisStreamSink,
+    RedisStreamSource,
+)
+from buildflow.io.strategies.sink import SinkStrategy
+from buildflow.io.strategies.source import SourceStrategy
+
+_DEFAULT_PORT = 6379
+_DEFAULT_CONSUMER_GROUP = "buildflow"
+_DEFAULT_BATCH_SIZE = 1000
+_DEFAULT_MAX_WAIT_SECS = 1
+_DEFAULT_CLAIM_IDLE_SECS = 60
+
+
+@dataclasses.dataclass
+class RedisStream(LocalPrimtive):
+    host: RedisHost
+    stream_name: RedisStreamName
+    port: RedisPort = _DEFAULT_PORT
+    db: int = 0
+    password: Optional[str] = None
+    # source options
+    consumer_group: RedisConsumerGroup = dataclasses.field(
+        default=_DEFAULT_CONSUMER_GROUP, init=False
+    )
+    batch_size: int = dataclasses.field(default=_DEFAULT_BATCH_SIZE, init=False)
+    max_wait_secs: float = dataclasses.field(default=_DEFAULT_MAX_WAIT_SECS, init=False)
+    claim_idle_secs: float = dataclasses.field(
+        default=_DEFAULT_CLAIM_IDLE_SECS, init=False
+    )
+    # sink options
+    max_stream_length: Optional[int] = dataclasses.field(default=None, init=False)
+
+    def options(
+        self,
+        # Source options
+        # Consumer group the source reads with, it is created if it doesn't
+        # exist yet.
+        consumer_group: RedisConsumerGroup = _DEFAULT_CONSUMER_GROUP,
+        # Max number of entries to read at once.
+        batch_size: int = _DEFAULT_BATCH_SIZE,
+        # How long a read blocks waiting for new entries.
+        max_wait_secs: float = _DEFAULT_MAX_WAIT_SECS,
+        # Entries that are pending (not acked) for longer than this are
+        # redelivered.
+        claim_idle_secs: float = _DEFAULT_CLAIM_IDLE_SECS,
+        # Sink options
+        # If set the stream is trimmed to approximately this many entries.
+        max_stream_length: Optional[int] = None,
+    ) -> "RedisStream":
+        self.consumer_group = consumer_group
+        self.batch_size = batch_size
+        self.max_wait_secs = max_wait_secs
+        self.claim_idle_secs = claim_idle_secs
+        self.max_stream_length = max_stream_length
+        return self
+
+    def primitive_id(self):
+        return f"{self.host}-{self.port}-{self.db}-{self.stream_name}"
+
+    @classmethod
+    def from_local_options(
+        cls,
+        local_options: LocalOptions,
+        *,
+        host: RedisHost,
+        stream_name: RedisStreamName,
+        port: RedisPort = _DEFAULT_PORT,
+    ) -> "RedisStream":
+        return cls(host=host, stream_name=stream_name, port=port)
+
+    def source(self, credentials: EmptyCredentials) -> SourceStrategy:
+        return RedisStreamSource(
+            credentials=credentials,
+            host=self.host,
+            port=self.port,
+            stream_name=self.stream_name,
+            consumer_group=self.consumer_group,
+            db=self.db,
+            password=self.password,
+            batch_size=self.batch_size,
+            max_wait_secs=self.max_wait_secs,
+            claim_idle_secs=self.claim_idle_secs,
+        )
+
+    def sink(self, credentials: EmptyCredentials) -> SinkStrategy:
+        return RedisStreamSink(
+            credentials=credentials,
+            host=self.host,
+            port=self.port,
+            stream_name=self.stream_name,
+            db=self.db,
+            password=self.password,
+            max_stream_length=self.max_stream_length,
+        )
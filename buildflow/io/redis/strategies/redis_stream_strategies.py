@@ -0,0 +1,302 @@
+import dataclasses
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import redis.asyncio as redis
+from redis import exceptions as redis_exceptions
+
+from buildflow.core import tracing
+from buildflow.core.credentials import EmptyCredentials
+from buildflow.core.types.redis_types import (
+    RedisConsumerGroup,
+    RedisHost,
+    RedisPort,
+    RedisStreamName,
+)
+from buildflow.core.utils import uuid
+from buildflow.io.strategies.sink import Batch, SinkStrategy
+from buildflow.io.strategies.source import AckInfo, PullResponse, SourceStrategy
+from buildflow.io.utils.schemas import converters
+
+# Stream entry field holding the payload, all other fields hold the trace
+# context.
+_DATA_FIELD = b"data"
+# Cursor XAUTOCLAIM returns once it scanned all pending entries.
+_CLAIM_DONE_ID = b"0-0"
+
+
+@dataclasses.dataclass
+class _RedisStreamAckInfo(AckInfo):
+    entry_ids: List[bytes]
+
+
+def _create_client(
+    host: RedisHost, port: RedisPort, db: int, password: Optional[str]
+) -> redis.Redis:
+    return redis.Redis(host=host, port=port, db=db, password=password)
+
+
+class RedisStreamSource(SourceStrategy):
+    """Reads entries of a Redis stream as a member of a consumer group.
+
+    Each replica is its own consumer in the group. Entries are read with
+    XREADGROUP, blocking for up to max_wait_secs if the stream is empty.
+
+    Acks are coalesced: ids of successfully processed entries are acked with a
+    single XACK that is pipelined with the next read. Entries that are not
+    acked (nacks, or entries of a replica that went away) stay pending, and are
+    claimed with XAUTOCLAIM once they have been idle for claim_idle_secs.
+    """
+
+    def __init__(
+        self,
+        *,
+        credentials: EmptyCredentials,
+        host: RedisHost,
+        port: RedisPort,
+        stream_name: RedisStreamName,
+        consumer_group: RedisConsumerGroup,
+        db: int = 0,
+        password: Optional[str] = None,
+        batch_size: int = 1000,
+        max_wait_secs: float = 1,
+        claim_idle_secs: float = 60,
+    ):
+        super().__init__(credentials=credentials, strategy_id="redis-stream-source")
+        self.host = host
+        self.port = port
+        self.stream_name = stream_name
+        self.consumer_group = consumer_group
+        self.db = db
+        self.password = password
+        self.batch_size = batch_size
+        self.max_wait_secs = max_wait_secs
+        self.claim_idle_secs = claim_idle_secs
+        self.consumer_name = uuid()
+        # initial state
+        self.client: Optional[redis.Redis] = None
+        self._pending_acks: List[bytes] = []
+        self._claim_cursor = _CLAIM_DONE_ID
+        self._next_claim_at = time.monotonic() + claim_idle_secs
+
+    async def _get_client(self) -> redis.Redis:
+        if self.client is None:
+            client = _create_client(self.host, self.port, self.db, self.password)
+            try:
+                await client.xgroup_create(
+                    self.stream_name, self.consumer_group, id="0", mkstream=True
+                )
+            except redis_exceptions.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self.client = client
+        return self.client
+
+    def _take_pending_acks(self) -> List[bytes]:
+        pending_acks = self._pending_acks
+        self._pending_acks = []
+        return pending_acks
+
+    async def _flush_acks(self):
+        to_ack = self._take_pending_acks()
+        if not to_ack:
+            return
+        client = await self._get_client()
+        try:
+            await client.xack(self.stream_name, self.consumer_group, *to_ack)
+        except Exception:
+            self._pending_acks.extend(to_ack)
+            raise
+
+    async def _claim_idle_entries(self) -> List[Tuple[bytes, Dict]]:
+        """Claims entries that have been pending for longer than claim_idle_secs.
+
+        Pending entries are scanned over multiple pulls (batch_size at a time),
+        after a full scan the next one starts after claim_idle_secs.
+        """
+        if self._claim_cursor == _CLAIM_DONE_ID:
+            if time.monotonic() < self._next_claim_at:
+                return []
+            self._next_claim_at = time.monotonic() + self.claim_idle_secs
+        client = await self._get_client()
+        response = await client.xautoclaim(
+            self.stream_name,
+            self.consumer_group,
+            self.consumer_name,
+            min_idle_time=int(self.claim_idle_secs * 1000),
+            start_id=self._claim_cursor,
+            count=self.batch_size,
+        )
+        self._claim_cursor = response[0]
+        # Entries that were trimmed from the stream while pending can't be
+        # processed anymore.
+        if len(response) > 2 and response[2]:
+            self._pending_acks.extend(response[2])
+        return response[1]
+
+    def _to_pull_response(self, entries: List[Tuple[bytes, Dict]]) -> PullResponse:
+        payload = []
+        entry_ids = []
+        trace_contexts = []
+        for entry_id, fields in entries:
+            if entry_id is None:
+                continue
+            if not fields or _DATA_FIELD not in fields:
+                logging.error("redis stream entry %s has no data field", entry_id)
+                self._pending_acks.append(entry_id)
+                continue
+            trace_contexts.append(
+                {
+                    key.decode(): value.decode()
+                    for key, value in fields.items()
+                    if key != _DATA_FIELD
+                }
+            )
+            payload.append(fields[_DATA_FIELD])
+            entry_ids.append(entry_id)
+        return PullResponse(
+            payload=payload,
+            ack_info=_RedisStreamAckInfo(entry_ids=entry_ids),
+            trace_contexts=trace_contexts,
+        )
+
+    async def pull(self) -> PullResponse:
+        client = await self._get_client()
+        entries = await self._claim_idle_entries()
+        remaining = self.batch_size - len(entries)
+        to_ack = self._take_pending_acks()
+        if remaining <= 0 and not to_ack:
+            return self._to_pull_response(entries)
+        pipeline = client.pipeline(transaction=False)
+        if to_ack:
+            pipeline.xack(self.stream_name, self.consumer_group, *to_ack)
+        if remaining > 0:
+            pipeline.xreadgroup(
+                self.consumer_group,
+                self.consumer_name,
+                {self.stream_name: ">"},
+                count=remaining,
+                # Don't wait for new entries if we already have some.
+                block=None if entries else int(self.max_wait_secs * 1000),
+            )
+        try:
+            results = await pipeline.execute()
+        except Exception:
+            # XACK is idempotent so it is safe to retry the acks.
+            self._pending_acks.extend(to_ack)
+            raise
+        if remaining > 0 and results[-1]:
+            for _, stream_entries in results[-1]:
+                entries.extend(stream_entries)
+        return self._to_pull_response(entries)
+
+    async def ack(self, to_ack: _RedisStreamAckInfo, success: bool):
+        if not success:
+            # The entries stay pending and are claimed again once they've been
+            # idle for claim_idle_secs.
+            return
+        self._pending_acks.extend(to_ack.entry_ids)
+        if len(self._pending_acks) >= self.batch_size:
+            await self._flush_acks()
+
+    async def backlog(self) -> int:
+        """Returns the number of entries not delivered yet plus pending entries.
+
+        If Redis can't compute the lag of the group (e.g. after entries were
+        deleted, or before Redis 7) the length of the stream is used instead.
+        """
+        client = await self._get_client()
+        for group in await client.xinfo_groups(self.stream_name):
+            name = group["name"]
+            if isinstance(name, bytes):
+                name = name.decode()
+            if name != self.consumer_group:
+                continue
+            lag = group.get("lag")
+            if lag is None:
+                lag = await client.xlen(self.stream_name)
+            return lag + group["pending"]
+        return 0
+
+    def max_batch_size(self) -> int:
+        return self.batch_size
+
+    def pull_converter(self, type_: Optional[Type]) -> Callable[[bytes], Any]:
+        return converters.bytes_pull_converter(type_)
+
+    async def teardown(self):
+        if self.client is not None:
+            try:
+                await self._flush_acks()
+                # Every replica joins the group under a new name, so we remove our
+                # consumer unless it still owns entries (other consumers claim
+                # those once they are idle).
+                pending = await self.client.xpending_range(
+                    self.stream_name,
+                    self.consumer_group,
+                    min="-",
+                    max="+",
+                    count=1,
+                    consumername=self.consumer_name,
+                )
+                if not pending:
+                    await self.client.xgroup_delconsumer(
+                        self.stream_name, self.consumer_group, self.consumer_name
+                    )
+            finally:
+                await self.client.aclose()
+                self.client = None
+
+
+class RedisStreamSink(SinkStrategy):
+    """Appends to a Redis stream, with one pipelined XADD per batch.
+
+    If max_stream_length is set the stream is (approximately) trimmed to that
+    many entries, acked entries are otherwise never removed from the stream.
+    """
+
+    def __init__(
+        self,
+        *,
+        credentials: EmptyCredentials,
+        host: RedisHost,
+        port: RedisPort,
+        stream_name: RedisStreamName,
+        db: int = 0,
+        password: Optional[str] = None,
+        max_stream_length: Optional[int] = None,
+    ):
+        super().__init__(credentials=credentials, strategy_id="redis-stream-sink")
+        self.host = host
+        self.port = port
+        self.stream_name = stream_name
+        self.db = db
+        self.password = password
+        self.max_stream_length = max_stream_length
+        self.client: Optional[redis.Redis] = None
+
+    async def push(self, batch: Batch):
+        if self.client is None:
+            self.client = _create_client(self.host, self.port, self.db, self.password)
+        # Propagates the current trace (if any) to the consumers of the stream.
+        trace_context = tracing.inject_context()
+        pipeline = self.client.pipeline(transaction=False)
+        for element in batch:
+            pipeline.xadd(
+                self.stream_name,
+                {_DATA_FIELD: element, **trace_context},
+                maxlen=self.max_stream_length,
+                approximate=True,
+            )
+        await pipeline.execute()
+
+    def push_converter(
+        self, user_defined_type: Optional[Type]
+    ) -> Callable[[Any], bytes]:
+        return converters.bytes_push_converter(user_defined_type)
+
+    async def teardown(self):
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
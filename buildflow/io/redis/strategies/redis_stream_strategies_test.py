@@ -0,0 +1,198 @@
+import unittest
+from unittest import mock
+
+from redis import exceptions as redis_exceptions
+
+from buildflow.io.redis.strategies import redis_stream_strategies
+
+
+def _mock_client():
+    client = mock.MagicMock()
+    for method in (
+        "xgroup_create",
+        "xack",
+        "xautoclaim",
+        "xinfo_groups",
+        "xlen",
+        "xpending_range",
+        "xgroup_delconsumer",
+        "aclose",
+    ):
+        setattr(client, method, mock.AsyncMock())
+    client.xpending_range.return_value = []
+    pipeline = mock.MagicMock()
+    # XREADGROUP returns None if no entries were read.
+    pipeline.execute = mock.AsyncMock(return_value=[None])
+    client.pipeline.return_value = pipeline
+    return client
+
+
+class RedisStreamStrategiesTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = _mock_client()
+        self.pipeline = self.client.pipeline.return_value
+        patcher = mock.patch.object(
+            redis_stream_strategies, "_create_client", return_value=self.client
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _source(self, **kwargs):
+        return redis_stream_strategies.RedisStreamSource(
+            credentials=None,
+            host="localhost",
+            port=6379,
+            stream_name="stream",
+            consumer_group="group",
+            **kwargs,
+        )
+
+    async def test_redis_stream_sink_push(self):
+        sink = redis_stream_strategies.RedisStreamSink(
+            credentials=None,
+            host="localhost",
+            port=6379,
+            stream_name="stream",
+            max_stream_length=100,
+        )
+
+        await sink.push([b"a", b"b", b"c"])
+
+        self.assertEqual(
+            self.pipeline.xadd.call_args_list,
+            [
+                mock.call("stream", {b"data": data}, maxlen=100, approximate=True)
+                for data in [b"a", b"b", b"c"]
+            ],
+        )
+        self.pipeline.execute.assert_awaited_once()
+
+        await sink.teardown()
+        self.client.aclose.assert_awaited_once()
+
+    async def test_redis_stream_source_pull_and_coalesced_ack(self):
+        source = self._source(batch_size=10, max_wait_secs=2)
+        self.pipeline.execute.return_value = [
+            [
+                [
+                    b"stream",
+                    [
+                        (b"1-0", {b"data": b"a", b"traceparent": b"tp"}),
+                        (b"2-0", {b"data": b"b"}),
+                    ],
+                ]
+            ]
+        ]
+
+        response = await source.pull()
+
+        self.client.xgroup_create.assert_awaited_once_with(
+            "stream", "group", id="0", mkstream=True
+        )
+        self.pipeline.xreadgroup.assert_called_once_with(
+            "group", source.consumer_name, {"stream": ">"}, count=10, block=2000
+        )
+        self.pipeline.xack.assert_not_called()
+        self.assertEqual(response.payload, [b"a", b"b"])
+        self.assertEqual(response.trace_contexts, [{"traceparent": "tp"}, {}])
+
+        # Acks are sent with the next read.
+        await source.ack(response.ack_info, success=True)
+        self.client.xack.assert_not_awaited()
+        self.pipeline.execute.return_value = [2, []]
+        response = await source.pull()
+
+        self.pipeline.xack.assert_called_once_with("stream", "group", b"1-0", b"2-0")
+        self.assertEqual(response.payload, [])
+
+    async def test_redis_stream_source_nack_not_acked(self):
+        source = self._source()
+        self.pipeline.execute.return_value = [
+            [[b"stream", [(b"1-0", {b"data": b"a"})]]]
+        ]
+        response = await source.pull()
+
+        await source.ack(response.ack_info, success=False)
+        self.client.xpending_range.return_value = [{"message_id": b"1-0"}]
+        await source.teardown()
+
+        self.pipeline.xack.assert_not_called()
+        self.client.xack.assert_not_awaited()
+        # The consumer still owns the nacked entry, so it isn't removed.
+        self.client.xgroup_delconsumer.assert_not_awaited()
+        self.client.aclose.assert_awaited_once()
+
+    async def test_redis_stream_source_teardown_removes_consumer(self):
+        source = self._source()
+        self.pipeline.execute.return_value = [
+            [[b"stream", [(b"1-0", {b"data": b"a"})]]]
+        ]
+        response = await source.pull()
+
+        await source.ack(response.ack_info, success=True)
+        await source.teardown()
+
+        self.client.xack.assert_awaited_once_with("stream", "group", b"1-0")
+        self.client.xpending_range.assert_awaited_once_with(
+            "stream",
+            "group",
+            min="-",
+            max="+",
+            count=1,
+            consumername=source.consumer_name,
+        )
+        self.client.xgroup_delconsumer.assert_awaited_once_with(
+            "stream", "group", source.consumer_name
+        )
+        self.client.aclose.assert_awaited_once()
+
+    async def test_redis_stream_source_group_exists(self):
+        self.client.xgroup_create.side_effect = redis_exceptions.ResponseError(
+            "BUSYGROUP Consumer Group name already exists"
+        )
+        source = self._source()
+
+        response = await source.pull()
+
+        self.assertEqual(response.payload, [])
+
+    async def test_redis_stream_source_claims_idle_entries(self):
+        source = self._source(batch_size=2, claim_idle_secs=0)
+        self.client.xautoclaim.return_value = [
+            b"0-0",
+            [(b"1-0", {b"data": b"a"}), (b"2-0", {b"data": b"b"})],
+            [b"3-0"],
+        ]
+
+        response = await source.pull()
+
+        self.client.xautoclaim.assert_awaited_once_with(
+            "stream",
+            "group",
+            source.consumer_name,
+            min_idle_time=0,
+            start_id=b"0-0",
+            count=2,
+        )
+        self.assertEqual(response.payload, [b"a", b"b"])
+        # The batch is full, but the deleted entry is acked.
+        self.pipeline.xreadgroup.assert_not_called()
+        self.pipeline.xack.assert_called_once_with("stream", "group", b"3-0")
+
+    async def test_redis_stream_source_backlog(self):
+        source = self._source()
+        self.client.xinfo_groups.return_value = [
+            {"name": b"other", "pending": 100, "lag": 100},
+            {"name": b"group", "pending": 3, "lag": 7},
+        ]
+        self.assertEqual(await source.backlog(), 10)
+
+        self.client.xinfo_groups.return_value = [
+            {"name": b"group", "pending": 3, "lag": None}
+        ]
+        self.client.xlen.return_value = 20
+        self.assertEqual(await source.backlog(), 23)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import enum
 import os
-from typing import Any, Callable, Dict, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Type, Union
 
 from buildflow.core.credentials.aws_credentials import AWSCredentials
 from buildflow.core.credentials.gcp_credentials import GCPCredentials
@@ -40,6 +40,11 @@ class SnowflakeTableSink(SinkStrategy):
     ) -> Callable[[Any], Dict[str, Any]]:
         return self.bucket_sink.push_converter(user_defined_type)
 
+    def arrow_push_converter(
+        self, user_defined_type: Type
+    ) -> Optional[Callable[[List[Any]], Any]]:
+        return self.bucket_sink.arrow_push_converter(user_defined_type)
+
     async def push(self, batch: Batch):
         await self.bucket_sink.push(batch)
         self.bucket_sink.file_path = self._get_new_file_path()
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Type
+from typing import Any, Callable, List, Optional, Type
 
 from buildflow.core.credentials import CredentialType
 from buildflow.io.strategies._strategy import StategyType, Strategy, StrategyID
@@ -21,6 +21,18 @@ class SinkStrategy(Strategy):
     def push_converter(self, user_defined_type: Type) -> Callable[[Any], Any]:
         raise NotImplementedError("push_converter not implemented")
 
+    def arrow_push_converter(
+        self, user_defined_type: Type
+    ) -> Optional[Callable[[List[Any]], Any]]:
+        """Returns a converter from a batch of outputs to a pyarrow.RecordBatch.
+
+        Sinks that write tabular data can override this to receive a single
+        RecordBatch in `push` instead of a list of elements converted with
+        `push_converter`. Returning None (the default) means the sink only
+        accepts lists.
+        """
+        return None
+
     async def teardown(self):
         """Teardown is called when the sink is no longer needed.
 
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Any, Callable, Iterable, Type
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
 
 from buildflow.core.credentials import CredentialType
 from buildflow.io.strategies._strategy import StategyType, Strategy, StrategyID
@@ -13,6 +13,10 @@ class AckInfo:
 class PullResponse:
     payload: Iterable[Any]
     ack_info: AckInfo
+    # Optional trace context propagated with each element of the payload (e.g.
+    # from the message attributes). Used to link the consumer spans to the
+    # spans of the producer.
+    trace_contexts: Optional[List[Dict[str, str]]] = None
 
 
 class SourceStrategy(Strategy):
@@ -0,0 +1,43 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from buildflow.types.portable import FileChangeEvent, PortableFileChangeEventType
+
+DEFAULT_PREFETCH_CONCURRENCY = 16
+DEFAULT_MAX_PREFETCH_BYTES = 256 * 1024 * 1024
+
+
+async def prefetch_blobs(
+    events: Iterable[FileChangeEvent],
+    *,
+    max_concurrent_prefetches: int = DEFAULT_PREFETCH_CONCURRENCY,
+    max_prefetch_bytes: int = DEFAULT_MAX_PREFETCH_BYTES,
+):
+    """Downloads the blobs of a batch of file change events concurrently.
+
+    At most max_concurrent_prefetches blobs are downloaded at once. No new
+    downloads are started once max_prefetch_bytes were downloaded (the sizes of
+    the blobs aren't known up front, so the in flight downloads can go over the
+    budget). Blobs that weren't prefetched, or failed to download, are read when
+    they are accessed. Delete events are skipped, since they have no blob.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_prefetches)
+    num_bytes = 0
+
+    async def prefetch(event: FileChangeEvent):
+        nonlocal num_bytes
+        if (
+            event.file_path is None
+            or event.portable_event_type == PortableFileChangeEventType.DELETED
+        ):
+            return
+        async with semaphore:
+            if num_bytes >= max_prefetch_bytes:
+                return
+            try:
+                num_bytes += await event.prefetch()
+            except Exception:
+                logging.exception("failed to prefetch blob of %s", event.file_path)
+
+    await asyncio.gather(*(prefetch(event) for event in events))
@@ -0,0 +1,70 @@
+import asyncio
+import dataclasses
+import unittest
+
+from buildflow.io.utils.blob_prefetch import prefetch_blobs
+from buildflow.types.portable import FileChangeEvent, PortableFileChangeEventType
+
+
+@dataclasses.dataclass
+class FakeFileChangeEvent(FileChangeEvent):
+    contents: bytes = b""
+    in_flight: list = dataclasses.field(default_factory=lambda: [0])
+    max_in_flight: list = dataclasses.field(default_factory=lambda: [0])
+
+    async def _async_download_blob(self) -> bytes:
+        self.in_flight[0] += 1
+        self.max_in_flight[0] = max(self.max_in_flight[0], self.in_flight[0])
+        await asyncio.sleep(0.01)
+        self.in_flight[0] -= 1
+        return self.contents
+
+
+class BlobPrefetchTest(unittest.IsolatedAsyncioTestCase):
+    def _events(self, num_events: int, contents: bytes = b"data"):
+        in_flight = [0]
+        max_in_flight = [0]
+        return [
+            FakeFileChangeEvent(
+                file_path=f"file{i}",
+                event_type=PortableFileChangeEventType.CREATED,
+                metadata={},
+                contents=contents,
+                in_flight=in_flight,
+                max_in_flight=max_in_flight,
+            )
+            for i in range(num_events)
+        ]
+
+    async def test_prefetch_blobs_max_concurrency(self):
+        events = self._events(10)
+
+        await prefetch_blobs(events, max_concurrent_prefetches=3)
+
+        self.assertEqual(events[0].max_in_flight[0], 3)
+        self.assertEqual([e.blob for e in events], [b"data"] * 10)
+
+    async def test_prefetch_blobs_max_bytes(self):
+        events = self._events(10, contents=b"0123456789")
+
+        await prefetch_blobs(events, max_concurrent_prefetches=1, max_prefetch_bytes=25)
+
+        self.assertEqual(
+            [e._prefetched_blob is not None for e in events],
+            [True] * 3 + [False] * 7,
+        )
+
+    async def test_prefetch_blobs_skips_deleted(self):
+        events = self._events(2)
+        events[0].event_type = PortableFileChangeEventType.DELETED
+
+        await prefetch_blobs(events, max_concurrent_prefetches=2)
+
+        self.assertIsNone(events[0]._prefetched_blob)
+        self.assertEqual(events[1]._prefetched_blob, b"data")
+        # Only a single download was started.
+        self.assertEqual(events[0].max_in_flight[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,101 @@
+import asyncio
+import functools
 import logging
-from typing import Optional
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
 
+import aiobotocore.session
 import boto3
 import botocore.exceptions
+from aiobotocore.config import AioConfig
 from botocore import UNSIGNED
 from botocore.client import Config
 
 from buildflow.core.credentials import AWSCredentials
 from buildflow.core.types.aws_types import AWSRegion
 
+# Max number of concurrent HTTP connections (and so requests) of an async client.
+_DEFAULT_MAX_POOL_CONNECTIONS = 100
+
+
+class AsyncAWSClient:
+    """An aiobotocore client that is shared by the strategies of a process.
+
+    aiobotocore clients have to be created inside of the event loop they are used
+    in, but strategies are constructed outside of it, so a client is created on
+    first use in each event loop. Its connection pool is sized for the largest pool
+    requested before then. Each strategy should call `close` once it is done with
+    the client, the clients are closed once all of them did.
+    """
+
+    def __init__(self, create_client_context: Callable[[int], Any]) -> None:
+        self._create_client_context = create_client_context
+        self.max_pool_connections = 0
+        self._num_users = 0
+        # Clients (and their connections) can't be shared across event loops, so
+        # we keep a client context and client per loop.
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[Any, Any]] = {}
+        self._locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = {}
+
+    def _acquire(self, max_pool_connections: int):
+        self.max_pool_connections = max(self.max_pool_connections, max_pool_connections)
+        self._num_users += 1
+
+    async def get(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is not None:
+            return client[1]
+        # The connections of clients of closed loops are already gone.
+        for other_loop in [other for other in self._clients if other.is_closed()]:
+            del self._clients[other_loop]
+            self._locks.pop(other_loop, None)
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            if loop not in self._clients:
+                client_context = self._create_client_context(self.max_pool_connections)
+                self._clients[loop] = (
+                    client_context,
+                    await client_context.__aenter__(),
+                )
+        return self._clients[loop][1]
+
+    async def close(self):
+        self._num_users = max(self._num_users - 1, 0)
+        if self._num_users > 0:
+            return
+        clients = self._clients
+        self._clients = {}
+        self._locks = {}
+        current_loop = asyncio.get_running_loop()
+        for loop, (client_context, _) in clients.items():
+            # Each client has to be closed in the loop it was created in.
+            if loop is current_loop:
+                await client_context.__aexit__(None, None, None)
+            elif loop.is_running():
+                await asyncio.wrap_future(
+                    asyncio.run_coroutine_threadsafe(
+                        client_context.__aexit__(None, None, None), loop
+                    )
+                )
+            elif not loop.is_closed():
+                logging.warning(
+                    "unable to close aws client of an event loop that isn't running"
+                )
+
+
+# Clients are cached per process and shared by all strategies (and
+# dependencies) using the same credentials and region. boto3 and aiobotocore
+# clients are safe to share between threads / tasks, boto3 resources are not so
+# they are cached per thread.
+_CACHE_LOCK = threading.Lock()
+# Whether anonymous credentials are used, checking the credentials requires a
+# request to STS.
+_USE_ANONYMOUS_CREDS: Dict[Tuple, bool] = {}
+_BOTO_CLIENTS: Dict[Tuple, Any] = {}
+_ASYNC_CLIENTS: Dict[Tuple, AsyncAWSClient] = {}
+_THREAD_LOCAL = threading.local()
+
 
 class AWSClients:
     def __init__(
@@ -16,11 +103,23 @@ class AWSClients:
         credentials: AWSCredentials,
         region: Optional[AWSRegion],
     ) -> None:
-        # TODO: add some caching for clients
         self.creds = credentials
         self.region = region
+        self._cache_key = (
+            credentials.access_key_id,
+            credentials.secret_access_key,
+            credentials.session_token,
+            region,
+        )
+        use_anonymous_creds = _USE_ANONYMOUS_CREDS.get(self._cache_key)
+        if use_anonymous_creds is None:
+            use_anonymous_creds = self._check_anonymous_creds()
+            _USE_ANONYMOUS_CREDS[self._cache_key] = use_anonymous_creds
+        self.use_anonymous_creds = use_anonymous_creds
+
+    def _check_anonymous_creds(self) -> bool:
         self.use_anonymous_creds = False
-        sts_client = self._get_boto_client("sts")
+        sts_client = self._create_boto_client("sts")
         try:
             # Verify credentials of caller.
             sts_client.get_caller_identity()
@@ -28,9 +127,21 @@ class AWSClients:
             logging.warning(
                 "no credentials in environment found, using anonymous credentials"
             )
-            self.use_anonymous_creds = True
+            return True
+        return False
 
     def _get_boto_client(self, service_name: str):
+        key = (self._cache_key, service_name)
+        client = _BOTO_CLIENTS.get(key)
+        if client is None:
+            with _CACHE_LOCK:
+                client = _BOTO_CLIENTS.get(key)
+                if client is None:
+                    client = self._create_boto_client(service_name)
+                    _BOTO_CLIENTS[key] = client
+        return client
+
+    def _create_boto_client(self, service_name: str):
         if self.use_anonymous_creds:
             return boto3.client(
                 service_name=service_name,
@@ -50,6 +161,60 @@ class AWSClients:
             aws_secret_access_key=self.creds.secret_access_key,
         )
 
+    def _get_async_client(
+        self, service_name: str, max_pool_connections: int
+    ) -> AsyncAWSClient:
+        key = (self._cache_key, service_name)
+        with _CACHE_LOCK:
+            client = _ASYNC_CLIENTS.get(key)
+            if client is None:
+                client = AsyncAWSClient(
+                    functools.partial(self._create_async_client_context, service_name)
+                )
+                _ASYNC_CLIENTS[key] = client
+            client._acquire(max_pool_connections)
+        return client
+
+    def _create_async_client_context(
+        self, service_name: str, max_pool_connections: int
+    ):
+        session = aiobotocore.session.get_session()
+        if self.use_anonymous_creds:
+            client_context = session.create_client(
+                service_name=service_name,
+                region_name=self.region,
+                config=AioConfig(
+                    signature_version=UNSIGNED,
+                    max_pool_connections=max_pool_connections,
+                ),
+            )
+        elif self.creds.session_token:
+            client_context = session.create_client(
+                service_name=service_name,
+                region_name=self.region,
+                aws_session_token=self.creds.session_token,
+                config=AioConfig(max_pool_connections=max_pool_connections),
+            )
+        else:
+            client_context = session.create_client(
+                service_name=service_name,
+                region_name=self.region,
+                aws_access_key_id=self.creds.access_key_id,
+                aws_secret_access_key=self.creds.secret_access_key,
+                config=AioConfig(max_pool_connections=max_pool_connections),
+            )
+        return client_context
+
+    def async_sqs_client(
+        self, max_pool_connections: int = _DEFAULT_MAX_POOL_CONNECTIONS
+    ) -> AsyncAWSClient:
+        return self._get_async_client("sqs", max_pool_connections)
+
+    def async_s3_client(
+        self, max_pool_connections: int = _DEFAULT_MAX_POOL_CONNECTIONS
+    ) -> AsyncAWSClient:
+        return self._get_async_client("s3", max_pool_connections)
+
     def sqs_client(self):
         return self._get_boto_client("sqs")
 
@@ -57,6 +222,17 @@ class AWSClients:
         return self._get_boto_client("s3")
 
     def s3_resource(self):
+        resources = getattr(_THREAD_LOCAL, "s3_resources", None)
+        if resources is None:
+            resources = {}
+            _THREAD_LOCAL.s3_resources = resources
+        resource = resources.get(self._cache_key)
+        if resource is None:
+            resource = self._create_s3_resource()
+            resources[self._cache_key] = resource
+        return resource
+
+    def _create_s3_resource(self):
         if self.use_anonymous_creds:
             return boto3.resource(
                 service_name="s3",
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+import unittest
+from unittest import mock
+
+from moto import mock_sqs, mock_sts
+
+from buildflow.core.credentials.aws_credentials import AWSCredentials
+from buildflow.core.options.credentials_options import CredentialsOptions
+from buildflow.io.utils.clients import aws_clients
+
+
+class AWSClientsTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        for mock_service in (mock_sts(), mock_sqs()):
+            mock_service.start()
+            self.addCleanup(mock_service.stop)
+        os.environ["AWS_ACCESS_KEY_ID"] = "dummy"
+        os.environ["AWS_SECRET_ACCESS_KEY"] = "dummy"
+        self.creds = AWSCredentials(CredentialsOptions.default())
+        aws_clients._USE_ANONYMOUS_CREDS.clear()
+        aws_clients._BOTO_CLIENTS.clear()
+        aws_clients._ASYNC_CLIENTS.clear()
+
+    def test_credentials_checked_once(self):
+        with mock.patch.object(
+            aws_clients.AWSClients, "_check_anonymous_creds", return_value=False
+        ) as check:
+            aws_clients.AWSClients(credentials=self.creds, region="us-east-1")
+            aws_clients.AWSClients(credentials=self.creds, region="us-east-1")
+            self.assertEqual(check.call_count, 1)
+
+            aws_clients.AWSClients(credentials=self.creds, region="us-west-2")
+            self.assertEqual(check.call_count, 2)
+
+    def test_boto_clients_cached(self):
+        clients = aws_clients.AWSClients(credentials=self.creds, region="us-east-1")
+        other_clients = aws_clients.AWSClients(
+            credentials=self.creds, region="us-east-1"
+        )
+        other_region = aws_clients.AWSClients(
+            credentials=self.creds, region="us-west-2"
+        )
+
+        self.assertIs(clients.sqs_client(), other_clients.sqs_client())
+        self.assertIs(clients.s3_resource(), other_clients.s3_resource())
+        self.assertIsNot(clients.sqs_client(), other_region.sqs_client())
+        self.assertIsNot(clients.sqs_client(), clients.s3_client())
+
+    async def test_async_client_shared(self):
+        clients = aws_clients.AWSClients(credentials=self.creds, region="us-east-1")
+        sink_client = clients.async_sqs_client(max_pool_connections=10)
+        source_client = clients.async_sqs_client(max_pool_connections=20)
+
+        self.assertIs(sink_client, source_client)
+        self.assertEqual(sink_client.max_pool_connections, 20)
+
+        client = await sink_client.get()
+        self.assertIs(client, await source_client.get())
+        self.assertEqual(client._client_config.max_pool_connections, 20)
+
+        # The client stays open until all of its users closed it.
+        await sink_client.close()
+        self.assertIs(client, await source_client.get())
+        await source_client.close()
+        self.assertEqual(source_client._clients, {})
+
+    async def test_async_client_per_loop(self):
+        closed_in_loops = []
+
+        def create_client_context(max_pool_connections):
+            async def aexit(*args):
+                closed_in_loops.append(asyncio.get_running_loop())
+
+            client_context = mock.MagicMock()
+            client_context.__aenter__ = mock.AsyncMock(side_effect=object)
+            client_context.__aexit__ = mock.AsyncMock(side_effect=aexit)
+            return client_context
+
+        async_client = aws_clients.AsyncAWSClient(create_client_context)
+        async_client._acquire(10)
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+        try:
+            client = await async_client.get()
+            other_client = asyncio.run_coroutine_threadsafe(
+                async_client.get(), other_loop
+            ).result()
+            self.assertIsNot(client, other_client)
+            self.assertIs(client, await async_client.get())
+
+            await async_client.close()
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+
+        # Each client is closed in the loop it was created in.
+        self.assertCountEqual(closed_in_loops, [asyncio.get_running_loop(), other_loop])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,11 @@
-from typing import Optional
+import datetime
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
+import google.auth.credentials
+import google.auth.transport.requests
 from google.api_core import client_options
 from google.cloud import bigquery, bigquery_storage_v1, monitoring_v3, pubsub, storage
 from google.cloud.bigquery_storage_v1.services.big_query_write.async_client import (
@@ -10,6 +16,68 @@ from google.pubsub_v1.services.subscriber import SubscriberAsyncClient
 
 from buildflow.core.credentials import GCPCredentials
 
+# Cached credentials are refreshed this long before their token expires, so
+# requests don't have to wait on a refresh.
+_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+_REFRESH_CHECK_INTERVAL_SECS = 60
+
+# Credentials and clients are cached per process and shared by all strategies
+# (and dependencies) using the same credentials and quota project. The sync
+# clients are safe to share between threads. The async clients are bound to the
+# event loop they are first used in, so those are not cached.
+_CACHE_LOCK = threading.Lock()
+_CREDENTIALS: Dict[Tuple, google.auth.credentials.Credentials] = {}
+_CLIENTS: Dict[Tuple, Any] = {}
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _needs_refresh(creds: google.auth.credentials.Credentials) -> bool:
+    if isinstance(creds, google.auth.credentials.AnonymousCredentials):
+        return False
+    if creds.token is None:
+        return True
+    # google-auth stores the expiry as a naive UTC datetime.
+    now = datetime.datetime.utcnow()
+    return creds.expiry is not None and creds.expiry - _REFRESH_MARGIN <= now
+
+
+def _refresh_credentials():
+    request = google.auth.transport.requests.Request()
+    while True:
+        time.sleep(_REFRESH_CHECK_INTERVAL_SECS)
+        for creds in list(_CREDENTIALS.values()):
+            if not _needs_refresh(creds):
+                continue
+            try:
+                creds.refresh(request)
+            except Exception:
+                # Requests will refresh the credentials themselves if needed.
+                logging.exception("failed to refresh gcp credentials")
+
+
+def _start_refresh_thread():
+    global _refresh_thread
+    if _refresh_thread is None:
+        _refresh_thread = threading.Thread(
+            target=_refresh_credentials, name="gcp-credentials-refresh", daemon=True
+        )
+        _refresh_thread.start()
+
+
+def _cached_creds(
+    credentials: GCPCredentials, quota_project_id: Optional[str]
+) -> google.auth.credentials.Credentials:
+    key = (credentials.service_account_info, quota_project_id)
+    creds = _CREDENTIALS.get(key)
+    if creds is None:
+        with _CACHE_LOCK:
+            creds = _CREDENTIALS.get(key)
+            if creds is None:
+                creds = credentials.get_creds(quota_project_id)
+                _CREDENTIALS[key] = creds
+                _start_refresh_thread()
+    return creds
+
 
 class GCPClients:
     def __init__(
@@ -18,14 +86,33 @@ class GCPClients:
         credentials: Optional[GCPCredentials] = None,
         quota_project_id: Optional[str] = None,
     ):
-        # TODO: we should probably cache the credentials per quota project id.
-        self.creds = credentials.get_creds(quota_project_id)
+        self.creds = _cached_creds(credentials, quota_project_id)
+        self._cache_key = (credentials.service_account_info, quota_project_id)
+
+    def _cached_client(self, name: str, create_client: Callable[[], Any], *args):
+        key = (self._cache_key, name, *args)
+        client = _CLIENTS.get(key)
+        if client is None:
+            with _CACHE_LOCK:
+                client = _CLIENTS.get(key)
+                if client is None:
+                    client = create_client()
+                    _CLIENTS[key] = client
+        return client
 
     def get_storage_client(self, project: str = None) -> storage.Client:
-        return storage.Client(credentials=self.creds, project=project)
+        return self._cached_client(
+            "storage",
+            lambda: storage.Client(credentials=self.creds, project=project),
+            project,
+        )
 
     def get_bigquery_client(self, project: str = None) -> bigquery.Client:
-        return bigquery.Client(credentials=self.creds, project=project)
+        return self._cached_client(
+            "bigquery",
+            lambda: bigquery.Client(credentials=self.creds, project=project),
+            project,
+        )
 
     def get_bigquery_write_async_client(
         self,
@@ -37,10 +124,16 @@ class GCPClients:
         )
 
     def get_bigquery_storage_client(self) -> bigquery_storage_v1.BigQueryReadClient:
-        return bigquery_storage_v1.BigQueryReadClient(credentials=self.creds)
+        return self._cached_client(
+            "bigquery_storage",
+            lambda: bigquery_storage_v1.BigQueryReadClient(credentials=self.creds),
+        )
 
     def get_metrics_client(self):
-        return monitoring_v3.MetricServiceClient(credentials=self.creds)
+        return self._cached_client(
+            "metrics",
+            lambda: monitoring_v3.MetricServiceClient(credentials=self.creds),
+        )
 
     def get_async_subscriber_client(self):
         return SubscriberAsyncClient(credentials=self.creds)
@@ -49,7 +142,11 @@ class GCPClients:
         return PublisherAsyncClient(credentials=self.creds)
 
     def get_publisher_client(self):
-        return pubsub.PublisherClient(credentials=self.creds)
+        return self._cached_client(
+            "publisher", lambda: pubsub.PublisherClient(credentials=self.creds)
+        )
 
     def get_subscriber_client(self):
-        return pubsub.SubscriberClient(credentials=self.creds)
+        return self._cached_client(
+            "subscriber", lambda: pubsub.SubscriberClient(credentials=self.creds)
+        )
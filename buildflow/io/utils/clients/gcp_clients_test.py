@@ -0,0 +1,78 @@
+import datetime
+import unittest
+from unittest import mock
+
+import google.auth.credentials
+
+from buildflow.core.credentials.gcp_credentials import GCPCredentials
+from buildflow.core.options.credentials_options import CredentialsOptions
+from buildflow.io.utils.clients import gcp_clients
+
+
+class GCPClientsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        gcp_clients._CREDENTIALS.clear()
+        gcp_clients._CLIENTS.clear()
+        self.creds = GCPCredentials(CredentialsOptions.default())
+        patcher = mock.patch.object(
+            GCPCredentials,
+            "get_creds",
+            side_effect=lambda quota_project_id=None: (
+                google.auth.credentials.AnonymousCredentials()
+            ),
+        )
+        self.get_creds = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_credentials_cached(self):
+        clients = gcp_clients.GCPClients(
+            credentials=self.creds, quota_project_id="project"
+        )
+        other_clients = gcp_clients.GCPClients(
+            credentials=self.creds, quota_project_id="project"
+        )
+        other_project = gcp_clients.GCPClients(
+            credentials=self.creds, quota_project_id="other-project"
+        )
+
+        self.assertIs(clients.creds, other_clients.creds)
+        self.assertIsNot(clients.creds, other_project.creds)
+        self.assertEqual(self.get_creds.call_count, 2)
+
+    def test_sync_clients_cached(self):
+        clients = gcp_clients.GCPClients(
+            credentials=self.creds, quota_project_id="project"
+        )
+        other_clients = gcp_clients.GCPClients(
+            credentials=self.creds, quota_project_id="project"
+        )
+
+        self.assertIs(
+            clients.get_storage_client("project"),
+            other_clients.get_storage_client("project"),
+        )
+        self.assertIsNot(
+            clients.get_storage_client("project"),
+            clients.get_storage_client("other-project"),
+        )
+
+    def test_needs_refresh(self):
+        self.assertFalse(
+            gcp_clients._needs_refresh(google.auth.credentials.AnonymousCredentials())
+        )
+
+        creds = mock.MagicMock(spec=google.auth.credentials.Credentials)
+        creds.token = None
+        self.assertTrue(gcp_clients._needs_refresh(creds))
+
+        now = datetime.datetime.utcnow()
+        creds.token = "token"
+        creds.expiry = now + datetime.timedelta(hours=1)
+        self.assertFalse(gcp_clients._needs_refresh(creds))
+
+        creds.expiry = now + datetime.timedelta(minutes=1)
+        self.assertTrue(gcp_clients._needs_refresh(creds))
+
+
+if __name__ == "__main__":
+    unittest.main()
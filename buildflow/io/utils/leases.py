@@ -0,0 +1,166 @@
+import asyncio
+import collections
+import dataclasses
+import logging
+import math
+import time
+from typing import Awaitable, Callable, Deque, Dict, Hashable, Iterable, List, Optional
+
+# Leases are extended once they expire in less than this many seconds.
+_RENEW_MARGIN_SECS = 5
+# How many of the most recent processing times the p99 is computed from.
+_NUM_PROCESSING_TIME_SAMPLES = 1000
+
+# Called with a list of lease ids and the new deadline in seconds.
+ExtendLeasesFn = Callable[[List[Hashable], int], Awaitable[None]]
+
+
+@dataclasses.dataclass
+class _Lease:
+    received_at: float
+    expires_at: float
+
+
+class LeaseManager:
+    """Extends the leases of messages that are still being processed.
+
+    Messages pulled from a queue (e.g. a Pub/Sub ack deadline, or a SQS
+    visibility timeout) are leased for a limited time, after which they are
+    redelivered. The lease manager tracks the ids of outstanding messages and
+    extends their leases (in bulk) right before they expire, so batches that take
+    longer than the lease are not redelivered while they are still being
+    processed.
+
+    Each extension uses the p99 of the observed processing time (time from
+    receiving a message until it was acked or nacked), so slow batches don't
+    need an extension request every few seconds. Leases are no longer extended
+    once they have been held for max_lease_seconds.
+    """
+
+    def __init__(
+        self,
+        extend_leases: ExtendLeasesFn,
+        *,
+        lease_seconds: int,
+        max_lease_seconds: int,
+        min_extension_seconds: int,
+        max_extension_seconds: int,
+        max_ids_per_request: int,
+        check_interval_secs: float = 1,
+    ):
+        # configuration
+        self.extend_leases = extend_leases
+        # How long a message is leased for when it is received.
+        self.lease_seconds = lease_seconds
+        self.max_lease_seconds = max_lease_seconds
+        # Bounds of a single extension accepted by the queue.
+        self.min_extension_seconds = min_extension_seconds
+        self.max_extension_seconds = max_extension_seconds
+        self.max_ids_per_request = max_ids_per_request
+        self.check_interval_secs = check_interval_secs
+        # initial state
+        self._leases: Dict[Hashable, _Lease] = {}
+        self._processing_secs: Deque[float] = collections.deque(
+            maxlen=_NUM_PROCESSING_TIME_SAMPLES
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def num_leases(self) -> int:
+        return len(self._leases)
+
+    def add(self, lease_ids: Iterable[Hashable]):
+        """Starts tracking the leases of newly received messages."""
+        now = time.monotonic()
+        expires_at = now + self.lease_seconds
+        for lease_id in lease_ids:
+            self._leases[lease_id] = _Lease(received_at=now, expires_at=expires_at)
+
+    def remove(self, lease_ids: Iterable[Hashable]):
+        """Stops tracking the leases of messages that were acked or nacked."""
+        now = time.monotonic()
+        for lease_id in lease_ids:
+            lease = self._leases.pop(lease_id, None)
+            if lease is not None:
+                self._processing_secs.append(now - lease.received_at)
+
+    def extension_seconds(self) -> int:
+        """Returns how long leases are extended for.
+
+        This is the p99 processing time, or the initial lease if no messages have
+        been processed yet.
+        """
+        if not self._processing_secs:
+            seconds = self.lease_seconds
+        else:
+            processing_secs = sorted(self._processing_secs)
+            seconds = processing_secs[int(0.99 * (len(processing_secs) - 1))]
+        return self._clamp_extension(math.ceil(seconds))
+
+    def _clamp_extension(self, seconds: int) -> int:
+        return min(max(seconds, self.min_extension_seconds), self.max_extension_seconds)
+
+    async def extend_expiring_leases(self):
+        """Extends the leases that are about to expire."""
+        now = time.monotonic()
+        extension_seconds = self.extension_seconds()
+        # Extension requests take a single deadline, so the ids are grouped by the
+        # deadline they need.
+        to_extend: Dict[int, List[Hashable]] = collections.defaultdict(list)
+        expired = []
+        for lease_id, lease in self._leases.items():
+            if lease.expires_at - now > _RENEW_MARGIN_SECS:
+                continue
+            remaining_lease_secs = lease.received_at + self.max_lease_seconds - now
+            if remaining_lease_secs <= 0:
+                expired.append(lease_id)
+                continue
+            # Don't extend past the max lease duration.
+            seconds = self._clamp_extension(
+                min(extension_seconds, math.ceil(remaining_lease_secs))
+            )
+            to_extend[seconds].append(lease_id)
+        if expired:
+            logging.warning(
+                "%s messages have been processing for more than %ss, their leases "
+                "will no longer be extended.",
+                len(expired),
+                self.max_lease_seconds,
+            )
+            for lease_id in expired:
+                del self._leases[lease_id]
+        for seconds, lease_ids in to_extend.items():
+            for i in range(0, len(lease_ids), self.max_ids_per_request):
+                chunk = lease_ids[i : i + self.max_ids_per_request]
+                try:
+                    await self.extend_leases(chunk, seconds)
+                except Exception:
+                    # The leases are still expiring so they are retried on the
+                    # next check.
+                    logging.exception("failed to extend leases")
+                    continue
+                expires_at = time.monotonic() + seconds
+                for lease_id in chunk:
+                    lease = self._leases.get(lease_id)
+                    if lease is not None:
+                        lease.expires_at = expires_at
+
+    def start(self):
+        """Starts extending leases in the background, if it isn't running yet."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._leases.clear()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.check_interval_secs)
+            await self.extend_expiring_leases()
@@ -0,0 +1,137 @@
+import unittest
+from unittest import mock
+
+from buildflow.io.utils import leases
+from buildflow.io.utils.leases import LeaseManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class LeaseManagerTest(unittest.IsolatedAsyncioTestCase):
+    def _lease_manager(self) -> LeaseManager:
+        return LeaseManager(
+            self.extend_leases,
+            lease_seconds=60,
+            max_lease_seconds=600,
+            min_extension_seconds=10,
+            max_extension_seconds=300,
+            max_ids_per_request=2500,
+        )
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(leases.time, "monotonic", self.clock.monotonic)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.extend_leases = mock.AsyncMock()
+        self.lease_manager = self._lease_manager()
+
+    async def test_extends_expiring_leases(self):
+        self.lease_manager.add(["1", "2"])
+
+        await self.lease_manager.extend_expiring_leases()
+        self.extend_leases.assert_not_called()
+
+        self.clock.now += 56
+        await self.lease_manager.extend_expiring_leases()
+
+        # No messages have been processed yet so the initial lease is used.
+        self.extend_leases.assert_awaited_once_with(["1", "2"], 60)
+
+        # The leases now expire 60 seconds from now.
+        self.extend_leases.reset_mock()
+        self.clock.now += 50
+        await self.lease_manager.extend_expiring_leases()
+        self.extend_leases.assert_not_called()
+
+    async def test_removed_leases_are_not_extended(self):
+        self.lease_manager.add(["1", "2"])
+        self.lease_manager.remove(["1"])
+
+        self.clock.now += 56
+        await self.lease_manager.extend_expiring_leases()
+
+        # The removed lease was processed in less than 10 seconds.
+        self.extend_leases.assert_awaited_once_with(["2"], 10)
+        self.assertEqual(self.lease_manager.num_leases, 1)
+
+    async def test_extension_uses_p99_processing_time(self):
+        for i in range(100):
+            self.lease_manager.add([str(i)])
+            self.clock.now += 120 if i == 99 else 30
+            self.lease_manager.remove([str(i)])
+
+        self.assertEqual(self.lease_manager.extension_seconds(), 30)
+
+        self.lease_manager.add(["slow"])
+        self.clock.now += 100
+        self.lease_manager.remove(["slow"])
+
+        self.assertEqual(self.lease_manager.extension_seconds(), 100)
+
+    async def test_extension_bounds(self):
+        self.lease_manager.add(["fast"])
+        self.clock.now += 1
+        self.lease_manager.remove(["fast"])
+        self.assertEqual(self.lease_manager.extension_seconds(), 10)
+
+        self.lease_manager = self._lease_manager()
+        self.lease_manager.add(["slow"])
+        self.clock.now += 1000
+        self.lease_manager.remove(["slow"])
+        self.assertEqual(self.lease_manager.extension_seconds(), 300)
+
+    async def test_max_lease_seconds(self):
+        self.lease_manager.add(["1"])
+
+        self.clock.now += 560
+        await self.lease_manager.extend_expiring_leases()
+        # Only extended until the max lease duration.
+        self.extend_leases.assert_awaited_once_with(["1"], 40)
+
+        self.extend_leases.reset_mock()
+        self.clock.now += 40
+        await self.lease_manager.extend_expiring_leases()
+        self.extend_leases.assert_not_called()
+        self.assertEqual(self.lease_manager.num_leases, 0)
+
+    async def test_extends_in_chunks(self):
+        ack_ids = [str(i) for i in range(3000)]
+        self.lease_manager.add(ack_ids)
+
+        self.clock.now += 56
+        await self.lease_manager.extend_expiring_leases()
+
+        self.assertEqual(
+            self.extend_leases.await_args_list,
+            [mock.call(ack_ids[:2500], 60), mock.call(ack_ids[2500:], 60)],
+        )
+
+    async def test_failed_extensions_are_retried(self):
+        self.extend_leases.side_effect = [RuntimeError("unavailable"), None]
+        self.lease_manager.add(["1"])
+
+        self.clock.now += 56
+        await self.lease_manager.extend_expiring_leases()
+        self.clock.now += 1
+        await self.lease_manager.extend_expiring_leases()
+
+        self.assertEqual(self.extend_leases.await_count, 2)
+
+    async def test_stop(self):
+        self.lease_manager.add(["1"])
+        self.lease_manager.start()
+
+        await self.lease_manager.stop()
+
+        self.assertEqual(self.lease_manager.num_leases, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Utilities for working with Arrow schemas."""
+
+import dataclasses
+import datetime
+import enum
+import types
+import typing
+from typing import Dict, List, Type, get_type_hints
+
+import pyarrow as pa
+
+# TODO: there are some other types that aren't as common:
+#   decimals, intervals, uuids
+_PY_TYPE_TO_ARROW_TYPE = {
+    int: pa.int64(),
+    str: pa.string(),
+    float: pa.float64(),
+    datetime.datetime: pa.timestamp("us"),
+    bytes: pa.binary(),
+    bool: pa.bool_(),
+    datetime.date: pa.date32(),
+    datetime.time: pa.time64("us"),
+}
+
+# Schemas keyed by dataclass type. Dataclasses can't change their fields after
+# they are defined so it is safe to generate the schema once.
+_SCHEMAS: Dict[Type, pa.Schema] = {}
+
+_UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+
+
+def _dataclass_fields(type_: Type) -> List[dataclasses.Field]:
+    # NOTE: dataclasses.fields doesn't work for types that were pickled into a
+    # ray actor, see bigquery_schemas._dataclass_fields.
+    fields = getattr(type_, dataclasses._FIELDS)
+    return [
+        f for f in fields.values() if f._field_type.__class__.__name__ == "_FIELD_BASE"
+    ]
+
+
+def _is_optional(field_type: Type) -> bool:
+    return (
+        typing.get_origin(field_type) in _UNION_TYPES
+        and len(field_type.__args__) == 2
+        and type(None) in field_type.__args__
+    )
+
+
+def _optional_inner_type(field_type: Type) -> Type:
+    args = field_type.__args__
+    return args[0] if args[1] is type(None) else args[1]
+
+
+def dataclass_to_arrow_schema(type_: Type) -> pa.Schema:
+    """Convert a dataclass to an Arrow schema.
+
+    Args:
+        type_: The dataclass type to convert.
+
+    Returns:
+        A pyarrow.Schema with one field per dataclass field. Optional fields are
+        nullable, all other fields are not.
+    """
+    schema = _SCHEMAS.get(type_)
+    if schema is None:
+        schema = pa.schema(dataclass_fields_to_arrow_schema(type_))
+        _SCHEMAS[type_] = schema
+    return schema
+
+
+def dataclass_fields_to_arrow_schema(type_: Type) -> List[pa.Field]:
+    try:
+        type_hints = get_type_hints(type_)
+    except NameError:
+        # Forward references that can't be resolved.
+        type_hints = {}
+    arrow_fields = []
+    for field in _dataclass_fields(type_):
+        field_type = type_hints.get(field.name, field.type)
+        nullable = False
+        if _is_optional(field_type):
+            nullable = True
+            field_type = _optional_inner_type(field_type)
+        arrow_fields.append(
+            pa.field(field.name, _to_arrow_type(field_type), nullable=nullable)
+        )
+    return arrow_fields
+
+
+def _to_arrow_type(field_type: Type) -> pa.DataType:
+    if _is_optional(field_type):
+        # Values inside of containers are always nullable in Arrow.
+        field_type = _optional_inner_type(field_type)
+    if field_type in _PY_TYPE_TO_ARROW_TYPE:
+        return _PY_TYPE_TO_ARROW_TYPE[field_type]
+    if isinstance(field_type, type) and issubclass(field_type, enum.Enum):
+        return _enum_to_arrow_type(field_type)
+    if dataclasses.is_dataclass(field_type):
+        return pa.struct(dataclass_fields_to_arrow_schema(field_type))
+    origin = typing.get_origin(field_type)
+    args = typing.get_args(field_type)
+    if origin in (list, set, frozenset) and len(args) == 1:
+        return pa.list_(_to_arrow_type(args[0]))
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return pa.list_(_to_arrow_type(args[0]))
+    if origin is dict and len(args) == 2:
+        return pa.map_(_to_arrow_type(args[0]), _to_arrow_type(args[1]))
+    raise ValueError(f"Can't convert type: {field_type} to an arrow schema")
+
+
+def _enum_to_arrow_type(enum_type: Type[enum.Enum]) -> pa.DataType:
+    # Enums are stored as their values.
+    value_types = {type(member.value) for member in enum_type}
+    if len(value_types) == 1:
+        value_type = value_types.pop()
+        if value_type in (int, str):
+            return _PY_TYPE_TO_ARROW_TYPE[value_type]
+    raise ValueError(
+        f"Can't convert enum: {enum_type} to an arrow schema, all values must be "
+        "either ints or strings"
+    )
@@ -0,0 +1,140 @@
+import enum
+import unittest
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pyarrow as pa
+
+from buildflow.io.utils.schemas import arrow_schemas
+
+
+class Status(enum.Enum):
+    ACTIVE = "active"
+
+
+class Priority(enum.Enum):
+    LOW = 1
+
+
+class ArrowSchemasTest(unittest.TestCase):
+    def test_primitive_types(self):
+        @dataclass
+        class Schema:
+            int_field: int
+            str_field: str
+            float_field: float
+            timestamp: datetime
+            bytes_field: bytes
+            bool_field: bool
+            date_field: date
+            time_field: time
+
+        schema = arrow_schemas.dataclass_to_arrow_schema(Schema)
+
+        expected_schema = pa.schema(
+            [
+                pa.field("int_field", pa.int64(), nullable=False),
+                pa.field("str_field", pa.string(), nullable=False),
+                pa.field("float_field", pa.float64(), nullable=False),
+                pa.field("timestamp", pa.timestamp("us"), nullable=False),
+                pa.field("bytes_field", pa.binary(), nullable=False),
+                pa.field("bool_field", pa.bool_(), nullable=False),
+                pa.field("date_field", pa.date32(), nullable=False),
+                pa.field("time_field", pa.time64("us"), nullable=False),
+            ]
+        )
+        self.assertEqual(schema, expected_schema)
+
+    def test_optional_types(self):
+        @dataclass
+        class Schema:
+            int_field: Optional[int]
+            str_field: Optional[str]
+
+        schema = arrow_schemas.dataclass_to_arrow_schema(Schema)
+
+        expected_schema = pa.schema(
+            [
+                pa.field("int_field", pa.int64(), nullable=True),
+                pa.field("str_field", pa.string(), nullable=True),
+            ]
+        )
+        self.assertEqual(schema, expected_schema)
+
+    def test_nested_and_container_types(self):
+        @dataclass
+        class Nested:
+            value: int
+            label: Optional[str]
+
+        @dataclass
+        class Schema:
+            nested: Nested
+            optional_nested: Optional[Nested]
+            nested_list: List[Nested]
+            optional_items: List[Optional[int]]
+            tags: Set[str]
+            values: Tuple[float, ...]
+            attributes: Dict[str, int]
+
+        schema = arrow_schemas.dataclass_to_arrow_schema(Schema)
+
+        nested_type = pa.struct(
+            [
+                pa.field("value", pa.int64(), nullable=False),
+                pa.field("label", pa.string(), nullable=True),
+            ]
+        )
+        expected_schema = pa.schema(
+            [
+                pa.field("nested", nested_type, nullable=False),
+                pa.field("optional_nested", nested_type, nullable=True),
+                pa.field("nested_list", pa.list_(nested_type), nullable=False),
+                pa.field("optional_items", pa.list_(pa.int64()), nullable=False),
+                pa.field("tags", pa.list_(pa.string()), nullable=False),
+                pa.field("values", pa.list_(pa.float64()), nullable=False),
+                pa.field(
+                    "attributes", pa.map_(pa.string(), pa.int64()), nullable=False
+                ),
+            ]
+        )
+        self.assertEqual(schema, expected_schema)
+
+    def test_enum_types(self):
+        @dataclass
+        class Schema:
+            status: Status
+            priority: Optional[Priority]
+
+        schema = arrow_schemas.dataclass_to_arrow_schema(Schema)
+
+        expected_schema = pa.schema(
+            [
+                pa.field("status", pa.string(), nullable=False),
+                pa.field("priority", pa.int64(), nullable=True),
+            ]
+        )
+        self.assertEqual(schema, expected_schema)
+
+    def test_schema_is_cached(self):
+        @dataclass
+        class Schema:
+            int_field: int
+
+        self.assertIs(
+            arrow_schemas.dataclass_to_arrow_schema(Schema),
+            arrow_schemas.dataclass_to_arrow_schema(Schema),
+        )
+
+    def test_unsupported_type(self):
+        @dataclass
+        class Schema:
+            any_field: Any
+
+        with self.assertRaises(ValueError):
+            arrow_schemas.dataclass_to_arrow_schema(Schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,12 +13,34 @@ Cause there's really a couple cases every converter needs to provide:
 5. We know how to convert the type (e.g. dataclass -> json)
 """
 
+import collections.abc
+import contextlib
+import contextvars
+import dataclasses
 import datetime
-import json
-from dataclasses import _FIELDS, is_dataclass
-from typing import Any, Callable, Dict, MutableMapping, Optional, Type, get_type_hints
+import enum
+import logging
+import operator
+import types
+import typing
+from dataclasses import _FIELDS, MISSING, is_dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+    get_type_hints,
+)
 
 import pandas as pd
+import pyarrow as pa
 from dacite import Config
 from dacite.cache import cache
 from dacite.core import _build_value
@@ -34,9 +56,11 @@ from dacite.exceptions import (
     UnexpectedDataError,
     WrongTypeError,
 )
-from dacite.types import is_instance
+from dacite.types import is_instance, is_optional
 
 from buildflow import exceptions
+from buildflow.io.utils.schemas import arrow_schemas
+from buildflow.io.utils.schemas.json_backends import json_backend
 
 
 def str_to_datetime(s: str) -> datetime.datetime:
@@ -48,60 +72,578 @@ def identity():
 
 
 def bytes_to_dict() -> Callable[[bytes], Dict[str, Any]]:
-    return lambda bytes_: json.loads(bytes_.decode())
+    return json_backend().loads
 
 
 def str_to_dict() -> Callable[[str], Dict[str, Any]]:
-    return lambda str_: json.loads(str_)
+    return json_backend().loads
 
 
 def bytes_to_dataclass(type_: Type) -> Callable[[bytes], Any]:
-    def _converter(bytes_: bytes) -> Any:
-        return _dataclass_from_dict(
-            type_,
-            json.loads(bytes_.decode()),
-            config=Config(type_hooks={datetime.datetime: str_to_datetime}),
-        )
-
-    return _converter
+    loads = json_backend().loads
+    decoder = dataclass_decoder(type_)
+    return lambda bytes_: decoder(loads(bytes_))
 
 
 def str_to_dataclass(type_: Type) -> Callable[[str], Any]:
-    return lambda s: _dataclass_from_dict(
-        type_,
-        json.loads(s),
-        config=Config(type_hooks={datetime.datetime: str_to_datetime}),
-    )
+    loads = json_backend().loads
+    decoder = dataclass_decoder(type_)
+    return lambda s: decoder(loads(s))
+
+
+class UnknownFieldPolicy(enum.Enum):
+    """How to handle fields in the data that the dataclass doesn't have."""
+
+    # Drop the unknown fields.
+    IGNORE = "ignore"
+    # Raise an UnexpectedDataError.
+    RAISE = "raise"
+
+
+class MissingFieldPolicy(enum.Enum):
+    """How to handle required dataclass fields that are missing from the data.
+
+    Fields with a default value (or that are Optional) are always filled in.
+    """
+
+    # Raise a MissingValueError.
+    RAISE = "raise"
+    # Set the field to None.
+    USE_NONE = "use_none"
+
+
+@dataclasses.dataclass(frozen=True)
+class DecodePolicy:
+    unknown_fields: UnknownFieldPolicy = UnknownFieldPolicy.IGNORE
+    missing_fields: MissingFieldPolicy = MissingFieldPolicy.RAISE
+
+
+@dataclasses.dataclass
+class DecodeShapeStats:
+    """Counters for the shapes (i.e. field sets) decoded for a dataclass type."""
+
+    # The number of field sets a decode plan was compiled for. Once a decoder
+    # caches _MAX_SHAPES_PER_TYPE plans the least recently used one is evicted,
+    # and a field set that is seen again after being evicted is counted again.
+    num_shapes: int = 0
+    # The number of elements that had fields the dataclass doesn't have.
+    num_unknown_field_elements: int = 0
+    # The number of elements that were missing required fields.
+    num_missing_field_elements: int = 0
+
+
+# The policy used when a decoder is compiled without an explicit policy.
+_DECODE_POLICY: contextvars.ContextVar[DecodePolicy] = contextvars.ContextVar(
+    "buildflow_decode_policy", default=DecodePolicy()
+)
+# Shape stats keyed by dataclass type.
+_DECODE_SHAPE_STATS: Dict[Type, DecodeShapeStats] = {}
+# Limits the number of decode plans cached per dataclass, in case the producer
+# sends sparse data with (nearly) unique field sets. Past the limit the least
+# recently used plan is evicted.
+_MAX_SHAPES_PER_TYPE = 64
+
+
+@contextlib.contextmanager
+def decode_policy(policy: DecodePolicy):
+    """Sets the policy of the dataclass decoders created inside of the block.
+
+    This lets the runtime configure decoding without every source having to pass
+    the policy through its pull_converter.
+    """
+    token = _DECODE_POLICY.set(policy)
+    try:
+        yield
+    finally:
+        _DECODE_POLICY.reset(token)
+
+
+def decode_shape_stats(type_: Type) -> DecodeShapeStats:
+    """Returns the shape stats of all decoders of the given dataclass type."""
+    stats = _DECODE_SHAPE_STATS.get(type_)
+    if stats is None:
+        stats = DecodeShapeStats()
+        _DECODE_SHAPE_STATS[type_] = stats
+    return stats
+
+
+# The config used when we fall back to dacite for types we can't compile.
+_DACITE_CONFIG = Config(type_hooks={datetime.datetime: str_to_datetime})
+# Compiled decoders keyed by dataclass type and decode policy.
+_DATACLASS_DECODERS: Dict[
+    Tuple[Type, DecodePolicy], Callable[[Mapping[str, Any]], Any]
+] = {}
+_PRIMITIVE_TYPES = (int, float, str, bool, bytes)
+_UNION_TYPES = (typing.Union, getattr(types, "UnionType", typing.Union))
+# How to handle a field that is missing from the data.
+_MISSING_REQUIRED = 0
+_MISSING_USE_DEFAULT = 1
+_MISSING_USE_NONE = 2
+
+
+def dataclass_decoder(
+    type_: Type, policy: Optional[DecodePolicy] = None
+) -> Callable[[Mapping[str, Any]], Any]:
+    """Returns a decoder from a dict to the given dataclass type.
+
+    The decoder is compiled once per type into a plan of per field decoders, so
+    decoding doesn't need to inspect the type hints of the dataclass for every
+    element. Field types that can't be compiled are decoded with dacite.
+
+    A decode plan is cached per shape (i.e. the set of field names of the data,
+    in any order). Data with new or missing fields, e.g. during a rolling upgrade
+    of the producer, gets its own plan instead of being checked field by field. How
+    unknown and missing fields are handled is configured with the policy, which
+    defaults to the policy set with decode_policy (if any). The default policy
+    matches _dataclass_from_dict: unknown fields are ignored and missing required
+    fields raise a MissingValueError.
+    """
+    if policy is None:
+        policy = _DECODE_POLICY.get()
+    key = (type_, policy)
+    decoder = _DATACLASS_DECODERS.get(key)
+    if decoder is None:
+        try:
+            decoder = _compile_dataclass_decoder(type_, policy)
+        except NameError:
+            # Forward references that can't be resolved, let dacite raise the
+            # error when an element is decoded.
+            decoder = lambda data: _dataclass_from_dict(  # noqa: E731
+                type_, data, config=_DACITE_CONFIG
+            )
+        _DATACLASS_DECODERS[key] = decoder
+    return decoder
+
+
+def _compile_dataclass_decoder(
+    data_class: Type, policy: DecodePolicy
+) -> Callable[[Mapping[str, Any]], Any]:
+    data_class_hints = get_type_hints(data_class)
+    frozen = is_frozen(data_class)
+    init_plan: List[Tuple[str, Callable[[Any], Any], int]] = []
+    post_init_plan: List[Tuple[str, Callable[[Any], Any]]] = []
+    for field in _dataclass_fields(data_class):
+        field_type = data_class_hints[field.name]
+        decoder = _compile_value_decoder(field_type, policy)
+        if not field.init:
+            if not frozen:
+                post_init_plan.append((field.name, decoder))
+            continue
+        if field.default is not MISSING or field.default_factory is not MISSING:
+            missing = _MISSING_USE_DEFAULT
+        elif is_optional(field_type):
+            missing = _MISSING_USE_NONE
+        else:
+            missing = _MISSING_REQUIRED
+        init_plan.append((field.name, decoder, missing))
+    field_names = {f.name for f in _dataclass_fields(data_class)}
+    stats = decode_shape_stats(data_class)
+    # Plans in least recently used order.
+    shape_plans: typing.OrderedDict[
+        FrozenSet[str], Callable[[Mapping[str, Any]], Any]
+    ] = collections.OrderedDict()
+
+    def compile_shape(
+        shape_names: FrozenSet[str],
+    ) -> Callable[[Mapping[str, Any]], Any]:
+        unknown_names = shape_names - field_names
+        if unknown_names and policy.unknown_fields == UnknownFieldPolicy.RAISE:
+            return _raise_decoder(lambda: UnexpectedDataError(keys=unknown_names))
+        present_plan = []
+        missing_values = {}
+        has_missing_fields = False
+        for name, decoder, missing in init_plan:
+            if name in shape_names:
+                present_plan.append((name, decoder))
+            elif missing == _MISSING_USE_NONE:
+                missing_values[name] = None
+            elif missing == _MISSING_REQUIRED:
+                if policy.missing_fields == MissingFieldPolicy.RAISE:
+                    return _raise_decoder(lambda: MissingValueError(name))
+                missing_values[name] = None
+                has_missing_fields = True
+            # Otherwise the dataclass will set the default value.
+        shape_post_init_plan = [
+            (name, decoder) for name, decoder in post_init_plan if name in shape_names
+        ]
+        has_unknown_fields = bool(unknown_names)
+
+        def decode_shape(data: Mapping[str, Any]) -> Any:
+            init_values = missing_values.copy()
+            for name, decoder in present_plan:
+                try:
+                    init_values[name] = decoder(data[name])
+                except DaciteFieldError as error:
+                    error.update_path(name)
+                    raise
+            instance = data_class(**init_values)
+            for name, decoder in shape_post_init_plan:
+                try:
+                    setattr(instance, name, decoder(data[name]))
+                except DaciteFieldError as error:
+                    error.update_path(name)
+                    raise
+            if has_unknown_fields:
+                stats.num_unknown_field_elements += 1
+            if has_missing_fields:
+                stats.num_missing_field_elements += 1
+            return instance
+
+        return decode_shape
+
+    def decode(data: Mapping[str, Any]) -> Any:
+        # NOTE: the dict check avoids the slow isinstance check against the abc.
+        if type(data) is not dict and not isinstance(data, collections.abc.Mapping):
+            raise WrongTypeError(field_type=data_class, value=data)
+        shape = frozenset(data)
+        shape_plan = shape_plans.get(shape)
+        if shape_plan is None:
+            shape_plan = compile_shape(shape)
+            if len(shape_plans) >= _MAX_SHAPES_PER_TYPE:
+                shape_plans.popitem(last=False)
+            shape_plans[shape] = shape_plan
+            stats.num_shapes += 1
+            if 1 < stats.num_shapes <= _MAX_SHAPES_PER_TYPE:
+                logging.info(
+                    "decoding new shape of %s with fields: %s",
+                    data_class.__name__,
+                    sorted(shape),
+                )
+            elif stats.num_shapes == _MAX_SHAPES_PER_TYPE + 1:
+                logging.warning(
+                    "decoded more than %s shapes of %s, evicting the least recently "
+                    "used decode plans",
+                    _MAX_SHAPES_PER_TYPE,
+                    data_class.__name__,
+                )
+        elif len(shape_plans) > 1:
+            shape_plans.move_to_end(shape)
+        return shape_plan(data)
+
+    return decode
+
+
+def _raise_decoder(error_fn: Callable[[], Exception]) -> Callable[[Any], Any]:
+    def decode(data: Any) -> Any:
+        raise error_fn()
+
+    return decode
+
+
+def _compile_value_decoder(type_: Type, policy: DecodePolicy) -> Callable[[Any], Any]:
+    """Returns a decoder for a single field value of the given type."""
+    if type_ is Any:
+        return _identity_decoder
+    if type_ is float:
+        # Matches dacite which follows the numeric tower (ints are valid floats).
+        return _instance_decoder((int, float))
+    if type_ in _PRIMITIVE_TYPES or type_ in (list, dict):
+        return _instance_decoder(type_)
+    if type_ is datetime.datetime:
+        return _decode_datetime
+    if isinstance(type_, type) and issubclass(type_, enum.Enum):
+        return _enum_decoder(type_)
+    if is_dataclass(type_):
+        return _nested_dataclass_decoder(type_, policy)
+    origin = typing.get_origin(type_)
+    args = typing.get_args(type_)
+    if origin in _UNION_TYPES and len(args) == 2 and type(None) in args:
+        inner_type = args[0] if args[1] is type(None) else args[1]
+        return _optional_decoder(_compile_value_decoder(inner_type, policy))
+    if origin is list and len(args) == 1:
+        return _list_decoder(_compile_value_decoder(args[0], policy))
+    if origin is dict and len(args) == 2 and args[0] in (str, Any):
+        return _dict_decoder(_compile_value_decoder(args[1], policy))
+    return _dacite_decoder(type_)
+
+
+def _identity_decoder(value: Any) -> Any:
+    return value
+
+
+def _instance_decoder(type_: Union[Type, Tuple[Type, ...]]) -> Callable[[Any], Any]:
+    field_type = type_[-1] if isinstance(type_, tuple) else type_
+
+    def decode(value: Any) -> Any:
+        if isinstance(value, type_):
+            return value
+        raise WrongTypeError(field_type=field_type, value=value)
+
+    return decode
+
+
+def _decode_datetime(value: Any) -> datetime.datetime:
+    if isinstance(value, str):
+        try:
+            return datetime.datetime.fromisoformat(value)
+        except ValueError:
+            # Not all ISO 8601 strings are supported by fromisoformat (e.g. a "Z"
+            # suffix before python 3.11) so we fall back to pandas.
+            pass
+    converted = str_to_datetime(value)
+    if isinstance(converted, datetime.datetime):
+        return converted
+    raise WrongTypeError(field_type=datetime.datetime, value=value)
+
+
+def _enum_decoder(enum_type: Type[enum.Enum]) -> Callable[[Any], Any]:
+    # Enums are encoded as their values by dataclass_encoder.
+    def decode(value: Any) -> Any:
+        if isinstance(value, enum_type):
+            return value
+        try:
+            return enum_type(value)
+        except ValueError:
+            raise WrongTypeError(field_type=enum_type, value=value)
+
+    return decode
+
+
+def _nested_dataclass_decoder(
+    data_class: Type, policy: DecodePolicy
+) -> Callable[[Any], Any]:
+    # NOTE: the nested decoder is compiled lazily to support recursive dataclasses.
+    dataclass_decoder_ = None
+
+    def decode(value: Any) -> Any:
+        nonlocal dataclass_decoder_
+        # NOTE: the dict check avoids the slow isinstance check against the abc.
+        if type(value) is dict or isinstance(value, collections.abc.Mapping):
+            if dataclass_decoder_ is None:
+                dataclass_decoder_ = dataclass_decoder(data_class, policy)
+            return dataclass_decoder_(value)
+        if isinstance(value, data_class):
+            return value
+        raise WrongTypeError(field_type=data_class, value=value)
+
+    return decode
+
+
+def _optional_decoder(decoder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else decoder(value)
+
+
+def _list_decoder(item_decoder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def decode(value: Any) -> Any:
+        if not isinstance(value, list):
+            raise WrongTypeError(field_type=list, value=value)
+        return [item_decoder(item) for item in value]
+
+    return decode
+
+
+def _dict_decoder(value_decoder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def decode(value: Any) -> Any:
+        if not isinstance(value, dict) or not all(isinstance(k, str) for k in value):
+            raise WrongTypeError(field_type=dict, value=value)
+        return {k: value_decoder(v) for k, v in value.items()}
+
+    return decode
+
+
+def _dacite_decoder(type_: Type) -> Callable[[Any], Any]:
+    def decode(value: Any) -> Any:
+        value = _build_value(type_=type_, data=value, config=_DACITE_CONFIG)
+        if not is_instance(value, type_):
+            raise WrongTypeError(field_type=type_, value=value)
+        return value
+
+    return decode
+
+
+_TEMPORAL_TYPES = (datetime.datetime, datetime.date, datetime.time)
+# Compiled encoders keyed by dataclass type and whether temporal values are kept
+# as is (i.e. for Arrow) instead of being converted to ISO format strings.
+_DATACLASS_ENCODERS: Dict[Tuple[Type, bool], Callable[[Any], Dict[str, Any]]] = {}
 
 
 def _dataclass_to_json(dataclass_instance) -> Dict[str, Any]:
+    return dataclass_encoder(type(dataclass_instance))(dataclass_instance)
+
+
+def dataclass_encoder(
+    type_: Type, *, native_temporal: bool = False
+) -> Callable[[Any], Dict[str, Any]]:
+    """Returns an encoder from the given dataclass type to a JSON compatible dict.
+
+    The encoder is compiled once per type from the field type hints, so fields
+    with JSON compatible types (e.g. int, str, List[str]) are copied without any
+    runtime type checks. Datetimes are converted to ISO format (unless
+    native_temporal is set), enums to their values, sets and tuples to lists and
+    nested dataclasses to dicts.
+    """
+    key = (type_, native_temporal)
+    encoder = _DATACLASS_ENCODERS.get(key)
+    if encoder is None:
+        try:
+            encoder = _compile_dataclass_encoder(type_, native_temporal)
+        except NameError:
+            # Forward references that can't be resolved, so we inspect the value
+            # of each field at runtime instead.
+            encoder = _compile_dataclass_encoder(
+                type_, native_temporal, use_type_hints=False
+            )
+        _DATACLASS_ENCODERS[key] = encoder
+    return encoder
+
+
+def _compile_dataclass_encoder(
+    data_class: Type, native_temporal: bool, use_type_hints: bool = True
+) -> Callable[[Any], Dict[str, Any]]:
     # NOTE: we roll our own asdict instead of using dataclasses.asdict because
     # of an issue with dataclasses and cloudpickle.
     # https://github.com/cloudpipe/cloudpickle/issues/386
-    # This also converts some field types that we know aren't serializable to
-    # json.
-    #   - datetime.datetime, datetime.date, datetime.time
-
-    # TODO: need to ensure we convert containers of dataclasses to json
-    to_ret = {}
-    for k in dataclass_instance.__dataclass_fields__:
-        val = getattr(dataclass_instance, k)
-        if isinstance(val, (datetime.datetime, datetime.date, datetime.time)):
-            val = val.isoformat()
-        if is_dataclass(val):
-            val = _dataclass_to_json(val)
-        if isinstance(val, list) and len(val) > 0 and is_dataclass(val[0]):
-            val = [_dataclass_to_json(v) for v in val]
-        to_ret[k] = val
-    return to_ret
+    data_class_hints = get_type_hints(data_class) if use_type_hints else {}
+    names = tuple(field.name for field in _dataclass_fields(data_class))
+    plan = tuple(
+        (name, encoder)
+        for name, encoder in (
+            (
+                name,
+                _compile_value_encoder(
+                    data_class_hints.get(name, Any), native_temporal
+                ),
+            )
+            for name in names
+        )
+        if encoder is not None
+    )
+    if not names:
+        return lambda dataclass_instance: {}
+    # attrgetter returns a single value (not a tuple) for a single name.
+    get_values = operator.attrgetter(*names) if len(names) > 1 else None
+
+    def encode(dataclass_instance: Any) -> Dict[str, Any]:
+        if get_values is None:
+            to_ret = {names[0]: getattr(dataclass_instance, names[0])}
+        else:
+            to_ret = dict(zip(names, get_values(dataclass_instance)))
+        # Fields that need encoding are replaced in place to preserve the
+        # field order.
+        for name, encoder in plan:
+            to_ret[name] = encoder(to_ret[name])
+        return to_ret
+
+    return encode
+
+
+def _compile_value_encoder(
+    type_: Type, native_temporal: bool = False
+) -> Optional[Callable[[Any], Any]]:
+    """Returns an encoder for a single field value, or None if no encoding is needed."""
+    if type_ in _PRIMITIVE_TYPES or type_ is type(None):
+        return None
+    if type_ in _TEMPORAL_TYPES:
+        return None if native_temporal else _encode_temporal
+    if isinstance(type_, type) and issubclass(type_, enum.Enum):
+        return _encode_enum
+    if is_dataclass(type_):
+        return _nested_dataclass_encoder(type_, native_temporal)
+    origin = typing.get_origin(type_)
+    args = typing.get_args(type_)
+    if origin in _UNION_TYPES and len(args) == 2 and type(None) in args:
+        # The encoders for non-primitive types already handle None values.
+        inner_type = args[0] if args[1] is type(None) else args[1]
+        return _compile_value_encoder(inner_type, native_temporal)
+    if origin in (list, set, frozenset) and len(args) == 1:
+        item_encoder = _compile_value_encoder(args[0], native_temporal)
+        if item_encoder is None and origin is list:
+            return None
+        return _collection_encoder(item_encoder)
+    if origin is tuple and len(args) == 2 and args[1] is Ellipsis:
+        return _collection_encoder(_compile_value_encoder(args[0], native_temporal))
+    if origin is dict and len(args) == 2 and args[0] is str:
+        value_encoder = _compile_value_encoder(args[1], native_temporal)
+        if value_encoder is None:
+            return None
+        return _dict_encoder(value_encoder)
+    return _encode_native_temporal_value if native_temporal else _encode_value
+
+
+def _encode_value(value: Any, native_temporal: bool = False) -> Any:
+    """Encodes a value whose type we only know at runtime."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, _TEMPORAL_TYPES):
+        return value if native_temporal else value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if is_dataclass(value):
+        return dataclass_encoder(type(value), native_temporal=native_temporal)(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_encode_value(v, native_temporal) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode_value(v, native_temporal) for k, v in value.items()}
+    return value
+
+
+def _encode_native_temporal_value(value: Any) -> Any:
+    return _encode_value(value, native_temporal=True)
+
+
+def _encode_temporal(value: Any) -> Any:
+    if isinstance(value, _TEMPORAL_TYPES):
+        return value.isoformat()
+    return value
+
+
+def _encode_enum(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    return value
+
+
+def _nested_dataclass_encoder(
+    data_class: Type, native_temporal: bool
+) -> Callable[[Any], Any]:
+    # NOTE: the nested encoder is compiled lazily to support recursive dataclasses.
+    dataclass_encoder_ = None
+
+    def encode(value: Any) -> Any:
+        nonlocal dataclass_encoder_
+        if value is None:
+            return None
+        if type(value) is not data_class:
+            # e.g. a subclass of the annotated dataclass.
+            return _encode_value(value, native_temporal)
+        if dataclass_encoder_ is None:
+            dataclass_encoder_ = dataclass_encoder(
+                data_class, native_temporal=native_temporal
+            )
+        return dataclass_encoder_(value)
+
+    return encode
+
+
+def _collection_encoder(
+    item_encoder: Optional[Callable[[Any], Any]]
+) -> Callable[[Any], Any]:
+    def encode(value: Any) -> Any:
+        if value is None:
+            return None
+        if item_encoder is None:
+            return list(value)
+        return [item_encoder(item) for item in value]
+
+    return encode
+
+
+def _dict_encoder(value_encoder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def encode(value: Any) -> Any:
+        if value is None:
+            return None
+        return {k: value_encoder(v) for k, v in value.items()}
+
+    return encode
 
 
 def dataclass_to_json() -> Callable[[Any], Dict[str, Any]]:
-    return lambda user_type: _dataclass_to_json(user_type)
+    return _dataclass_to_json
 
 
 def dataclass_to_bytes() -> Callable[[Any], bytes]:
-    return lambda user_type: json.dumps(_dataclass_to_json(user_type)).encode("utf-8")
+    dumps_bytes = json_backend().dumps_bytes
+    return lambda user_type: dumps_bytes(_dataclass_to_json(user_type))
 
 
 def json_push_converter(type_: Optional[Type]) -> Callable[[Any], Dict[str, Any]]:
@@ -114,7 +656,7 @@ def json_push_converter(type_: Optional[Type]) -> Callable[[Any], Dict[str, Any]
     if hasattr(type_, "to_json"):
         return lambda output: type_.to_json(output)
     if is_dataclass(type_):
-        return dataclass_to_json()
+        return dataclass_encoder(type_)
     if origin is list or origin is set or origin is tuple:
         if not hasattr(type_, "__args__"):
             return identity()
@@ -143,7 +685,8 @@ def bytes_push_converter(type_: Optional[Type]) -> Callable[[Any], bytes]:
         # Try to serialize it to json then encode it.
         try:
             json_converter = json_push_converter(type_)
-            return lambda output: json.dumps(json_converter(output)).encode("utf-8")
+            dumps_bytes = json_backend().dumps_bytes
+            return lambda output: dumps_bytes(json_converter(output))
         except exceptions.CannotConvertSinkException:
             raise exceptions.CannotConvertSinkException(
                 "Cannot convert from type to bytes: `{type_}`"
@@ -165,13 +708,111 @@ def str_push_converter(type_: Optional[Type]) -> Callable[[Any], str]:
         # Try to serialize it to json then encode it.
         try:
             json_converter = json_push_converter(type_)
-            return lambda output: json.dumps(json_converter(output))
+            dumps_str = json_backend().dumps_str
+            return lambda output: dumps_str(json_converter(output))
         except exceptions.CannotConvertSinkException:
             raise exceptions.CannotConvertSinkException(
                 "Cannot convert from type to bytes: `{type_}`"
             )
 
 
+def arrow_push_converter(
+    type_: Optional[Type],
+) -> Optional[Callable[[List[Any]], pa.RecordBatch]]:
+    """Returns a converter from a batch of dataclass outputs to a RecordBatch.
+
+    Columns are built directly from the dataclass fields instead of creating a
+    dict per element, and are typed with the schema generated from the dataclass
+    (see arrow_schemas) so no type inference happens per batch. Enums are
+    converted to their values and nested dataclasses to structs.
+
+    Returns None if the batch can't be converted to Arrow directly (e.g. the
+    output type is not a dataclass or provides its own to_json), in which case
+    the elements should be converted one at a time with json_push_converter.
+    """
+    if type_ is None or hasattr(type_, "to_json"):
+        return None
+    origin = typing.get_origin(type_)
+    if origin in (list, set, tuple):
+        # The runtime flattens collections of outputs into the batch.
+        args = typing.get_args(type_)
+        if not args:
+            return None
+        return arrow_push_converter(args[0])
+    if not is_dataclass(type_):
+        return None
+
+    try:
+        schema = arrow_schemas.dataclass_to_arrow_schema(type_)
+    except ValueError:
+        # The dataclass has fields Arrow has no equivalent for (e.g. Any), so
+        # the schema is inferred from the first batch instead.
+        schema = None
+    try:
+        data_class_hints = get_type_hints(type_)
+    except NameError:
+        data_class_hints = {}
+    if schema is not None:
+        names = schema.names
+        required_names = [field.name for field in schema if not field.nullable]
+    else:
+        names = [field.name for field in _dataclass_fields(type_)]
+        required_names = []
+    plan = tuple(
+        (
+            name,
+            operator.attrgetter(name),
+            _compile_value_encoder(
+                data_class_hints.get(name, Any), native_temporal=True
+            ),
+        )
+        for name in names
+    )
+
+    def convert(batch: List[Any]) -> pa.RecordBatch:
+        nonlocal schema
+        columns = {}
+        for name, get_value, encoder in plan:
+            column = list(map(get_value, batch))
+            if encoder is not None:
+                column = list(map(encoder, column))
+            columns[name] = column
+        if schema is None:
+            record_batch = pa.RecordBatch.from_pydict(columns)
+            # The inferred schema is reused for following batches, unless a
+            # column only contained nulls and its type is still unknown.
+            if not any(pa.types.is_null(field.type) for field in record_batch.schema):
+                schema = record_batch.schema
+            return record_batch
+        record_batch = pa.RecordBatch.from_pydict(columns, schema=schema)
+        # Arrow doesn't check nullability when building arrays, null counts
+        # are cheap to compute though.
+        null_names = [
+            name for name in required_names if record_batch.column(name).null_count
+        ]
+        if null_names:
+            # Python doesn't enforce the annotations, so these were written before
+            # batches were converted to Arrow directly. Mark the fields nullable
+            # for this batch instead of failing it.
+            logging.warning(
+                "fields %s of %s are not optional but contain None values",
+                null_names,
+                type_.__name__,
+            )
+            relaxed_schema = schema
+            for name in null_names:
+                index = relaxed_schema.get_field_index(name)
+                relaxed_schema = relaxed_schema.set(
+                    index, relaxed_schema.field(index).with_nullable(True)
+                )
+            record_batch = pa.RecordBatch.from_arrays(
+                record_batch.columns, schema=relaxed_schema
+            )
+        return record_batch
+
+    return convert
+
+
 def str_pull_converter(type_: Optional[Type]) -> Callable[[str], Any]:
     if type_ is None:
         return identity()
@@ -192,6 +833,42 @@ def str_pull_converter(type_: Optional[Type]) -> Callable[[str], Any]:
             )
 
 
+def dict_pull_converter(type_: Optional[Type]) -> Callable[[Dict[str, Any]], Any]:
+    if type_ is None:
+        return identity()
+    elif is_dataclass(type_):
+        return dataclass_decoder(type_)
+    else:
+        if hasattr(type_, "__origin__"):
+            type_ = type_.__origin__
+        if issubclass(type_, dict):
+            return identity()
+        else:
+            raise exceptions.CannotConvertSourceException(
+                f"Cannot convert from dict to type: `{type_}`"
+            )
+
+
+def bytes_pull_converter(type_: Optional[Type]) -> Callable[[bytes], Any]:
+    if type_ is None:
+        return identity()
+    elif hasattr(type_, "from_bytes"):
+        return lambda output: type_.from_bytes(output)
+    elif is_dataclass(type_):
+        return bytes_to_dataclass(type_)
+    else:
+        if hasattr(type_, "__origin__"):
+            type_ = type_.__origin__
+        if issubclass(type_, bytes):
+            return identity()
+        elif issubclass(type_, dict):
+            return bytes_to_dict()
+        else:
+            raise exceptions.CannotConvertSourceException(
+                f"Cannot convert from bytes to type: `{type_}`"
+            )
+
+
 def _dataclass_fields(data_class: Type):
     fields = getattr(data_class, _FIELDS)
     return [f for f in fields.values()]
@@ -1,8 +1,13 @@
 import datetime
+import enum
 import json
 import unittest
-from dataclasses import asdict, dataclass
-from typing import Dict, List, Optional, Set
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from unittest import mock
+
+import pyarrow as pa
+from dacite.exceptions import MissingValueError, UnexpectedDataError, WrongTypeError
 
 from buildflow import exceptions
 from buildflow.io.utils.schemas import converters
@@ -22,6 +27,59 @@ class InputDataClass:
     timestamp: Optional[datetime.datetime] = None
 
 
+@dataclass
+class AllFieldTypes:
+    required: float
+    optional_no_default: Optional[str]
+    nested_dict: Dict[str, Nested]
+    union: Union[int, str]
+    tags: Set[str]
+    any_value: object = None
+    with_default: List[int] = field(default_factory=lambda: [1])
+    not_init: int = field(default=0, init=False)
+
+
+@dataclass
+class Versioned:
+    id: int
+    name: str
+    note: Optional[str] = None
+
+
+@dataclass
+class VersionedParent:
+    child: Versioned
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclass
+class EncoderFieldTypes:
+    color: Color
+    date: datetime.date
+    tags: Set[str]
+    pairs: Tuple[int, ...]
+    nested_by_key: Dict[str, Nested]
+    optional_nested: Optional[Nested]
+    untyped: Any
+
+
+@dataclass
+class RoundTrip:
+    color: Color
+    timestamp: datetime.datetime
+    nested_by_key: Dict[str, Nested]
+    optional_nested: Optional[Nested]
+
+
+@dataclass
+class Recursive:
+    value: int
+    child: Optional["Recursive"] = None
+
+
 class ConvertersTest(unittest.TestCase):
     def test_bytes_to_dict(self):
         expected_dict = {"a": 1, "b": 2}
@@ -161,11 +219,12 @@ class ConvertersTest(unittest.TestCase):
         input_class = InputDataClass(
             a=1, b=2, nested=Nested(c=3), nested_list=[Nested(c=4)]
         )
-        expected_output = json.dumps(asdict(input_class)).encode()
+        expected_output = asdict(input_class)
 
         converter = converters.bytes_push_converter(InputDataClass)
 
-        self.assertEqual(expected_output, converter(input_class))
+        # NOTE: the exact bytes depend on which JSON backend is installed.
+        self.assertEqual(expected_output, json.loads(converter(input_class)))
 
     def test_bytes_push_converter_not_supported(self):
         with self.assertRaises(exceptions.CannotConvertSinkException):
@@ -197,11 +256,12 @@ class ConvertersTest(unittest.TestCase):
         input_class = InputDataClass(
             a=1, b=2, nested=Nested(c=3), nested_list=[Nested(c=4)]
         )
-        expected_output = json.dumps(asdict(input_class))
+        expected_output = asdict(input_class)
 
         converter = converters.str_push_converter(InputDataClass)
 
-        self.assertEqual(expected_output, converter(input_class))
+        # NOTE: the exact string depends on which JSON backend is installed.
+        self.assertEqual(expected_output, json.loads(converter(input_class)))
 
     def test_str_push_converter_not_supported(self):
         with self.assertRaises(exceptions.CannotConvertSinkException):
@@ -237,6 +297,299 @@ class ConvertersTest(unittest.TestCase):
 
         self.assertEqual("a", converter("a"))
 
+    def test_dataclass_decoder_matches_dacite(self):
+        data = {
+            "required": 1,
+            "nested_dict": {"a": {"c": 1}},
+            "union": "x",
+            "tags": {"a"},
+            "any_value": [1, "2"],
+            "not_init": 5,
+        }
+
+        decoder = converters.dataclass_decoder(AllFieldTypes)
+
+        decoded = decoder(data)
+        self.assertEqual(
+            converters._dataclass_from_dict(
+                AllFieldTypes, data, config=converters._DACITE_CONFIG
+            ),
+            decoded,
+        )
+        self.assertIsNone(decoded.optional_no_default)
+        self.assertEqual(decoded.nested_dict, {"a": Nested(c=1)})
+        self.assertEqual(decoded.with_default, [1])
+        self.assertEqual(decoded.not_init, 5)
+        self.assertIs(decoder, converters.dataclass_decoder(AllFieldTypes))
+
+    def test_dataclass_decoder_recursive(self):
+        decoder = converters.dataclass_decoder(Recursive)
+
+        decoded = decoder({"value": 1, "child": {"value": 2}})
+
+        self.assertEqual(decoded, Recursive(value=1, child=Recursive(value=2)))
+
+    def test_dataclass_decoder_datetime(self):
+        decoder = converters.dataclass_decoder(InputDataClass)
+
+        decoded = decoder({"a": 1, "b": 2, "timestamp": "2023-01-01T00:00:00Z"})
+
+        self.assertEqual(
+            decoded.timestamp,
+            datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+
+    def test_dataclass_decoder_errors(self):
+        decoder = converters.dataclass_decoder(InputDataClass)
+
+        with self.assertRaises(MissingValueError) as missing:
+            decoder({"a": 1})
+        self.assertEqual(missing.exception.field_path, "b")
+
+        with self.assertRaises(WrongTypeError) as wrong_type:
+            decoder({"a": 1, "b": 2, "nested_list": [{"c": "not an int"}]})
+        self.assertEqual(wrong_type.exception.field_path, "nested_list.c")
+
+    def test_dataclass_decoder_shape_stats(self):
+        # NOTE: stats are tracked per type so we use a type only this test uses.
+        @dataclass
+        class Event:
+            id: int
+            name: str
+            note: Optional[str] = None
+
+        policy = converters.DecodePolicy(
+            missing_fields=converters.MissingFieldPolicy.USE_NONE
+        )
+        decoder = converters.dataclass_decoder(Event, policy)
+        stats = converters.decode_shape_stats(Event)
+
+        decoder({"id": 1, "name": "a"})
+        decoder({"id": 2, "name": "b"})
+        # A producer that added a field.
+        decoded = decoder({"id": 3, "name": "c", "added": True})
+        decoder({"id": 4, "name": "d", "added": True})
+        # A producer that doesn't set a required field.
+        decoder({"id": 5})
+
+        self.assertEqual(decoded, Event(id=3, name="c"))
+        self.assertEqual(stats.num_shapes, 3)
+        self.assertEqual(stats.num_unknown_field_elements, 2)
+        self.assertEqual(stats.num_missing_field_elements, 1)
+
+    def test_dataclass_decoder_shapes_ignore_field_order(self):
+        @dataclass
+        class Event:
+            id: int
+            name: str
+
+        decoder = converters.dataclass_decoder(Event)
+        stats = converters.decode_shape_stats(Event)
+
+        decoder({"id": 1, "name": "a"})
+        decoded = decoder({"name": "b", "id": 2})
+
+        self.assertEqual(decoded, Event(id=2, name="b"))
+        self.assertEqual(stats.num_shapes, 1)
+
+    def test_dataclass_decoder_shapes_evicted(self):
+        @dataclass
+        class Event:
+            id: int
+
+        decoder = converters.dataclass_decoder(Event)
+        stats = converters.decode_shape_stats(Event)
+
+        with mock.patch.object(converters, "_MAX_SHAPES_PER_TYPE", 2):
+            decoder({"id": 1, "a": 1})
+            decoder({"id": 1, "b": 1})
+            decoder({"id": 1, "a": 1})
+            # Evicts the plan for "b", which was used least recently.
+            decoder({"id": 1, "c": 1})
+            decoder({"id": 1, "a": 1})
+            self.assertEqual(stats.num_shapes, 3)
+            self.assertEqual(decoder({"id": 1, "b": 1}), Event(id=1))
+            self.assertEqual(stats.num_shapes, 4)
+
+    def test_dataclass_decoder_unknown_field_policy(self):
+        policy = converters.DecodePolicy(
+            unknown_fields=converters.UnknownFieldPolicy.RAISE
+        )
+        decoder = converters.dataclass_decoder(Versioned, policy)
+
+        self.assertEqual(decoder({"id": 1, "name": "a"}), Versioned(id=1, name="a"))
+        with self.assertRaises(UnexpectedDataError) as unexpected:
+            decoder({"id": 1, "name": "a", "added": True})
+        self.assertEqual(unexpected.exception.keys, {"added"})
+        # The policy applies to nested dataclasses as well.
+        with self.assertRaises(UnexpectedDataError):
+            converters.dataclass_decoder(VersionedParent, policy)(
+                {"child": {"id": 1, "name": "a", "added": True}}
+            )
+
+    def test_dataclass_decoder_missing_field_policy(self):
+        policy = converters.DecodePolicy(
+            missing_fields=converters.MissingFieldPolicy.USE_NONE
+        )
+
+        with converters.decode_policy(policy):
+            decoder = converters.bytes_to_dataclass(VersionedParent)
+
+        self.assertEqual(
+            decoder(b'{"child": {"id": 1}}'),
+            VersionedParent(child=Versioned(id=1, name=None)),
+        )
+        with self.assertRaises(MissingValueError):
+            converters.bytes_to_dataclass(VersionedParent)(b'{"child": {"id": 1}}')
+
+    def test_dataclass_decoder_wrong_type(self):
+        decoder = converters.dataclass_decoder(Versioned)
+
+        with self.assertRaises(WrongTypeError):
+            decoder([{"id": 1, "name": "a"}])
+
+    def test_dataclass_encoder(self):
+        input_class = EncoderFieldTypes(
+            color=Color.RED,
+            date=datetime.date(2023, 1, 1),
+            tags={"a"},
+            pairs=(1, 2),
+            nested_by_key={"a": Nested(c=1)},
+            optional_nested=None,
+            untyped=[Nested(c=2), datetime.time(1, 2)],
+        )
+
+        encoder = converters.dataclass_encoder(EncoderFieldTypes)
+
+        self.assertEqual(
+            encoder(input_class),
+            {
+                "color": "red",
+                "date": "2023-01-01",
+                "tags": ["a"],
+                "pairs": [1, 2],
+                "nested_by_key": {"a": {"c": 1}},
+                "optional_nested": None,
+                "untyped": [{"c": 2}, "01:02:00"],
+            },
+        )
+        self.assertIs(encoder, converters.dataclass_encoder(EncoderFieldTypes))
+
+    def test_dataclass_encoder_decoder_round_trip(self):
+        input_class = RoundTrip(
+            color=Color.RED,
+            timestamp=datetime.datetime(2023, 1, 1, 1, 2, 3),
+            nested_by_key={"a": Nested(c=1)},
+            optional_nested=Nested(c=2),
+        )
+
+        encoded = converters.dataclass_to_bytes()(input_class)
+
+        decoded = converters.bytes_to_dataclass(RoundTrip)(encoded)
+        self.assertEqual(decoded, input_class)
+
+    def test_dataclass_encoder_recursive(self):
+        encoder = converters.dataclass_encoder(Recursive)
+
+        encoded = encoder(Recursive(value=1, child=Recursive(value=2)))
+
+        self.assertEqual(encoded, {"value": 1, "child": {"value": 2, "child": None}})
+
+    def test_arrow_push_converter(self):
+        timestamp = datetime.datetime(2023, 1, 1, 1, 2, 3)
+        first = InputDataClass(a=1, b=2, nested=Nested(c=3), timestamp=timestamp)
+        second = InputDataClass(a=4, b=5, nested_list=[Nested(c=6)])
+
+        converter = converters.arrow_push_converter(List[InputDataClass])
+        record_batch = converter([first, second])
+
+        self.assertEqual(
+            record_batch.schema.field("timestamp").type, pa.timestamp("us")
+        )
+        self.assertEqual(
+            record_batch.to_pylist(),
+            [
+                {
+                    "a": 1,
+                    "b": 2,
+                    "nested": {"c": 3},
+                    "nested_list": None,
+                    "timestamp": timestamp,
+                },
+                {
+                    "a": 4,
+                    "b": 5,
+                    "nested": None,
+                    "nested_list": [{"c": 6}],
+                    "timestamp": None,
+                },
+            ],
+        )
+        self.assertEqual(converter([second]).schema, record_batch.schema)
+
+    def test_arrow_push_converter_uses_dataclass_schema(self):
+        converter = converters.arrow_push_converter(RoundTrip)
+
+        # The first batch only contains nulls for the optional field, but the
+        # column is still typed.
+        record_batch = converter(
+            [
+                RoundTrip(
+                    color=Color.RED,
+                    timestamp=datetime.datetime(2023, 1, 1),
+                    nested_by_key={"a": Nested(c=1)},
+                    optional_nested=None,
+                )
+            ]
+        )
+
+        self.assertEqual(
+            record_batch.schema.field("optional_nested").type,
+            pa.struct([pa.field("c", pa.int64(), nullable=False)]),
+        )
+        self.assertEqual(
+            record_batch.column("nested_by_key").to_pylist(), [[("a", {"c": 1})]]
+        )
+
+    def test_arrow_push_converter_required_field_is_none(self):
+        converter = converters.arrow_push_converter(InputDataClass)
+
+        record_batch = converter(
+            [InputDataClass(a=1, b=2), InputDataClass(a=1, b=None)]
+        )
+
+        # The field is made nullable for this batch instead of failing it.
+        self.assertTrue(record_batch.schema.field("b").nullable)
+        self.assertFalse(record_batch.schema.field("a").nullable)
+        self.assertEqual(record_batch.column("b").to_pylist(), [2, None])
+
+    def test_arrow_push_converter_enum(self):
+        converter = converters.arrow_push_converter(RoundTrip)
+        record_batch = converter(
+            [
+                RoundTrip(
+                    color=Color.RED,
+                    timestamp=datetime.datetime(2023, 1, 1),
+                    nested_by_key={},
+                    optional_nested=None,
+                )
+            ]
+        )
+
+        self.assertEqual(record_batch.column("color").to_pylist(), ["red"])
+
+    def test_arrow_push_converter_unsupported_types(self):
+        @dataclass
+        class CustomJson:
+            a: int
+
+            def to_json(self) -> Dict[str, int]:
+                return {"b": self.a}
+
+        self.assertIsNone(converters.arrow_push_converter(None))
+        self.assertIsNone(converters.arrow_push_converter(Dict[str, Any]))
+        self.assertIsNone(converters.arrow_push_converter(CustomJson))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,144 @@
+"""JSON (de)serialization backends used by the converters.
+
+The fastest installed backend is used by default: orjson, then msgspec, then the
+standard library. The backend can be forced with the BUILDFLOW_JSON_BACKEND
+environment variable (one of: json, orjson, msgspec).
+
+NOTE: orjson and msgspec produce compact JSON (no spaces after separators), so
+the exact bytes differ from the standard library, but the decoded values are the
+same.
+"""
+import dataclasses
+import datetime
+import enum
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Union
+
+_BACKEND_ENV_VAR = "BUILDFLOW_JSON_BACKEND"
+_BACKEND_PREFERENCE = ("orjson", "msgspec", "json")
+
+
+@dataclasses.dataclass(frozen=True)
+class JsonBackend:
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps_bytes: Callable[[Any], bytes]
+    dumps_str: Callable[[Any], str]
+
+
+def _json_default(value: Any) -> Any:
+    """Converts values the JSON backends can't serialize on their own."""
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # Imported here to avoid a circular import.
+        from buildflow.io.utils.schemas.converters import dataclass_encoder
+
+        return dataclass_encoder(type(value))(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib_backend() -> JsonBackend:
+    def dumps_str(value: Any) -> str:
+        return json.dumps(value, default=_json_default)
+
+    return JsonBackend(
+        name="json",
+        loads=json.loads,
+        dumps_bytes=lambda value: dumps_str(value).encode("utf-8"),
+        dumps_str=dumps_str,
+    )
+
+
+def _orjson_backend() -> JsonBackend:
+    import orjson
+
+    stdlib = _stdlib_backend()
+    option = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the standard library (e.g. integers larger
+            # than 64 bits), so we fall back before failing.
+            return json.loads(data)
+
+    def dumps_bytes(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, default=_json_default, option=option)
+        except orjson.JSONEncodeError:
+            return stdlib.dumps_bytes(value)
+
+    return JsonBackend(
+        name="orjson",
+        loads=loads,
+        dumps_bytes=dumps_bytes,
+        dumps_str=lambda value: dumps_bytes(value).decode("utf-8"),
+    )
+
+
+def _msgspec_backend() -> JsonBackend:
+    import msgspec
+
+    stdlib = _stdlib_backend()
+    encoder = msgspec.json.Encoder(enc_hook=_json_default)
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError:
+            return json.loads(data)
+
+    def dumps_bytes(value: Any) -> bytes:
+        try:
+            return encoder.encode(value)
+        except (msgspec.EncodeError, OverflowError, TypeError):
+            return stdlib.dumps_bytes(value)
+
+    return JsonBackend(
+        name="msgspec",
+        loads=loads,
+        dumps_bytes=dumps_bytes,
+        dumps_str=lambda value: dumps_bytes(value).decode("utf-8"),
+    )
+
+
+_BACKEND_FACTORIES: Dict[str, Callable[[], JsonBackend]] = {
+    "json": _stdlib_backend,
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+}
+_BACKENDS: Dict[str, JsonBackend] = {}
+
+
+def json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Returns the JSON backend with the given name, or the default backend.
+
+    Raises ValueError if the name is unknown, and ImportError if the requested
+    backend isn't installed.
+    """
+    if name is None:
+        name = os.environ.get(_BACKEND_ENV_VAR)
+    if name is None:
+        for candidate in _BACKEND_PREFERENCE:
+            try:
+                return json_backend(candidate)
+            except ImportError:
+                continue
+    if name not in _BACKEND_FACTORIES:
+        raise ValueError(
+            f"Unknown JSON backend: {name}. "
+            f"Must be one of: {list(_BACKEND_FACTORIES.keys())}"
+        )
+    backend = _BACKENDS.get(name)
+    if backend is None:
+        backend = _BACKEND_FACTORIES[name]()
+        _BACKENDS[name] = backend
+    return backend
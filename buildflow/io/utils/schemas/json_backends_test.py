@@ -0,0 +1,70 @@
+import dataclasses
+import datetime
+import importlib.util
+import json
+import os
+import unittest
+from unittest import mock
+
+from buildflow.io.utils.schemas import json_backends
+
+_INSTALLED_BACKENDS = [
+    name
+    for name in ("json", "orjson", "msgspec")
+    if name == "json" or importlib.util.find_spec(name) is not None
+]
+
+
+@dataclasses.dataclass
+class Nested:
+    a: int
+
+
+class JsonBackendsTest(unittest.TestCase):
+    def test_backends_round_trip(self):
+        value = {
+            "int": 1,
+            "large_int": 2**70,
+            "float": 1.5,
+            "str": "a",
+            "list": [1, None, True],
+            "nested": {"a": [{"b": 1}]},
+        }
+        for name in _INSTALLED_BACKENDS:
+            with self.subTest(backend=name):
+                backend = json_backends.json_backend(name)
+
+                self.assertEqual(backend.name, name)
+                self.assertEqual(json.loads(backend.dumps_bytes(value)), value)
+                self.assertEqual(json.loads(backend.dumps_str(value)), value)
+                self.assertEqual(backend.loads(json.dumps(value).encode()), value)
+                self.assertEqual(backend.loads(json.dumps(value)), value)
+
+    def test_backends_serialize_non_json_types(self):
+        value = {
+            "datetime": datetime.datetime(2023, 1, 1, 1, 2, 3),
+            "set": {1},
+            "dataclass": Nested(a=1),
+        }
+        expected = {
+            "datetime": "2023-01-01T01:02:03",
+            "set": [1],
+            "dataclass": {"a": 1},
+        }
+        for name in _INSTALLED_BACKENDS:
+            with self.subTest(backend=name):
+                backend = json_backends.json_backend(name)
+
+                self.assertEqual(json.loads(backend.dumps_bytes(value)), expected)
+
+    def test_backend_from_env_var(self):
+        with mock.patch.dict(os.environ, {"BUILDFLOW_JSON_BACKEND": "json"}):
+            self.assertEqual(json_backends.json_backend().name, "json")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            json_backends.json_backend("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
 import dataclasses
 import enum
-from typing import Any
+from typing import Any, AsyncIterator, Optional
 from urllib.parse import unquote_plus
 
+import botocore.exceptions
+
 from buildflow.core.types.aws_types import S3BucketName
-from buildflow.types.portable import FileChangeEvent, PortableFileChangeEventType
+from buildflow.types.portable import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    FileChangeEvent,
+    PortableFileChangeEventType,
+)
 
 
 class S3ChangeStreamEventType(enum.Enum):
@@ -61,11 +67,74 @@ class S3FileChangeEvent(FileChangeEvent):
     event_type: S3ChangeStreamEventType
     bucket_name: S3BucketName
     s3_client: Any
+    # An AsyncAWSClient for s3, used by read_blob.
+    async_s3_client: Optional[Any] = None
 
     @property
-    def blob(self) -> bytes:
+    def _key(self) -> str:
         # S3 gives us a url encoded path, so we need to decode it inorder to read
         # the file from s3.
-        file_path = unquote_plus(self.file_path)
-        data = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_path)
+        return unquote_plus(self.file_path)
+
+    def _download_blob(self) -> bytes:
+        data = self.s3_client.get_object(Bucket=self.bucket_name, Key=self._key)
+        return data["Body"].read()
+
+    def _download_blob_range(self, start: int, end: int) -> bytes:
+        if start >= end:
+            return b""
+        try:
+            data = self.s3_client.get_object(
+                Bucket=self.bucket_name, Key=self._key, Range=f"bytes={start}-{end - 1}"
+            )
+        except botocore.exceptions.ClientError as e:
+            # The range starts after the end of the object.
+            if e.response["Error"]["Code"] == "InvalidRange":
+                return b""
+            raise
         return data["Body"].read()
+
+    async def _async_download_blob(self) -> bytes:
+        if self.async_s3_client is None:
+            return await super()._async_download_blob()
+        s3_client = await self.async_s3_client.get()
+        data = await s3_client.get_object(Bucket=self.bucket_name, Key=self._key)
+        async with data["Body"] as body:
+            return await body.read()
+
+    async def read_blob_range(self, start: int, end: int) -> bytes:
+        if self.async_s3_client is None or self._prefetched_blob is not None:
+            return await super().read_blob_range(start, end)
+        if start >= end:
+            return b""
+        s3_client = await self.async_s3_client.get()
+        try:
+            data = await s3_client.get_object(
+                Bucket=self.bucket_name, Key=self._key, Range=f"bytes={start}-{end - 1}"
+            )
+        except botocore.exceptions.ClientError as e:
+            # The range starts after the end of the object.
+            if e.response["Error"]["Code"] == "InvalidRange":
+                return b""
+            raise
+        async with data["Body"] as body:
+            return await body.read()
+
+    async def stream_blob(
+        self, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        if self.async_s3_client is None or self._prefetched_blob is not None:
+            async for chunk in super().stream_blob(chunk_size):
+                yield chunk
+            return
+        # Streams the body of a single request instead of a request per chunk.
+        s3_client = await self.async_s3_client.get()
+        data = await s3_client.get_object(Bucket=self.bucket_name, Key=self._key)
+        remaining = data["ContentLength"]
+        async with data["Body"] as body:
+            while remaining > 0:
+                chunk = await body.read(min(chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
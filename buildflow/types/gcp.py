@@ -26,19 +26,34 @@ class GCSChangeStreamEventType(enum.Enum):
                 f"event type: {portable_type}"
             ) from None
 
+    def to_portable_type(self):
+        if self == GCSChangeStreamEventType.OBJECT_FINALIZE:
+            return PortableFileChangeEventType.CREATED
+        elif self == GCSChangeStreamEventType.OBJECT_DELETE:
+            return PortableFileChangeEventType.DELETED
+        return PortableFileChangeEventType.UNKNOWN
+
 
 @dataclasses.dataclass
 class GCSFileChangeEvent(FileChangeEvent):
     event_type: GCSChangeStreamEventType
     storage_client: storage.Client
 
-    @property
-    def blob(self) -> bytes:
+    def _get_blob(self) -> storage.Blob:
         if self.metadata["eventType"] == "OBJECT_DELETE":
             raise ValueError("Can't fetch blob for `OBJECT_DELETE` event.")
         bucket = self.storage_client.bucket(bucket_name=self.metadata["bucketId"])
-        blob = bucket.get_blob(self.metadata["objectId"])
-        return blob.download_as_bytes()
+        return bucket.get_blob(self.metadata["objectId"])
+
+    def _download_blob(self) -> bytes:
+        return self._get_blob().download_as_bytes()
+
+    def _download_blob_range(self, start: int, end: int) -> bytes:
+        blob = self._get_blob()
+        if start >= blob.size:
+            return b""
+        # GCS ranges include the end byte.
+        return blob.download_as_bytes(start=start, end=min(end, blob.size) - 1)
 
 
 class CloudSQLDatabaseVersion:
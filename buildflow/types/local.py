@@ -21,13 +21,28 @@ class FileChangeStreamEventType(enum.Enum):
                 f"event type: {portable_type}"
             ) from None
 
+    def to_portable_type(self):
+        if self == FileChangeStreamEventType.CREATED:
+            return PortableFileChangeEventType.CREATED
+        elif self == FileChangeStreamEventType.DELETED:
+            return PortableFileChangeEventType.DELETED
+        return PortableFileChangeEventType.UNKNOWN
+
+
+class FileChangeOverflowPolicy(enum.Enum):
+    # Stop reading file changes until there is room in the buffer.
+    BLOCK = "block"
+    # Drop the oldest buffered event to make room for the new one.
+    DROP_OLDEST = "drop_oldest"
+    # Drop the new event.
+    DROP_NEWEST = "drop_newest"
+
 
 @dataclasses.dataclass
 class LocalFileChangeEvent(FileChangeEvent):
     event_type: FileChangeStreamEventType
 
-    @property
-    def blob(self) -> bytes:
+    def _download_blob(self) -> bytes:
         if self.metadata["eventType"] == "deleted":
             raise ValueError("Can't fetch blob for `delete` event.")
         with open(self.metadata["srcPath"], "rb") as f:
@@ -1,9 +1,12 @@
+import asyncio
 import enum
-from dataclasses import dataclass
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional
 
 from buildflow.core.types.shared_types import FilePath
 
+DEFAULT_STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 class FileFormat(enum.Enum):
     # TODO: Support additional file formats (Arrow, Avro, etc..)
@@ -26,6 +29,77 @@ class FileChangeEvent:
     # Metadata specific to the cloud provider.
     metadata: Dict[str, Any]
 
+    # Contents of the file, if the source prefetched it.
+    _prefetched_blob: Optional[bytes] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def portable_event_type(self) -> PortableFileChangeEventType:
+        if isinstance(self.event_type, PortableFileChangeEventType):
+            return self.event_type
+        return self.event_type.to_portable_type()
+
     @property
     def blob(self) -> bytes:
+        """Returns the contents of the file.
+
+        This blocks while the file is read, async processors should use
+        `await event.read_blob()` instead.
+        """
+        if self._prefetched_blob is not None:
+            return self._prefetched_blob
+        return self._download_blob()
+
+    async def read_blob(self) -> bytes:
+        """Returns the contents of the file without blocking the event loop."""
+        if self._prefetched_blob is not None:
+            return self._prefetched_blob
+        return await self._async_download_blob()
+
+    async def read_blob_range(self, start: int, end: int) -> bytes:
+        """Returns the bytes in [start, end) of the file.
+
+        Less than end - start bytes are returned if the file is shorter.
+        """
+        if self._prefetched_blob is not None:
+            return self._prefetched_blob[start:end]
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._download_blob_range, start, end)
+
+    async def stream_blob(
+        self, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Yields the contents of the file in chunks of chunk_size bytes.
+
+        Only one chunk is held in memory at a time, so this can be used for files
+        that don't fit into memory.
+        """
+        offset = 0
+        while True:
+            chunk = await self.read_blob_range(offset, offset + chunk_size)
+            if chunk:
+                yield chunk
+            if len(chunk) < chunk_size:
+                return
+            offset += chunk_size
+
+    async def prefetch(self) -> int:
+        """Downloads the contents of the file, so reading it doesn't block.
+
+        Returns the size of the file in bytes.
+        """
+        if self._prefetched_blob is None:
+            self._prefetched_blob = await self._async_download_blob()
+        return len(self._prefetched_blob)
+
+    def _download_blob(self) -> bytes:
         raise NotImplementedError(f"blob not implemented for {type(self)}")
+
+    async def _async_download_blob(self) -> bytes:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._download_blob)
+
+    def _download_blob_range(self, start: int, end: int) -> bytes:
+        # Providers that support ranged reads override this.
+        return self._download_blob()[start:end]
@@ -39,6 +39,8 @@ class MockAWSResponse(aiobotocore.awsrequest.AioAWSResponse):
     def __init__(self, response: botocore.awsrequest.AWSResponse):
         self._moto_response = response
         self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
         self.raw = MockHttpClientResponse(response)
 
     # adapt async methods to use moto's response
@@ -68,6 +70,11 @@ class MockHttpClientResponse(aiohttp.client_reqrep.ClientResponse):
         self.content.read = read
         self.response = response
 
+    def close(self) -> None:
+        """
+        There is no connection to release.
+        """
+
     @property
     def raw_headers(self) -> Any:
         """